@@ -4,12 +4,26 @@ Flask Web Application для управления клиентами.
 Использует паттерны MVC и Observer для структурирования приложения.
 """
 
-from flask import Flask, render_template_string, request, redirect, url_for
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from flask import Flask, Response, abort, request, redirect, stream_with_context, url_for
+from werkzeug.http import is_resource_modified
+from src.core.compression import Compressor
 from src.core.db_manager import DB_manager
+from src.core.sqlite_manager import SQLite_manager
+from src.core.metrics import Metrics
+from src.mvc.observer_dispatcher import ObserverDispatcher, DEFAULT_MAX_QUEUE
+from src.repositories.client_rep_base import Client_rep_base
 from src.repositories.client_rep_db import Client_rep_db
 from src.repositories.client_rep_db_adapter import Client_rep_db_adapter
+from src.repositories.client_rep_sqlite import Client_rep_sqlite
 from src.mvc.client_view import ClientView
-from src.mvc.client_controller import ClientController, ClientAddController, ClientEditController, ClientDeleteController
+from src.mvc.static_assets import IMMUTABLE_CACHE_CONTROL, find_asset
+from src.mvc.client_controller import (
+    ClientController, ClientAddController, ClientEditController, ClientDeleteController, ErrorPage
+)
+from src.mvc.client_api_controller import ClientApiController, encode_json
+from src.mvc.client_events import DEFAULT_COALESCE_WINDOW, ClientEventBroadcaster
 
 
 # Параметры подключения к базе данных
@@ -22,23 +36,88 @@ DB_PARAMS = {
 }
 
 
-def create_app() -> Flask:
+def render_page(html: str) -> Response:
+    """
+    Возвращает готовый HTML от ClientView как ответ.
+
+    Представление уже формирует итоговую страницу, поэтому она отдается
+    напрямую, без компиляции в Jinja-шаблон на каждый запрос (и без
+    интерпретации '{{ ... }}' в данных клиентов).
+
+    Args:
+        html: HTML-строка страницы
+
+    Returns:
+        Объект Response с типом text/html
+    """
+    return Response(html, mimetype='text/html')
+
+
+def render_json(data: Any, status: int = 200) -> Response:
+    """
+    Возвращает данные JSON API как ответ.
+
+    Args:
+        data: данные ответа (словари, списки и простые значения)
+        status: HTTP-статус
+
+    Returns:
+        Объект Response с типом application/json
+    """
+    return Response(encode_json(data), status=status, mimetype='application/json')
+
+
+def create_app(repo: Optional[Client_rep_base] = None, config: Optional[Dict[str, Any]] = None) -> Flask:
     """
     Создает и конфигурирует Flask приложение.
     
+    Args:
+        repo: репозиторий клиентов (по умолчанию - адаптер PostgreSQL по DB_PARAMS
+            или встроенной базы SQLite, если задан SQLITE_PATH)
+        config: дополнительные настройки app.config (например, COMPRESS_LEVEL,
+            EVENTS_COALESCE_WINDOW - окно объединения событий SSE в секундах,
+            ASYNC_OBSERVERS - доставлять уведомления наблюдателям в фоновом потоке,
+            SQLITE_PATH - путь к файлу базы SQLite вместо PostgreSQL)
+    
     Returns:
         Настроенное Flask приложение
     """
     app = Flask(__name__)
+    if config:
+        app.config.update(config)
+    
+    # Метрики приложения и сжатие ответов (gzip/deflate)
+    metrics = Metrics()
+    app.extensions['metrics'] = metrics
+    Compressor(app, metrics)
+    
+    @app.route('/metrics')
+    def show_metrics():
+        """
+        Отдает метрики приложения в текстовом формате.
+        
+        Returns:
+            Строки вида '<имя> <значение>'
+        """
+        # Статистика кэша репозитория с ограниченной памятью (Client_rep_bounded)
+        if hasattr(repo, 'get_cache_stats'):
+            for name, value in repo.get_cache_stats().items():
+                metrics.set_gauge(f'repository_cache_{name}', value)
+        return Response(metrics.render_text(), mimetype='text/plain')
     
     # Инициализируем компоненты MVC
     try:
-        # 1. Создаем Singleton DB_manager
-        db_manager = DB_manager(DB_PARAMS)
-        
-        # 2. Создаем репозиторий с адаптером
-        base_repo = Client_rep_db(db_manager)
-        repo = Client_rep_db_adapter(base_repo)
+        if repo is None and app.config.get('SQLITE_PATH'):
+            # 1-2. Встроенная база SQLite (без сервера БД)
+            base_repo = Client_rep_sqlite(SQLite_manager(app.config['SQLITE_PATH']))
+            repo = Client_rep_db_adapter(base_repo)
+        elif repo is None:
+            # 1. Создаем Singleton DB_manager
+            db_manager = DB_manager(DB_PARAMS)
+            
+            # 2. Создаем репозиторий с адаптером
+            base_repo = Client_rep_db(db_manager)
+            repo = Client_rep_db_adapter(base_repo)
         
         # 3. Создаем представление
         view = ClientView()
@@ -55,19 +134,104 @@ def create_app() -> Flask:
         # 7. Создаем контроллер удаления
         delete_controller = ClientDeleteController(repo)
         
+        # 8. Создаем контроллер JSON API
+        api_controller = ClientApiController(repo)
+        
+        # 9. Подписываем рассылку изменений браузерам (SSE)
+        broadcaster = ClientEventBroadcaster(
+            repo, view,
+            coalesce_window=app.config.get('EVENTS_COALESCE_WINDOW', DEFAULT_COALESCE_WINDOW),
+            metrics=metrics
+        )
+        repo.add_observer(broadcaster)
+        
+        # 10. Асинхронная доставка уведомлений (по умолчанию выключена)
+        if app.config.get('ASYNC_OBSERVERS'):
+            dispatcher = ObserverDispatcher(
+                max_queue=app.config.get('OBSERVER_QUEUE_SIZE', DEFAULT_MAX_QUEUE),
+                metrics=metrics
+            )
+            repo.set_dispatcher(dispatcher.start())
+            app.extensions['observer_dispatcher'] = dispatcher
+        
     except Exception as e:
         print(f"❌ Ошибка инициализации приложения: {e}")
         return app
     
+    def conditional_page(build_html: Callable[[], str]) -> Response:
+        """
+        Отдает страницу с валидаторами кэша по версии данных репозитория.
+        
+        ETag и Last-Modified вычисляются до вызова контроллера (get_validators),
+        поэтому на совпадающий условный запрос
+        (If-None-Match / If-Modified-Since) сразу отдается 304 без выборки
+        клиентов и без рендеринга. Для БД версия читается из счетчика
+        изменений в базе (одним запросом), поэтому учитывает запись из других
+        процессов. Сообщения об ошибках контроллера (ErrorPage) отдаются без
+        валидаторов и не кэшируются.
+        
+        Args:
+            build_html: функция, формирующая HTML страницы (вызов контроллера)
+            
+        Returns:
+            Ответ 200 со страницей или 304 Not Modified
+        """
+        etag, modified_at = repo.get_validators()
+        last_modified = datetime.fromtimestamp(modified_at, tz=timezone.utc)
+        
+        if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = Response(status=304)
+        else:
+            html = build_html()
+            response = render_page(html)
+            if isinstance(html, ErrorPage):
+                # Сообщения об ошибках контроллера не кэшируем
+                return response
+        
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        # Страницы с персональными данными: только в браузере и с перепроверкой
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    
+    @app.route('/assets/<filename>')
+    def static_asset(filename: str):
+        """
+        Отдает статический файл представления по имени с отпечатком.
+        
+        Имя меняется вместе с содержимым, поэтому ответ кэшируется
+        браузерами и прокси на год без перепроверки.
+        
+        Args:
+            filename: имя файла с отпечатком (например, clients.3f2a9c1b7d4e.css)
+            
+        Returns:
+            Содержимое файла или 404 для неизвестного имени (в т.ч. старой версии)
+        """
+        asset = find_asset(filename)
+        if asset is None:
+            abort(404)
+        
+        response = Response(asset.content, mimetype=asset.mimetype)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        response.set_etag(asset.digest)
+        return response.make_conditional(request)
+    
     @app.route('/')
     def index():
         """
         Главная страница со списком всех клиентов.
         
+        Поддерживает условные запросы: пока данные не менялись,
+        повторный запрос получает 304 без обращения к репозиторию.
+        
         Поддерживает параметры запроса для фильтрации и сортировки:
         - filter_city: фильтр по городу
         - sort_by: поле для сортировки (id, last_name, total_spending)
         - sort_order: порядок сортировки (ASC или DESC)
+        - page: номер страницы (с 1)
+        - page_size: клиентов на странице (по умолчанию 10, не больше 100)
         
         Returns:
             HTML представление главной страницы
@@ -75,8 +239,43 @@ def create_app() -> Flask:
         # Получаем параметры запроса
         params = request.args.to_dict() if request.args else None
         
-        # Передаем параметры в контроллер
-        return render_template_string(controller.index(params))
+        # Передаем параметры в контроллер (если страница изменилась)
+        return conditional_page(lambda: controller.index(params))
+    
+    @app.route('/export')
+    def export_clients():
+        """
+        Страница со списком всех клиентов (без пагинации), отдаваемая потоком.
+        
+        Принимает те же параметры, что и главная страница (filter_city,
+        sort_by, sort_order), например /export?filter_city=Москва.
+        Заголовок страницы отправляется сразу, строки - по мере чтения
+        из репозитория, память не зависит от числа клиентов.
+        
+        Returns:
+            Потоковый HTML ответ
+        """
+        params = request.args.to_dict() if request.args else None
+        response = Response(stream_with_context(controller.stream_index(params)), mimetype='text/html')
+        # Просим обратный прокси (nginx) не буферизовать ответ целиком
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @app.route('/events')
+    def client_events():
+        """
+        Поток изменений списка клиентов (Server-Sent Events).
+        
+        Главная страница подписывается на него и заменяет измененные строки
+        таблицы на месте, не перезагружая список.
+        
+        Returns:
+            Потоковый ответ text/event-stream
+        """
+        response = Response(stream_with_context(broadcaster.stream()), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
     
     @app.route('/client/<int:client_id>')
     def show_client(client_id: int):
@@ -89,7 +288,7 @@ def create_app() -> Flask:
         Returns:
             HTML представление деталей клиента
         """
-        return render_template_string(controller.show_details(client_id))
+        return conditional_page(lambda: controller.show_details(client_id))
     
     @app.route('/add', methods=['GET', 'POST'])
     def add_client():
@@ -129,10 +328,10 @@ def create_app() -> Flask:
                 return redirect(url_for('index'))
             else:
                 # Ошибка валидации, возвращаем форму с ошибками
-                return render_template_string(result)
+                return render_page(result)
         
         # GET: отображаем пустую форму
-        return render_template_string(add_controller.get_form())
+        return render_page(add_controller.get_form())
     
     @app.route('/edit/<int:client_id>', methods=['GET', 'POST'])
     def edit_client(client_id: int):
@@ -175,10 +374,10 @@ def create_app() -> Flask:
                 return redirect(url_for('index'))
             else:
                 # Ошибка валидации, возвращаем форму с ошибками
-                return render_template_string(result)
+                return render_page(result)
         
         # GET: отображаем форму редактирования
-        return render_template_string(edit_controller.get_edit_form(client_id))
+        return render_page(edit_controller.get_edit_form(client_id))
     
     @app.route('/delete/<int:client_id>')
     def delete_client(client_id: int):
@@ -197,6 +396,87 @@ def create_app() -> Flask:
         # В любом случае редирект на главную
         return redirect(url_for('index'))
     
+    @app.route('/api/clients', methods=['GET', 'POST'])
+    def api_clients():
+        """
+        JSON API: список клиентов и создание клиента.
+        
+        GET: страница клиентов с курсором (параметры filter_city, sort_by,
+        sort_order, limit, cursor, fields=short), например
+        /api/clients?sort_by=total_spending&sort_order=DESC&limit=100
+        POST: создание клиента из JSON-объекта с полями клиента
+        
+        Returns:
+            GET: {"items": [...], "next_cursor": ...}
+            POST: 201 с данными созданного клиента
+            400 с {"error": ...} при некорректных параметрах или данных
+        """
+        try:
+            if request.method == 'POST':
+                client = api_controller.create_client(request.get_json(silent=True))
+                response = render_json(client, status=201)
+                response.headers['Location'] = url_for('api_client', client_id=client['id'])
+                return response
+            
+            return render_json(api_controller.list_clients(request.args.to_dict()))
+        except ValueError as e:
+            return render_json({'error': str(e)}, status=400)
+    
+    @app.route('/api/clients/<int:client_id>', methods=['GET', 'PUT', 'PATCH', 'DELETE'])
+    def api_client(client_id: int):
+        """
+        JSON API: операции с одним клиентом.
+        
+        GET: данные клиента
+        PUT: замена всех полей клиента
+        PATCH: изменение переданных полей
+        DELETE: удаление клиента
+        
+        Args:
+            client_id: ID клиента
+            
+        Returns:
+            Данные клиента (GET, PUT, PATCH), 204 (DELETE),
+            404 если клиент не найден, 400 при некорректных данных
+        """
+        try:
+            if request.method == 'DELETE':
+                if api_controller.delete_client(client_id):
+                    return Response(status=204)
+                client = None
+            elif request.method in ('PUT', 'PATCH'):
+                client = api_controller.update_client(
+                    client_id, request.get_json(silent=True), partial=(request.method == 'PATCH')
+                )
+            else:
+                client = api_controller.get_client(client_id)
+        except ValueError as e:
+            return render_json({'error': str(e)}, status=400)
+        
+        if client is None:
+            return render_json({'error': f"Клиент с ID {client_id} не найден"}, status=404)
+        return render_json(client)
+    
+    @app.route('/api/clients/export.ndjson')
+    def api_export_clients():
+        """
+        JSON API: выгрузка всех клиентов в формате NDJSON (потоком).
+        
+        Принимает параметры filter_city, sort_by, sort_order и fields=short.
+        Память не зависит от числа клиентов.
+        
+        Returns:
+            Потоковый ответ application/x-ndjson или 400 при некорректных параметрах
+        """
+        try:
+            lines = api_controller.export_ndjson(request.args.to_dict())
+        except ValueError as e:
+            return render_json({'error': str(e)}, status=400)
+        
+        response = Response(stream_with_context(lines), mimetype='application/x-ndjson')
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
     return app
 
 
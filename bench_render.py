@@ -0,0 +1,103 @@
+"""
+Бенчмарк отдачи страниц Flask-приложения.
+
+Сравнивает задержку ответов для / и /client/<id>:
+- прежний конвейер: HTML от ClientView компилируется как Jinja-шаблон
+  (render_template_string) на каждый запрос
+- текущий конвейер: готовый HTML отдается напрямую (render_page)
+
+Также выводит размер ответа в байтах: с таблицей стилей, подключенной
+внешним кэшируемым файлом, и со стилями, встроенными в каждую страницу.
+
+Приложение создается поверх JSON-репозитория во временном файле,
+поэтому база данных не нужна.
+
+Запуск: python3 bench_render.py [количество_запросов]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from flask import render_template_string
+from app import create_app
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.mvc.static_assets import STYLESHEET
+
+
+def make_repo(count: int = 100) -> Client_rep_json:
+    """Создает JSON-репозиторий во временном файле с count клиентами."""
+    repo = Client_rep_json(os.path.join(tempfile.mkdtemp(), "bench_render.json"))
+    for i in range(1, count + 1):
+        repo._clients.append(Client(
+            id=i,
+            last_name="Иванов",
+            first_name="Иван",
+            patronymic="Иванович",
+            phone=f"7{i:010d}",
+            email=f"client{i}@mail.ru",
+            passport_series="1234",
+            passport_number="567890",
+            zip_code=123456,
+            city="Москва",
+            street="Ленина",
+            house="1",
+            total_spending=float(i * 1000),
+        ))
+    repo._touch()
+    return repo
+
+
+def measure(func, requests: int) -> float:
+    """Возвращает среднее время одного вызова func (в мс)."""
+    func()  # прогрев
+    start = time.perf_counter()
+    for _ in range(requests):
+        func()
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    app = create_app(make_repo())
+
+    # Прежний конвейер: тот же HTML, но с компиляцией в Jinja-шаблон
+    def legacy(endpoint: str, **kwargs):
+        html = app.view_functions[endpoint](**kwargs).get_data(as_text=True)
+        return render_template_string(html)
+
+    app.add_url_rule('/legacy/', 'legacy_index', lambda: legacy('index'))
+    app.add_url_rule(
+        '/legacy/client/<int:client_id>', 'legacy_show_client',
+        lambda client_id: legacy('show_client', client_id=client_id)
+    )
+
+    client = app.test_client()
+
+    print("=" * 70)
+    print(f"Бенчмарк отдачи страниц: {requests} запросов на маршрут")
+    print("=" * 70)
+    print(f"{'Маршрут':<20}{'render_template_string, мс':>28}{'render_page, мс':>20}")
+
+    for path in ("/", "/client/1"):
+        old_ms = measure(lambda: client.get("/legacy" + path), requests)
+        new_ms = measure(lambda: client.get(path), requests)
+        print(f"{path:<20}{old_ms:>28.3f}{new_ms:>20.3f}")
+
+    # Размер ответа: стили внешним файлом против стилей в каждой странице
+    link_tag = f'<link rel="stylesheet" href="{STYLESHEET.url}">'
+    inline_style = "<style>\n" + STYLESHEET.content.decode("utf-8") + "</style>"
+
+    print()
+    print(f"{'Маршрут':<20}{'встроенный CSS, байт':>28}{'внешний CSS, байт':>20}")
+    for path in ("/", "/client/1"):
+        html = client.get(path).get_data(as_text=True)
+        inline_bytes = len(html.replace(link_tag, inline_style).encode("utf-8"))
+        print(f"{path:<20}{inline_bytes:>28}{len(html.encode('utf-8')):>20}")
+    print(f"Таблица стилей {STYLESHEET.url}: {len(STYLESHEET.content)} байт, загружается один раз")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Бенчмарк встроенной базы SQLite (Client_rep_sqlite) на большом числе клиентов.
+
+Замеряет:
+- массовую вставку add_many (пачки в транзакциях) и открытие базы
+- постраничный вывод: страница k (get_k_n_short_list) в начале и в конце
+  списка (LIMIT/OFFSET) и keyset-страница (get_page_after)
+- запросы декоратора: фильтр по городу, сортировка по полю, подсчет
+- одиночные операции add, replace_by_id, get_by_id
+
+Запуск: python3 bench_sqlite.py [количество_клиентов ...]
+(по умолчанию 1000000)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from src.models.client import Client
+from src.core.sqlite_manager import SQLite_manager
+from src.decorators.client_rep_db_decorator import Client_rep_db_decorator
+from src.repositories.client_rep_sqlite import Client_rep_sqlite
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь", "Самара", "Томск", "Сочи"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов"]
+
+PAGE_SIZE = 20
+
+
+def make_clients(count: int):
+    """Создает count клиентов со случайными городом, фамилией и тратами (генератор)."""
+    rnd = random.Random(42)
+    for i in range(1, count + 1):
+        yield Client(
+            id=i,
+            last_name=rnd.choice(LAST_NAMES),
+            first_name="Иван",
+            patronymic="Иванович",
+            phone=f"7{i:010d}",
+            email=f"client{i}@mail.ru",
+            passport_series="1234",
+            passport_number=f"{i % 1000000:06d}",
+            zip_code=rnd.randint(100000, 999999),
+            city=rnd.choice(CITIES),
+            street="Ленина",
+            house=str(rnd.randint(1, 200)),
+            total_spending=float(rnd.randint(0, 1000000)),
+        )
+
+
+def measure(func, repeat: int = 1):
+    """Возвращает (среднее время выполнения func в секундах, результат последнего вызова)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def report(name: str, seconds: float) -> None:
+    """Печатает строку результата."""
+    print(f"  {name:<48}{seconds * 1000:>12.2f} мс")
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [1_000_000]
+
+    for count in counts:
+        print("=" * 80)
+        print(f"БЕНЧМАРК SQLITE: {count} клиентов, страница {PAGE_SIZE}")
+        print("=" * 80)
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "clients.db")
+            seconds, _ = measure(lambda: Client_rep_sqlite(SQLite_manager(path)).add_many(make_clients(count)))
+            print(f"  {'add_many (с созданием клиентов)':<48}{seconds:>12.2f} с")
+            print(f"  {'размер файла':<48}{os.path.getsize(path) / 1e6:>11.1f} МБ")
+
+            repo = Client_rep_sqlite(SQLite_manager(path))
+            last_page = count // PAGE_SIZE
+            last_id = (last_page - 1) * PAGE_SIZE
+
+            report("открытие базы", measure(lambda: Client_rep_sqlite(SQLite_manager(path)))[0])
+            report("get_k_n_short_list: первая страница", measure(lambda: repo.get_k_n_short_list(1, PAGE_SIZE), 20)[0])
+            report("get_k_n_short_list: последняя страница",
+                   measure(lambda: repo.get_k_n_short_list(last_page, PAGE_SIZE), 5)[0])
+            report("get_page_after: последняя страница",
+                   measure(lambda: repo.get_page_after((None, last_id), PAGE_SIZE), 20)[0])
+
+            by_city = Client_rep_db_decorator(repo).set_filter('city', 'Казань')
+            by_spending = Client_rep_db_decorator(repo).set_sort('total_spending', 'DESC')
+            report("декоратор: фильтр по городу, первая страница",
+                   measure(lambda: by_city.get_k_n_short_list(1, PAGE_SIZE), 20)[0])
+            report("декоратор: количество по городу", measure(by_city.get_count, 5)[0])
+            _, page = measure(lambda: by_spending.get_page_after(None, PAGE_SIZE))
+            after = (page[-1].total_spending, page[-1].id)
+            report("декоратор: сортировка по тратам, первая страница",
+                   measure(lambda: by_spending.get_page_after(None, PAGE_SIZE), 20)[0])
+            report("декоратор: сортировка по тратам, keyset-страница",
+                   measure(lambda: by_spending.get_page_after(after, PAGE_SIZE), 20)[0])
+            report("get_count", measure(repo.get_count, 5)[0])
+
+            client = repo.get_by_id(count // 2)
+            report("get_by_id", measure(lambda: repo.get_by_id(count // 2), 100)[0])
+            report("replace_by_id", measure(lambda: repo.replace_by_id(client.id, client), 100)[0])
+            report("add", measure(lambda: repo.add(client), 100)[0])
+        finally:
+            shutil.rmtree(directory)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Бенчмарк запуска файловых репозиториев: основной файл, двоичный снимок, JSON Lines.
+
+Сравнивает время создания репозитория (загрузка всех клиентов):
+- Client_rep_json: разбор JSON и валидация каждой записи
+- Client_rep_yaml: разбор YAML и валидация (только до YAML_MAX_COUNT клиентов)
+- двоичный снимок (snapshot=True), когда он записан по текущему основному файлу
+- Client_rep_jsonl: запуск без индекса и с сохраненным индексом, чтение
+  клиента по ID и страницы, память Python на открытый репозиторий
+
+Запуск: python3 bench_startup.py [количество_клиентов ...]
+(по умолчанию 100000 и 1000000)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.client_rep_jsonl import INDEX_SUFFIX, Client_rep_jsonl
+from src.repositories.client_rep_yaml import Client_rep_yaml
+from src.repositories.client_snapshot import SNAPSHOT_SUFFIX
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь", "Самара", "Томск", "Сочи"]
+STREETS = ["Ленина", "Мира", "Гагарина", "Советская", "Садовая"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов"]
+
+# YAML разбирается слишком долго для миллионов записей
+YAML_MAX_COUNT = 100_000
+
+
+def make_clients(count: int) -> list:
+    """Создает count клиентов со случайными городом, улицей, фамилией и тратами."""
+    rnd = random.Random(42)
+    return [
+        Client(
+            id=i,
+            last_name=rnd.choice(LAST_NAMES),
+            first_name="Иван",
+            patronymic="Иванович",
+            phone=f"7{i:010d}",
+            email=f"client{i}@mail.ru",
+            passport_series="1234",
+            passport_number=f"{i % 1000000:06d}",
+            zip_code=rnd.randint(100000, 999999),
+            city=rnd.choice(CITIES),
+            street=rnd.choice(STREETS),
+            house=str(rnd.randint(1, 200)),
+            total_spending=float(rnd.randint(0, 1000000)),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(func) -> float:
+    """Возвращает время выполнения func (в секундах)."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench(repo_class, directory: str, clients: list) -> None:
+    """Замеряет запуск репозитория repo_class из основного файла и из снимка."""
+    extension = ".json" if repo_class is Client_rep_json else ".yaml"
+    path = os.path.join(directory, "clients" + extension)
+
+    writer = repo_class(None)
+    writer.file_path = path
+    writer._clients = clients
+    save_seconds = measure(writer._save_to_file)
+
+    # Первый запуск со снимком читает основной файл и пишет снимок
+    plain_seconds = measure(lambda: repo_class(path))
+    measure(lambda: repo_class(path, snapshot=True))
+    snapshot_seconds = measure(lambda: repo_class(path, snapshot=True))
+
+    file_mb = os.path.getsize(path) / 1e6
+    snapshot_mb = os.path.getsize(path + SNAPSHOT_SUFFIX) / 1e6
+    print(f"{repo_class.__name__:<18}{file_mb:>10.1f} МБ{plain_seconds:>12.2f} с"
+          f"{snapshot_mb:>12.1f} МБ{snapshot_seconds:>12.2f} с{plain_seconds / snapshot_seconds:>10.1f}x"
+          f"   (запись файла {save_seconds:.1f} с)")
+
+
+def bench_jsonl(directory: str, clients: list) -> None:
+    """Замеряет запуск Client_rep_jsonl, чтение по ID и занимаемую память."""
+    path = os.path.join(directory, "clients.jsonl")
+    writer = Client_rep_jsonl(path)
+    writer._clients = clients
+    writer.close()
+
+    os.remove(path + INDEX_SUFFIX)
+    scan_seconds = measure(lambda: Client_rep_jsonl(path).close())
+    index_seconds = measure(lambda: Client_rep_jsonl(path).close())
+
+    repo = Client_rep_jsonl(path)
+    middle = len(clients) // 2
+    by_id_ms = measure(lambda: [repo.get_by_id(client_id) for client_id in range(middle, middle + 1000)]) * 1000
+    page_ms = measure(lambda: repo.get_k_n_short_list(1, 20)) * 1000
+    repo.close()
+
+    tracemalloc.start()
+    repo = Client_rep_jsonl(path)
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    repo.close()
+
+    print(f"Client_rep_jsonl: запуск без индекса {scan_seconds:.2f} с, с индексом {index_seconds:.2f} с; "
+          f"get_by_id {by_id_ms:.2f} мс/1000 шт.; страница 20 - {page_ms:.2f} мс; "
+          f"память Python {memory_mb:.1f} МБ ({os.path.getsize(path) / 1e6:.1f} МБ в файле)")
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+
+    for count in counts:
+        print("=" * 100)
+        print(f"БЕНЧМАРК ЗАПУСКА: {count} клиентов")
+        print("=" * 100)
+        clients = make_clients(count)
+        print(f"{'Репозиторий':<18}{'файл':>13}{'запуск':>14}{'снимок':>15}{'запуск':>14}{'ускорение':>11}")
+
+        directory = tempfile.mkdtemp()
+        try:
+            bench(Client_rep_json, directory, clients)
+            if count <= YAML_MAX_COUNT:
+                bench(Client_rep_yaml, directory, clients)
+            else:
+                print(f"Client_rep_yaml пропущен (больше {YAML_MAX_COUNT} клиентов)")
+            bench_jsonl(directory, clients)
+        finally:
+            shutil.rmtree(directory)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Бенчмарк форматов хранения файловых репозиториев: размер против времени.
+
+Для каждого варианта замеряет размер файла, время сохранения
+(_save_to_file) и время загрузки (создание репозитория):
+- JSON с отступами (прежний формат) и компактный JSON
+- компактный JSON со сжатием gzip, bz2, xz
+- YAML без сжатия и со сжатием gzip
+
+Запуск: python3 bench_storage.py [количество_клиентов ...]
+(по умолчанию 100000)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.client_rep_yaml import Client_rep_yaml
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь", "Самара", "Томск", "Сочи"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов"]
+
+# Варианты: (название, класс репозитория, имя файла, параметры конструктора)
+VARIANTS = [
+    ("JSON indent=2", Client_rep_json, "clients.json", {}),
+    ("JSON compact", Client_rep_json, "compact.json", {'compact': True}),
+    ("JSON compact + gzip", Client_rep_json, "clients.json.gz", {'compact': True}),
+    ("JSON compact + bz2", Client_rep_json, "clients.json.bz2", {'compact': True}),
+    ("JSON compact + xz", Client_rep_json, "clients.json.xz", {'compact': True}),
+    ("YAML", Client_rep_yaml, "clients.yaml", {}),
+    ("YAML + gzip", Client_rep_yaml, "clients.yaml.gz", {}),
+]
+
+
+def make_clients(count: int) -> list:
+    """Создает count клиентов со случайными городом, фамилией и тратами."""
+    rnd = random.Random(42)
+    return [
+        Client(
+            id=i,
+            last_name=rnd.choice(LAST_NAMES),
+            first_name="Иван",
+            patronymic="Иванович",
+            phone=f"7{i:010d}",
+            email=f"client{i}@mail.ru",
+            passport_series="1234",
+            passport_number=f"{i % 1000000:06d}",
+            zip_code=rnd.randint(100000, 999999),
+            city=rnd.choice(CITIES),
+            street="Ленина",
+            house=str(rnd.randint(1, 200)),
+            total_spending=float(rnd.randint(0, 1000000)),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(func) -> float:
+    """Возвращает время выполнения func (в секундах)."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000]
+
+    for count in counts:
+        print("=" * 80)
+        print(f"БЕНЧМАРК ФОРМАТОВ ХРАНЕНИЯ: {count} клиентов")
+        print("=" * 80)
+        clients = make_clients(count)
+        print(f"{'Формат':<22}{'размер':>12}{'сжатие':>9}{'сохранение':>13}{'загрузка':>12}")
+
+        directory = tempfile.mkdtemp()
+        try:
+            base_size = None
+            for name, repo_class, file_name, options in VARIANTS:
+                writer = repo_class(None, **options)
+                writer.file_path = os.path.join(directory, file_name)
+                writer._clients = clients
+                save_seconds = measure(writer._save_to_file)
+                load_seconds = measure(lambda: repo_class(writer.file_path, **options))
+
+                size = os.path.getsize(writer.file_path)
+                base_size = base_size or size
+                print(f"{name:<22}{size / 1e6:>9.1f} МБ{base_size / size:>8.1f}x"
+                      f"{save_seconds:>11.2f} с{load_seconds:>10.2f} с")
+        finally:
+            shutil.rmtree(directory)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Бенчмарк частичной выборки (top-k) в Client_rep_file_decorator.
+
+Сравнивает время получения страниц отсортированного списка:
+- полная сортировка (прежнее поведение, каждая страница сортирует весь список)
+- частичная выборка через кучу для первых страниц
+- автоматический переход на полную сортировку для глубоких страниц
+
+Запуск: python3 bench_top_k.py [количество_клиентов]
+"""
+
+import random
+import sys
+import time
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь", "Самара", "Томск", "Сочи"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов"]
+
+
+def make_clients(count: int) -> list:
+    """Создает count клиентов со случайными городом, фамилией и тратами."""
+    rnd = random.Random(42)
+    return [
+        Client(
+            id=i,
+            last_name=rnd.choice(LAST_NAMES),
+            first_name="Иван",
+            patronymic="Иванович",
+            phone=f"7{i:010d}",
+            email=f"client{i}@mail.ru",
+            passport_series="1234",
+            passport_number="567890",
+            zip_code=rnd.randint(100000, 999999),
+            city=rnd.choice(CITIES),
+            street="Ленина",
+            house="1",
+            total_spending=float(rnd.randint(0, 1000000)),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(func, repeat: int = 3) -> float:
+    """Возвращает лучшее время выполнения func из repeat попыток (в мс)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("=" * 70)
+    print(f"БЕНЧМАРК TOP-K: {count} клиентов в памяти")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    repo = Client_rep_json(None)
+    repo._clients = make_clients(count)
+    print(f"Клиенты созданы за {time.perf_counter() - start:.1f} с\n")
+
+    def full_sort_page(k: int, n: int = 10) -> None:
+        # Прежнее поведение: полная сортировка на каждый запрос
+        clients = sorted(repo._clients, key=lambda c: c.total_spending, reverse=True)
+        clients[(k - 1) * n:k * n]
+
+    def decorated_page(k: int, n: int = 10) -> None:
+        # Новый декоратор без кэша между замерами: каждый раз холодный старт
+        decorator = Client_rep_file_decorator(repo).set_sort("total_spending", reverse=True)
+        decorator.get_k_n_short_list(k, n)
+
+    print(f"{'Страница':<12}{'полная сортировка, мс':>25}{'декоратор, мс':>20}")
+    for page in (1, 10, 100, count // 10 // 2):
+        old_ms = measure(lambda: full_sort_page(page))
+        new_ms = measure(lambda: decorated_page(page))
+        print(f"{page:<12}{old_ms:>25.1f}{new_ms:>20.1f}")
+
+    print("\n--- Фильтр по городу + сортировка по фамилии, страница 1 ---")
+    old_ms = measure(lambda: sorted(
+        [c for c in repo._clients if c.city == "Москва"], key=lambda c: c.last_name
+    )[:10])
+    new_ms = measure(lambda: Client_rep_file_decorator(repo)
+                     .set_filter("city", "Москва")
+                     .set_sort("last_name")
+                     .get_k_n_short_list(1, 10))
+    print(f"Полная сортировка: {old_ms:.1f} мс, декоратор: {new_ms:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Бенчмарк YAML репозитория: чистый Python против LibYAML, дописывание против перезаписи.
+
+Сравнивает:
+- разбор файла yaml.SafeLoader и yaml.CSafeLoader (LibYAML)
+- выгрузку коллекции yaml.SafeDumper и yaml.CSafeDumper
+- полную загрузку Client_rep_yaml (разбор и валидация клиентов)
+- add(): дописывание одного документа против перезаписи всего файла
+
+Запуск: python3 bench_yaml.py [количество_клиентов ...]
+(по умолчанию 10000 и 100000)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import yaml
+from src.models.client import Client
+from src.repositories.client_rep_yaml import HAS_LIBYAML, Client_rep_yaml
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь", "Самара", "Томск", "Сочи"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов"]
+
+
+def make_clients(count: int) -> list:
+    """Создает count клиентов со случайными городом, фамилией и тратами."""
+    rnd = random.Random(42)
+    return [
+        Client(
+            id=i,
+            last_name=rnd.choice(LAST_NAMES),
+            first_name="Иван",
+            patronymic="Иванович",
+            phone=f"7{i:010d}",
+            email=f"client{i}@mail.ru",
+            passport_series="1234",
+            passport_number="567890",
+            zip_code=rnd.randint(100000, 999999),
+            city=rnd.choice(CITIES),
+            street="Ленина",
+            house="1",
+            total_spending=float(rnd.randint(0, 1000000)),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(func) -> float:
+    """Возвращает время выполнения func (в секундах)."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def dump(path: str, clients: list, dumper) -> None:
+    """Выгружает клиентов в path потоком документов с заданным выгрузчиком."""
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.dump_all((client.to_dict() for client in clients), f, Dumper=dumper,
+                      explicit_start=True, allow_unicode=True, sort_keys=False)
+
+
+def load(path: str, loader) -> int:
+    """Разбирает path заданным загрузчиком и возвращает число документов."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in yaml.load_all(f, Loader=loader))
+
+
+def report(name: str, python_seconds: float, c_seconds: float) -> None:
+    """Печатает строку сравнения двух замеров."""
+    print(f"{name:<28}{python_seconds:>12.2f} с{c_seconds:>12.2f} с{python_seconds / c_seconds:>10.1f}x")
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    if not HAS_LIBYAML:
+        print("PyYAML собран без LibYAML: сравнивать не с чем")
+        return
+
+    for count in counts:
+        print("=" * 80)
+        print(f"БЕНЧМАРК YAML: {count} клиентов")
+        print("=" * 80)
+        clients = make_clients(count)
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "clients.yaml")
+        try:
+            print(f"{'Операция':<28}{'Python':>14}{'LibYAML':>14}{'ускорение':>10}")
+            save_python = measure(lambda: dump(path, clients, yaml.SafeDumper))
+            save_c = measure(lambda: dump(path, clients, yaml.CSafeDumper))
+            report("выгрузка", save_python, save_c)
+            report("разбор", measure(lambda: load(path, yaml.SafeLoader)),
+                   measure(lambda: load(path, yaml.CSafeLoader)))
+            print(f"Client_rep_yaml: загрузка с валидацией {measure(lambda: Client_rep_yaml(path)):.2f} с "
+                  f"({os.path.getsize(path) / 1e6:.1f} МБ)")
+
+            repo = Client_rep_yaml(path)
+            new_client = clients[0]
+            append_ms = measure(lambda: repo.add(new_client)) * 1000
+            rewrite_ms = measure(repo._save_to_file) * 1000
+            print(f"add: дописывание {append_ms:.2f} мс, перезапись всего файла {rewrite_ms:.0f} мс "
+                  f"({rewrite_ms / append_ms:.0f}x)")
+        finally:
+            shutil.rmtree(directory)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import gzip
+import time
+import zlib
+from typing import Callable, Dict, Optional
+from flask import Flask, Request, Response, request
+from src.core.metrics import Metrics
+
+
+# Сжимаемые типы содержимого (изображения, архивы и т.п. уже сжаты)
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'image/svg+xml',
+})
+
+# Поддерживаемые кодировки в порядке предпочтения сервера
+ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {
+    'gzip': lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+    'deflate': lambda data, level: zlib.compress(data, level),
+}
+
+
+class Compressor:
+    """
+    Сжатие ответов Flask-приложения (gzip/deflate) по Accept-Encoding.
+
+    Сжимаются только ответы со сжимаемым типом содержимого, размером не
+    меньше COMPRESS_MIN_SIZE, без собственного Content-Encoding, не потоковые
+    и без Cache-Control: no-transform. Ко всем таким ответам добавляется
+    Vary: Accept-Encoding, чтобы прокси хранили версии раздельно.
+
+    Настройки (app.config):
+        COMPRESS_LEVEL: уровень сжатия 1-9 (по умолчанию 6)
+        COMPRESS_MIN_SIZE: минимальный размер тела в байтах (по умолчанию 500)
+
+    Метрики (если передан реестр Metrics):
+        compression_responses_total: число сжатых ответов
+        compression_bytes_in_total / compression_bytes_out_total: байты до и после сжатия
+        compression_cpu_seconds_total: процессорное время на сжатие
+        compression_ratio: доля размера после сжатия от исходного (накопительно)
+    """
+
+    def __init__(self, app: Optional[Flask] = None, metrics: Optional[Metrics] = None):
+        """
+        Args:
+            app: Flask-приложение (можно подключить позже через init_app)
+            metrics: реестр метрик для статистики сжатия
+        """
+        self.metrics = metrics
+        self.level = 6
+        self.min_size = 500
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Подключает сжатие к приложению.
+
+        Raises:
+            ValueError: если COMPRESS_LEVEL вне диапазона 1-9
+        """
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        self.level = int(app.config['COMPRESS_LEVEL'])
+        self.min_size = int(app.config['COMPRESS_MIN_SIZE'])
+        if not 1 <= self.level <= 9:
+            raise ValueError("COMPRESS_LEVEL должен быть от 1 до 9")
+
+        app.after_request(self.compress_response)
+
+    def choose_encoding(self, req: Request) -> Optional[str]:
+        """
+        Выбирает кодировку по заголовку Accept-Encoding с учетом q-значений.
+
+        Returns:
+            'gzip', 'deflate' или None, если клиент не принимает сжатие
+        """
+        return req.accept_encodings.best_match(list(ENCODERS))
+
+    def compress_response(self, response: Response) -> Response:
+        """
+        Сжимает ответ, если это допустимо и выгодно (обработчик after_request).
+
+        Args:
+            response: ответ приложения
+
+        Returns:
+            Тот же объект ответа (сжатый или без изменений)
+        """
+        if response.status_code == 304 and response.mimetype in COMPRESSIBLE_MIMETYPES:
+            # 304 должен нести тот же Vary, что и полный ответ
+            response.vary.add('Accept-Encoding')
+            return response
+
+        if not self._is_eligible(response):
+            return response
+
+        # Представление зависит от Accept-Encoding, даже если сейчас не сжимаем
+        response.vary.add('Accept-Encoding')
+
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        start = time.thread_time()
+        compressed = ENCODERS[encoding](data, self.level)
+        cpu_seconds = time.thread_time() - start
+
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # Сжатое тело отличается побайтно: строгий ETag становится слабым
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        self._record(len(data), len(compressed), cpu_seconds)
+        return response
+
+    def _is_eligible(self, response: Response) -> bool:
+        """Проверяет, можно ли сжимать ответ (без учета Accept-Encoding)."""
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.direct_passthrough or response.is_streamed:
+            return False
+        if 'Content-Encoding' in response.headers:
+            return False
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return False
+        if response.cache_control.no_transform:
+            return False
+        length = response.calculate_content_length()
+        return length is not None and length >= self.min_size
+
+    def _record(self, size_in: int, size_out: int, cpu_seconds: float) -> None:
+        """Обновляет метрики сжатия."""
+        if self.metrics is None:
+            return
+        self.metrics.increment('compression_responses_total')
+        total_in = self.metrics.increment('compression_bytes_in_total', size_in)
+        total_out = self.metrics.increment('compression_bytes_out_total', size_out)
+        self.metrics.increment('compression_cpu_seconds_total', cpu_seconds)
+        self.metrics.set_gauge('compression_ratio', total_out / total_in)
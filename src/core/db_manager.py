@@ -1,6 +1,7 @@
+import uuid
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 
 
 class DB_manager:
@@ -46,6 +47,7 @@ class DB_manager:
         if not hasattr(self, 'conn'):
             if db_params is None:
                 raise ValueError("db_params обязателен при первом создании DB_manager")
+            self.db_params = db_params
             self.conn = psycopg2.connect(**db_params)
 
     def execute_query(
@@ -107,6 +109,45 @@ class DB_manager:
             print(f"Ошибка при выполнении SQL запроса: {e}")
             raise
 
+    def iter_query(
+        self,
+        sql: str,
+        params: Optional[tuple] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Выполняет SELECT и отдает строки по одной через серверный курсор.
+
+        Строки забираются с сервера пачками по batch_size, поэтому память
+        не зависит от размера результата. Запрос выполняется при первом
+        обращении к итератору.
+
+        Курсор открывается на отдельном соединении, которое закрывается
+        вместе с итератором: коммиты и откаты других запросов на общем
+        соединении (self.conn) не закрывают курсор посреди долгой выгрузки.
+
+        Args:
+            sql: SQL запрос с плейсхолдерами %s
+            params: кортеж параметров для подстановки в запрос
+            batch_size: сколько строк забирать с сервера за раз
+
+        Returns:
+            Итератор словарей с данными строк
+        """
+        conn = psycopg2.connect(**self.db_params)
+        try:
+            conn.set_session(readonly=True)
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(sql, params or ())
+                for row in cursor:
+                    yield row
+        except psycopg2.Error as e:
+            print(f"Ошибка при выполнении SQL запроса: {e}")
+            raise
+        finally:
+            conn.close()
+
     def close(self) -> None:
         """Закрывает соединение с базой данных."""
         if hasattr(self, 'conn') and self.conn:
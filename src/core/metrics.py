@@ -0,0 +1,72 @@
+import threading
+from typing import Dict
+
+
+class Metrics:
+    """
+    Потокобезопасный реестр метрик приложения.
+
+    Хранит счетчики (монотонно растущие суммы) и показатели (последнее
+    значение). Отдается приложением в текстовом формате на /metrics.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой реестр метрик."""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+
+    def increment(self, name: str, value: float = 1.0) -> float:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            name: имя метрики (например, 'compression_responses_total')
+            value: приращение
+
+        Returns:
+            Новое значение счетчика
+        """
+        with self._lock:
+            total = self._counters.get(name, 0.0) + value
+            self._counters[name] = total
+            return total
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Устанавливает значение показателя.
+
+        Args:
+            name: имя метрики
+            value: текущее значение
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> float:
+        """
+        Возвращает значение счетчика или показателя (0, если метрики нет).
+
+        Args:
+            name: имя метрики
+        """
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name]
+            return self._gauges.get(name, 0.0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Возвращает копию всех метрик (счетчики и показатели)."""
+        with self._lock:
+            values = dict(self._counters)
+            values.update(self._gauges)
+            return values
+
+    def render_text(self) -> str:
+        """
+        Форматирует метрики построчно: '<имя> <значение>'.
+
+        Returns:
+            Текст в формате, понятном Prometheus и аналогичным сборщикам
+        """
+        return "".join(f"{name} {value:g}\n" for name, value in sorted(self.snapshot().items()))
@@ -0,0 +1,194 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+
+# Сколько скомпилированных запросов sqlite3 держит в кэше соединения
+# (параметр cached_statements: запрос с тем же текстом не компилируется заново)
+STATEMENT_CACHE_SIZE = 256
+
+# Настройки соединения: журнал WAL (запись не переписывает страницы файла
+# базы на месте, fsync только при контрольных точках - вместе с
+# synchronous = NORMAL это дешевые коммиты), регистрозависимый LIKE, как
+# в PostgreSQL (при нем префиксный LIKE может использовать индекс)
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA case_sensitive_like = ON",
+    "PRAGMA temp_store = MEMORY",
+)
+
+_PLACEHOLDER = re.compile(r'%s')
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def to_sqlite_sql(sql: str) -> str:
+    """
+    Заменяет плейсхолдеры %s (стиль psycopg2) на ? (стиль sqlite3).
+
+    Кэшируется только результат текстовой замены. Компиляцию повторных
+    запросов экономит кэш cached_statements соединения sqlite3: для него
+    важно, что одинаковый запрос дает одинаковый текст.
+
+    Args:
+        sql: SQL запрос с плейсхолдерами %s
+
+    Returns:
+        SQL запрос с плейсхолдерами ?
+    """
+    return _PLACEHOLDER.sub('?', sql)
+
+
+class SQLite_manager:
+    """
+    Класс для управления подключением к встроенной базе SQLite.
+
+    Повторяет интерфейс DB_manager (execute_query, execute_query_single,
+    iter_query), поэтому запросы с плейсхолдерами %s, которые строят
+    Client_rep_db_decorator и предикаты, выполняются без изменений.
+    Плейсхолдеры ? в запросах тоже допустимы.
+
+    В отличие от DB_manager не является Singleton: каждому файлу базы
+    соответствует свой менеджер. Одно соединение разделяется между потоками
+    приложения, обращения к нему сериализуются блокировкой, поэтому запросы
+    одного процесса выполняются по очереди, в том числе чтения.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открывает (или создает) файл базы и настраивает соединение.
+
+        Args:
+            path: путь к файлу базы SQLite (':memory:' - база в памяти)
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
+
+    def execute_query(
+        self,
+        sql: str,
+        params: Optional[tuple] = None,
+        fetch: bool = False,
+        commit: bool = False
+    ) -> Optional[List[sqlite3.Row]]:
+        """
+        Выполняет SQL запрос с контролем над транзакциями.
+
+        Args:
+            sql: SQL запрос с плейсхолдерами %s
+            params: кортеж параметров для подстановки в запрос
+            fetch: если True, возвращает результат запроса
+            commit: если True, выполняет коммит после запроса
+
+        Returns:
+            Список строк sqlite3.Row (при fetch=True) или None
+        """
+        with self._lock:
+            try:
+                cursor = self.conn.execute(to_sqlite_sql(sql), params or ())
+                result = cursor.fetchall() if fetch else None
+                if commit:
+                    self.conn.commit()
+                return result
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"Ошибка при выполнении SQL запроса: {e}")
+                raise
+
+    def execute_query_single(
+        self,
+        sql: str,
+        params: Optional[tuple] = None
+    ) -> Optional[sqlite3.Row]:
+        """
+        Выполняет SQL запрос и возвращает одну строку.
+
+        Args:
+            sql: SQL запрос с плейсхолдерами %s
+            params: кортеж параметров для подстановки в запрос
+
+        Returns:
+            Строка sqlite3.Row (доступ по имени колонки) или None
+        """
+        with self._lock:
+            try:
+                return self.conn.execute(to_sqlite_sql(sql), params or ()).fetchone()
+            except sqlite3.Error as e:
+                print(f"Ошибка при выполнении SQL запроса: {e}")
+                raise
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Выполняет блок в одной транзакции записи (BEGIN IMMEDIATE).
+
+        На время блока соединение закреплено за текущим потоком. При выходе
+        без исключения выполняется коммит, при исключении - откат, и
+        исключение пробрасывается дальше.
+
+        Returns:
+            Контекстный менеджер, отдающий соединение sqlite3
+        """
+        with self._lock:
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+
+    def iter_query(
+        self,
+        sql: str,
+        params: Optional[tuple] = None,
+        batch_size: int = 1000
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Выполняет SELECT и отдает строки по одной.
+
+        Строки забираются пачками по batch_size, поэтому память не зависит
+        от размера результата. Блокировка соединения удерживается только
+        на время чтения пачки. Запрос выполняется при первом обращении
+        к итератору.
+
+        Args:
+            sql: SQL запрос с плейсхолдерами %s
+            params: кортеж параметров для подстановки в запрос
+            batch_size: сколько строк забирать за раз
+
+        Returns:
+            Итератор строк sqlite3.Row
+        """
+        cursor = self.conn.cursor()
+        try:
+            with self._lock:
+                cursor.execute(to_sqlite_sql(sql), params or ())
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        except sqlite3.Error as e:
+            print(f"Ошибка при выполнении SQL запроса: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        """Закрывает соединение с базой данных."""
+        if hasattr(self, 'conn') and self.conn:
+            self.conn.close()
+
+    def __del__(self) -> None:
+        """Гарантирует закрытие соединения при удалении объекта."""
+        self.close()
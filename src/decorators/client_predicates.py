@@ -0,0 +1,329 @@
+"""
+Модель составных условий (предикатов) для фильтрации клиентов.
+
+Общая для декораторов репозиториев: Client_rep_db_decorator компилирует
+предикаты в параметризованный SQL, Client_rep_file_decorator проверяет их
+в памяти, используя индексы репозитория там, где они есть.
+
+Пример:
+    Or(
+        And(Eq('city', 'Москва'), Range('total_spending', low=100000)),
+        Prefix('last_name', 'Ив')
+    )
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, List, Optional, Tuple
+from src.models.client import Client
+
+
+# Колонки таблицы clients, которые разрешено использовать в условиях и сортировке
+CLIENT_COLUMNS: Tuple[str, ...] = (
+    'id', 'last_name', 'first_name', 'patronymic', 'phone', 'email',
+    'passport_series', 'passport_number', 'zip_code', 'city', 'street',
+    'house', 'total_spending',
+)
+
+
+def check_column(field: str, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> str:
+    """
+    Проверяет, что поле входит в список разрешенных колонок.
+
+    Args:
+        field: имя поля
+        allowed_columns: разрешенные имена колонок
+
+    Returns:
+        Имя поля (для использования в SQL)
+
+    Raises:
+        ValueError: если поле не разрешено
+    """
+    if field not in allowed_columns:
+        raise ValueError(f"Поле '{field}' недоступно для фильтрации или сортировки")
+    return field
+
+
+class Predicate(ABC):
+    """
+    Базовый класс условия над объектом Client.
+
+    Поддерживает проверку в памяти (matches) и компиляцию в SQL (to_sql).
+    Предикаты неизменяемы, сравниваются по значению и могут служить ключами кэша.
+    Операторы & и | создают And и Or.
+    """
+
+    @abstractmethod
+    def matches(self, client: Client) -> bool:
+        """
+        Проверяет условие для клиента.
+
+        Args:
+            client: объект Client
+
+        Returns:
+            True, если клиент удовлетворяет условию
+        """
+        pass
+
+    @abstractmethod
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        """
+        Компилирует условие в SQL фрагмент с плейсхолдерами %s.
+
+        Args:
+            allowed_columns: разрешенные имена колонок
+
+        Returns:
+            Кортеж (sql, params)
+
+        Raises:
+            ValueError: если условие ссылается на неразрешенную колонку
+        """
+        pass
+
+    @abstractmethod
+    def _key(self) -> Tuple:
+        """Возвращает кортеж, однозначно описывающий условие."""
+        pass
+
+    def __and__(self, other: 'Predicate') -> 'And':
+        return And(self, other)
+
+    def __or__(self, other: 'Predicate') -> 'Or':
+        return Or(self, other)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Predicate) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        args = ", ".join(repr(part) for part in self._key()[1:])
+        return f"{type(self).__name__}({args})"
+
+
+class Eq(Predicate):
+    """Условие равенства: field = value."""
+
+    def __init__(self, field: str, value: Any):
+        self.field = field
+        self.value = value
+
+    def matches(self, client: Client) -> bool:
+        return hasattr(client, self.field) and getattr(client, self.field) == self.value
+
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        column = check_column(self.field, allowed_columns)
+        if self.value is None:
+            return f"{column} IS NULL", []
+        return f"{column} = %s", [self.value]
+
+    def _key(self) -> Tuple:
+        return ('eq', self.field, self.value)
+
+
+class In(Predicate):
+    """Условие вхождения в множество: field IN (v1, v2, ...)."""
+
+    def __init__(self, field: str, values: Iterable[Any]):
+        self.field = field
+        self.values = tuple(values)
+
+    def matches(self, client: Client) -> bool:
+        return hasattr(client, self.field) and getattr(client, self.field) in self.values
+
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        column = check_column(self.field, allowed_columns)
+        if not self.values:
+            return "1 = 0", []
+        placeholders = ", ".join(["%s"] * len(self.values))
+        return f"{column} IN ({placeholders})", list(self.values)
+
+    def _key(self) -> Tuple:
+        return ('in', self.field, self.values)
+
+
+class Range(Predicate):
+    """
+    Диапазонное условие: low <= field <= high.
+
+    Любую из границ можно опустить (None), включение границ настраивается.
+    """
+
+    def __init__(
+        self,
+        field: str,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True
+    ):
+        if low is None and high is None:
+            raise ValueError("Для диапазона нужна хотя бы одна граница")
+        self.field = field
+        self.low = low
+        self.high = high
+        self.include_low = include_low
+        self.include_high = include_high
+
+    def matches(self, client: Client) -> bool:
+        if not hasattr(client, self.field):
+            return False
+        value = getattr(client, self.field)
+        try:
+            if self.low is not None:
+                if value < self.low or (value == self.low and not self.include_low):
+                    return False
+            if self.high is not None:
+                if value > self.high or (value == self.high and not self.include_high):
+                    return False
+        except TypeError:
+            return False
+        return True
+
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        column = check_column(self.field, allowed_columns)
+        parts = []
+        params = []
+        if self.low is not None:
+            parts.append(f"{column} {'>=' if self.include_low else '>'} %s")
+            params.append(self.low)
+        if self.high is not None:
+            parts.append(f"{column} {'<=' if self.include_high else '<'} %s")
+            params.append(self.high)
+        return " AND ".join(parts), params
+
+    def _key(self) -> Tuple:
+        return ('range', self.field, self.low, self.high, self.include_low, self.include_high)
+
+
+class Prefix(Predicate):
+    """Условие на начало строки: field LIKE 'prefix%'."""
+
+    def __init__(self, field: str, prefix: str):
+        if not isinstance(prefix, str):
+            raise ValueError("Префикс должен быть строкой")
+        self.field = field
+        self.prefix = prefix
+
+    def matches(self, client: Client) -> bool:
+        value = getattr(client, self.field, None)
+        return isinstance(value, str) and value.startswith(self.prefix)
+
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        column = check_column(self.field, allowed_columns)
+        # Экранируем спецсимволы LIKE, чтобы префикс сравнивался буквально
+        escaped = self.prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"{column} LIKE %s ESCAPE '\\'", [escaped + '%']
+
+    def upper_bound(self) -> str:
+        """
+        Возвращает строку, большую любой строки с этим префиксом.
+
+        Позволяет искать по префиксу как по диапазону [prefix, upper_bound).
+        """
+        return self.prefix + '\U0010ffff'
+
+    def _key(self) -> Tuple:
+        return ('prefix', self.field, self.prefix)
+
+
+class And(Predicate):
+    """Конъюнкция условий: все условия должны выполняться."""
+
+    def __init__(self, *predicates: Predicate):
+        if not predicates:
+            raise ValueError("And требует хотя бы одно условие")
+        self.predicates: Tuple[Predicate, ...] = predicates
+
+    def matches(self, client: Client) -> bool:
+        return all(predicate.matches(client) for predicate in self.predicates)
+
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        parts = []
+        params: List[Any] = []
+        for predicate in self.predicates:
+            sql, predicate_params = predicate.to_sql(allowed_columns)
+            parts.append(f"({sql})")
+            params.extend(predicate_params)
+        return " AND ".join(parts), params
+
+    def _key(self) -> Tuple:
+        return ('and',) + tuple(predicate._key() for predicate in self.predicates)
+
+    def __repr__(self) -> str:
+        return f"And({', '.join(repr(p) for p in self.predicates)})"
+
+
+class Or(Predicate):
+    """Дизъюнкция условий: достаточно выполнения хотя бы одного."""
+
+    def __init__(self, *predicates: Predicate):
+        if not predicates:
+            raise ValueError("Or требует хотя бы одно условие")
+        self.predicates: Tuple[Predicate, ...] = predicates
+
+    def matches(self, client: Client) -> bool:
+        return any(predicate.matches(client) for predicate in self.predicates)
+
+    def to_sql(self, allowed_columns: Iterable[str] = CLIENT_COLUMNS) -> Tuple[str, List[Any]]:
+        parts = []
+        params: List[Any] = []
+        for predicate in self.predicates:
+            sql, predicate_params = predicate.to_sql(allowed_columns)
+            parts.append(f"({sql})")
+            params.extend(predicate_params)
+        return " OR ".join(parts), params
+
+    def _key(self) -> Tuple:
+        return ('or',) + tuple(predicate._key() for predicate in self.predicates)
+
+    def __repr__(self) -> str:
+        return f"Or({', '.join(repr(p) for p in self.predicates)})"
+
+
+def compare(field: str, operator: str, value: Any) -> Predicate:
+    """
+    Создает условие сравнения по оператору.
+
+    Пример: compare('total_spending', '>=', 100000)
+
+    Args:
+        field: имя поля
+        operator: один из '=', '==', '>', '>=', '<', '<='
+        value: значение для сравнения
+
+    Returns:
+        Предикат Eq или Range
+
+    Raises:
+        ValueError: если оператор не поддерживается
+    """
+    if operator in ('=', '=='):
+        return Eq(field, value)
+    if operator == '>':
+        return Range(field, low=value, include_low=False)
+    if operator == '>=':
+        return Range(field, low=value)
+    if operator == '<':
+        return Range(field, high=value, include_high=False)
+    if operator == '<=':
+        return Range(field, high=value)
+    raise ValueError(f"Неподдерживаемый оператор сравнения: '{operator}'")
+
+
+def combine(predicates: Iterable[Optional[Predicate]]) -> Optional[Predicate]:
+    """
+    Объединяет условия через And, пропуская None.
+
+    Returns:
+        None, если условий нет; само условие, если оно одно; иначе And
+    """
+    parts = [predicate for predicate in predicates if predicate is not None]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+    return And(*parts)
@@ -0,0 +1,528 @@
+"""
+Планировщик запросов для фильтрации и сортировки клиентов в памяти.
+
+Используется Client_rep_file_decorator. По статистике репозитория
+(число различных значений полей, гистограммы для числовых полей)
+оценивает число строк и стоимость каждого способа доступа:
+- полный просмотр коллекции (FullScan)
+- поиск по индексу равенства (IndexLookup)
+- обход диапазона упорядоченного индекса (IndexRange)
+- объединение индексных выборок для OR-групп (IndexUnion)
+и выбирает самый дешевый. Аналогично выбирается способ упорядочивания:
+обход упорядоченного индекса, частичная выборка через кучу или сортировка.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from math import log2
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+from src.models.client import Client
+from src.decorators.client_predicates import And, Eq, In, Or, Predicate, Prefix, Range
+
+
+# Условные стоимости операций (в единицах "проверка условия для одной строки")
+SCAN_ROW_COST = 1.0       # чтение и проверка строки при полном просмотре
+INDEX_PROBE_COST = 2.0    # один поиск в индексе (хэш или бинарный поиск)
+INDEX_ROW_COST = 0.5      # разыменование одной записи индекса
+RECHECK_ROW_COST = 1.0    # повторная проверка условия для кандидата
+SORT_ROW_COST = 0.3       # сравнение при сортировке (на строку и уровень log2)
+HEAP_ROW_COST = 0.4       # проход строки через кучу при частичной выборке
+
+# Селективности по умолчанию, когда статистики недостаточно
+DEFAULT_EQ_SELECTIVITY = 0.05
+DEFAULT_RANGE_SELECTIVITY = 1 / 3
+PREFIX_CHAR_SELECTIVITY = 0.1
+
+# Собранная статистика по репозиториям (не удерживает сами репозитории)
+_statistics_by_repo: 'WeakKeyDictionary[Any, TableStatistics]' = WeakKeyDictionary()
+
+
+class FieldStatistics:
+    """
+    Статистика по одному полю: число различных значений и гистограмма.
+
+    Гистограмма - равноглубинная: список границ b0 <= b1 <= ... <= bB,
+    в каждом интервале примерно одинаковое число строк.
+    """
+
+    def __init__(self, field_name: str, distinct_count: int, histogram: Optional[List[Any]] = None):
+        """
+        Args:
+            field_name: имя поля
+            distinct_count: число различных значений
+            histogram: границы равноглубинной гистограммы (только для числовых полей)
+        """
+        self.field_name = field_name
+        self.distinct_count = distinct_count
+        self.histogram = histogram
+
+    def eq_selectivity(self) -> float:
+        """Оценивает долю строк с field = value (равномерное распределение)."""
+        return 1 / self.distinct_count if self.distinct_count else 0.0
+
+    def range_selectivity(self, low: Any, high: Any) -> Optional[float]:
+        """
+        Оценивает долю строк с low <= field <= high по гистограмме.
+
+        Returns:
+            Доля строк от 0 до 1 или None, если гистограммы нет
+        """
+        if not self.histogram:
+            return None
+        try:
+            low_fraction = self._fraction_below(low) if low is not None else 0.0
+            high_fraction = self._fraction_below(high) if high is not None else 1.0
+        except TypeError:
+            return 0.0
+        return max(0.0, high_fraction - low_fraction)
+
+    def _fraction_below(self, value: Any) -> float:
+        """Доля строк со значением поля не больше value (с интерполяцией внутри интервала)."""
+        bounds = self.histogram
+        buckets = len(bounds) - 1
+        if value < bounds[0]:
+            return 0.0
+        if value >= bounds[-1]:
+            return 1.0
+        i = bisect_right(bounds, value) - 1
+        width = bounds[i + 1] - bounds[i]
+        inside = (value - bounds[i]) / width if width else 1.0
+        return (i + inside) / buckets
+
+
+class TableStatistics:
+    """Статистика по коллекции клиентов репозитория."""
+
+    def __init__(self, row_count: int, fields: Dict[str, FieldStatistics], generation: int):
+        """
+        Args:
+            row_count: число клиентов на момент сбора
+            fields: статистика по полям
+            generation: поколение репозитория на момент сбора
+        """
+        self.row_count = row_count
+        self.fields = fields
+        self.generation = generation
+
+    @classmethod
+    def collect(
+        cls,
+        repo: Any,
+        histogram_fields: Tuple[str, ...],
+        buckets: int
+    ) -> 'TableStatistics':
+        """
+        Собирает статистику по индексированным полям репозитория.
+
+        Число различных значений берется из индексов, границы гистограмм -
+        выборкой позиций из упорядоченного индекса, поэтому сбор не требует
+        сортировки. Для полей гистограмм без упорядоченного индекса значения
+        собираются обходом iter_clients и сортируются.
+
+        Args:
+            repo: репозиторий, наследуемый от Client_rep_base
+            histogram_fields: поля, для которых строится гистограмма
+            buckets: число интервалов гистограммы
+        """
+        indexes = repo._get_indexes()
+        row_count = repo.get_count()
+        fields = {}
+
+        for name, index in indexes.hash_indexes.items():
+            fields[name] = FieldStatistics(name, index.distinct_count())
+
+        for name, index in indexes.sorted_indexes.items():
+            histogram = None
+            if name in histogram_fields and row_count:
+                step = (row_count - 1) / buckets
+                histogram = [index.value_at(round(i * step)) for i in range(buckets + 1)]
+            fields[name] = FieldStatistics(name, index.distinct_count(), histogram)
+
+        for name in histogram_fields:
+            if name not in fields and row_count:
+                values = sorted(getattr(client, name) for client in repo.iter_clients())
+                step = (row_count - 1) / buckets
+                histogram = [values[round(i * step)] for i in range(buckets + 1)]
+                fields[name] = FieldStatistics(name, len(set(values)), histogram)
+
+        return cls(row_count, fields, repo.get_generation())
+
+
+class AccessPath(ABC):
+    """
+    Способ получения кандидатов для условия фильтрации.
+
+    Хранит оценку числа строк и стоимость, а после выполнения - фактическое
+    число строк (actual_rows) для explain().
+    """
+
+    def __init__(self, estimated_rows: float, cost: float):
+        self.estimated_rows = estimated_rows
+        self.cost = cost
+        self.actual_rows: Optional[int] = None
+
+    @abstractmethod
+    def fetch(self, repo: Any) -> Iterable[Client]:
+        """Возвращает кандидатов из репозитория (могут содержать лишние строки)."""
+        pass
+
+    @abstractmethod
+    def describe(self) -> str:
+        """Возвращает краткое описание способа доступа."""
+        pass
+
+    def execute(self, repo: Any) -> Iterable[Client]:
+        """Выполняет доступ и запоминает фактическое число строк."""
+        candidates = self.fetch(repo)
+        self.actual_rows = len(candidates)
+        return candidates
+
+    def explain_lines(self, indent: str) -> List[str]:
+        """Возвращает строки описания плана для explain()."""
+        actual = "-" if self.actual_rows is None else str(self.actual_rows)
+        return [
+            f"{indent}-> {self.describe()}  "
+            f"(стоимость {self.cost:.1f}, строк: оценка {self.estimated_rows:.0f}, факт {actual})"
+        ]
+
+
+class FullScan(AccessPath):
+    """
+    Полный просмотр коллекции.
+
+    Клиенты читаются потоком через iter_clients, поэтому репозитории,
+    которые читают файл по требованию, не строят список всей коллекции.
+    """
+
+    def fetch(self, repo: Any) -> Iterator[Client]:
+        return repo.iter_clients()
+
+    def execute(self, repo: Any) -> Iterator[Client]:
+        """Обходит коллекцию; фактическое число строк известно после обхода."""
+        self.actual_rows = 0
+        for client in self.fetch(repo):
+            self.actual_rows += 1
+            yield client
+
+    def describe(self) -> str:
+        return "Полный просмотр"
+
+
+class IndexLookup(AccessPath):
+    """Поиск по индексу равенства для одного или нескольких значений."""
+
+    def __init__(self, field: str, values: Tuple[Any, ...], estimated_rows: float, cost: float):
+        super().__init__(estimated_rows, cost)
+        self.field = field
+        self.values = values
+
+    def fetch(self, repo: Any) -> List[Client]:
+        if len(self.values) == 1:
+            return repo.find_equal(self.field, self.values[0])
+        found = {}
+        for value in self.values:
+            for client in repo.find_equal(self.field, value):
+                found[client.id] = client
+        return list(found.values())
+
+    def describe(self) -> str:
+        values = ", ".join(repr(value) for value in self.values)
+        return f"Поиск по индексу {self.field} IN ({values})"
+
+
+class IndexRange(AccessPath):
+    """Обход диапазона упорядоченного индекса."""
+
+    def __init__(
+        self,
+        field: str,
+        low: Any,
+        high: Any,
+        include_low: bool,
+        include_high: bool,
+        estimated_rows: float,
+        cost: float
+    ):
+        super().__init__(estimated_rows, cost)
+        self.field = field
+        self.low = low
+        self.high = high
+        self.include_low = include_low
+        self.include_high = include_high
+
+    def fetch(self, repo: Any) -> List[Client]:
+        return list(repo.iter_range(
+            self.field, self.low, self.high,
+            include_low=self.include_low, include_high=self.include_high
+        ))
+
+    def describe(self) -> str:
+        low = "-∞" if self.low is None else repr(self.low)
+        high = "+∞" if self.high is None else repr(self.high)
+        left = "[" if self.include_low and self.low is not None else "("
+        right = "]" if self.include_high and self.high is not None else ")"
+        return f"Диапазон индекса {self.field} {left}{low}, {high}{right}"
+
+
+class IndexUnion(AccessPath):
+    """Объединение индексных выборок (для OR-групп)."""
+
+    def __init__(self, paths: List[AccessPath], estimated_rows: float, cost: float):
+        super().__init__(estimated_rows, cost)
+        self.paths = paths
+
+    def fetch(self, repo: Any) -> List[Client]:
+        found = {}
+        for path in self.paths:
+            for client in path.execute(repo):
+                found[client.id] = client
+        return list(found.values())
+
+    def describe(self) -> str:
+        return "Объединение индексных выборок"
+
+    def explain_lines(self, indent: str) -> List[str]:
+        lines = super().explain_lines(indent)
+        for path in self.paths:
+            lines.extend(path.explain_lines(indent + "    "))
+        return lines
+
+
+class QueryPlan:
+    """
+    План запроса: способ доступа, проверка условия и способ упорядочивания.
+
+    Заполняется фактическими значениями по мере выполнения и выводится explain().
+    """
+
+    # Способы упорядочивания
+    ORDER_NONE = 'none'
+    ORDER_INDEX = 'index'
+    ORDER_HEAP = 'heap'
+    ORDER_SORT = 'sort'
+
+    ORDER_NAMES = {
+        ORDER_NONE: "порядок хранения",
+        ORDER_INDEX: "обход упорядоченного индекса",
+        ORDER_HEAP: "частичная выборка через кучу",
+        ORDER_SORT: "полная сортировка",
+    }
+
+    def __init__(self, predicate: Optional[Predicate], access: AccessPath, estimated_rows: float):
+        """
+        Args:
+            predicate: условие фильтрации (None - без фильтра)
+            access: выбранный способ доступа
+            estimated_rows: оценка числа строк после проверки условия
+        """
+        self.predicate = predicate
+        self.access = access
+        self.estimated_rows = estimated_rows
+        self.actual_rows: Optional[int] = None
+        self.sort_attr: Optional[str] = None
+        self.sort_reverse = False
+        self.order_method = self.ORDER_NONE
+        self.order_cost = 0.0
+
+    @property
+    def cost(self) -> float:
+        """Полная оценка стоимости плана."""
+        return self.access.cost + self.order_cost
+
+    def explain(self) -> str:
+        """Возвращает текстовое описание плана с оценками и фактическими значениями."""
+        actual = "-" if self.actual_rows is None else str(self.actual_rows)
+        lines = [f"План (стоимость {self.cost:.1f})"]
+        if self.sort_attr is not None:
+            direction = "DESC" if self.sort_reverse else "ASC"
+            lines.append(
+                f"-> Упорядочивание по {self.sort_attr} {direction}: "
+                f"{self.ORDER_NAMES[self.order_method]} (стоимость {self.order_cost:.1f})"
+            )
+        condition = "нет" if self.predicate is None else repr(self.predicate)
+        lines.append(f"    -> Условие: {condition}  (строк: оценка {self.estimated_rows:.0f}, факт {actual})")
+        lines.extend(self.access.explain_lines("        "))
+        return "\n".join(lines)
+
+
+class QueryPlanner:
+    """
+    Стоимостный планировщик для Client_rep_file_decorator.
+
+    Статистика собирается по полям индексов репозитория, хранится отдельно
+    для каждого репозитория (декораторы создаются на каждый запрос, а статистика
+    переиспользуется) и пересобирается, когда число изменений с момента сбора
+    превышает STALE_FRACTION от числа строк. Для репозиториев без индексов
+    возможен только полный просмотр, поэтому статистика по полям не собирается.
+    """
+
+    # Поля, для которых строятся гистограммы значений
+    HISTOGRAM_FIELDS: Tuple[str, ...] = ('total_spending', 'zip_code')
+
+    # Число интервалов гистограммы
+    HISTOGRAM_BUCKETS = 32
+
+    # Доля измененных строк, после которой статистика считается устаревшей
+    STALE_FRACTION = 0.1
+
+    def __init__(self, repo: Any):
+        """
+        Args:
+            repo: репозиторий, наследуемый от Client_rep_base
+        """
+        self._repo = repo
+
+    def get_statistics(self) -> TableStatistics:
+        """Возвращает статистику, пересобирая ее при заметном числе изменений."""
+        if not (self._repo.HASH_INDEX_FIELDS or self._repo.SORTED_INDEX_FIELDS):
+            return TableStatistics(self._repo.get_count(), {}, self._repo.get_generation())
+
+        statistics = _statistics_by_repo.get(self._repo)
+        if statistics is not None:
+            changes = self._repo.get_generation() - statistics.generation
+            if changes <= max(1, self.STALE_FRACTION * statistics.row_count):
+                return statistics
+
+        statistics = TableStatistics.collect(self._repo, self.HISTOGRAM_FIELDS, self.HISTOGRAM_BUCKETS)
+        _statistics_by_repo[self._repo] = statistics
+        return statistics
+
+    def estimate_selectivity(self, predicate: Predicate) -> float:
+        """
+        Оценивает долю строк, удовлетворяющих условию.
+
+        And оценивается в предположении независимости условий.
+        """
+        statistics = self.get_statistics()
+        if isinstance(predicate, And):
+            selectivity = 1.0
+            for part in predicate.predicates:
+                selectivity *= self.estimate_selectivity(part)
+            return selectivity
+        if isinstance(predicate, Or):
+            miss = 1.0
+            for part in predicate.predicates:
+                miss *= 1 - self.estimate_selectivity(part)
+            return 1 - miss
+
+        field_statistics = statistics.fields.get(getattr(predicate, 'field', None))
+        if isinstance(predicate, Eq):
+            return field_statistics.eq_selectivity() if field_statistics else DEFAULT_EQ_SELECTIVITY
+        if isinstance(predicate, In):
+            per_value = field_statistics.eq_selectivity() if field_statistics else DEFAULT_EQ_SELECTIVITY
+            return min(1.0, per_value * len(set(predicate.values)))
+        if isinstance(predicate, Range):
+            if field_statistics is not None:
+                selectivity = field_statistics.range_selectivity(predicate.low, predicate.high)
+                if selectivity is not None:
+                    return selectivity
+            return DEFAULT_RANGE_SELECTIVITY
+        if isinstance(predicate, Prefix):
+            floor = field_statistics.eq_selectivity() if field_statistics else 0.0
+            return max(floor, PREFIX_CHAR_SELECTIVITY ** len(predicate.prefix))
+        return DEFAULT_RANGE_SELECTIVITY
+
+    def plan_access(self, predicate: Optional[Predicate]) -> QueryPlan:
+        """
+        Выбирает самый дешевый способ доступа для условия.
+
+        Args:
+            predicate: условие фильтрации (None - без фильтра)
+
+        Returns:
+            Объект QueryPlan без упорядочивания
+        """
+        rows = self.get_statistics().row_count
+        if predicate is None:
+            return QueryPlan(None, FullScan(rows, rows * SCAN_ROW_COST), rows)
+
+        estimated_rows = rows * self.estimate_selectivity(predicate)
+        best: AccessPath = FullScan(rows, rows * SCAN_ROW_COST)
+        for path in self._index_paths(predicate):
+            if path.cost < best.cost:
+                best = path
+        return QueryPlan(predicate, best, estimated_rows)
+
+    def choose_order(
+        self,
+        sort_attr: str,
+        filtered: bool,
+        matched_rows: int,
+        limit: Optional[int]
+    ) -> Tuple[str, float]:
+        """
+        Выбирает способ упорядочивания отфильтрованных строк.
+
+        Args:
+            sort_attr: поле сортировки
+            filtered: установлен ли фильтр
+            matched_rows: число строк после фильтрации
+            limit: сколько первых строк нужно (None - все)
+
+        Returns:
+            Кортеж (способ из QueryPlan.ORDER_*, стоимость)
+        """
+        rows = self._repo.get_count()
+        matched = float(max(1, matched_rows))
+        wanted = matched if limit is None else min(float(limit), matched)
+
+        options = [(QueryPlan.ORDER_SORT, matched * max(1.0, log2(matched)) * SORT_ROW_COST)]
+        if limit is not None:
+            heap_cost = matched * HEAP_ROW_COST + wanted * max(1.0, log2(wanted)) * SORT_ROW_COST
+            options.append((QueryPlan.ORDER_HEAP, heap_cost))
+        if self._repo.has_sorted_index(sort_attr):
+            # Обход индекса останавливается, когда набрано wanted подходящих строк;
+            # с фильтром в среднем придется просмотреть rows * wanted / matched записей
+            walked = rows * wanted / matched if filtered else wanted
+            options.append((QueryPlan.ORDER_INDEX, min(rows, walked) * INDEX_ROW_COST))
+
+        return min(options, key=lambda option: option[1])
+
+    def _index_paths(self, predicate: Predicate) -> List[AccessPath]:
+        """Перечисляет индексные способы доступа для условия."""
+        repo = self._repo
+        rows = self.get_statistics().row_count
+
+        def path_cost(probes: int, candidates: float) -> float:
+            # Поиск в индексе + разыменование + повторная проверка + восстановление порядка хранения
+            reorder = candidates * max(1.0, log2(max(candidates, 1.0))) * SORT_ROW_COST
+            return probes * INDEX_PROBE_COST + candidates * (INDEX_ROW_COST + RECHECK_ROW_COST) + reorder
+
+        if isinstance(predicate, (Eq, In)):
+            field = predicate.field
+            if not (repo.has_hash_index(field) or repo.has_sorted_index(field)):
+                return []
+            values = (predicate.value,) if isinstance(predicate, Eq) else tuple(dict.fromkeys(predicate.values))
+            candidates = rows * self.estimate_selectivity(predicate)
+            return [IndexLookup(field, values, candidates, path_cost(len(values), candidates))]
+
+        if isinstance(predicate, (Range, Prefix)) and repo.has_sorted_index(predicate.field):
+            candidates = rows * self.estimate_selectivity(predicate)
+            cost = path_cost(1, candidates)
+            if isinstance(predicate, Range):
+                return [IndexRange(predicate.field, predicate.low, predicate.high,
+                                   predicate.include_low, predicate.include_high, candidates, cost)]
+            return [IndexRange(predicate.field, predicate.prefix, predicate.upper_bound(),
+                               True, False, candidates, cost)]
+
+        if isinstance(predicate, And):
+            # Любая индексируемая часть конъюнкции дает надмножество результата
+            paths = []
+            for part in predicate.predicates:
+                paths.extend(self._index_paths(part))
+            return paths
+
+        if isinstance(predicate, Or):
+            # Для дизъюнкции индекс должен покрывать каждую ветвь
+            branches = []
+            for part in predicate.predicates:
+                part_paths = self._index_paths(part)
+                if not part_paths:
+                    return []
+                branches.append(min(part_paths, key=lambda path: path.cost))
+            candidates = min(rows, sum(path.estimated_rows for path in branches))
+            cost = sum(path.cost for path in branches) + candidates * INDEX_ROW_COST
+            return [IndexUnion(branches, candidates, cost)]
+
+        return []
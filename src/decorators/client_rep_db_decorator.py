@@ -1,6 +1,8 @@
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 from src.repositories.client_rep_db import Client_rep_db
+from src.repositories.client_rep_sqlite import Client_rep_sqlite
 from src.models.client import Client, ClientShort
+from src.decorators.client_predicates import CLIENT_COLUMNS, Eq, Predicate, check_column, combine
 
 
 class Client_rep_db_decorator:
@@ -9,17 +11,29 @@ class Client_rep_db_decorator:
 
     Позволяет строить динамические SQL-запросы с фильтрами и сортировкой,
     не изменяя исходный код Client_rep_db. Использует паттерн Decorator.
+
+    Кроме простых фильтров по равенству поддерживает составные условия
+    (см. src.decorators.client_predicates), которые компилируются в
+    параметризованный SQL. Имена полей проверяются по списку ALLOWED_COLUMNS.
+
+    Работает и со встроенной базой Client_rep_sqlite: ее SQLite_manager
+    выполняет те же запросы, а индексы по полям обслуживают фильтры
+    и сортировку.
     """
 
-    def __init__(self, repo: Client_rep_db):
+    # Колонки, допустимые в условиях WHERE и ORDER BY
+    ALLOWED_COLUMNS = CLIENT_COLUMNS
+
+    def __init__(self, repo: Union[Client_rep_db, Client_rep_sqlite]):
         """
         Инициализирует декоратор с объектом репозитория БД.
 
         Args:
-            repo: объект Client_rep_db для работы с БД
+            repo: объект Client_rep_db или Client_rep_sqlite для работы с БД
         """
         self._repo = repo
         self._filters: Dict[str, Any] = {}
+        self._predicate: Optional[Predicate] = None
         self._sort_field: Optional[str] = None
         self._sort_order: str = 'ASC'
 
@@ -33,10 +47,36 @@ class Client_rep_db_decorator:
 
         Returns:
             self для chain-вызовов
+
+        Raises:
+            ValueError: если поле не входит в ALLOWED_COLUMNS
         """
+        check_column(field, self.ALLOWED_COLUMNS)
         self._filters[field] = value
         return self
 
+    def set_predicate(self, predicate: Optional[Predicate]) -> 'Client_rep_db_decorator':
+        """
+        Устанавливает составное условие (равенство, IN, диапазон, префикс, OR-группы).
+
+        Условие объединяется с фильтрами set_filter через AND и выполняется
+        на стороне БД.
+
+        Args:
+            predicate: объект Predicate или None для сброса
+
+        Returns:
+            self для chain-вызовов
+
+        Raises:
+            ValueError: если условие ссылается на поле вне ALLOWED_COLUMNS
+        """
+        if predicate is not None:
+            # Компилируем заранее, чтобы ошибка в поле проявилась сразу
+            predicate.to_sql(self.ALLOWED_COLUMNS)
+        self._predicate = predicate
+        return self
+
     def set_sort(self, field: str, order: str = 'ASC') -> 'Client_rep_db_decorator':
         """
         Устанавливает поле и направление сортировки.
@@ -47,9 +87,13 @@ class Client_rep_db_decorator:
 
         Returns:
             self для chain-вызовов
+
+        Raises:
+            ValueError: если порядок некорректен или поле не входит в ALLOWED_COLUMNS
         """
         if order.upper() not in ('ASC', 'DESC'):
             raise ValueError("order должен быть 'ASC' или 'DESC'")
+        check_column(field, self.ALLOWED_COLUMNS)
         self._sort_field = field
         self._sort_order = order.upper()
         return self
@@ -62,6 +106,7 @@ class Client_rep_db_decorator:
             self для chain-вызовов
         """
         self._filters = {}
+        self._predicate = None
         return self
 
     def clear_sort(self) -> 'Client_rep_db_decorator':
@@ -77,36 +122,37 @@ class Client_rep_db_decorator:
 
     def _build_where_clause(self) -> Tuple[str, Tuple]:
         """
-        Строит WHERE клаузу на основе установленных фильтров.
+        Строит WHERE клаузу на основе установленных фильтров и условия.
 
         Returns:
             Кортеж (where_clause, params) где where_clause - SQL фрагмент,
             а params - параметры для подстановки
         """
-        if not self._filters:
+        predicate = combine(
+            [Eq(field, value) for field, value in self._filters.items()] + [self._predicate]
+        )
+        if predicate is None:
             return '', ()
 
-        where_parts = []
-        params = []
-
-        for field, value in self._filters.items():
-            where_parts.append(f"{field} = %s")
-            params.append(value)
-
-        where_clause = " WHERE " + " AND ".join(where_parts)
-        return where_clause, tuple(params)
+        sql, params = predicate.to_sql(self.ALLOWED_COLUMNS)
+        return " WHERE " + sql, tuple(params)
 
     def _build_order_clause(self) -> str:
         """
         Строит ORDER BY клаузу на основе установленной сортировки.
 
+        Клиенты с равными значениями поля упорядочиваются по возрастанию id,
+        как в Client_rep_file_decorator: порядок страниц детерминирован.
+
         Returns:
             SQL фрагмент с ORDER BY или пустая строка
         """
         if self._sort_field is None:
             return ""
+        if self._sort_field == 'id':
+            return f" ORDER BY id {self._sort_order}"
 
-        return f" ORDER BY {self._sort_field} {self._sort_order}"
+        return f" ORDER BY {self._sort_field} {self._sort_order}, id ASC"
 
     def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
         """
@@ -154,6 +200,80 @@ class Client_rep_db_decorator:
             print(f"Ошибка при получении отфильтрованного списка клиентов: {e}")
             return []
 
+    def iter_clients(self, batch_size: int = 1000) -> Iterator[Client]:
+        """
+        Обходит всех отфильтрованных и отсортированных клиентов без пагинации.
+
+        Строки читаются серверным курсором пачками по batch_size,
+        поэтому память не зависит от размера выборки.
+
+        Args:
+            batch_size: сколько строк забирать из БД за раз
+
+        Returns:
+            Итератор объектов Client
+        """
+        sql = "SELECT * FROM clients"
+        where_clause, where_params = self._build_where_clause()
+        sql += where_clause
+        sql += self._build_order_clause() or " ORDER BY id"
+
+        for row in self._repo.db_manager.iter_query(sql, where_params, batch_size=batch_size):
+            row = dict(row)
+            row['total_spending'] = float(row['total_spending'])
+            yield Client(**row)
+
+    def get_page_after(self, after: Optional[Tuple[Any, int]], n: int) -> List[Client]:
+        """
+        Возвращает до n клиентов, следующих за позицией after (keyset-пагинация).
+
+        Вместо OFFSET используется условие на (поле сортировки, id), поэтому
+        стоимость страницы не зависит от ее номера, а вставки и удаления
+        между запросами не сдвигают страницы. Без сортировки порядок - по id.
+
+        Args:
+            after: (значение поля сортировки, id) последнего клиента предыдущей
+                страницы или None для первой страницы
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Список объектов Client размером до n элементов
+        """
+        if n < 1:
+            raise ValueError("Размер страницы должен быть >= 1")
+
+        field = self._sort_field or 'id'
+        where_clause, params = self._build_where_clause()
+        conditions = [f"({where_clause[len(' WHERE '):]})"] if where_clause else []
+
+        if after is not None:
+            value, last_id = after
+            op = '<' if self._sort_field is not None and self._sort_order == 'DESC' else '>'
+            if field == 'id':
+                conditions.append(f"id {op} %s")
+                params += (last_id,)
+            else:
+                conditions.append(f"({field} {op} %s OR ({field} = %s AND id > %s))")
+                params += (value, value, last_id)
+
+        sql = "SELECT * FROM clients"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += self._build_order_clause() or " ORDER BY id"
+        sql += " LIMIT %s"
+
+        try:
+            rows = self._repo.db_manager.execute_query(sql, params + (n,), fetch=True)
+            clients = []
+            for row in rows or []:
+                row = dict(row)
+                row['total_spending'] = float(row['total_spending'])
+                clients.append(Client(**row))
+            return clients
+        except Exception as e:
+            print(f"Ошибка при получении страницы клиентов: {e}")
+            return []
+
     def get_count(self) -> int:
         """
         Возвращает количество отфильтрованных клиентов.
@@ -1,6 +1,13 @@
-from typing import Optional, List, Any
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Optional, List, Any, Callable, Iterable, Iterator, Tuple
 from src.repositories.client_rep_base import Client_rep_base
 from src.models.client import Client, ClientShort
+from src.decorators.client_predicates import Eq, Predicate, combine
+from src.decorators.client_query_planner import FullScan, QueryPlan, QueryPlanner
 
 
 class Client_rep_file_decorator:
@@ -9,8 +16,33 @@ class Client_rep_file_decorator:
 
     Работает с любым репозиторием, наследуемым от Client_rep_base (JSON, YAML).
     Позволяет фильтровать и сортировать данные в памяти без изменения исходного кода.
+    Кроме фильтра по равенству поддерживает составные условия (set_predicate).
+
+    Способ выполнения выбирает стоимостный планировщик (QueryPlanner): полный
+    просмотр, поиск по индексам репозитория (HASH_INDEX_FIELDS и SORTED_INDEX_FIELDS
+    в Client_rep_base), обход упорядоченного индекса, частичная выборка через кучу
+    или сортировка. План запроса показывает explain(). Результаты кэшируются
+    для каждой пары (фильтр, сортировка) и сбрасываются, когда меняется
+    поколение репозитория (get_generation). Кэш защищен блокировкой, поэтому
+    страницу и количество можно запрашивать из разных потоков одновременно.
+
+    Без фильтра выборка не строится: страницы, количество и обход берутся
+    прямо из репозитория (get_k_n_short_list, get_count, iter_clients), а
+    полный просмотр идет потоком через iter_clients.
+
+    Если репозиторий не держит клиентов в памяти (RESIDENT_CLIENTS = False,
+    например Client_rep_bounded), выборки кэшируются как списки ID в нужном
+    порядке (режим ключей): сортируются пары (ключ сортировки, id), а клиенты
+    страницы запрашиваются через get_by_id.
     """
 
+    # Максимальное число закэшированных выборок (разных комбинаций фильтра и сортировки)
+    CACHE_SIZE = 8
+
+    # Частичная выборка через кучу используется, пока запрошенный префикс
+    # (k * n элементов) не превышает 1/TOP_K_RATIO отфильтрованного списка
+    TOP_K_RATIO = 16
+
     def __init__(self, repo: Client_rep_base):
         """
         Инициализирует декоратор с файловым репозиторием.
@@ -21,8 +53,15 @@ class Client_rep_file_decorator:
         self._repo = repo
         self._filter_attr: Optional[str] = None
         self._filter_value: Optional[Any] = None
+        self._predicate: Optional[Predicate] = None
         self._sort_attr: Optional[str] = None
         self._sort_reverse: bool = False
+        self._keys_only = not repo.RESIDENT_CLIENTS
+        self._cache: 'OrderedDict[Tuple, List[Any]]' = OrderedDict()
+        self._cache_generation: Optional[int] = None
+        self._cache_lock = threading.RLock()
+        self._planner = QueryPlanner(repo)
+        self._last_plan: Optional[QueryPlan] = None
 
     def set_filter(self, attr_name: str, value: Any) -> 'Client_rep_file_decorator':
         """
@@ -39,10 +78,28 @@ class Client_rep_file_decorator:
         self._filter_value = value
         return self
 
+    def set_predicate(self, predicate: Optional[Predicate]) -> 'Client_rep_file_decorator':
+        """
+        Устанавливает составное условие (равенство, IN, диапазон, префикс, OR-группы).
+
+        Условие объединяется с фильтром set_filter через AND. Части условия
+        по индексированным полям вычисляются через индексы репозитория.
+
+        Args:
+            predicate: объект Predicate или None для сброса
+
+        Returns:
+            self для chain-вызовов
+        """
+        self._predicate = predicate
+        return self
+
     def set_sort(self, attr_name: str, reverse: bool = False) -> 'Client_rep_file_decorator':
         """
         Устанавливает сортировку по атрибуту объекта Client.
 
+        Клиенты с равными значениями атрибута упорядочиваются по возрастанию id.
+
         Args:
             attr_name: имя атрибута для сортировки (например, 'last_name', 'total_spending')
             reverse: если True, сортировать в обратном порядке (DESC)
@@ -63,6 +120,7 @@ class Client_rep_file_decorator:
         """
         self._filter_attr = None
         self._filter_value = None
+        self._predicate = None
         return self
 
     def clear_sort(self) -> 'Client_rep_file_decorator':
@@ -76,46 +134,302 @@ class Client_rep_file_decorator:
         self._sort_reverse = False
         return self
 
-    def _get_filtered_clients(self) -> List[Client]:
+    def _to_entries(self, clients: Iterable[Client]) -> List[Any]:
         """
-        Получает список клиентов с применением фильтра.
+        Превращает клиентов в элементы кэшируемой выборки.
 
         Returns:
-            Список объектов Client после применения фильтра
+            Список объектов Client или, в режиме ключей, их ID
+        """
+        if self._keys_only:
+            return [client.id for client in clients]
+        return list(clients)
+
+    def _fetch_clients(self, entries: Iterable[Any]) -> Iterator[Client]:
         """
-        clients = list(self._repo._clients)
+        Возвращает клиентов по элементам выборки (в режиме ключей - через get_by_id).
 
-        # Применяем фильтр, если установлен
+        Returns:
+            Итератор объектов Client (удаленные после построения выборки пропускаются)
+        """
+        if not self._keys_only:
+            return iter(entries)
+        clients = (self._repo.get_by_id(client_id) for client_id in entries)
+        return (client for client in clients if client is not None)
+
+    def _get_cached(self, key: Tuple, build: Callable[[], List[Any]]) -> List[Any]:
+        """
+        Возвращает закэшированную выборку по ключу или строит и кэширует ее.
+
+        Кэш целиком сбрасывается, если поколение репозитория изменилось
+        с момента последнего обращения.
+
+        Args:
+            key: ключ выборки (параметры фильтра и сортировки)
+            build: функция построения выборки при промахе кэша
+
+        Returns:
+            Список объектов Client или их ID в режиме ключей
+            (не изменять - он разделяется между вызовами)
+        """
+        with self._cache_lock:
+            generation = self._repo.get_generation()
+            if generation != self._cache_generation:
+                self._cache.clear()
+                self._cache_generation = generation
+
+            clients = self._cache.get(key)
+            if clients is not None:
+                self._cache.move_to_end(key)
+                return clients
+
+            # Построение идет под блокировкой: параллельный запрос того же
+            # ключа дождется результата вместо повторного построения
+            clients = build()
+            self._cache[key] = clients
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return clients
+
+    def _get_filter_predicate(self) -> Optional[Predicate]:
+        """
+        Возвращает итоговое условие фильтрации (set_filter AND set_predicate).
+
+        Returns:
+            Объект Predicate или None, если фильтры не установлены
+        """
+        equality = None
         if self._filter_attr is not None and self._filter_value is not None:
-            clients = [
-                client for client in clients
-                if hasattr(client, self._filter_attr) and
-                getattr(client, self._filter_attr) == self._filter_value
-            ]
+            equality = Eq(self._filter_attr, self._filter_value)
+        return combine([equality, self._predicate])
 
-        return clients
+    def _has_filter(self) -> bool:
+        """Проверяет, установлен ли фильтр."""
+        return self._get_filter_predicate() is not None
 
-    def _get_filtered_and_sorted_clients(self) -> List[Client]:
+    def _get_filtered_clients(self) -> List[Any]:
+        """
+        Получает список клиентов с применением фильтра.
+
+        Returns:
+            Список объектов Client после применения фильтра (в режиме ключей - их ID)
+        """
+        key = ('filter', self._get_filter_predicate())
+        return self._get_cached(key, self._build_filtered_clients)
+
+    def _get_filtered_count(self) -> int:
+        """
+        Возвращает число клиентов после фильтрации.
+
+        Без фильтра число берется из репозитория, выборка не строится.
+        """
+        if not self._has_filter():
+            return self._repo.get_count()
+        return len(self._get_filtered_clients())
+
+    def _iter_filtered_clients(self) -> Iterator[Client]:
+        """
+        Обходит отфильтрованных клиентов в порядке хранения.
+
+        Без фильтра клиенты берутся из репозитория по одному (iter_clients).
+        В режиме ключей условие проверяется на том же потоке, а не через
+        закэшированные ID: проход по iter_clients не вытесняет кэш репозитория.
+        """
+        predicate = self._get_filter_predicate()
+        if predicate is None:
+            return self._repo.iter_clients()
+        if self._keys_only:
+            return (client for client in self._repo.iter_clients() if predicate.matches(client))
+        return iter(self._get_filtered_clients())
+
+    def _build_filtered_clients(self) -> List[Any]:
+        """
+        Строит список клиентов с применением фильтра (без кэша).
+
+        Способ доступа (полный просмотр или индексы) выбирает планировщик.
+
+        Returns:
+            Новый список объектов Client после применения фильтра (в порядке хранения;
+            в режиме ключей - их ID)
+        """
+        predicate = self._get_filter_predicate()
+        plan = self._planner.plan_access(predicate)
+        self._last_plan = plan
+
+        candidates = plan.access.execute(self._repo)
+        if predicate is None:
+            clients = candidates
+        elif isinstance(plan.access, FullScan):
+            clients = (client for client in candidates if predicate.matches(client))
+        else:
+            # Индексы дают надмножество результата: перепроверяем условие
+            # и восстанавливаем порядок хранения
+            matched = [client for client in candidates if predicate.matches(client)]
+            clients = self._repo._sort_by_storage_order(matched)
+
+        entries = self._to_entries(clients)
+        plan.actual_rows = len(entries)
+        return entries
+
+    def _get_filtered_and_sorted_clients(self) -> List[Any]:
         """
         Получает список клиентов с применением фильтра и сортировки.
 
         Returns:
             Список объектов Client после применения фильтра и сортировки
+            (в режиме ключей - их ID)
         """
-        clients = self._get_filtered_clients()
+        if self._sort_attr is None:
+            return self._get_filtered_clients()
 
-        # Применяем сортировку, если установлена
-        if self._sort_attr is not None:
-            try:
-                clients.sort(
-                    key=lambda c: getattr(c, self._sort_attr),
-                    reverse=self._sort_reverse
-                )
-            except AttributeError as e:
-                print(f"Ошибка при сортировке: атрибут '{self._sort_attr}' не найден. {e}")
+        key = ('sort', self._get_filter_predicate(), self._sort_attr, self._sort_reverse)
+        return self._get_cached(key, self._build_sorted_clients)
+
+    def _build_sorted_clients(self) -> List[Any]:
+        """
+        Строит отсортированную копию отфильтрованного списка (без кэша).
+
+        Returns:
+            Новый список объектов Client после применения фильтра и сортировки
+            (в режиме ключей - их ID)
+        """
+        if self._choose_order(None) == QueryPlan.ORDER_INDEX:
+            return self._to_entries(self._iter_index_order())
+        if self._keys_only:
+            return self._build_sorted_ids()
+
+        clients = list(self._iter_filtered_clients())
+
+        try:
+            clients.sort(key=self._get_sort_key(), reverse=self._sort_reverse)
+        except AttributeError as e:
+            print(f"Ошибка при сортировке: атрибут '{self._sort_attr}' не найден. {e}")
 
         return clients
 
+    def _build_sorted_ids(self) -> List[int]:
+        """
+        Строит отсортированный список ID отфильтрованных клиентов (режим ключей).
+
+        Клиенты читаются потоком, а сортируются пары (ключ сортировки, id),
+        поэтому декодированные клиенты в памяти не накапливаются.
+
+        Returns:
+            Новый список ID после применения фильтра и сортировки
+        """
+        sort_key = self._get_sort_key()
+        try:
+            keys = [(sort_key(client), client.id) for client in self._iter_filtered_clients()]
+        except AttributeError as e:
+            print(f"Ошибка при сортировке: атрибут '{self._sort_attr}' не найден. {e}")
+            return self._to_entries(self._iter_filtered_clients())
+
+        # Ключ сортировки уже содержит id, поэтому пары сравниваются только по нему
+        keys.sort(reverse=self._sort_reverse)
+        return [client_id for _, client_id in keys]
+
+    def _get_sort_key(self) -> Callable[[Client], Tuple]:
+        """
+        Возвращает ключ сортировки по установленному полю.
+
+        Клиенты с равными значениями поля упорядочиваются по возрастанию id
+        в обоих направлениях - так же, как при обходе упорядоченного индекса.
+        """
+        attr = self._sort_attr
+        if self._sort_reverse:
+            return lambda c: (getattr(c, attr), -c.id)
+        return lambda c: (getattr(c, attr), c.id)
+
+    def _choose_order(self, limit: Optional[int]) -> str:
+        """
+        Выбирает через планировщик способ упорядочивания отфильтрованного списка.
+
+        Args:
+            limit: сколько первых клиентов нужно (None - весь список)
+
+        Returns:
+            Один из QueryPlan.ORDER_INDEX, QueryPlan.ORDER_HEAP, QueryPlan.ORDER_SORT
+        """
+        method, cost = self._planner.choose_order(
+            self._sort_attr, self._has_filter(), self._get_filtered_count(), limit
+        )
+        plan = self._last_plan
+        if plan is not None and plan.predicate == self._get_filter_predicate():
+            plan.sort_attr = self._sort_attr
+            plan.sort_reverse = self._sort_reverse
+            plan.order_method = method
+            plan.order_cost = cost
+        return method
+
+    def _iter_index_order(self) -> Iterator[Client]:
+        """
+        Обходит отфильтрованных клиентов в порядке сортировки по упорядоченному индексу.
+
+        Returns:
+            Итератор Client (поле сортировки должно иметь упорядоченный индекс)
+        """
+        ordered = self._repo.iter_range(self._sort_attr, reverse=self._sort_reverse)
+        if not self._has_filter():
+            return ordered
+
+        filtered = self._get_filtered_clients()
+        ids = set(filtered) if self._keys_only else {client.id for client in filtered}
+        return (client for client in ordered if client.id in ids)
+
+    def _get_sorted_prefix(self, end_idx: int) -> List[Any]:
+        """
+        Возвращает не менее end_idx первых клиентов в порядке сортировки.
+
+        Для первых страниц планировщик может выбрать вместо полной сортировки
+        O(n log n) обход упорядоченного индекса или частичную выборку через
+        кучу O(n log m), где m - длина префикса.
+        Для глубоких страниц (и если полная сортировка уже в кэше) возвращается
+        полностью отсортированный список.
+
+        Args:
+            end_idx: индекс, до которого (не включая) нужен упорядоченный префикс
+
+        Returns:
+            Список объектов Client (в режиме ключей - их ID), упорядоченный так же,
+            как полная сортировка (при равных значениях поля - по возрастанию id)
+        """
+        with self._cache_lock:
+            return self._get_sorted_prefix_locked(end_idx)
+
+    def _get_sorted_prefix_locked(self, end_idx: int) -> List[Any]:
+        """Тело _get_sorted_prefix; вызывается под блокировкой кэша."""
+        full_key = ('sort', self._get_filter_predicate(), self._sort_attr, self._sort_reverse)
+        top_key = ('top',) + full_key[1:]
+
+        if end_idx * self.TOP_K_RATIO > self._get_filtered_count() or full_key in self._cache:
+            return self._get_filtered_and_sorted_clients()
+
+        method = self._choose_order(end_idx)
+        if method == QueryPlan.ORDER_SORT:
+            return self._get_filtered_and_sorted_clients()
+        if method == QueryPlan.ORDER_INDEX:
+            # Упорядоченный индекс отдает первые end_idx элементов без сортировки
+            return self._to_entries(islice(self._iter_index_order(), end_idx))
+
+        prefix = self._cache.get(top_key)
+        if prefix is not None and len(prefix) >= end_idx:
+            self._cache.move_to_end(top_key)
+            return prefix
+
+        # Берем префикс с запасом, чтобы последовательное листание
+        # первых страниц не пересчитывало кучу на каждом шаге
+        size = max(end_idx, 2 * len(prefix)) if prefix is not None else end_idx
+        select = heapq.nlargest if self._sort_reverse else heapq.nsmallest
+        try:
+            # nsmallest/nlargest дают тот же порядок, что и sorted(...)[:size]
+            prefix = select(size, self._iter_filtered_clients(), key=self._get_sort_key())
+        except AttributeError:
+            return self._get_filtered_and_sorted_clients()
+        prefix = self._to_entries(prefix)
+
+        self._cache.pop(top_key, None)
+        return self._get_cached(top_key, lambda: prefix)
+
     def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
         """
         Возвращает отфильтрованный и отсортированный список ClientShort для k-й страницы.
@@ -132,26 +446,139 @@ class Client_rep_file_decorator:
         if n < 1:
             raise ValueError("Размер страницы должен быть >= 1")
 
-        # Получаем отфильтрованный и отсортированный список
-        filtered_sorted_clients = self._get_filtered_and_sorted_clients()
-
-        # Применяем пагинацию
         start_idx = (k - 1) * n
         end_idx = start_idx + n
-        page_clients = filtered_sorted_clients[start_idx:end_idx]
+
+        if self._sort_attr is None and not self._has_filter():
+            return self._repo.get_k_n_short_list(k, n)
+
+        # Получаем отфильтрованный и отсортированный список (или его префикс)
+        if self._sort_attr is not None:
+            filtered_sorted_clients = self._get_sorted_prefix(end_idx)
+        else:
+            filtered_sorted_clients = self._get_filtered_clients()
+
+        # Применяем пагинацию
+        page_clients = self._fetch_clients(filtered_sorted_clients[start_idx:end_idx])
 
         # Преобразуем в ClientShort
         return [ClientShort(client) for client in page_clients]
 
+    def iter_clients(self) -> Iterator[Client]:
+        """
+        Обходит всех отфильтрованных и отсортированных клиентов без пагинации.
+
+        Если планировщик выбирает обход упорядоченного индекса, клиенты
+        отдаются прямо из индекса, без построения отсортированной копии.
+
+        Returns:
+            Итератор объектов Client
+        """
+        if self._sort_attr is None:
+            return self._iter_filtered_clients()
+        if self._choose_order(None) == QueryPlan.ORDER_INDEX:
+            return self._iter_index_order()
+        return self._fetch_clients(self._get_filtered_and_sorted_clients())
+
+    def get_page_after(self, after: Optional[Tuple[Any, int]], n: int) -> List[Client]:
+        """
+        Возвращает до n клиентов, следующих за позицией after (keyset-пагинация).
+
+        Позиция ищется двоичным поиском в закэшированной отсортированной
+        выборке, поэтому вставки и удаления между запросами не сдвигают
+        страницы. Без сортировки порядок - по id, как в Client_rep_db_decorator.
+
+        Args:
+            after: (значение поля сортировки, id) последнего клиента предыдущей
+                страницы или None для первой страницы
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Список объектов Client размером до n элементов
+
+        Raises:
+            ValueError: если n < 1 или значение after не сравнимо с полем сортировки
+        """
+        if n < 1:
+            raise ValueError("Размер страницы должен быть >= 1")
+
+        if self._sort_attr is None:
+            attr, reverse = 'id', False
+            if self._keys_only:
+                entries = sorted(self._get_filtered_clients())
+            else:
+                entries = sorted(self._iter_filtered_clients(), key=lambda client: client.id)
+        elif after is None:
+            return list(self._fetch_clients(self._get_sorted_prefix(n)[:n]))
+        else:
+            attr, reverse = self._sort_attr, self._sort_reverse
+            entries = self._get_filtered_and_sorted_clients()
+
+        if after is None:
+            return list(self._fetch_clients(entries[:n]))
+
+        value, last_id = after
+
+        def is_after(entry: Any) -> bool:
+            client = self._repo.get_by_id(entry) if self._keys_only else entry
+            current = getattr(client, attr)
+            if current == value:
+                return client.id > last_id
+            return current < value if reverse else current > value
+
+        # Выборка упорядочена, поэтому is_after ложно для префикса и истинно после него
+        low, high = 0, len(entries)
+        try:
+            while low < high:
+                middle = (low + high) // 2
+                if is_after(entries[middle]):
+                    high = middle
+                else:
+                    low = middle + 1
+        except TypeError as e:
+            raise ValueError(f"Значение курсора не сравнимо с полем '{attr}': {e}")
+
+        return list(self._fetch_clients(entries[low:low + n]))
+
     def get_count(self) -> int:
         """
         Возвращает количество клиентов ПОСЛЕ применения фильтров.
 
+        Ответ берется из той же закэшированной выборки, что и страницы списка,
+        а без фильтра - из репозитория.
+
         Returns:
             int: количество отфильтрованных клиентов
         """
-        filtered_clients = self._get_filtered_clients()
-        return len(filtered_clients)
+        return self._get_filtered_count()
+
+    def explain(self, k: int = 1, n: int = 10) -> str:
+        """
+        Выполняет запрос k-й страницы и описывает выбранный план.
+
+        Кэш декоратора предварительно сбрасывается, чтобы план был построен
+        и выполнен заново. Для каждого шага выводятся стоимость, оценка
+        числа строк по статистике и фактическое число строк.
+
+        Args:
+            k: номер страницы (начиная с 1)
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Текстовое описание плана
+        """
+        with self._cache_lock:
+            self._cache.clear()
+        # Без фильтра выборка не строится, поэтому план полного просмотра
+        # составляется здесь
+        self._last_plan = None if self._has_filter() else self._planner.plan_access(None)
+        start = time.perf_counter()
+        page = self.get_k_n_short_list(k, n)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        lines = [self._last_plan.explain()] if self._last_plan is not None else []
+        lines.append(f"Страница {k} (по {n}): {len(page)} строк, {elapsed_ms:.2f} мс")
+        return "\n".join(lines)
 
     # Методы-делегаты
 
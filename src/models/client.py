@@ -117,6 +117,57 @@ class Client(ClientBase):
             f")"
         )
 
+    def to_dict(self) -> dict:
+        """
+        Возвращает словарь с полями клиента (для JSON API и сериализации).
+
+        Значения берутся напрямую из атрибутов, минуя свойства: объект уже
+        прошел валидацию, а to_dict вызывается для каждой строки выгрузки.
+
+        Returns:
+            dict: поля в том же виде, что принимает конструктор
+        """
+        return {
+            'id': self._id,
+            'last_name': self._last_name,
+            'first_name': self._first_name,
+            'patronymic': self._patronymic,
+            'phone': self._phone,
+            'email': self._email,
+            'passport_series': self._passport_series,
+            'passport_number': self._passport_number,
+            'zip_code': self._zip_code,
+            'city': self._city,
+            'street': self._street,
+            'house': self._house,
+            'total_spending': self._total_spending,
+        }
+
+    # Атрибуты в порядке аргументов конструктора (для _restore)
+    _RESTORE_ATTRIBUTES = (
+        '_id', '_last_name', '_first_name', '_patronymic', '_phone', '_email',
+        '_passport_series', '_passport_number', '_zip_code', '_city', '_street',
+        '_house', '_total_spending',
+    )
+
+    @classmethod
+    def _restore(cls, values: tuple) -> 'Client':
+        """
+        Восстанавливает клиента из уже проверенных значений без валидации.
+
+        Только для данных, сохраненных из объектов Client (например, двоичный
+        снимок репозитория): проверки сеттеров при этом не выполняются.
+
+        Args:
+            values: значения полей в порядке аргументов конструктора
+
+        Returns:
+            Client: восстановленный объект
+        """
+        client = cls.__new__(cls)
+        client.__dict__.update(zip(cls._RESTORE_ATTRIBUTES, values))
+        return client
+
     @classmethod
     def from_json(cls, json_str: str):
         """
@@ -386,6 +437,20 @@ class ClientShort(ClientBase):
         """Возвращает общую сумму трат клиента."""
         return self._total_spending
 
+    def to_dict(self) -> dict:
+        """
+        Возвращает словарь с краткими данными клиента (для JSON API).
+
+        Returns:
+            dict: ключи id, fullname, contact, total_spending
+        """
+        return {
+            'id': self._id,
+            'fullname': self._fullname,
+            'contact': self._contact,
+            'total_spending': self._total_spending,
+        }
+
     def __str__(self) -> str:
         """Возвращает краткое строковое представление объекта ClientShort."""
         return (
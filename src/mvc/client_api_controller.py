@@ -0,0 +1,305 @@
+"""
+Контроллер JSON API для клиентов (/api/clients).
+
+Работает поверх тех же репозиториев и декораторов, что и HTML-контроллеры:
+список с фильтром по городу и сортировкой (make_listing_repo), курсорная
+(keyset) пагинация, операции создания, изменения и удаления с валидацией
+через класс Client и потоковая выгрузка в формате NDJSON.
+
+Методы возвращают готовые для ответа данные (словари) или None, если
+клиент не найден; ошибки в параметрах и данных - ValueError.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.models.client import Client, ClientShort
+from src.repositories.client_rep_base import Client_rep_base
+from src.decorators.client_predicates import CLIENT_COLUMNS
+from src.mvc.client_controller import make_listing_repo
+from src.mvc.observer import ClientEvent
+
+
+# Размер страницы списка по умолчанию и наибольший допустимый (параметр limit)
+DEFAULT_API_LIMIT = 50
+MAX_API_LIMIT = 1000
+
+# Сколько строк NDJSON отдавать одним фрагментом при выгрузке
+EXPORT_BATCH_ROWS = 1000
+
+# Поля клиента, которые передаются при создании и изменении (id назначает репозиторий)
+CLIENT_FIELDS = tuple(field for field in CLIENT_COLUMNS if field != 'id')
+
+# Компактный JSON без экранирования кириллицы; кодировщик создается один раз
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), check_circular=False)
+
+
+def encode_json(data: Any) -> str:
+    """
+    Сериализует данные в компактный JSON.
+
+    Args:
+        data: словари, списки и простые значения (например, Client.to_dict())
+
+    Returns:
+        JSON-строка
+    """
+    return _json_encoder.encode(data)
+
+
+class ClientApiController:
+    """
+    Контроллер JSON API для клиентов.
+
+    Изменения данных, как и в HTML-контроллерах, сопровождаются
+    уведомлением наблюдателей репозитория.
+    """
+
+    def __init__(self, repo: Client_rep_base) -> None:
+        """
+        Инициализирует контроллер API с репозиторием.
+
+        Args:
+            repo: Объект репозитория для доступа к данным
+        """
+        self.repo = repo
+
+    def list_clients(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Возвращает страницу клиентов с курсором на следующую страницу.
+
+        Параметры (все необязательные):
+        - filter_city, sort_by, sort_order: как на главной странице (sort_by по умолчанию id)
+        - limit: размер страницы (по умолчанию DEFAULT_API_LIMIT, не больше MAX_API_LIMIT)
+        - cursor: значение next_cursor из предыдущего ответа
+        - fields: 'short' - краткие данные (ClientShort) вместо полных
+
+        Args:
+            params: Словарь параметров запроса
+
+        Returns:
+            Словарь {'items': [...], 'next_cursor': str или None}
+
+        Raises:
+            ValueError: если параметры или курсор некорректны
+        """
+        params = params or {}
+        filter_city, sort_by, sort_order = self._get_listing_params(params)
+        limit = self._get_limit(params)
+        after = self._decode_cursor(params.get('cursor', ''), sort_by, sort_order)
+
+        repo_to_use = make_listing_repo(self.repo, filter_city, sort_by, sort_order)
+
+        # Запрашиваем на одного клиента больше, чтобы узнать, есть ли следующая страница
+        clients = repo_to_use.get_page_after(after, limit + 1)
+        next_cursor = None
+        if len(clients) > limit:
+            clients = clients[:limit]
+            last = clients[-1]
+            next_cursor = self._encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
+
+        if params.get('fields') == 'short':
+            items = [ClientShort(client).to_dict() for client in clients]
+        else:
+            items = [client.to_dict() for client in clients]
+        return {'items': items, 'next_cursor': next_cursor}
+
+    def get_client(self, client_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает данные клиента по ID.
+
+        Args:
+            client_id: ID клиента
+
+        Returns:
+            Словарь с полями клиента или None, если клиент не найден
+        """
+        client = self.repo.get_by_id(client_id)
+        return client.to_dict() if client else None
+
+    def create_client(self, data: Any) -> Dict[str, Any]:
+        """
+        Создает клиента из JSON-объекта со всеми полями CLIENT_FIELDS.
+
+        Args:
+            data: Разобранное тело запроса
+
+        Returns:
+            Словарь с полями созданного клиента (включая назначенный id)
+
+        Raises:
+            ValueError: если данные некорректны
+        """
+        # Временный ID, репозиторий назначит настоящий
+        new_client = self._build_client(1, data)
+        self.repo.add(new_client)
+
+        # Уведомляем наблюдателей
+        self.repo.notify(ClientEvent(ClientEvent.ADDED, new_client.id, new_client))
+        return new_client.to_dict()
+
+    def update_client(self, client_id: int, data: Any, partial: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Изменяет данные клиента.
+
+        Args:
+            client_id: ID клиента
+            data: Разобранное тело запроса
+            partial: если True, переданные поля дополняются текущими
+                значениями (PATCH), иначе нужны все поля (PUT)
+
+        Returns:
+            Словарь с новыми полями клиента или None, если клиент не найден
+
+        Raises:
+            ValueError: если данные некорректны
+        """
+        current_client = self.repo.get_by_id(client_id)
+        if not current_client:
+            return None
+
+        if partial and isinstance(data, dict):
+            data = {**current_client.to_dict(), **data}
+        updated_client = self._build_client(client_id, data)
+        self.repo.replace_by_id(client_id, updated_client)
+
+        # Уведомляем наблюдателей
+        self.repo.notify(ClientEvent(ClientEvent.UPDATED, client_id, updated_client))
+        return updated_client.to_dict()
+
+    def delete_client(self, client_id: int) -> bool:
+        """
+        Удаляет клиента по ID.
+
+        Args:
+            client_id: ID клиента
+
+        Returns:
+            True если клиент удален, False если он не найден
+        """
+        if not self.repo.get_by_id(client_id):
+            return False
+
+        self.repo.delete_by_id(client_id)
+
+        # Уведомляем наблюдателей об изменении
+        self.repo.notify(ClientEvent(ClientEvent.DELETED, client_id))
+        return True
+
+    def export_ndjson(self, params: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Выгружает всех клиентов в формате NDJSON (один JSON-объект на строку).
+
+        Клиенты читаются из репозитория по одному (iter_clients), строки
+        отдаются пачками по EXPORT_BATCH_ROWS, поэтому память не зависит
+        от числа клиентов. Параметры filter_city, sort_by, sort_order и
+        fields - как в list_clients. Параметры проверяются при создании
+        генератора, до отправки первой строки.
+
+        Args:
+            params: Словарь параметров запроса
+
+        Returns:
+            Итератор фрагментов NDJSON
+
+        Raises:
+            ValueError: если параметры некорректны
+        """
+        params = params or {}
+        filter_city, sort_by, sort_order = self._get_listing_params(params)
+        repo_to_use = make_listing_repo(self.repo, filter_city, sort_by, sort_order)
+        short = params.get('fields') == 'short'
+        return self._iter_ndjson(repo_to_use.iter_clients(), short)
+
+    def _iter_ndjson(self, clients: Iterator[Client], short: bool) -> Iterator[str]:
+        """Генерирует строки NDJSON пачками по EXPORT_BATCH_ROWS."""
+        encode = _json_encoder.encode
+        batch: List[str] = []
+        for client in clients:
+            data = ClientShort(client).to_dict() if short else client.to_dict()
+            batch.append(encode(data))
+            if len(batch) >= EXPORT_BATCH_ROWS:
+                batch.append('')
+                yield '\n'.join(batch)
+                batch = []
+        if batch:
+            batch.append('')
+            yield '\n'.join(batch)
+
+    def _get_listing_params(self, params: Dict[str, Any]) -> Tuple[str, str, str]:
+        """
+        Возвращает фильтр по городу, поле и порядок сортировки.
+
+        Returns:
+            Кортеж (filter_city, sort_by, sort_order); sort_by по умолчанию id
+        """
+        filter_city = str(params.get('filter_city', '')).strip()
+        sort_by = str(params.get('sort_by', '')).strip() or 'id'
+        sort_order = str(params.get('sort_order', 'ASC')).strip().upper() or 'ASC'
+        return filter_city, sort_by, sort_order
+
+    def _get_limit(self, params: Dict[str, Any]) -> int:
+        """
+        Возвращает размер страницы из параметра limit.
+
+        Raises:
+            ValueError: если limit не целое число от 1 до MAX_API_LIMIT
+        """
+        value = params.get('limit')
+        if value in (None, ''):
+            return DEFAULT_API_LIMIT
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"limit должен быть целым числом, получено: {value!r}")
+        if not 1 <= limit <= MAX_API_LIMIT:
+            raise ValueError(f"limit должен быть от 1 до {MAX_API_LIMIT}")
+        return limit
+
+    def _encode_cursor(self, sort_by: str, sort_order: str, value: Any, client_id: int) -> str:
+        """Кодирует позицию последнего клиента страницы в непрозрачную строку."""
+        raw = encode_json([sort_by, sort_order, value, client_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def _decode_cursor(self, cursor: str, sort_by: str, sort_order: str) -> Optional[Tuple[Any, int]]:
+        """
+        Декодирует курсор в позицию (значение поля сортировки, id).
+
+        Курсор действителен только для той же сортировки, с которой он выдан.
+
+        Returns:
+            Позиция или None, если курсор не передан
+
+        Raises:
+            ValueError: если курсор поврежден или выдан для другой сортировки
+        """
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            cursor_sort_by, cursor_order, value, client_id = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise ValueError("Некорректный курсор")
+        if (cursor_sort_by, cursor_order) != (sort_by, sort_order) or not isinstance(client_id, int):
+            raise ValueError("Курсор выдан для другой сортировки")
+        return value, client_id
+
+    def _build_client(self, client_id: int, data: Any) -> Client:
+        """
+        Создает объект Client из JSON-объекта (валидация - в конструкторе Client).
+
+        Raises:
+            ValueError: если данные не объект, поля отсутствуют, лишние или некорректны
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Ожидается JSON-объект с данными клиента")
+
+        unknown = sorted(set(data) - set(CLIENT_FIELDS) - {'id'})
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(unknown)}")
+        missing = [field for field in CLIENT_FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"Отсутствуют поля: {', '.join(missing)}")
+
+        return Client(id=client_id, **{field: data[field] for field in CLIENT_FIELDS})
@@ -5,11 +5,76 @@
 обработкой запросов пользователя.
 """
 
-from typing import Optional, Dict, List, Union, Any
+from html import escape
+from math import ceil
+from typing import Optional, Dict, Iterator, List, Tuple, Union, Any
 from src.repositories.client_rep_base import Client_rep_base
+from src.repositories.client_rep_db_adapter import Client_rep_db_adapter
 from src.mvc.client_view import ClientView
-from src.models.client import Client
+from src.mvc.observer import ClientEvent
+from src.models.client import Client, ClientShort
 from src.decorators.client_rep_db_decorator import Client_rep_db_decorator
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.decorators.client_predicates import check_column
+
+
+# Размер страницы списка по умолчанию и наибольший допустимый (параметр page_size)
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class ErrorPage(str):
+    """
+    Сообщение об ошибке, которое контроллер возвращает вместо страницы.
+
+    Это обычная HTML-строка; отдельный тип позволяет приложению отличить
+    ошибку от страницы (например, не отдавать для нее валидаторы кэша).
+    """
+
+
+def make_listing_repo(
+    repo: Client_rep_base,
+    filter_city: str = '',
+    sort_by: str = '',
+    sort_order: str = 'ASC'
+) -> Union[Client_rep_db_decorator, Client_rep_file_decorator]:
+    """
+    Оборачивает репозиторий декоратором с фильтром по городу и сортировкой.
+    
+    Для БД используется Client_rep_db_decorator, для файловых репозиториев -
+    Client_rep_file_decorator.
+    
+    Args:
+        repo: Репозиторий клиентов
+        filter_city: Город для фильтра (пустая строка - без фильтра)
+        sort_by: Поле сортировки (пустая строка - без сортировки)
+        sort_order: Порядок сортировки (ASC или DESC)
+        
+    Returns:
+        Декоратор репозитория
+        
+    Raises:
+        ValueError: если поле сортировки или порядок некорректны
+    """
+    if sort_by:
+        check_column(sort_by)
+    if sort_order not in ('ASC', 'DESC'):
+        raise ValueError("Порядок сортировки должен быть 'ASC' или 'DESC'")
+    
+    if isinstance(repo, Client_rep_db_adapter):
+        decorated = Client_rep_db_decorator(repo.db_repository)
+        if filter_city:
+            decorated.set_filter('city', filter_city)
+        if sort_by:
+            decorated.set_sort(sort_by, sort_order)
+        return decorated
+    
+    decorated = Client_rep_file_decorator(repo)
+    if filter_city:
+        decorated.set_filter('city', filter_city)
+    if sort_by:
+        decorated.set_sort(sort_by, reverse=(sort_order == 'DESC'))
+    return decorated
 
 
 class ClientController:
@@ -38,47 +103,120 @@ class ClientController:
         """
         Обрабатывает главную страницу с списком клиентов.
         
-        Получает первую страницу клиентов (по 10 на странице) из репозитория.
-        Если переданы параметры фильтрации/сортировки, использует декоратор.
+        Номер страницы и ее размер берутся из параметров page и page_size
+        (по умолчанию 1 и DEFAULT_PAGE_SIZE, не больше MAX_PAGE_SIZE).
+        Количество клиентов запрашивается до загрузки страницы, чтобы номер
+        за пределами списка сразу заменить последней страницей. Если переданы параметры фильтрации/сортировки,
+        использует декоратор.
         
         Args:
-            params: Словарь параметров запроса (filter_city, sort_by, sort_order)
+            params: Словарь параметров запроса (filter_city, sort_by, sort_order,
+                page, page_size)
             
         Returns:
             HTML-строка главной страницы
         """
         try:
-            # Определяем, нужен ли декоратор
-            repo_to_use = self.repo
-            
-            if params:
-                # Получаем параметры фильтрации и сортировки
-                filter_city = params.get('filter_city', '').strip()
-                sort_by = params.get('sort_by', '').strip()
-                sort_order = params.get('sort_order', 'ASC').strip().upper()
-                
-                # Если есть параметры, создаем декоратор
-                if filter_city or sort_by:
-                    repo_to_use = Client_rep_db_decorator(self.repo)
-                    
-                    # Применяем фильтр если есть
-                    if filter_city:
-                        repo_to_use.set_filter('city', filter_city)
-                    
-                    # Применяем сортировку если есть
-                    if sort_by:
-                        repo_to_use.set_sort(sort_by, sort_order)
-            
-            # Получаем первую страницу с 10 клиентами
-            clients_short = repo_to_use.get_k_n_short_list(k=1, n=10)
+            page, page_size = self._get_page_params(params)
+            
+            # Если переданы фильтр или сортировка, используем декоратор
+            repo_to_use = self._get_listing_repo(params)
+            
+            # Номер страницы за пределами списка заменяется последней страницей
+            total = repo_to_use.get_count()
+            page = min(page, max(1, ceil(total / page_size)))
+            clients_short = repo_to_use.get_k_n_short_list(k=page, n=page_size)
             
             # Уведомляем наблюдателей об обновлении данных
-            self.repo.notify(clients_short)
+            self.repo.notify(ClientEvent(ClientEvent.LISTED, clients=clients_short))
             
             # Возвращаем HTML
-            return self.view.render_main_page(clients_short)
+            pagination = {
+                'page': page,
+                'page_size': page_size,
+                'total': total,
+                'query': {key: (params or {}).get(key, '') for key in ('filter_city', 'sort_by', 'sort_order')},
+            }
+            return self.view.render_main_page(clients_short, pagination)
+        except Exception as e:
+            return ErrorPage(f"<h1>Ошибка</h1><p>Не удалось загрузить список клиентов: {escape(str(e))}</p>")
+    
+    def stream_index(self, params: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Отдает страницу со списком ВСЕХ клиентов по частям (без пагинации).
+        
+        Заголовок страницы отдается сразу, строки таблицы - по мере чтения
+        из репозитория (iter_clients), поэтому память не зависит от числа
+        клиентов. Наблюдатели не уведомляются: полный список не собирается.
+        
+        Args:
+            params: Словарь параметров запроса (filter_city, sort_by, sort_order)
+            
+        Returns:
+            Итератор фрагментов HTML
+        """
+        try:
+            repo_to_use = self._get_listing_repo(params)
         except Exception as e:
-            return f"<h1>Ошибка</h1><p>Не удалось загрузить список клиентов: {e}</p>"
+            yield f"<h1>Ошибка</h1><p>Не удалось загрузить список клиентов: {escape(str(e))}</p>"
+            return
+        
+        clients_short = (ClientShort(client) for client in repo_to_use.iter_clients())
+        try:
+            yield from self.view.stream_main_page(clients_short)
+        except Exception as e:
+            # Заголовок уже отправлен: дописываем сообщение в конец страницы
+            yield f"<p>Ошибка при выгрузке списка клиентов: {escape(str(e))}</p>"
+    
+    def _get_page_params(self, params: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Возвращает номер и размер страницы из параметров запроса.
+        
+        Нечисловые и неположительные значения заменяются значениями
+        по умолчанию, размер страницы ограничивается MAX_PAGE_SIZE.
+        
+        Args:
+            params: Словарь параметров запроса (page, page_size)
+            
+        Returns:
+            Кортеж (номер страницы, размер страницы)
+        """
+        def positive_int(name: str, default: int) -> int:
+            try:
+                value = int(str((params or {}).get(name, '')).strip())
+            except ValueError:
+                return default
+            return value if value >= 1 else default
+        
+        page = positive_int('page', 1)
+        page_size = min(positive_int('page_size', DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        return page, page_size
+    
+    def _get_listing_repo(self, params: Optional[Dict[str, Any]]) -> Any:
+        """
+        Возвращает репозиторий для списка клиентов с учетом параметров запроса.
+        
+        Если заданы фильтр по городу или сортировка, репозиторий
+        оборачивается декоратором (см. make_listing_repo).
+        
+        Args:
+            params: Словарь параметров запроса (filter_city, sort_by, sort_order)
+            
+        Returns:
+            Репозиторий или декоратор с методами get_k_n_short_list и iter_clients
+        """
+        if not params:
+            return self.repo
+        
+        # Получаем параметры фильтрации и сортировки
+        filter_city = params.get('filter_city', '').strip()
+        sort_by = params.get('sort_by', '').strip()
+        sort_order = params.get('sort_order', 'ASC').strip().upper()
+        
+        if not (filter_city or sort_by):
+            return self.repo
+        
+        return make_listing_repo(self.repo, filter_city, sort_by, sort_order)
     
     def show_details(self, client_id: int) -> str:
         """
@@ -97,15 +235,15 @@ class ClientController:
             client = self.repo.get_by_id(client_id)
             
             if not client:
-                return f"<h1>Ошибка</h1><p>Клиент с ID {client_id} не найден</p>"
+                return ErrorPage(f"<h1>Ошибка</h1><p>Клиент с ID {client_id} не найден</p>")
             
             # Уведомляем наблюдателей об обновлении данных
-            self.repo.notify(client)
+            self.repo.notify(ClientEvent(ClientEvent.VIEWED, client.id, client))
             
             # Возвращаем HTML
             return self.view.render_client_details(client)
         except Exception as e:
-            return f"<h1>Ошибка</h1><p>Не удалось загрузить информацию о клиенте: {e}</p>"
+            return ErrorPage(f"<h1>Ошибка</h1><p>Не удалось загрузить информацию о клиенте: {escape(str(e))}</p>")
 
 
 class ClientAddController:
@@ -213,7 +351,7 @@ class ClientAddController:
             self.repo.add(new_client)
             
             # Уведомляем наблюдателей
-            self.repo.notify(new_client)
+            self.repo.notify(ClientEvent(ClientEvent.ADDED, new_client.id, new_client))
             
             return True
         
@@ -281,10 +419,10 @@ class ClientEditController:
             client = self.repo.get_by_id(client_id)
             
             if not client:
-                return f"<h1>Ошибка</h1><p>Клиент с ID {client_id} не найден</p>"
+                return ErrorPage(f"<h1>Ошибка</h1><p>Клиент с ID {client_id} не найден</p>")
             
             # Уведомляем наблюдателей об обновлении данных
-            self.repo.notify(client)
+            self.repo.notify(ClientEvent(ClientEvent.VIEWED, client.id, client))
             
             # Возвращаем форму редактирования
             return self.view.render_client_form(
@@ -294,7 +432,7 @@ class ClientEditController:
                 client=client
             )
         except Exception as e:
-            return f"<h1>Ошибка</h1><p>Не удалось загрузить форму редактирования: {e}</p>"
+            return ErrorPage(f"<h1>Ошибка</h1><p>Не удалось загрузить форму редактирования: {escape(str(e))}</p>")
     
     def update_client(self, client_id: int, form_data: Dict[str, str]) -> Union[bool, str]:
         """
@@ -319,7 +457,7 @@ class ClientEditController:
             current_client = self.repo.get_by_id(client_id)
             
             if not current_client:
-                return f"<h1>Ошибка</h1><p>Клиент с ID {client_id} не найден</p>"
+                return ErrorPage(f"<h1>Ошибка</h1><p>Клиент с ID {client_id} не найден</p>")
             
             # Преобразуем данные формы в нужные типы
             last_name = form_data.get('last_name', '').strip()
@@ -368,7 +506,7 @@ class ClientEditController:
             self.repo.replace_by_id(client_id, updated_client)
             
             # Уведомляем наблюдателей
-            self.repo.notify(updated_client)
+            self.repo.notify(ClientEvent(ClientEvent.UPDATED, client_id, updated_client))
             
             return True
         
@@ -391,7 +529,7 @@ class ClientEditController:
             except Exception:
                 pass
             
-            return f"<h1>Ошибка</h1><p>Ошибка валидации: {error_message}</p>"
+            return ErrorPage(f"<h1>Ошибка</h1><p>Ошибка валидации: {escape(error_message)}</p>")
         
         except Exception as e:
             # Неожиданная ошибка
@@ -409,7 +547,7 @@ class ClientEditController:
             except Exception:
                 pass
             
-            return f"<h1>Ошибка</h1><p>Ошибка обновления: {str(e)}</p>"
+            return ErrorPage(f"<h1>Ошибка</h1><p>Ошибка обновления: {escape(str(e))}</p>")
 
 
 class ClientDeleteController:
@@ -443,7 +581,7 @@ class ClientDeleteController:
             self.repo.delete_by_id(client_id)
             
             # Уведомляем наблюдателей об изменении
-            self.repo.notify(f"Клиент с ID {client_id} был удален")
+            self.repo.notify(ClientEvent(ClientEvent.DELETED, client_id))
             
             return True
         except ValueError as e:
@@ -0,0 +1,215 @@
+"""
+Рассылка изменений списка клиентов браузерам (Server-Sent Events).
+
+ClientEventBroadcaster подписывается на репозиторий как наблюдатель.
+Изменения (добавление, редактирование, удаление) собираются в течение
+короткого окна и отправляются подписчикам одним сообщением: для каждого
+измененного клиента - новая строка таблицы главной страницы или признак
+удаления. Несколько изменений одного клиента за окно дают одно событие
+с его последним состоянием.
+
+Наблюдатель подписан только на события изменения (ClientEvent.CHANGES),
+поэтому уведомления о чтении (список, страница клиента) до него не доходят.
+"""
+
+import queue
+import threading
+from typing import Any, Dict, Iterator, Optional, Set
+from src.models.client import ClientShort
+from src.core.metrics import Metrics
+from src.mvc.observer import AbstractObserver, ClientEvent
+from src.mvc.client_view import ClientView
+from src.mvc.client_api_controller import encode_json
+from src.repositories.client_rep_base import Client_rep_base
+
+
+# Окно, в течение которого изменения собираются в одно сообщение (секунды)
+DEFAULT_COALESCE_WINDOW = 0.25
+
+# Сколько неотправленных сообщений может накопиться у одного подписчика
+MAX_PENDING_MESSAGES = 100
+
+# Интервал комментариев-пингов, чтобы прокси не закрывали соединение (секунды)
+HEARTBEAT_INTERVAL = 15.0
+
+# Сообщение подписчику, который не успевал читать: страницу нужно перезагрузить
+_RELOAD_MESSAGE = "event: reload\ndata: {}\n\n"
+
+
+class ClientEventBroadcaster(AbstractObserver):
+    """
+    Наблюдатель репозитория, рассылающий изменения подписчикам SSE.
+
+    Каждый подписчик получает собственную очередь сообщений ограниченного
+    размера (MAX_PENDING_MESSAGES). Если очередь переполнена, накопленные
+    сообщения отбрасываются и вместо них отправляется событие reload.
+
+    Метрики (если передан реестр Metrics):
+        events_subscribers: число подключенных подписчиков
+        events_messages_total: число разосланных сообщений
+        events_changes_total: число событий об изменении клиентов
+        events_dropped_total: число переполнений очереди подписчика
+    """
+
+    topics = ClientEvent.CHANGES
+
+    def __init__(
+        self,
+        repo: Client_rep_base,
+        view: ClientView,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        metrics: Optional[Metrics] = None
+    ) -> None:
+        """
+        Args:
+            repo: Репозиторий, изменения которого рассылаются
+            view: Представление для генерации строк таблицы
+            coalesce_window: Окно объединения изменений (0 - рассылать сразу)
+            metrics: Реестр метрик
+        """
+        self.repo = repo
+        self.view = view
+        self.coalesce_window = coalesce_window
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._subscribers: Set[queue.Queue] = set()
+        self._pending: Dict[int, None] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._sequence = 0
+
+    def update(self, data: Any) -> None:
+        """
+        Принимает уведомление репозитория и планирует рассылку изменения.
+
+        Args:
+            data: Событие изменения (ClientEvent)
+        """
+        if not isinstance(data, ClientEvent) or data.type not in ClientEvent.CHANGES:
+            return
+
+        with self._lock:
+            self._pending[data.client_id] = None
+
+            if not self._subscribers:
+                self._pending.clear()
+                return
+            if self._timer is None and self.coalesce_window > 0:
+                self._timer = threading.Timer(self.coalesce_window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if self.coalesce_window <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Немедленно рассылает накопленные изменения подписчикам."""
+        with self._lock:
+            client_ids = list(self._pending)
+            self._pending.clear()
+            self._timer = None
+        if not client_ids:
+            return
+
+        events = [self._build_event(client_id) for client_id in client_ids]
+        with self._lock:
+            self._sequence += 1
+            message = f"id: {self._sequence}\nevent: clients\ndata: {encode_json({'events': events})}\n\n"
+            subscribers = list(self._subscribers)
+
+        for messages in subscribers:
+            self._deliver(messages, message)
+        self._record('events_messages_total')
+        self._record('events_changes_total', len(events))
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Регистрирует подписчика.
+
+        Returns:
+            Очередь, в которую будут поступать сообщения SSE
+        """
+        messages: queue.Queue = queue.Queue(maxsize=MAX_PENDING_MESSAGES)
+        with self._lock:
+            self._subscribers.add(messages)
+            count = len(self._subscribers)
+        self._set_subscribers_gauge(count)
+        return messages
+
+    def unsubscribe(self, messages: queue.Queue) -> None:
+        """
+        Удаляет подписчика.
+
+        Args:
+            messages: Очередь, полученная из subscribe
+        """
+        with self._lock:
+            self._subscribers.discard(messages)
+            count = len(self._subscribers)
+        self._set_subscribers_gauge(count)
+
+    def stream(self, heartbeat: float = HEARTBEAT_INTERVAL) -> Iterator[str]:
+        """
+        Генерирует поток SSE для одного подключения.
+
+        Подписка оформляется при первом обращении к генератору и снимается,
+        когда генератор закрывается (клиент отключился).
+
+        Args:
+            heartbeat: Интервал пингов при отсутствии событий (секунды)
+
+        Returns:
+            Итератор фрагментов text/event-stream
+        """
+        messages = self.subscribe()
+        try:
+            # Задержка переподключения браузера после обрыва (мс)
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield messages.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": ping\n\n"
+        finally:
+            self.unsubscribe(messages)
+
+    def _build_event(self, client_id: int) -> Dict[str, Any]:
+        """
+        Строит событие по текущему состоянию клиента в репозитории.
+
+        Returns:
+            {'type': 'delete', 'id': ...} или {'type': 'upsert', 'id': ..., 'html': строка таблицы}
+        """
+        client = self.repo.get_by_id(client_id)
+        if client is None:
+            return {'type': 'delete', 'id': client_id}
+        return {'type': 'upsert', 'id': client_id, 'html': self.view.render_row(ClientShort(client))}
+
+    def _deliver(self, messages: queue.Queue, message: str) -> None:
+        """Кладет сообщение в очередь подписчика; при переполнении заменяет очередь на reload."""
+        try:
+            messages.put_nowait(message)
+            return
+        except queue.Full:
+            pass
+
+        # Подписчик не успевает читать: отдельные изменения уже не помогут
+        self._record('events_dropped_total')
+        while True:
+            try:
+                messages.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            messages.put_nowait(_RELOAD_MESSAGE)
+        except queue.Full:
+            pass
+
+    def _set_subscribers_gauge(self, count: int) -> None:
+        """Обновляет показатель числа подписчиков."""
+        if self.metrics is not None:
+            self.metrics.set_gauge('events_subscribers', count)
+
+    def _record(self, name: str, value: float = 1.0) -> None:
+        """Увеличивает счетчик, если передан реестр метрик."""
+        if self.metrics is not None:
+            self.metrics.increment(name, value)
@@ -3,168 +3,46 @@
 
 Генерирует HTML-контент для веб-приложения на основе данных,
 полученных от контроллера.
+
+Шаблоны страниц - константы модуля: статическая оболочка и неизменные
+части главной страницы собираются один раз при импорте,
+на каждый запрос подставляются только данные. Все значения из данных
+клиентов экранируются (html.escape). Стили подключаются внешним файлом
+с отпечатком содержимого (см. static_assets), чтобы он кэшировался.
 """
 
-from typing import Any, List, Optional, Dict
-from src.mvc.observer import AbstractObserver
+from html import escape
+from math import ceil
+from urllib.parse import urlencode
+from typing import Any, Iterable, Iterator, List, Optional, Dict
+from src.mvc.observer import AbstractObserver, ClientEvent
 from src.models.client import Client, ClientShort
+from src.mvc.static_assets import SCRIPT, STYLESHEET
 
 
-class ClientView(AbstractObserver):
-    """
-    Представление для отображения клиентов.
-    
-    Реализует паттерн Observer для получения уведомлений об изменениях
-    и генерирует HTML для веб-интерфейса.
-    """
-    
-    def __init__(self) -> None:
-        """Инициализирует представление с пустым состоянием."""
-        self._state: Optional[Any] = None
-    
-    def update(self, data: Any) -> None:
-        """
-        Обновляет состояние представления при изменении данных в репозитории.
-        
-        Args:
-            data: Данные об изменении из репозитория
-        """
-        self._state = data
-    
-    def _get_base_html(self, title: str, content: str) -> str:
-        """
-        Возвращает базовый HTML шаблон со стилями.
-        
-        Args:
-            title: Заголовок страницы
-            content: Содержимое страницы
-            
-        Returns:
-            HTML-строка
-        """
-        return f"""<!DOCTYPE html>
+# Сколько строк таблицы отдавать одним фрагментом при потоковой выдаче
+STREAM_BATCH_ROWS = 100
+
+# Оболочка страницы: до заголовка, от заголовка до содержимого и после содержимого
+_SHELL_HEAD = """<!DOCTYPE html>
 <html lang="ru">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        h1, h2 {{
-            color: #333;
-            border-bottom: 2px solid #007bff;
-            padding-bottom: 10px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            background-color: white;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            margin-top: 20px;
-        }}
-        th {{
-            background-color: #007bff;
-            color: white;
-            padding: 12px;
-            text-align: left;
-            font-weight: 600;
-        }}
-        td {{
-            padding: 12px;
-            border-bottom: 1px solid #ddd;
-        }}
-        tr:hover {{
-            background-color: #f0f0f0;
-        }}
-        a {{
-            color: #007bff;
-            text-decoration: none;
-            font-weight: 500;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-        .back-link {{
-            display: inline-block;
-            margin-bottom: 20px;
-            color: #007bff;
-            font-weight: 500;
-        }}
-        .info-box {{
-            background-color: white;
-            border-left: 4px solid #007bff;
-            padding: 20px;
-            margin: 20px 0;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }}
-        .info-row {{
-            display: flex;
-            justify-content: space-between;
-            padding: 10px 0;
-            border-bottom: 1px solid #eee;
-        }}
-        .info-row label {{
-            font-weight: 600;
-            color: #333;
-            min-width: 200px;
-        }}
-        .info-row span {{
-            color: #666;
-        }}
-        .info-row:last-child {{
-            border-bottom: none;
-        }}
-        .no-data {{
-            text-align: center;
-            color: #999;
-            padding: 40px;
-            font-size: 18px;
-        }}
-    </style>
+    <title>"""
+
+_SHELL_BODY = """</title>
+    <link rel="stylesheet" href="{stylesheet_url}">
 </head>
 <body>
-    {content}
+    """.format(stylesheet_url=STYLESHEET.url)
+
+_SHELL_TAIL = """
 </body>
 </html>"""
-    
-    def render_main_page(self, clients_short: List[ClientShort]) -> str:
-        """
-        Генерирует HTML главной страницы со списком клиентов.
-        
-        Args:
-            clients_short: Список объектов ClientShort для отображения
-            
-        Returns:
-            HTML-строка главной страницы
-        """
-        if not clients_short:
-            content = '<h1>Список клиентов</h1><div class="no-data">Нет данных</div>'
-            return self._get_base_html('Клиенты', content)
-        
-        # Генерируем строки таблицы
-        table_rows = ""
-        for client in clients_short:
-            table_rows += f"""
-        <tr>
-            <td>{client.id}</td>
-            <td>{client.fullname}</td>
-            <td>{client.contact}</td>
-            <td>{client.total_spending:.2f} ₽</td>
-            <td>
-                <a href="/client/{client.id}" target="_blank" style="margin-right: 10px;">Подробнее</a>
-                <a href="/edit/{client.id}" style="margin-right: 10px;">Редактировать</a>
-                <a href="/delete/{client.id}" style="color: #dc3545; margin-right: 10px;" onclick="return confirm('Вы уверены, что хотите удалить этого клиента?');">Удалить</a>
-            </td>
-        </tr>
-"""
-        
-        table_html = f"""<h1>Список клиентов</h1>
+
+# Главная страница: неизменные части до и после строк таблицы
+_MAIN_PAGE_HEAD = """<h1>Список клиентов</h1>
     <div style="margin-bottom: 20px;">
         <a href="/add" style="display: inline-block; padding: 10px 20px; background-color: #28a745; color: white; border-radius: 4px; text-decoration: none; font-weight: 600;">+ Добавить нового клиента</a>
     </div>
@@ -208,120 +86,98 @@ class ClientView(AbstractObserver):
                 <th>Действия</th>
             </tr>
         </thead>
-        <tbody>
-            {table_rows}
+        <tbody data-live="/events">
+            """
+
+# После таблицы - уведомление об изменениях списка и сценарий живого обновления строк
+_MAIN_PAGE_TAIL = """
         </tbody>
-    </table>"""
-        
-        return self._get_base_html('Клиенты', table_html)
-    
-    def render_client_details(self, client: Client) -> str:
-        """
-        Генерирует HTML страницы с подробной информацией о клиенте.
-        
-        Args:
-            client: Объект Client с полной информацией
-            
-        Returns:
-            HTML-строка с деталями клиента
-        """
-        if not client:
-            content = '<h1>Детали клиента</h1><div class="no-data">Клиент не найден</div>'
-            return self._get_base_html('Детали клиента', content)
-        
-        details_html = f"""<a href="/" class="back-link">← Вернуться на главную</a>
-    <h1>Детали клиента (ID: {client.id})</h1>
+    </table>
+    <div id="live-notice" class="live-notice" hidden>Список клиентов изменился. <a href="">Обновить</a></div>
+    <script src="{script_url}" defer></script>""".format(script_url=SCRIPT.url)
+
+# Навигация по страницам под таблицей
+_PAGINATION_TEMPLATE = """
+    <div class="pagination">
+        {prev_link}
+        <span>Страница {page} из {pages} · Всего клиентов: {total}</span>
+        {next_link}
+    </div>"""
+
+_PAGE_LINK_TEMPLATE = '<a href="{url}">{label}</a>'
+_PAGE_DISABLED_TEMPLATE = '<span class="disabled">{label}</span>'
+
+# Строка таблицы главной страницы (str.format, значения экранированы заранее)
+_MAIN_ROW_TEMPLATE = """
+        <tr data-id="{id}">
+            <td>{id}</td>
+            <td>{fullname}</td>
+            <td>{contact}</td>
+            <td>{total_spending} ₽</td>
+            <td>
+                <a href="/client/{id}" target="_blank" style="margin-right: 10px;">Подробнее</a>
+                <a href="/edit/{id}" style="margin-right: 10px;">Редактировать</a>
+                <a href="/delete/{id}" style="color: #dc3545; margin-right: 10px;" onclick="return confirm('Вы уверены, что хотите удалить этого клиента?');">Удалить</a>
+            </td>
+        </tr>
+"""
+
+_DETAILS_TEMPLATE = """<a href="/" class="back-link">← Вернуться на главную</a>
+    <h1>Детали клиента (ID: {id})</h1>
     <div class="info-box">
         <h2>Личные данные</h2>
         <div class="info-row">
             <label>ФИО:</label>
-            <span>{client.last_name} {client.first_name} {client.patronymic}</span>
+            <span>{last_name} {first_name} {patronymic}</span>
         </div>
         <div class="info-row">
             <label>Телефон:</label>
-            <span><a href="tel:{client.phone}">{client.phone}</a></span>
+            <span><a href="tel:{phone}">{phone}</a></span>
         </div>
         <div class="info-row">
             <label>Email:</label>
-            <span><a href="mailto:{client.email}">{client.email}</a></span>
+            <span><a href="mailto:{email}">{email}</a></span>
         </div>
         <div class="info-row">
             <label>Паспорт:</label>
-            <span>{client.passport_series} {client.passport_number}</span>
+            <span>{passport_series} {passport_number}</span>
         </div>
     </div>
     <div class="info-box">
         <h2>Адрес проживания</h2>
         <div class="info-row">
             <label>Почтовый индекс:</label>
-            <span>{client.zip_code}</span>
+            <span>{zip_code}</span>
         </div>
         <div class="info-row">
             <label>Город:</label>
-            <span>{client.city}</span>
+            <span>{city}</span>
         </div>
         <div class="info-row">
             <label>Улица:</label>
-            <span>{client.street}</span>
+            <span>{street}</span>
         </div>
         <div class="info-row">
             <label>Дом:</label>
-            <span>{client.house}</span>
+            <span>{house}</span>
         </div>
     </div>
     <div class="info-box">
         <h2>Финансовая информация</h2>
         <div class="info-row">
             <label>Общие траты:</label>
-            <span style="font-size: 18px; font-weight: 600; color: #28a745;">{client.total_spending:.2f} ₽</span>
+            <span style="font-size: 18px; font-weight: 600; color: #28a745;">{total_spending} ₽</span>
         </div>
     </div>"""
-        
-        return self._get_base_html(f'Клиент {client.last_name}', details_html)
-    
-    def render_client_form(self, title: str, button_text: str, action_url: str, client: Optional[Client] = None, errors: Optional[List[str]] = None) -> str:
-        """
-        Генерирует универсальную HTML форму для добавления или редактирования клиента.
-        
-        Параметры title, button_text и action_url позволяют переиспользовать форму
-        для разных операций (Add/Edit).
-        
-        Args:
-            title: Заголовок формы (например, "Добавление клиента" или "Редактирование клиента")
-            button_text: Текст на кнопке отправки (например, "Создать" или "Сохранить изменения")
-            action_url: URL для отправки формы (например, "/add" или "/edit/1")
-            client: Объект Client для предзаполнения формы (если None - форма пустая для добавления)
-            errors: Список ошибок валидации (если есть)
-            
-        Returns:
-            HTML-строка с формой
-        """
-        # Если передан client, используем его данные; иначе пустые значения
-        last_name = client.last_name if client else ''
-        first_name = client.first_name if client else ''
-        patronymic = client.patronymic if client else ''
-        phone = client.phone if client else ''
-        email = client.email if client else ''
-        passport_series = client.passport_series if client else ''
-        passport_number = client.passport_number if client else ''
-        zip_code = str(client.zip_code) if client else ''
-        city = client.city if client else ''
-        street = client.street if client else ''
-        house = client.house if client else ''
-        total_spending = f"{client.total_spending:.2f}" if client else '0.00'
-        
-        # Генерируем блок ошибок, если они есть
-        errors_html = ""
-        if errors:
-            errors_list = "".join([f"<li>{error}</li>" for error in errors])
-            errors_html = f"""<div style="background-color: #f8d7da; color: #721c24; padding: 12px; border: 1px solid #f5c6cb; border-radius: 4px; margin-bottom: 20px;">
+
+_FORM_ERRORS_TEMPLATE = """<div style="background-color: #f8d7da; color: #721c24; padding: 12px; border: 1px solid #f5c6cb; border-radius: 4px; margin-bottom: 20px;">
         <strong>❌ Ошибки при заполнении формы:</strong>
         <ul style="margin: 10px 0 0 0;">
             {errors_list}
         </ul>
     </div>"""
-        
-        form_html = f"""<a href="/" style="display: inline-block; margin-bottom: 20px; color: #007bff; font-weight: 500;">← Вернуться на главную</a>
+
+_FORM_TEMPLATE = """<a href="/" style="display: inline-block; margin-bottom: 20px; color: #007bff; font-weight: 500;">← Вернуться на главную</a>
     <h1>{title}</h1>
     {errors_html}
     <form method="POST" action="{action_url}" style="background-color: white; padding: 20px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);">
@@ -407,7 +263,244 @@ class ClientView(AbstractObserver):
             <a href="/" style="padding: 12px 30px; background-color: #6c757d; color: white; border-radius: 4px; text-decoration: none; font-weight: 600; display: inline-flex; align-items: center;">✕ Отмена</a>
         </div>
     </form>"""
-        
-        return self._get_base_html(title, form_html)
 
 
+def _build_page(title: str, content: str) -> str:
+    """Собирает страницу из оболочки, экранированного заголовка и готового содержимого."""
+    return "".join((_SHELL_HEAD, escape(title), _SHELL_BODY, content, _SHELL_TAIL))
+
+
+# Страницы и части страниц, которые не зависят от данных, собираются один раз
+_MAIN_PAGE_PREFIX = _SHELL_HEAD + "Клиенты" + _SHELL_BODY + _MAIN_PAGE_HEAD
+_MAIN_PAGE_SUFFIX = _MAIN_PAGE_TAIL + _SHELL_TAIL
+_EMPTY_MAIN_PAGE = _build_page('Клиенты', '<h1>Список клиентов</h1><div class="no-data">Нет данных</div>')
+_CLIENT_NOT_FOUND_PAGE = _build_page(
+    'Детали клиента', '<h1>Детали клиента</h1><div class="no-data">Клиент не найден</div>'
+)
+
+
+class ClientView(AbstractObserver):
+    """
+    Представление для отображения клиентов.
+    
+    Реализует паттерн Observer для получения уведомлений об изменениях
+    и генерирует HTML для веб-интерфейса.
+    """
+    
+    # Страницы строятся из переданных в render_* данных, поэтому представление
+    # подписано только на изменения и не удерживает списки клиентов (LISTED)
+    topics = ClientEvent.CHANGES
+    
+    def __init__(self) -> None:
+        """Инициализирует представление с пустым состоянием."""
+        self._state: Optional[Any] = None
+    
+    def update(self, data: Any) -> None:
+        """
+        Обновляет состояние представления при изменении данных в репозитории.
+        
+        Args:
+            data: Событие изменения (ClientEvent) из репозитория
+        """
+        self._state = data
+    
+    def _get_base_html(self, title: str, content: str) -> str:
+        """
+        Возвращает страницу в базовом HTML шаблоне со стилями.
+        
+        Args:
+            title: Заголовок страницы (экранируется)
+            content: Содержимое страницы (готовый HTML)
+            
+        Returns:
+            HTML-строка
+        """
+        return _build_page(title, content)
+    
+    def render_main_page(
+        self,
+        clients_short: List[ClientShort],
+        pagination: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Генерирует HTML главной страницы со списком клиентов.
+        
+        Args:
+            clients_short: Список объектов ClientShort для отображения
+            pagination: Параметры навигации по страницам: page, page_size,
+                total (всего клиентов) и query (параметры фильтра и сортировки,
+                сохраняемые в ссылках). Без него навигация не выводится
+            
+        Returns:
+            HTML-строка главной страницы
+        """
+        if not clients_short:
+            return _EMPTY_MAIN_PAGE
+        
+        # Строки таблицы собираются через join, без повторной конкатенации
+        table_rows = "".join([self.render_row(client) for client in clients_short])
+        
+        if pagination is None:
+            return "".join((_MAIN_PAGE_PREFIX, table_rows, _MAIN_PAGE_SUFFIX))
+        
+        return "".join((
+            _MAIN_PAGE_PREFIX, table_rows, _MAIN_PAGE_TAIL,
+            self._render_pagination(pagination), _SHELL_TAIL
+        ))
+    
+    def _render_pagination(self, pagination: Dict[str, Any]) -> str:
+        """
+        Генерирует блок ссылок на предыдущую и следующую страницы.
+        
+        Args:
+            pagination: Словарь с ключами page, page_size, total и query
+            
+        Returns:
+            HTML-строка блока навигации
+        """
+        page = pagination['page']
+        page_size = pagination['page_size']
+        total = pagination['total']
+        pages = max(1, ceil(total / page_size))
+        query = {key: value for key, value in (pagination.get('query') or {}).items() if value}
+        
+        def link(target: int, label: str) -> str:
+            if target < 1 or target > pages:
+                return _PAGE_DISABLED_TEMPLATE.format(label=label)
+            url = "/?" + urlencode({**query, 'page': target, 'page_size': page_size})
+            return _PAGE_LINK_TEMPLATE.format(url=escape(url), label=label)
+        
+        return _PAGINATION_TEMPLATE.format(
+            prev_link=link(page - 1, "← Назад"),
+            page=page,
+            pages=pages,
+            total=total,
+            next_link=link(page + 1, "Вперед →"),
+        )
+    
+    def stream_main_page(self, clients_short: Iterable[ClientShort]) -> Iterator[str]:
+        """
+        Генерирует HTML главной страницы по частям (потоковый режим).
+        
+        Сначала отдается оболочка страницы и заголовок таблицы - до обращения
+        к clients_short, затем строки пачками по STREAM_BATCH_ROWS. Память
+        не зависит от числа строк, если clients_short - ленивый итератор.
+        
+        Args:
+            clients_short: Итератор объектов ClientShort
+            
+        Returns:
+            Итератор фрагментов HTML
+        """
+        yield _MAIN_PAGE_PREFIX
+        
+        batch = []
+        for client in clients_short:
+            batch.append(self.render_row(client))
+            if len(batch) >= STREAM_BATCH_ROWS:
+                yield "".join(batch)
+                batch = []
+        if batch:
+            yield "".join(batch)
+        
+        yield _MAIN_PAGE_SUFFIX
+    
+    def render_row(self, client: ClientShort) -> str:
+        """
+        Генерирует строку таблицы главной страницы.
+        
+        Используется и при живом обновлении: строка заменяет на странице
+        строку с тем же data-id.
+        
+        Args:
+            client: Объект ClientShort
+            
+        Returns:
+            HTML-строка <tr> с экранированными данными
+        """
+        return _MAIN_ROW_TEMPLATE.format(
+            id=client.id,
+            fullname=escape(str(client.fullname)),
+            contact=escape(str(client.contact)),
+            total_spending=f"{client.total_spending:.2f}",
+        )
+    
+    def render_client_details(self, client: Client) -> str:
+        """
+        Генерирует HTML страницы с подробной информацией о клиенте.
+        
+        Args:
+            client: Объект Client с полной информацией
+            
+        Returns:
+            HTML-строка с деталями клиента
+        """
+        if not client:
+            return _CLIENT_NOT_FOUND_PAGE
+        
+        details_html = _DETAILS_TEMPLATE.format(
+            id=client.id,
+            last_name=escape(client.last_name),
+            first_name=escape(client.first_name),
+            patronymic=escape(client.patronymic),
+            phone=escape(client.phone),
+            email=escape(client.email),
+            passport_series=escape(client.passport_series),
+            passport_number=escape(client.passport_number),
+            zip_code=client.zip_code,
+            city=escape(client.city),
+            street=escape(client.street),
+            house=escape(client.house),
+            total_spending=f"{client.total_spending:.2f}",
+        )
+        
+        return self._get_base_html(f'Клиент {client.last_name}', details_html)
+    
+    def render_client_form(self, title: str, button_text: str, action_url: str, client: Optional[Client] = None, errors: Optional[List[str]] = None) -> str:
+        """
+        Генерирует универсальную HTML форму для добавления или редактирования клиента.
+        
+        Параметры title, button_text и action_url позволяют переиспользовать форму
+        для разных операций (Add/Edit).
+        
+        Args:
+            title: Заголовок формы (например, "Добавление клиента" или "Редактирование клиента")
+            button_text: Текст на кнопке отправки (например, "Создать" или "Сохранить изменения")
+            action_url: URL для отправки формы (например, "/add" или "/edit/1")
+            client: Объект Client для предзаполнения формы (если None - форма пустая для добавления)
+            errors: Список ошибок валидации (если есть)
+            
+        Returns:
+            HTML-строка с формой
+        """
+        # Если передан client, используем его данные; иначе пустые значения
+        values = {
+            'last_name': client.last_name if client else '',
+            'first_name': client.first_name if client else '',
+            'patronymic': client.patronymic if client else '',
+            'phone': client.phone if client else '',
+            'email': client.email if client else '',
+            'passport_series': client.passport_series if client else '',
+            'passport_number': client.passport_number if client else '',
+            'zip_code': str(client.zip_code) if client else '',
+            'city': client.city if client else '',
+            'street': client.street if client else '',
+            'house': client.house if client else '',
+            'total_spending': f"{client.total_spending:.2f}" if client else '0.00',
+        }
+        
+        # Генерируем блок ошибок, если они есть
+        errors_html = ""
+        if errors:
+            errors_list = "".join([f"<li>{escape(str(error))}</li>" for error in errors])
+            errors_html = _FORM_ERRORS_TEMPLATE.format(errors_list=errors_list)
+        
+        form_html = _FORM_TEMPLATE.format(
+            title=escape(title),
+            errors_html=errors_html,
+            action_url=escape(action_url),
+            button_text=escape(button_text),
+            **{name: escape(value) for name, value in values.items()}
+        )
+        
+        return self._get_base_html(title, form_html)
@@ -2,8 +2,60 @@
 Паттерн Observer для поддержки Publish-Subscribe между репозиторием и представлением.
 """
 
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+from src.models.client import Client
+
+
+class ClientEvent:
+    """
+    Типизированное уведомление о клиентах.
+    
+    Тип события (type) - одна из констант ADDED, UPDATED, DELETED, LISTED,
+    VIEWED; по нему Subject выбирает подписанных наблюдателей.
+    """
+    
+    ADDED = 'added'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    LISTED = 'listed'
+    VIEWED = 'viewed'
+    
+    TYPES = frozenset((ADDED, UPDATED, DELETED, LISTED, VIEWED))
+    
+    # События об изменении данных (в отличие от чтения)
+    CHANGES = frozenset((ADDED, UPDATED, DELETED))
+    
+    __slots__ = ('type', 'client_id', 'client', 'clients')
+    
+    def __init__(
+        self,
+        event_type: str,
+        client_id: Optional[int] = None,
+        client: Optional[Client] = None,
+        clients: Optional[List[Any]] = None
+    ) -> None:
+        """
+        Args:
+            event_type: Тип события (ClientEvent.ADDED и т.д.)
+            client_id: ID клиента (для событий об одном клиенте)
+            client: Клиент (для ADDED, UPDATED, VIEWED)
+            clients: Список клиентов (для LISTED)
+            
+        Raises:
+            ValueError: если тип события неизвестен
+        """
+        if event_type not in self.TYPES:
+            raise ValueError(f"Неизвестный тип события: {event_type}")
+        self.type = event_type
+        self.client_id = client_id
+        self.client = client
+        self.clients = clients
+    
+    def __repr__(self) -> str:
+        return f"ClientEvent({self.type!r}, client_id={self.client_id!r})"
 
 
 class AbstractObserver(ABC):
@@ -14,6 +66,13 @@ class AbstractObserver(ABC):
     которые должны реагировать на уведомления от Subject.
     """
     
+    # Типы событий, на которые подписывается наблюдатель (None - все уведомления)
+    topics: Optional[Iterable[str]] = None
+    
+    # False - наблюдатель вызывается синхронно даже при асинхронной доставке
+    # (например, если ему нужно состояние репозитория в момент уведомления)
+    asynchronous: bool = True
+    
     @abstractmethod
     def update(self, data: Any) -> None:
         """
@@ -29,41 +88,107 @@ class Subject:
     """
     Издатель (Subject) - класс, за которым наблюдают.
     
-    Поддерживает список зарегистрированных наблюдателей
-    и уведомляет их об изменениях состояния.
+    Поддерживает реестр наблюдателей и уведомляет их об изменениях состояния.
+    Наблюдатели хранятся по слабым ссылкам: Subject не продлевает им жизнь,
+    удаленный сборщиком мусора наблюдатель просто перестает получать
+    уведомления. Наблюдатель, подписанный на типы событий, получает только
+    события ClientEvent этих типов; нетипизированные уведомления получают все.
+    
+    По умолчанию наблюдатели вызываются синхронно; с set_dispatcher
+    уведомления доставляются в фоновом потоке (см. ObserverDispatcher).
     """
     
     def __init__(self) -> None:
-        """Инициализирует пустой список наблюдателей."""
-        self._observers: List[AbstractObserver] = []
+        """Инициализирует пустой реестр наблюдателей."""
+        self._registry_lock = threading.Lock()
+        # Наблюдатель -> его типы событий (None - все уведомления)
+        self._subscriptions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Тип события (None - все уведомления) -> наблюдатели
+        self._by_topic: Dict[Optional[str], weakref.WeakKeyDictionary] = {None: weakref.WeakKeyDictionary()}
+        self._dispatcher: Optional[Any] = None
+    
+    @property
+    def _observers(self) -> List[AbstractObserver]:
+        """Список живых наблюдателей в порядке подписки."""
+        with self._registry_lock:
+            return list(self._subscriptions)
     
-    def add_observer(self, observer: AbstractObserver) -> None:
+    def add_observer(self, observer: AbstractObserver, topics: Optional[Iterable[str]] = None) -> None:
         """
-        Регистрирует наблюдателя.
+        Регистрирует наблюдателя (повторный вызов заменяет его подписку).
         
         Args:
             observer: Объект, реализующий интерфейс AbstractObserver
+            topics: Типы событий ClientEvent (по умолчанию - observer.topics,
+                None - все уведомления)
+                
+        Raises:
+            ValueError: если передан неизвестный тип события
         """
-        if observer not in self._observers:
-            self._observers.append(observer)
+        if topics is None:
+            topics = getattr(observer, 'topics', None)
+        subscription: Optional[FrozenSet[str]] = None
+        if topics is not None:
+            subscription = frozenset(topics)
+            unknown = subscription - ClientEvent.TYPES
+            if unknown:
+                raise ValueError(f"Неизвестные типы событий: {', '.join(sorted(unknown))}")
+        
+        with self._registry_lock:
+            self._unsubscribe(observer)
+            self._subscriptions[observer] = subscription
+            for topic in subscription if subscription is not None else (None,):
+                self._by_topic.setdefault(topic, weakref.WeakKeyDictionary())[observer] = None
     
     def remove_observer(self, observer: AbstractObserver) -> None:
         """
-        Удаляет наблюдателя из списка.
+        Удаляет наблюдателя из реестра.
         
         Args:
             observer: Объект для удаления
         """
-        if observer in self._observers:
-            self._observers.remove(observer)
+        with self._registry_lock:
+            self._unsubscribe(observer)
+    
+    def _unsubscribe(self, observer: AbstractObserver) -> None:
+        """Удаляет наблюдателя из реестра (вызывается под _registry_lock)."""
+        subscription = self._subscriptions.pop(observer, None)
+        for topic in subscription if subscription is not None else (None,):
+            self._by_topic[topic].pop(observer, None)
+    
+    def set_dispatcher(self, dispatcher: Optional[Any]) -> None:
+        """
+        Включает асинхронную доставку уведомлений.
+        
+        Args:
+            dispatcher: ObserverDispatcher или None для синхронной доставки
+        """
+        self._dispatcher = dispatcher
     
     def notify(self, data: Any) -> None:
         """
-        Уведомляет всех наблюдателей об изменении состояния.
+        Уведомляет наблюдателей об изменении состояния.
         
         Args:
-            data: Данные для передачи наблюдателям
+            data: Данные для передачи наблюдателям (ClientEvent или любые
+                другие данные - их получают все наблюдатели)
         """
-        for observer in self._observers:
-            observer.update(data)
-
+        with self._registry_lock:
+            if isinstance(data, ClientEvent):
+                observers = list(self._by_topic[None])
+                observers.extend(self._by_topic.get(data.type, ()))
+            else:
+                observers = list(self._subscriptions)
+        
+        if self._dispatcher is None:
+            for observer in observers:
+                observer.update(data)
+            return
+        
+        deferred = []
+        for observer in observers:
+            if getattr(observer, 'asynchronous', True):
+                deferred.append(observer)
+            else:
+                observer.update(data)
+        self._dispatcher.submit(deferred, data)
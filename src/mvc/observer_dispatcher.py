@@ -0,0 +1,210 @@
+"""
+Асинхронная доставка уведомлений Subject наблюдателям.
+
+По умолчанию Subject.notify вызывает update каждого наблюдателя прямо
+в потоке запроса. ObserverDispatcher (подключается через
+Subject.set_dispatcher) только ставит уведомление в очередь; фоновый поток
+доставляет уведомления пачками, и медленный или падающий наблюдатель
+не задерживает запрос и не мешает остальным.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.core.metrics import Metrics
+
+
+# Наибольшее число уведомлений в очереди (при заполнении - обратное давление)
+DEFAULT_MAX_QUEUE = 1000
+
+# Наибольшее число уведомлений в одной пачке доставки
+DEFAULT_BATCH_SIZE = 100
+
+# Сколько ждать места в заполненной очереди, прежде чем отбросить уведомление (секунды)
+DEFAULT_BLOCK_TIMEOUT = 0.5
+
+# Признак остановки рабочего потока
+_STOP = object()
+
+
+class ObserverDispatcher:
+    """
+    Очередь уведомлений с доставкой в фоновом потоке.
+
+    Порядок уведомлений для каждого наблюдателя сохраняется. Если у
+    наблюдателя есть метод update_batch(items), пачка передается ему
+    одним вызовом, иначе update вызывается для каждого уведомления.
+    Исключение наблюдателя печатается и учитывается в метриках, остальные
+    наблюдатели пачки получают уведомления как обычно.
+
+    Обратное давление: если очередь заполнена, submit ждет до block_timeout
+    секунд, затем отбрасывает уведомление.
+
+    Метрики (если передан реестр Metrics):
+        observer_queue_depth: число уведомлений в очереди
+        observer_delivery_latency_seconds: задержка последней пачки (от submit до доставки)
+        observer_events_total / observer_events_dropped_total: доставлено / отброшено
+        observer_batches_total: число пачек
+        observer_errors_total: число исключений наблюдателей
+    """
+
+    def __init__(
+        self,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+        metrics: Optional[Metrics] = None
+    ) -> None:
+        """
+        Args:
+            max_queue: Наибольшее число уведомлений в очереди
+            batch_size: Наибольшее число уведомлений в пачке
+            block_timeout: Ожидание места в очереди (0 - отбрасывать сразу)
+            metrics: Реестр метрик
+
+        Raises:
+            ValueError: если max_queue или batch_size меньше 1
+        """
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue и batch_size должны быть >= 1")
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.metrics = metrics
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> 'ObserverDispatcher':
+        """
+        Запускает рабочий поток (повторный вызов ничего не делает).
+
+        Returns:
+            self для chain-вызовов
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='observer-dispatcher', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Доставляет оставшиеся уведомления и останавливает рабочий поток.
+
+        Args:
+            timeout: Наибольшее время ожидания (None - без ограничения)
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def submit(self, observers: Sequence[Any], data: Any) -> bool:
+        """
+        Ставит уведомление в очередь.
+
+        Args:
+            observers: Наблюдатели, которым нужно доставить уведомление
+            data: Данные уведомления
+
+        Returns:
+            True если уведомление принято, False если очередь заполнена
+        """
+        if not observers:
+            return True
+        self.start()
+        try:
+            item = (time.monotonic(), tuple(observers), data)
+            if self.block_timeout > 0:
+                self._queue.put(item, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            self._increment('observer_events_dropped_total')
+            print("Очередь уведомлений заполнена, уведомление отброшено")
+            return False
+        finally:
+            self._set_gauge('observer_queue_depth', self._queue.qsize())
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ждет, пока все принятые уведомления будут доставлены.
+
+        Args:
+            timeout: Наибольшее время ожидания (None - без ограничения)
+
+        Returns:
+            True если очередь опустела, False по истечении timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def get_queue_depth(self) -> int:
+        """Возвращает текущее число уведомлений в очереди."""
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        """Цикл рабочего потока: собирает пачку и доставляет ее."""
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in items)
+            batch = [item for item in items if item is not _STOP]
+            try:
+                if batch:
+                    self._deliver(batch)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _deliver(self, batch: List[Tuple[float, Tuple[Any, ...], Any]]) -> None:
+        """Доставляет пачку уведомлений с изоляцией ошибок по наблюдателям."""
+        # Группируем по наблюдателю, сохраняя порядок уведомлений
+        per_observer: Dict[int, Tuple[Any, List[Any]]] = {}
+        for _, observers, data in batch:
+            for observer in observers:
+                per_observer.setdefault(id(observer), (observer, []))[1].append(data)
+
+        for observer, items in per_observer.values():
+            try:
+                update_batch = getattr(observer, 'update_batch', None)
+                if update_batch is not None:
+                    update_batch(items)
+                else:
+                    for data in items:
+                        observer.update(data)
+            except Exception as e:
+                self._increment('observer_errors_total')
+                print(f"Ошибка наблюдателя {type(observer).__name__}: {e}")
+
+        self._increment('observer_events_total', len(batch))
+        self._increment('observer_batches_total')
+        self._set_gauge('observer_delivery_latency_seconds', time.monotonic() - batch[0][0])
+        self._set_gauge('observer_queue_depth', self._queue.qsize())
+
+    def _increment(self, name: str, value: float = 1.0) -> None:
+        """Увеличивает счетчик, если передан реестр метрик."""
+        if self.metrics is not None:
+            self.metrics.increment(name, value)
+
+    def _set_gauge(self, name: str, value: float) -> None:
+        """Устанавливает показатель, если передан реестр метрик."""
+        if self.metrics is not None:
+            self.metrics.set_gauge(name, value)
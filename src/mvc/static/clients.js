@@ -0,0 +1,39 @@
+// Живое обновление списка клиентов по событиям сервера (/events).
+// Измененные строки таблицы заменяются на месте, удаленные убираются.
+// Если появились новые клиенты или сервер просит перезагрузку,
+// показывается уведомление со ссылкой на обновление страницы.
+(function () {
+    var tbody = document.querySelector('tbody[data-live]');
+    if (!tbody || !window.EventSource) {
+        return;
+    }
+    var notice = document.getElementById('live-notice');
+    var source = new EventSource(tbody.getAttribute('data-live'));
+
+    function showNotice() {
+        if (notice) {
+            notice.hidden = false;
+        }
+    }
+
+    function findRow(id) {
+        return tbody.querySelector('tr[data-id="' + id + '"]');
+    }
+
+    source.addEventListener('clients', function (message) {
+        JSON.parse(message.data).events.forEach(function (event) {
+            var row = findRow(event.id);
+            if (event.type === 'delete') {
+                if (row) {
+                    row.remove();
+                }
+            } else if (row) {
+                row.outerHTML = event.html;
+            } else {
+                showNotice();
+            }
+        });
+    });
+
+    source.addEventListener('reload', showNotice);
+})();
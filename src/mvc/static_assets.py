@@ -0,0 +1,75 @@
+"""
+Статические файлы представления (таблица стилей и сценарий страницы).
+
+Каждый файл читается один раз при импорте и публикуется под именем
+с отпечатком содержимого (например, clients.3f2a9c1b7d4e.css). Изменение
+файла меняет URL, поэтому ответы можно кэшировать в браузерах и прокси
+без срока устаревания.
+"""
+
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional
+
+
+# Каталог со статическими файлами представления
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Префикс URL, по которому приложение отдает файлы с отпечатками
+ASSETS_URL_PREFIX = '/assets/'
+
+# Заголовок кэширования для файлов с отпечатком: год, без перепроверки
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class StaticAsset:
+    """
+    Статический файл с отпечатком содержимого в имени.
+
+    Attributes:
+        content: содержимое файла (bytes)
+        digest: отпечаток содержимого (первые 12 символов SHA-256)
+        filename: опубликованное имя файла с отпечатком
+        url: URL файла
+        mimetype: MIME-тип по расширению файла
+    """
+
+    def __init__(self, path: str, url_prefix: str = ASSETS_URL_PREFIX):
+        """
+        Читает файл и вычисляет его отпечаток.
+
+        Args:
+            path: путь к файлу
+            url_prefix: префикс URL для публикации
+        """
+        with open(path, 'rb') as file:
+            self.content: bytes = file.read()
+        self.digest = hashlib.sha256(self.content).hexdigest()[:12]
+        stem, suffix = os.path.splitext(os.path.basename(path))
+        self.filename = f"{stem}.{self.digest}{suffix}"
+        self.url = url_prefix + self.filename
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+# Таблица стилей всех страниц ClientView
+STYLESHEET = StaticAsset(os.path.join(STATIC_DIR, 'clients.css'))
+
+# Сценарий живого обновления главной страницы (события /events)
+SCRIPT = StaticAsset(os.path.join(STATIC_DIR, 'clients.js'))
+
+# Опубликованные файлы по имени с отпечатком
+ASSETS: Dict[str, StaticAsset] = {asset.filename: asset for asset in (STYLESHEET, SCRIPT)}
+
+
+def find_asset(filename: str) -> Optional[StaticAsset]:
+    """
+    Находит опубликованный файл по имени с отпечатком.
+
+    Args:
+        filename: имя файла из URL
+
+    Returns:
+        StaticAsset или None, если такого файла (или такой версии) нет
+    """
+    return ASSETS.get(filename)
@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class SegmentedLRUCache:
+    """
+    Кэш ограниченного размера с вытеснением по сегментированному LRU (SLRU).
+
+    Записи делятся на два сегмента:
+    - испытательный (probation): сюда попадает новая запись;
+    - защищенный (protected): сюда переводится запись при повторном обращении.
+
+    Вытесняется самая давно использованная запись испытательного сегмента,
+    поэтому однократные обращения (например, проход по всей коллекции)
+    вытесняют только такие же однократные записи и не трогают часто
+    используемые. При переполнении защищенного сегмента его самая давняя
+    запись возвращается в испытательный.
+
+    Статистика: hits - найдено в кэше, faults - пришлось загружать,
+    evictions - вытеснено записей.
+    """
+
+    def __init__(self, capacity: int, protected_fraction: float = 0.8):
+        """
+        Args:
+            capacity: наибольшее число записей в кэше
+            protected_fraction: доля емкости защищенного сегмента
+
+        Raises:
+            ValueError: если емкость меньше 1 или доля вне диапазона [0, 1)
+        """
+        if capacity < 1:
+            raise ValueError("Емкость кэша должна быть >= 1")
+        if not 0 <= protected_fraction < 1:
+            raise ValueError("Доля защищенного сегмента должна быть в диапазоне [0, 1)")
+        self.capacity = capacity
+        self.protected_capacity = int(capacity * protected_fraction)
+        self._probation: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._protected: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.faults = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._protected or key in self._probation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Возвращает значение и отмечает обращение (повторное - переводит в защищенный сегмент).
+
+        Args:
+            key: ключ записи
+
+        Returns:
+            Значение или None, если записи нет (считается как fault)
+        """
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            self.hits += 1
+            return self._protected[key]
+        if key in self._probation:
+            value = self._probation.pop(key)
+            self._promote(key, value)
+            self.hits += 1
+            return value
+        self.faults += 1
+        return None
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Возвращает значение, не меняя порядок вытеснения (для последовательных проходов).
+
+        Args:
+            key: ключ записи
+
+        Returns:
+            Значение или None, если записи нет (считается как fault)
+        """
+        value = self._protected.get(key)
+        if value is None:
+            value = self._probation.get(key)
+        if value is None:
+            self.faults += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Добавляет или обновляет запись.
+
+        Новая запись попадает в испытательный сегмент; у существующей
+        меняется только значение.
+
+        Args:
+            key: ключ записи
+            value: значение (не None)
+        """
+        if key in self._protected:
+            self._protected[key] = value
+            return
+        if key in self._probation:
+            self._probation[key] = value
+            return
+        self._probation[key] = value
+        self._evict()
+
+    def discard(self, key: Hashable) -> None:
+        """Удаляет запись, если она есть."""
+        self._protected.pop(key, None)
+        self._probation.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все записи (статистика сохраняется)."""
+        self._protected.clear()
+        self._probation.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику кэша.
+
+        Returns:
+            Словарь resident, protected, capacity, hits, faults, evictions
+        """
+        return {
+            'resident': len(self),
+            'protected': len(self._protected),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'faults': self.faults,
+            'evictions': self.evictions,
+        }
+
+    def _promote(self, key: Hashable, value: Any) -> None:
+        """Переводит запись в защищенный сегмент, возвращая его излишек в испытательный."""
+        if not self.protected_capacity:
+            self._probation[key] = value
+            return
+        self._protected[key] = value
+        while len(self._protected) > self.protected_capacity:
+            demoted_key, demoted_value = self._protected.popitem(last=False)
+            self._probation[demoted_key] = demoted_value
+        self._evict()
+
+    def _evict(self) -> None:
+        """Вытесняет записи, пока размер кэша больше емкости."""
+        while len(self) > self.capacity:
+            if self._probation:
+                self._probation.popitem(last=False)
+            else:
+                self._protected.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,379 @@
+from bisect import bisect_left, insort
+from itertools import chain
+from math import inf
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.client import Client
+
+
+class HashIndex:
+    """
+    Хэш-индекс по полю объекта Client.
+
+    Отвечает на запросы равенства (field == value) за O(1) без просмотра
+    всей коллекции. Хранит для каждого значения словарь id -> Client.
+    """
+
+    def __init__(self, field_name: str):
+        """
+        Создает пустой хэш-индекс.
+
+        Args:
+            field_name: имя индексируемого поля (например, 'city')
+        """
+        self.field_name = field_name
+        self._buckets: Dict[Any, Dict[int, Client]] = {}
+
+    def add(self, client: Client) -> None:
+        """Добавляет клиента в индекс."""
+        value = getattr(client, self.field_name)
+        self._buckets.setdefault(value, {})[client.id] = client
+
+    def remove(self, client: Client) -> None:
+        """Удаляет клиента из индекса (если он там есть)."""
+        value = getattr(client, self.field_name)
+        bucket = self._buckets.get(value)
+        if bucket is not None:
+            bucket.pop(client.id, None)
+            if not bucket:
+                del self._buckets[value]
+
+    def lookup(self, value: Any) -> List[Client]:
+        """
+        Возвращает клиентов, у которых поле равно value.
+
+        Args:
+            value: искомое значение
+
+        Returns:
+            Список объектов Client (в порядке добавления в индекс)
+        """
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            # Нехэшируемое значение не может совпасть ни с одним полем Client
+            return []
+        return list(bucket.values()) if bucket else []
+
+    def distinct_count(self) -> int:
+        """Возвращает количество различных значений поля."""
+        return len(self._buckets)
+
+
+class SortedIndex:
+    """
+    Упорядоченный индекс по полю объекта Client.
+
+    Хранит отсортированный список пар (значение, id). Позволяет отвечать
+    на диапазонные запросы (low <= field <= high) за O(log n + m) и обходить
+    коллекцию в порядке поля без сортировки. Клиенты с равными значениями
+    поля упорядочены по возрастанию id в обоих направлениях обхода.
+    """
+
+    def __init__(self, field_name: str, clients_by_id: Dict[int, Client]):
+        """
+        Создает пустой упорядоченный индекс.
+
+        Args:
+            field_name: имя индексируемого поля (например, 'last_name')
+            clients_by_id: общий словарь id -> Client для разыменования записей
+        """
+        self.field_name = field_name
+        self._entries: List[Tuple[Any, int]] = []
+        self._clients_by_id = clients_by_id
+
+    def build(self, clients: Iterable[Client]) -> None:
+        """Строит индекс заново по коллекции клиентов."""
+        self._entries = sorted((getattr(client, self.field_name), client.id) for client in clients)
+
+    def add(self, client: Client) -> None:
+        """Добавляет клиента в индекс."""
+        insort(self._entries, (getattr(client, self.field_name), client.id))
+
+    def remove(self, client: Client) -> None:
+        """Удаляет клиента из индекса (если он там есть)."""
+        entry = (getattr(client, self.field_name), client.id)
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def iter_range(
+        self,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+        reverse: bool = False
+    ) -> Iterator[Client]:
+        """
+        Обходит клиентов, у которых значение поля попадает в диапазон.
+
+        Args:
+            low: нижняя граница (None - без ограничения)
+            high: верхняя граница (None - без ограничения)
+            include_low: включать ли нижнюю границу
+            include_high: включать ли верхнюю границу
+            reverse: обходить ли диапазон по убыванию значения
+
+        Returns:
+            Итератор объектов Client в порядке поля. Если границы
+            несравнимы с типом поля, итератор пуст.
+        """
+        entries = self._entries
+        try:
+            # (value,) меньше любой пары (value, id), а (value, inf) - больше
+            if low is None:
+                start = 0
+            else:
+                start = bisect_left(entries, (low,) if include_low else (low, inf))
+            if high is None:
+                stop = len(entries)
+            else:
+                stop = bisect_left(entries, (high, inf) if include_high else (high,))
+        except TypeError:
+            return iter(())
+
+        return self._iter_entries(start, stop, reverse)
+
+    def _iter_entries(self, start: int, stop: int, reverse: bool) -> Iterator[Client]:
+        """Разыменовывает записи индекса в диапазоне [start, stop)."""
+        entries = self._entries
+        by_id = self._clients_by_id
+        if not reverse:
+            for i in range(start, stop):
+                yield by_id[entries[i][1]]
+            return
+
+        # По убыванию обходим группы равных значений, но внутри группы
+        # сохраняем возрастание id - как у стабильной сортировки с reverse=True
+        i = stop
+        while i > start:
+            group_start = max(bisect_left(entries, (entries[i - 1][0],), start, i), start)
+            for j in range(group_start, i):
+                yield by_id[entries[j][1]]
+            i = group_start
+
+    def values(self) -> Iterator[Any]:
+        """Обходит значения поля в порядке возрастания (с повторами)."""
+        return (entry[0] for entry in self._entries)
+
+    def value_at(self, position: int) -> Any:
+        """Возвращает значение поля в позиции position упорядоченного индекса."""
+        return self._entries[position][0]
+
+    def distinct_count(self) -> int:
+        """Возвращает количество различных значений поля (один проход по индексу)."""
+        count = 0
+        previous = object()
+        for value in self.values():
+            if value != previous:
+                count += 1
+                previous = value
+        return count
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ClientIndexes:
+    """
+    Набор вторичных индексов над коллекцией клиентов репозитория.
+
+    Объединяет хэш-индексы (равенство) и упорядоченные индексы (диапазоны,
+    упорядоченный обход), а также карту позиций клиентов в списке репозитория,
+    чтобы результаты поиска по равенству шли в порядке хранения.
+    """
+
+    def __init__(self, hash_fields: Iterable[str], sorted_fields: Iterable[str]):
+        """
+        Создает пустой набор индексов.
+
+        Args:
+            hash_fields: поля для хэш-индексов
+            sorted_fields: поля для упорядоченных индексов
+        """
+        self._clients_by_id: Dict[int, Client] = {}
+        self.hash_indexes: Dict[str, HashIndex] = {name: HashIndex(name) for name in hash_fields}
+        self.sorted_indexes: Dict[str, SortedIndex] = {
+            name: SortedIndex(name, self._clients_by_id) for name in sorted_fields
+        }
+        self._positions: Optional[Dict[int, int]] = None
+
+    def build(self, clients: List[Client]) -> None:
+        """
+        Строит все индексы по списку клиентов.
+
+        Args:
+            clients: список клиентов репозитория (в порядке хранения)
+        """
+        self._clients_by_id.clear()
+        for client in clients:
+            self._clients_by_id[client.id] = client
+        for index in self.hash_indexes.values():
+            for client in clients:
+                index.add(client)
+        for index in self.sorted_indexes.values():
+            index.build(clients)
+        self._positions = {client.id: i for i, client in enumerate(clients)}
+
+    def add(self, client: Client, position: int) -> None:
+        """
+        Добавляет клиента во все индексы.
+
+        Args:
+            client: добавленный клиент
+            position: его индекс в списке репозитория
+        """
+        self._clients_by_id[client.id] = client
+        for index in self.hash_indexes.values():
+            index.add(client)
+        for index in self.sorted_indexes.values():
+            index.add(client)
+        if self._positions is not None:
+            self._positions[client.id] = position
+
+    def remove(self, client: Client) -> None:
+        """
+        Удаляет клиента из всех индексов.
+
+        Удаление сдвигает позиции последующих клиентов, поэтому карта
+        позиций будет перестроена при следующем поиске.
+        """
+        self._remove_from_indexes(client)
+        self._clients_by_id.pop(client.id, None)
+        self._positions = None
+
+    def replace(self, old_client: Client, new_client: Client) -> None:
+        """
+        Заменяет клиента в индексах, сохраняя его позицию в списке.
+
+        Args:
+            old_client: прежний объект (с тем же id)
+            new_client: новый объект
+        """
+        self._remove_from_indexes(old_client)
+        self._clients_by_id[new_client.id] = new_client
+        for index in self.hash_indexes.values():
+            index.add(new_client)
+        for index in self.sorted_indexes.values():
+            index.add(new_client)
+
+    @classmethod
+    def merge(
+        cls,
+        hash_fields: Iterable[str],
+        sorted_fields: Iterable[str],
+        parts: List['ClientIndexes']
+    ) -> 'ClientIndexes':
+        """
+        Собирает индексы всей коллекции из индексов ее непересекающихся частей.
+
+        Записи упорядоченных индексов частей не копируются, а их слияние
+        стоит O(n log k): сортировка timsort находит в сцепленном списке
+        уже упорядоченные участки частей. Карта позиций строится при первом
+        обращении.
+
+        Args:
+            hash_fields: поля для хэш-индексов (есть в каждой части)
+            sorted_fields: поля для упорядоченных индексов (есть в каждой части)
+            parts: индексы частей коллекции (например, шардов)
+
+        Returns:
+            Новый объект ClientIndexes
+        """
+        merged = cls(hash_fields, sorted_fields)
+        for part in parts:
+            merged._clients_by_id.update(part._clients_by_id)
+            for name, index in merged.hash_indexes.items():
+                buckets = index._buckets
+                for value, bucket in part.hash_indexes[name]._buckets.items():
+                    existing = buckets.get(value)
+                    if existing is None:
+                        buckets[value] = bucket.copy()
+                    else:
+                        existing.update(bucket)
+        for name, index in merged.sorted_indexes.items():
+            index._entries = sorted(chain.from_iterable(part.sorted_indexes[name]._entries for part in parts))
+        return merged
+
+    def invalidate_positions(self) -> None:
+        """Сбрасывает карту позиций (после переупорядочивания списка)."""
+        self._positions = None
+
+    def has_hash_index(self, field_name: str) -> bool:
+        """Проверяет, есть ли хэш-индекс по полю."""
+        return field_name in self.hash_indexes
+
+    def has_sorted_index(self, field_name: str) -> bool:
+        """Проверяет, есть ли упорядоченный индекс по полю."""
+        return field_name in self.sorted_indexes
+
+    def find_equal(
+        self,
+        field_name: str,
+        value: Any,
+        clients: Optional[List[Client]] = None
+    ) -> Optional[List[Client]]:
+        """
+        Находит клиентов с field == value по хэш- или упорядоченному индексу.
+
+        Args:
+            field_name: имя поля
+            value: искомое значение
+            clients: список клиентов репозитория для восстановления позиций
+                (None - порядок восстанавливает вызывающий)
+
+        Returns:
+            Список Client в порядке хранения (или в порядке индекса, если
+            clients не передан) или None, если по полю нет индекса
+        """
+        if field_name in self.hash_indexes:
+            found = self.hash_indexes[field_name].lookup(value)
+        elif field_name in self.sorted_indexes:
+            found = list(self.sorted_indexes[field_name].iter_range(value, value))
+        else:
+            return None
+
+        if clients is None:
+            return found
+        return self.sort_by_position(found, clients)
+
+    def sort_by_position(self, found: List[Client], clients: List[Client]) -> List[Client]:
+        """
+        Упорядочивает найденных клиентов в порядке хранения (на месте).
+
+        Args:
+            found: клиенты репозитория, найденные по индексам
+            clients: список клиентов репозитория
+
+        Returns:
+            Тот же список found, отсортированный по позиции в clients
+        """
+        if len(found) > 1:
+            positions = self._get_positions(clients)
+            found.sort(key=lambda client: positions[client.id])
+        return found
+
+    def iter_range(self, field_name: str, *args: Any, **kwargs: Any) -> Optional[Iterator[Client]]:
+        """
+        Обходит диапазон по упорядоченному индексу (см. SortedIndex.iter_range).
+
+        Returns:
+            Итератор Client или None, если по полю нет упорядоченного индекса
+        """
+        index = self.sorted_indexes.get(field_name)
+        if index is None:
+            return None
+        return index.iter_range(*args, **kwargs)
+
+    def _get_positions(self, clients: List[Client]) -> Dict[int, int]:
+        """Возвращает карту id -> позиция, перестраивая ее при необходимости."""
+        if self._positions is None:
+            self._positions = {client.id: i for i, client in enumerate(clients)}
+        return self._positions
+
+    def _remove_from_indexes(self, client: Client) -> None:
+        """Удаляет клиента из хэш- и упорядоченных индексов."""
+        for index in self.hash_indexes.values():
+            index.remove(client)
+        for index in self.sorted_indexes.values():
+            index.remove(client)
@@ -0,0 +1,158 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from src.models.client import Client
+
+
+# Меньше этого числа записей процессы не запускаются (запуск и передача дороже проверки)
+PARALLEL_MIN_RECORDS = 50_000
+
+# Записей в одной порции, отправляемой рабочему процессу
+DEFAULT_CHUNK_SIZE = 10_000
+
+_client_values = attrgetter(*Client._RESTORE_ATTRIBUTES)
+
+
+def validate_records(
+    records: Iterable[Tuple[Any, Any]],
+    workers: Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    min_parallel: Optional[int] = None
+) -> Tuple[List[Client], List[Tuple[Any, str]]]:
+    """
+    Создает объекты Client из разобранных записей, при необходимости в нескольких процессах.
+
+    Записи делятся на порции по chunk_size; рабочий процесс проверяет каждую
+    запись конструктором Client и возвращает только кортежи проверенных
+    и нормализованных значений, из которых родитель собирает клиентов
+    без повторной валидации (Client._restore). Порядок записей сохраняется,
+    в обработке одновременно не больше двух порций на процесс.
+
+    Если записей меньше min_parallel, workers == 1 или процессы запустить
+    не удалось, записи проверяются в текущем процессе.
+
+    Args:
+        records: пары (ключ записи, словарь полей); ключ - например,
+            позиция в файле - попадает в сообщения об ошибках
+        workers: число рабочих процессов (None - по числу ядер)
+        chunk_size: записей в порции
+        min_parallel: наименьшее число записей для параллельной проверки
+            (None - PARALLEL_MIN_RECORDS)
+
+    Returns:
+        Кортеж (клиенты в порядке записей, ошибки [(ключ, сообщение)])
+
+    Raises:
+        ValueError: если workers или chunk_size меньше 1
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Число процессов должно быть >= 1")
+    if chunk_size < 1:
+        raise ValueError("Размер порции должен быть >= 1")
+
+    if min_parallel is None:
+        min_parallel = PARALLEL_MIN_RECORDS
+
+    records = iter(records)
+    if workers == 1:
+        return _validate_serial(records)
+
+    head = list(islice(records, min_parallel))
+    if len(head) < min_parallel:
+        return _validate_serial(iter(head))
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError) as e:
+        print(f"Параллельная проверка недоступна, записи проверяются в одном процессе: {e}")
+        return _validate_serial(chain(head, records))
+
+    with executor:
+        return _validate_parallel(executor, _iter_chunks(chain(head, records), chunk_size), workers * 2)
+
+
+def _validate_serial(records: Iterator[Tuple[Any, Any]]) -> Tuple[List[Client], List[Tuple[Any, str]]]:
+    """Проверяет записи в текущем процессе."""
+    clients = []
+    errors = []
+    for key, record in records:
+        try:
+            clients.append(Client(**record))
+        except (ValueError, TypeError) as e:
+            errors.append((key, str(e)))
+    return clients, errors
+
+
+def _validate_chunk(chunk: List[Tuple[Any, Any]]) -> Tuple[List[tuple], List[Tuple[Any, str]]]:
+    """
+    Проверяет порцию записей (выполняется в рабочем процессе).
+
+    Returns:
+        Кортеж (значения полей проверенных клиентов для Client._restore, ошибки)
+    """
+    clients, errors = _validate_serial(iter(chunk))
+    return [_client_values(client) for client in clients], errors
+
+
+def _validate_parallel(
+    executor: ProcessPoolExecutor,
+    chunks: Iterator[List[Tuple[Any, Any]]],
+    max_pending: int
+) -> Tuple[List[Client], List[Tuple[Any, str]]]:
+    """
+    Раздает порции процессам и собирает результаты по порядку.
+
+    Если пул процессов перестал работать, оставшиеся порции проверяются
+    в текущем процессе.
+    """
+    clients: List[Client] = []
+    errors: List[Tuple[Any, str]] = []
+    pending = deque()
+    broken = False
+    restore = Client._restore
+
+    def collect() -> None:
+        nonlocal broken
+        chunk, future = pending.popleft()
+        values = None
+        if future is not None:
+            try:
+                values, chunk_errors = future.result()
+            except BrokenProcessPool:
+                broken = True
+        if values is None:
+            values, chunk_errors = _validate_chunk(chunk)
+        clients.extend(restore(client_values) for client_values in values)
+        errors.extend(chunk_errors)
+
+    for chunk in chunks:
+        future = None
+        if not broken:
+            try:
+                future = executor.submit(_validate_chunk, chunk)
+            except BrokenProcessPool:
+                broken = True
+        pending.append((chunk, future))
+        if len(pending) >= max_pending:
+            collect()
+    while pending:
+        collect()
+
+    if broken:
+        print("Пул процессов остановился, часть записей проверена в одном процессе")
+    return clients, errors
+
+
+def _iter_chunks(records: Iterator[Tuple[Any, Any]], chunk_size: int) -> Iterator[List[Tuple[Any, Any]]]:
+    """Делит записи на списки по chunk_size."""
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
 import os
-from typing import Optional, List
+import time
+import uuid
+from typing import Optional, List, Any, Iterator, Tuple
 from src.models.client import Client, ClientShort
 from src.mvc.observer import Subject
+from src.repositories.client_indexes import ClientIndexes
+from src.repositories.client_snapshot import (
+    SNAPSHOT_SUFFIX, read_snapshot, read_snapshot_source, source_signature, write_snapshot
+)
+
+
+# Через сколько изменений снимок записывается заново (иначе - в close())
+DEFAULT_SNAPSHOT_INTERVAL = 1000
 
 
 class Client_rep_base(Subject, ABC):
@@ -12,20 +22,70 @@ class Client_rep_base(Subject, ABC):
     Содержит общую логику CRUD операций, сортировки и постраничной выдачи.
     Подклассы должны реализовать методы _load_from_file и _save_to_file
     для работы с конкретными форматами (JSON, YAML и т.д.).
+
+    Поддерживает вторичные индексы: хэш-индексы по полям HASH_INDEX_FIELDS
+    (поиск по равенству) и упорядоченные индексы по полям SORTED_INDEX_FIELDS
+    (диапазоны и обход в порядке поля). Индексы строятся при первом обращении
+    и поддерживаются инкрементально в add/replace_by_id/delete_by_id.
+
+    С параметром snapshot=True рядом с основным файлом поддерживается
+    двоичный снимок (файл с расширением SNAPSHOT_SUFFIX): при запуске данные
+    читаются из него, если размер и время изменения основного файла совпадают
+    с записанными в снимке. Снимок записывается не при каждом изменении,
+    а раз в snapshot_interval изменений и в close(); пока он не записан,
+    основной файл отличается от запомненного и снимок при запуске не читается.
+
+    Параметр load_workers задает число процессов для проверки записей при
+    загрузке основного файла (validate_records); небольшие файлы всегда
+    проверяются в одном процессе.
     """
 
-    def __init__(self, file_path: Optional[str] = None):
+    # Поля с хэш-индексами (переопределяются в подклассах при необходимости)
+    HASH_INDEX_FIELDS: Tuple[str, ...] = ('city', 'email', 'phone')
+
+    # Поля с упорядоченными индексами
+    SORTED_INDEX_FIELDS: Tuple[str, ...] = ('last_name', 'total_spending', 'zip_code')
+
+    # Держит ли репозиторий всех клиентов в памяти. Если нет, декораторы
+    # кэшируют выборки как списки ID, а клиентов запрашивают по get_by_id
+    RESIDENT_CLIENTS: bool = True
+
+    def __init__(
+        self,
+        file_path: Optional[str] = None,
+        snapshot: bool = False,
+        load_workers: Optional[int] = 1,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL
+    ):
         """
         Инициализирует репозиторий с путем к файлу.
 
         Args:
             file_path: путь к файлу для хранения данных (опционально, для адаптеров БД)
+            snapshot: поддерживать двоичный снимок для быстрого запуска
+            load_workers: число процессов для проверки записей при загрузке
+                (1 - в текущем процессе, None - по числу ядер)
+            snapshot_interval: через сколько изменений записывать снимок заново
         """
         super().__init__()
         self.file_path = file_path
+        self.snapshot = snapshot and file_path is not None
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_changes = 0
+        self.load_workers = load_workers
         self._clients: List[Client] = []
+        # Поколение изменений: увеличивается при каждой модификации коллекции,
+        # позволяет декораторам и кэшам понять, что данные устарели
+        self._generation: int = 0
+        # Метка экземпляра (поколения разных запусков не совпадут)
+        # и время последнего изменения - для ETag/Last-Modified
+        self._instance_token: str = uuid.uuid4().hex[:8]
+        self._last_modified: float = time.time()
+        self._indexes: Optional[ClientIndexes] = None
+        self._indexed_list: Optional[List[Client]] = None
         if file_path is not None:
-            self._load_from_file()
+            self._load()
+            self._touch()
 
     @abstractmethod
     def _load_from_file(self) -> None:
@@ -45,6 +105,254 @@ class Client_rep_base(Subject, ABC):
         """
         pass
 
+    def _append_to_file(self, client: Client) -> None:
+        """
+        Сохраняет в файл только что добавленного клиента.
+
+        По умолчанию файл перезаписывается целиком; форматы, в которые можно
+        дописывать записи (например, многодокументный YAML), переопределяют метод.
+
+        Args:
+            client: добавленный клиент (последний в _clients)
+        """
+        self._save_to_file()
+
+    def _load(self) -> None:
+        """
+        Загружает коллекцию: из снимка, если он актуален, иначе из основного файла.
+
+        После загрузки из основного файла снимок записывается заново,
+        чтобы следующий запуск был быстрым.
+        """
+        if self.snapshot and self._load_from_snapshot():
+            return
+        self._load_from_file()
+        if self.snapshot:
+            self._save_snapshot()
+
+    def _save(self, appended: Optional[Client] = None) -> None:
+        """
+        Сохраняет коллекцию в основной файл.
+
+        Снимок (если включен) записывается заново только раз в
+        snapshot_interval изменений: запись снимка - O(n), и при каждом
+        изменении она отменила бы выигрыш от дописывания в файл.
+
+        Args:
+            appended: клиент, добавленный в конец _clients (файл можно дописать)
+        """
+        if appended is not None:
+            self._append_to_file(appended)
+        else:
+            self._save_to_file()
+        if self.snapshot:
+            self._snapshot_changes += 1
+            if self._snapshot_changes >= self.snapshot_interval:
+                self._save_snapshot()
+
+    def close(self) -> None:
+        """
+        Записывает снимок, если после последней записи были изменения.
+
+        Без вызова close данные не теряются: устаревший снимок при следующем
+        запуске не читается, а переписывается по основному файлу.
+        """
+        if self.snapshot and self._snapshot_changes:
+            self._save_snapshot()
+
+    def _get_snapshot_path(self) -> str:
+        """Возвращает путь к файлу снимка рядом с основным файлом."""
+        return self.file_path + SNAPSHOT_SUFFIX
+
+    def _load_from_snapshot(self) -> bool:
+        """
+        Загружает _clients из снимка, если он записан по текущему основному файлу.
+
+        Размер и st_mtime_ns основного файла сравниваются на точное совпадение
+        с заголовком снимка: сравнение "снимок не старше файла" пропускает
+        изменения на файловых системах с грубыми метками времени.
+
+        Returns:
+            True если данные загружены из снимка
+        """
+        snapshot_path = self._get_snapshot_path()
+        if not os.path.exists(snapshot_path) or not os.path.exists(self.file_path):
+            return False
+
+        try:
+            if read_snapshot_source(snapshot_path) != source_signature(self.file_path):
+                return False
+            self._clients = read_snapshot(snapshot_path)
+            return True
+        except (ValueError, OSError) as e:
+            print(f"Ошибка при чтении снимка {snapshot_path}: {e}")
+            return False
+
+    def _save_snapshot(self) -> None:
+        """Записывает снимок текущей коллекции (ошибки печатаются, основной файл не затрагивается)."""
+        self._snapshot_changes = 0
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            write_snapshot(self._get_snapshot_path(), self._clients, source_signature(self.file_path))
+        except (ValueError, OSError) as e:
+            print(f"Ошибка при сохранении снимка {self._get_snapshot_path()}: {e}")
+
+    def _touch(self) -> None:
+        """
+        Отмечает, что коллекция клиентов изменилась.
+
+        Вызывается после каждой операции, меняющей состав или порядок _clients.
+        """
+        self._generation += 1
+        self._last_modified = time.time()
+
+    def get_generation(self) -> int:
+        """
+        Возвращает текущее поколение изменений репозитория.
+
+        Значение растет при каждом add/replace_by_id/delete_by_id/sort_by_field,
+        поэтому по нему можно инвалидировать закэшированные выборки.
+
+        Returns:
+            int: номер поколения
+        """
+        return self._generation
+
+    def get_version(self) -> str:
+        """
+        Возвращает строку версии данных для валидаторов кэша (ETag).
+
+        Состоит из метки экземпляра репозитория и поколения изменений,
+        поэтому меняется при каждом изменении и при перезапуске приложения.
+
+        Returns:
+            str: версия вида '<метка>-<поколение>'
+        """
+        return f"{self._instance_token}-{self._generation}"
+
+    def get_last_modified(self) -> float:
+        """
+        Возвращает время последнего изменения коллекции (для Last-Modified).
+
+        Returns:
+            float: время в секундах от начала эпохи (time.time())
+        """
+        return self._last_modified
+
+    def get_validators(self) -> Tuple[str, float]:
+        """
+        Возвращает валидаторы кэша одним вызовом: версию (ETag) и время изменения (Last-Modified).
+
+        Репозитории, которые читают версию из хранилища, переопределяют метод,
+        чтобы получать оба значения одним чтением.
+
+        Returns:
+            (get_version(), get_last_modified())
+        """
+        return self.get_version(), self.get_last_modified()
+
+    def _get_indexes(self) -> ClientIndexes:
+        """
+        Возвращает индексы, при необходимости строя их по текущему списку.
+
+        Индексы перестраиваются, если список _clients был подменен целиком
+        (например, при загрузке из файла).
+
+        Returns:
+            Объект ClientIndexes, согласованный с _clients
+        """
+        if self._indexes is None or self._indexed_list is not self._clients:
+            indexes = ClientIndexes(self.HASH_INDEX_FIELDS, self.SORTED_INDEX_FIELDS)
+            indexes.build(self._clients)
+            self._indexes = indexes
+            self._indexed_list = self._clients
+        return self._indexes
+
+    def _get_built_indexes(self) -> Optional[ClientIndexes]:
+        """
+        Возвращает индексы, только если они уже построены и актуальны.
+
+        Используется при модификациях: непостроенные индексы обновлять не нужно,
+        они будут построены при первом поиске.
+        """
+        if self._indexes is not None and self._indexed_list is self._clients:
+            return self._indexes
+        return None
+
+    def has_hash_index(self, field_name: str) -> bool:
+        """
+        Проверяет, есть ли хэш-индекс по полю.
+
+        Args:
+            field_name: имя поля Client
+        """
+        return field_name in self.HASH_INDEX_FIELDS
+
+    def has_sorted_index(self, field_name: str) -> bool:
+        """
+        Проверяет, есть ли упорядоченный индекс по полю.
+
+        Args:
+            field_name: имя поля Client
+        """
+        return field_name in self.SORTED_INDEX_FIELDS
+
+    def find_equal(self, field_name: str, value: Any) -> Optional[List[Client]]:
+        """
+        Находит клиентов с заданным значением поля по индексу.
+
+        Args:
+            field_name: имя поля Client
+            value: искомое значение
+
+        Returns:
+            Список Client в порядке хранения или None, если поле не индексировано
+        """
+        return self._get_indexes().find_equal(field_name, value, self._clients)
+
+    def _sort_by_storage_order(self, clients: List[Client]) -> List[Client]:
+        """
+        Упорядочивает клиентов репозитория в порядке хранения (на месте).
+
+        Args:
+            clients: клиенты из этого репозитория (например, найденные по индексам)
+
+        Returns:
+            Тот же список, отсортированный по позиции в _clients
+        """
+        return self._get_indexes().sort_by_position(clients, self._clients)
+
+    def iter_range(
+        self,
+        field_name: str,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+        reverse: bool = False
+    ) -> Optional[Iterator[Client]]:
+        """
+        Обходит клиентов в порядке поля в диапазоне значений по индексу.
+
+        Без границ возвращает всю коллекцию в порядке поля (без сортировки).
+        Клиенты с равными значениями поля идут по возрастанию id.
+
+        Args:
+            field_name: имя поля Client
+            low: нижняя граница (None - без ограничения)
+            high: верхняя граница (None - без ограничения)
+            include_low: включать ли нижнюю границу
+            include_high: включать ли верхнюю границу
+            reverse: обходить ли по убыванию
+
+        Returns:
+            Итератор Client или None, если по полю нет упорядоченного индекса
+        """
+        return self._get_indexes().iter_range(
+            field_name, low, high, include_low=include_low, include_high=include_high, reverse=reverse
+        )
+
     def get_by_id(self, client_id: int) -> Optional[Client]:
         """
         Возвращает объект Client по ID или None, если не найден.
@@ -80,8 +388,35 @@ class Client_rep_base(Subject, ABC):
             # Если список пуст, начиная с ID = 1
             client.id = 1
 
-        self._clients.append(client)
-        self._save_to_file()
+        self._insert_client(client)
+
+    def _insert_client(self, client: Client, position: Optional[int] = None) -> None:
+        """
+        Вставляет клиента с уже назначенным ID в список и сохраняет файл.
+
+        Вставка в конец дописывает файл (_append_to_file), в середину -
+        перезаписывает его.
+
+        Args:
+            client: клиент с уникальным id
+            position: позиция в _clients (None - в конец)
+        """
+        if position is None or position >= len(self._clients):
+            self._clients.append(client)
+            position = len(self._clients) - 1
+            appended = client
+        else:
+            self._clients.insert(position, client)
+            appended = None
+
+        indexes = self._get_built_indexes()
+        if indexes is not None:
+            indexes.add(client, position)
+            if appended is None:
+                # Вставка сдвинула позиции последующих клиентов
+                indexes.invalidate_positions()
+        self._touch()
+        self._save(appended=appended)
 
     def replace_by_id(self, client_id: int, new_client: Client) -> None:
         """
@@ -101,7 +436,11 @@ class Client_rep_base(Subject, ABC):
             if client.id == client_id:
                 new_client.id = client_id
                 self._clients[i] = new_client
-                self._save_to_file()
+                indexes = self._get_built_indexes()
+                if indexes is not None:
+                    indexes.replace(client, new_client)
+                self._touch()
+                self._save()
                 return
 
         raise ValueError(f"Клиент с ID {client_id} не найден")
@@ -119,11 +458,28 @@ class Client_rep_base(Subject, ABC):
         for i, client in enumerate(self._clients):
             if client.id == client_id:
                 self._clients.pop(i)
-                self._save_to_file()
+                indexes = self._get_built_indexes()
+                if indexes is not None:
+                    indexes.remove(client)
+                self._touch()
+                self._save()
                 return
 
         raise ValueError(f"Клиент с ID {client_id} не найден")
 
+    def iter_clients(self) -> Iterator[Client]:
+        """
+        Обходит всех клиентов в порядке хранения.
+
+        Используется для потоковой выдачи больших списков: клиенты
+        отдаются по одному, без построения промежуточных списков.
+
+        Returns:
+            Итератор объектов Client
+        """
+        for client in self._clients:
+            yield client
+
     def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
         """
         Возвращает список из n объектов класса ClientShort для k-й страницы.
@@ -170,7 +526,11 @@ class Client_rep_base(Subject, ABC):
             )
 
         self._clients.sort(key=lambda client: getattr(client, field_name))
-        self._save_to_file()
+        indexes = self._get_built_indexes()
+        if indexes is not None:
+            indexes.invalidate_positions()
+        self._touch()
+        self._save()
 
     def get_count(self) -> int:
         """
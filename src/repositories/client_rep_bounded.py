@@ -0,0 +1,167 @@
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+from src.repositories.client_cache import SegmentedLRUCache
+from src.repositories.client_indexes import ClientIndexes
+from src.repositories.client_rep_jsonl import Client_rep_jsonl
+from src.models.client import Client, ClientShort
+
+
+# Сколько декодированных клиентов держать в памяти по умолчанию
+DEFAULT_MAX_RESIDENT = 10000
+
+
+class Client_rep_bounded(Client_rep_jsonl):
+    """
+    Репозиторий JSON Lines с ограниченным числом клиентов в памяти.
+
+    Декодированные объекты Client хранятся в кэше SegmentedLRUCache
+    емкостью max_resident; остальные читаются из файла по требованию
+    (fault) и вытесняются, когда кэш заполнен. Политика устойчива
+    к последовательным проходам: iter_clients берет клиентов из кэша,
+    если они там есть, но не добавляет новых, а однократно прочитанные
+    страницы не вытесняют клиентов, к которым обращались повторно.
+
+    Вторичных индексов нет (они держали бы в памяти всю коллекцию), поэтому
+    планировщик декоратора не собирает статистику, а фильтры и сортировки
+    выполняются полным просмотром через iter_clients. Декоратор хранит
+    выборки как списки ID (RESIDENT_CLIENTS = False) и читает клиентов
+    страницы через get_by_id, поэтому в памяти не больше max_resident клиентов.
+
+    Статистика кэша - get_cache_stats().
+    """
+
+    HASH_INDEX_FIELDS = ()
+    SORTED_INDEX_FIELDS = ()
+    RESIDENT_CLIENTS = False
+
+    def __init__(self, file_path: str, max_resident: int = DEFAULT_MAX_RESIDENT):
+        """
+        Открывает репозиторий.
+
+        Args:
+            file_path: путь к файлу данных JSON Lines
+            max_resident: наибольшее число декодированных клиентов в памяти
+
+        Raises:
+            ValueError: если max_resident меньше 1
+        """
+        self._cache = SegmentedLRUCache(max_resident)
+        super().__init__(file_path)
+
+    @Client_rep_jsonl._clients.setter
+    def _clients(self, clients: List[Client]) -> None:
+        """Заменяет всю коллекцию и очищает кэш."""
+        Client_rep_jsonl._clients.fset(self, clients)
+        with self._lock:
+            self._cache.clear()
+
+    def get_by_id(self, client_id: int) -> Optional[Client]:
+        """
+        Возвращает объект Client по ID или None, если не найден.
+
+        Клиент берется из кэша или читается из файла и помещается в кэш.
+
+        Args:
+            client_id: уникальный идентификатор клиента
+
+        Returns:
+            Client объект или None
+        """
+        with self._lock:
+            return self._lookup(client_id)
+
+    def replace_by_id(self, client_id: int, new_client: Client) -> None:
+        """
+        Заменяет объект Client по ID на новый объект (и в кэше).
+
+        Args:
+            client_id: ID клиента для замены
+            new_client: новый объект Client с новыми данными
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        with self._lock:
+            super().replace_by_id(client_id, new_client)
+            if client_id in self._cache:
+                self._cache.put(client_id, new_client)
+
+    def delete_by_id(self, client_id: int) -> None:
+        """
+        Удаляет объект Client по ID (и из кэша).
+
+        Args:
+            client_id: ID клиента для удаления
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        with self._lock:
+            super().delete_by_id(client_id)
+            self._cache.discard(client_id)
+
+    def iter_clients(self) -> Iterator[Client]:
+        """
+        Обходит всех клиентов в порядке хранения, не вытесняя кэш.
+
+        Returns:
+            Итератор объектов Client
+        """
+        with self._lock:
+            client_ids = list(self._offsets)
+        for client_id in client_ids:
+            with self._lock:
+                client = self._lookup(client_id, scan=True)
+            if client is not None:
+                yield client
+
+    def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
+        """
+        Возвращает список из n объектов класса ClientShort для k-й страницы.
+
+        Args:
+            k: номер страницы (начиная с 1)
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Список объектов ClientShort размером до n элементов
+        """
+        if k < 1:
+            raise ValueError("Номер страницы должен быть >= 1")
+        if n < 1:
+            raise ValueError("Размер страницы должен быть >= 1")
+
+        with self._lock:
+            page_ids = list(islice(self._offsets, (k - 1) * n, k * n))
+            return [ClientShort(self.get_by_id(client_id)) for client_id in page_ids]
+
+    def _get_indexes(self) -> ClientIndexes:
+        """Возвращает пустые индексы без полей (файл не читается, в репозитории не сохраняются)."""
+        return ClientIndexes(self.HASH_INDEX_FIELDS, self.SORTED_INDEX_FIELDS)
+
+    def _lookup(self, client_id: int, scan: bool = False) -> Optional[Client]:
+        """
+        Возвращает клиента из кэша или из файла (вызывается под _lock).
+
+        Args:
+            client_id: ID клиента
+            scan: последовательный проход - кэш не меняется, прочитанный
+                из файла клиент в него не добавляется
+        """
+        client = self._cache.peek(client_id) if scan else self._cache.get(client_id)
+        if client is None:
+            client = super().get_by_id(client_id)
+            if client is not None and not scan:
+                self._cache.put(client_id, client)
+        return client
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику кэша клиентов.
+
+        Returns:
+            Словарь resident (клиентов в памяти), protected, capacity,
+            hits, faults (чтений из файла), evictions (вытеснений)
+        """
+        with self._lock:
+            return self._cache.get_stats()
@@ -1,8 +1,29 @@
-from typing import Optional, List
+from typing import Optional, List, Iterator, Tuple
 from src.models.client import Client, ClientShort
 from src.core.db_manager import DB_manager
 
 
+# Счетчик изменений таблицы clients (одна строка). Его увеличивает триггер
+# на каждую изменяющую инструкцию, поэтому версия учитывает запись из любого
+# процесса и напрямую в БД
+CREATE_VERSION_TABLE_SQL = """CREATE TABLE IF NOT EXISTS clients_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+INSERT INTO clients_version DEFAULT VALUES ON CONFLICT DO NOTHING;
+CREATE OR REPLACE FUNCTION clients_bump_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE clients_version SET version = version + 1, changed_at = clock_timestamp();
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql"""
+
+CREATE_VERSION_TRIGGER_SQL = """CREATE TRIGGER clients_bump_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON clients
+    FOR EACH STATEMENT EXECUTE FUNCTION clients_bump_version()"""
+
+
 class Client_rep_db:
     """
     Класс для управления коллекцией объектов Client в PostgreSQL базе данных.
@@ -19,6 +40,81 @@ class Client_rep_db:
             db_manager: объект DB_manager (Singleton) для работы с БД
         """
         self.db_manager = db_manager
+        self._create_version_table()
+
+    def _create_version_table(self) -> None:
+        """
+        Создает счетчик изменений clients_version и триггер, если их нет.
+
+        При ошибке (например, нет прав на DDL) версия не читается из БД,
+        и get_version возвращает None.
+        """
+        try:
+            self.db_manager.execute_query(CREATE_VERSION_TABLE_SQL)
+            exists = self.db_manager.execute_query_single(
+                "SELECT 1 FROM pg_trigger WHERE tgname = 'clients_bump_version' AND tgrelid = 'clients'::regclass"
+            )
+            if not exists:
+                self.db_manager.execute_query(CREATE_VERSION_TRIGGER_SQL)
+            self.db_manager.conn.commit()
+        except Exception as e:
+            self.db_manager.conn.rollback()
+            print(f"Ошибка при создании счетчика изменений: {e}")
+
+    def get_version(self) -> Optional[str]:
+        """
+        Возвращает версию данных таблицы clients из счетчика изменений.
+
+        Версия меняется при любой записи в таблицу, в том числе из других
+        процессов и в обход приложения.
+
+        Returns:
+            str: версия вида '<счетчик>-<время изменения в мкс>' или None,
+            если счетчик недоступен
+        """
+        validators = self.get_validators()
+        return validators[0] if validators else None
+
+    def get_last_modified(self) -> Optional[float]:
+        """
+        Возвращает время последнего изменения таблицы clients.
+
+        Returns:
+            float: время в секундах от начала эпохи или None, если счетчик недоступен
+        """
+        validators = self.get_validators()
+        return validators[1] if validators else None
+
+    def get_validators(self) -> Optional[Tuple[str, float]]:
+        """
+        Возвращает версию данных и время последнего изменения одним чтением счетчика.
+
+        Returns:
+            (версия как в get_version, время как в get_last_modified) или None,
+            если счетчик недоступен
+        """
+        row = self._get_version_row()
+        if not row:
+            return None
+        return f"{row['version']}-{int(row['changed_at'] * 1_000_000)}", row['changed_at']
+
+    def _get_version_row(self) -> Optional[dict]:
+        """
+        Читает строку счетчика изменений.
+
+        Returns:
+            Словарь {'version': int, 'changed_at': float} или None
+        """
+        try:
+            row = self.db_manager.execute_query_single(
+                "SELECT version, EXTRACT(EPOCH FROM changed_at) AS changed_at FROM clients_version"
+            )
+        except Exception as e:
+            print(f"Ошибка при чтении версии данных: {e}")
+            return None
+        if not row:
+            return None
+        return {'version': int(row['version']), 'changed_at': float(row['changed_at'])}
 
     def get_by_id(self, client_id: int) -> Optional[Client]:
         """
@@ -85,6 +181,24 @@ class Client_rep_db:
             print(f"Ошибка при получении списка клиентов: {e}")
             return []
 
+    def iter_clients(self, batch_size: int = 1000) -> Iterator[Client]:
+        """
+        Обходит всех клиентов в порядке id, не загружая таблицу целиком.
+
+        Строки читаются серверным курсором пачками по batch_size.
+
+        Args:
+            batch_size: сколько строк забирать из БД за раз
+
+        Returns:
+            Итератор объектов Client
+        """
+        rows = self.db_manager.iter_query("SELECT * FROM clients ORDER BY id", batch_size=batch_size)
+        for row in rows:
+            row = dict(row)
+            row['total_spending'] = float(row['total_spending'])
+            yield Client(**row)
+
     def add(self, client: Client) -> None:
         """
         Добавляет новый объект Client в БД.
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple, Union
 from src.repositories.client_rep_base import Client_rep_base
 from src.repositories.client_rep_db import Client_rep_db
+from src.repositories.client_rep_sqlite import Client_rep_sqlite
 from src.models.client import Client, ClientShort
 
 
@@ -8,16 +9,22 @@ class Client_rep_db_adapter(Client_rep_base):
     """
     Адаптер для включения Client_rep_db в иерархию репозиториев.
 
-    Адаптирует интерфейс базы данных (Client_rep_db) к интерфейсу
-    Client_rep_base, позволяя работать с БД через общий интерфейс.
+    Адаптирует интерфейс базы данных (Client_rep_db или встроенной базы
+    Client_rep_sqlite) к интерфейсу Client_rep_base, позволяя работать
+    с БД через общий интерфейс.
+
+    Изменения через адаптер увеличивают поколение репозитория (get_generation).
+    Изменения, сделанные в БД в обход этого процесса, поколение не учитывает,
+    поэтому версия для ETag и время изменения (get_version, get_last_modified)
+    читаются из счетчика изменений в самой БД.
     """
 
-    def __init__(self, db_repository: Client_rep_db):
+    def __init__(self, db_repository: Union[Client_rep_db, Client_rep_sqlite]):
         """
         Инициализирует адаптер с объектом репозитория БД.
 
         Args:
-            db_repository: объект Client_rep_db для работы с базой данных
+            db_repository: объект Client_rep_db или Client_rep_sqlite для работы с базой данных
         """
         # Вызываем super().__init__(None) ПЕРВЫМ ДЕЛОМ для инициализации Subject
         super().__init__(None)
@@ -39,6 +46,44 @@ class Client_rep_db_adapter(Client_rep_base):
         """
         pass
 
+    def get_version(self) -> str:
+        """
+        Возвращает версию данных из счетчика изменений БД.
+
+        Если счетчик недоступен, используется версия этого процесса
+        (Client_rep_base.get_version).
+
+        Returns:
+            str: версия данных
+        """
+        version = self.db_repository.get_version()
+        return f"db-{version}" if version is not None else super().get_version()
+
+    def get_last_modified(self) -> float:
+        """
+        Возвращает время последнего изменения данных в БД.
+
+        Returns:
+            float: время в секундах от начала эпохи
+        """
+        last_modified = self.db_repository.get_last_modified()
+        return last_modified if last_modified is not None else super().get_last_modified()
+
+    def get_validators(self) -> Tuple[str, float]:
+        """
+        Возвращает версию данных и время изменения одним чтением счетчика изменений БД.
+
+        Если счетчик недоступен, используются значения этого процесса.
+
+        Returns:
+            (версия как в get_version, время как в get_last_modified)
+        """
+        validators = self.db_repository.get_validators()
+        if validators is None:
+            return super().get_version(), super().get_last_modified()
+        version, last_modified = validators
+        return f"db-{version}", last_modified
+
     def get_by_id(self, client_id: int) -> Optional[Client]:
         """
         Возвращает объект Client по ID, используя репозиторий БД.
@@ -59,6 +104,7 @@ class Client_rep_db_adapter(Client_rep_base):
             client: объект Client для добавления
         """
         self.db_repository.add(client)
+        self._touch()
 
     def replace_by_id(self, client_id: int, new_client: Client) -> None:
         """
@@ -69,6 +115,7 @@ class Client_rep_db_adapter(Client_rep_base):
             new_client: новый объект Client с новыми данными
         """
         self.db_repository.replace_by_id(client_id, new_client)
+        self._touch()
 
     def delete_by_id(self, client_id: int) -> None:
         """
@@ -78,6 +125,7 @@ class Client_rep_db_adapter(Client_rep_base):
             client_id: ID клиента для удаления
         """
         self.db_repository.delete_by_id(client_id)
+        self._touch()
 
     def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
         """
@@ -93,6 +141,15 @@ class Client_rep_db_adapter(Client_rep_base):
         """
         return self.db_repository.get_k_n_short_list(k, n)
 
+    def iter_clients(self) -> Iterator[Client]:
+        """
+        Обходит всех клиентов БД, не загружая таблицу целиком.
+
+        Returns:
+            Итератор объектов Client в порядке id
+        """
+        return self.db_repository.iter_clients()
+
     def get_count(self) -> int:
         """
         Возвращает общее количество клиентов, используя репозиторий БД.
@@ -1,7 +1,10 @@
 import json
 import os
-from src.repositories.client_rep_base import Client_rep_base
-from src.models.client import Client
+from typing import List, Optional, Tuple
+from src.repositories.client_parallel import validate_records
+from src.repositories.client_rep_base import DEFAULT_SNAPSHOT_INTERVAL, Client_rep_base
+from src.repositories.file_compression import COMPRESSION_ERRORS, open_text
+from src.repositories.json_stream import JSONStreamError, iter_json_array
 
 
 class Client_rep_json(Client_rep_base):
@@ -10,67 +13,88 @@ class Client_rep_json(Client_rep_base):
 
     Наследует общую логику от Client_rep_base и реализует специфичные методы
     для работы с JSON.
+
+    Файл разбирается потоково (iter_json_array): клиенты создаются по одному
+    по мере чтения, поэтому в памяти не держатся одновременно весь текст
+    файла и список словарей. Записи, не прошедшие валидацию, пропускаются
+    и сохраняются в load_errors вместе с позицией в файле.
+
+    Файлы с расширением .gz, .bz2, .xz или .lzma (например, 'clients.json.gz')
+    сжимаются и распаковываются на лету (open_text). С compact=True файл
+    пишется без отступов.
     """
 
+    def __init__(
+        self,
+        file_path: Optional[str] = None,
+        snapshot: bool = False,
+        load_workers: Optional[int] = 1,
+        compact: bool = False,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL
+    ):
+        """
+        Инициализирует репозиторий с путем к файлу.
+
+        Args:
+            file_path: путь к JSON файлу (расширение сжатия - сжатый файл)
+            snapshot: поддерживать двоичный снимок для быстрого запуска
+            load_workers: число процессов для проверки записей при загрузке
+            compact: сохранять JSON без отступов
+            snapshot_interval: через сколько изменений записывать снимок заново
+        """
+        # Ошибки последней загрузки: (позиция записи в файле в символах, сообщение)
+        self.load_errors: List[Tuple[int, str]] = []
+        self.compact = compact
+        super().__init__(file_path, snapshot, load_workers, snapshot_interval)
+
     def _load_from_file(self) -> None:
         """
         Загружает данные из JSON файла в приватный список _clients.
 
         Если файл не найден или пуст, инициализирует пустой список.
         """
+        self._clients = []
+        self.load_errors = []
         if not os.path.exists(self.file_path):
-            self._clients = []
             return
 
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:
-                    self._clients = []
-                    return
-
-                data = json.loads(content)
-                self._clients = []
-
-                if isinstance(data, list):
-                    for client_dict in data:
-                        try:
-                            client = Client(**client_dict)
-                            self._clients.append(client)
-                        except (ValueError, TypeError) as e:
-                            print(f"Ошибка при загрузке клиента: {e}")
-        except (json.JSONDecodeError, IOError) as e:
+            with open_text(self.file_path) as f:
+                self._clients, self.load_errors = validate_records(iter_json_array(f), self.load_workers)
+        except (JSONStreamError, IOError) + COMPRESSION_ERRORS as e:
             print(f"Ошибка при чтении файла {self.file_path}: {e}")
             self._clients = []
+            self.load_errors = []
+
+        if self.load_errors:
+            offset, message = self.load_errors[0]
+            print(f"Пропущено записей с ошибками в {self.file_path}: {len(self.load_errors)} "
+                  f"(первая на позиции {offset}: {message}), подробности в load_errors")
 
     def _save_to_file(self) -> None:
         """
         Сохраняет всю коллекцию _clients в JSON файл.
 
-        Преобразует объекты Client в словари перед сохранением.
+        Клиенты преобразуются в словари и записываются по одному (сжатые
+        файлы сжимаются потоком). По умолчанию JSON с отступами, в режиме
+        compact - без отступов и пробелов, по клиенту на строку.
         """
-        clients_data = []
-        for client in self._clients:
-            client_dict = {
-                'id': client.id,
-                'last_name': client.last_name,
-                'first_name': client.first_name,
-                'patronymic': client.patronymic,
-                'phone': client.phone,
-                'email': client.email,
-                'passport_series': client.passport_series,
-                'passport_number': client.passport_number,
-                'zip_code': client.zip_code,
-                'city': client.city,
-                'street': client.street,
-                'house': client.house,
-                'total_spending': client.total_spending,
-            }
-            clients_data.append(client_dict)
+        if self.compact:
+            dumps_options = {'ensure_ascii': False, 'separators': (',', ':')}
+            separator, indent_newline = ',\n', '\n'
+        else:
+            dumps_options = {'ensure_ascii': False, 'indent': 2}
+            separator, indent_newline = ',\n  ', '\n  '
 
         try:
             os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(clients_data, f, ensure_ascii=False, indent=2)
+            with open_text(self.file_path, 'w') as f:
+                f.write('[')
+                for i, client in enumerate(self._clients):
+                    # Переводы строк внутри строк JSON экранированы, поэтому
+                    # сдвиг вложенных строк на отступ списка безопасен
+                    f.write(separator if i else indent_newline)
+                    f.write(json.dumps(client.to_dict(), **dumps_options).replace('\n', indent_newline))
+                f.write('\n]' if self._clients else ']')
         except IOError as e:
             print(f"Ошибка при сохранении в файл {self.file_path}: {e}")
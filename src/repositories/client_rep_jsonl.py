@@ -0,0 +1,571 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+from src.repositories.client_rep_base import Client_rep_base
+from src.repositories.client_indexes import ClientIndexes
+from src.models.client import Client, ClientShort
+
+
+# Расширение файла индекса рядом с файлом данных
+INDEX_SUFFIX = '.idx'
+
+# Через сколько дописанных строк сохранять индекс на диск
+INDEX_CHECKPOINT_INTERVAL = 1000
+
+# Минимальное число устаревших строк, после которого файл может быть уплотнен
+COMPACT_MIN_STALE = 1000
+
+_INDEX_MAGIC = b'CLJIDX'
+_INDEX_VERSION = 1
+
+# Сигнатура, версия, размер файла данных, CRC32 его хвоста, число записей, число устаревших строк
+_INDEX_HEADER = struct.Struct('<6sHQIQQ')
+
+# Сколько последних байт файла данных проверяется при чтении индекса
+_INDEX_CHECK_BYTES = 4096
+
+# Доступен ли mmap.resize (нужен mremap: на macOS его нет, resize бросает SystemError)
+_mmap_resize_supported = True
+
+# Начало строки записи, которую пишет этот репозиторий ({"id": 123, ...})
+_ID_PREFIX = b'{"id": '
+_TOMBSTONE_SUFFIX = b', "deleted": true}'
+
+
+class Client_rep_jsonl(Client_rep_base):
+    """
+    Класс для управления коллекцией объектов Client в формате JSON Lines.
+
+    В отличие от остальных файловых репозиториев, клиенты не загружаются
+    в память при запуске. Хранится только индекс ID -> смещение строки
+    в файле, а сам файл читается через mmap: get_by_id, страницы списка
+    и iter_clients декодируют только нужные строки.
+
+    Файл - журнал, в который только дописывают: при замене клиента
+    дописывается его новая строка, при удалении - строка-отметка
+    {"id": N, "deleted": true}. Устаревшие строки убираются уплотнением
+    (compact), которое выполняется автоматически, когда их становится
+    больше, чем актуальных. Порядок хранения - порядок первого появления
+    клиента в файле.
+
+    Индекс сохраняется в файл с расширением INDEX_SUFFIX. При запуске
+    он читается целиком, а строки, дописанные после его сохранения,
+    дочитываются из файла данных; без индекса файл просматривается один раз
+    (декодируется только ID каждой строки).
+
+    Декоратор фильтрации и сортировки читает коллекцию через iter_clients.
+    Индексы строятся при первом поиске одним проходом по файлу и дальше
+    обновляются при каждом изменении, а порядок хранения для результатов
+    поиска берется из индекса смещений. Атрибут _clients строит список
+    всей коллекции при каждом обращении и нужен только для sort_by_field.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Открывает репозиторий.
+
+        Args:
+            file_path: путь к файлу данных JSON Lines
+        """
+        self._lock = threading.RLock()
+        self._offsets: Dict[int, int] = {}
+        self._mm: Optional[mmap.mmap] = None
+        self._size = 0
+        self._stale = 0
+        self._max_id = 0
+        self._unsaved_lines = 0
+        self._positions: Optional[Dict[int, int]] = None
+        self._positions_generation = -1
+        super().__init__(None)
+        self.file_path = file_path
+        self._load_from_file()
+        self._touch()
+
+    @property
+    def _clients(self) -> List[Client]:
+        """Вся коллекция в порядке хранения (новый список при каждом обращении)."""
+        return list(self.iter_clients())
+
+    @_clients.setter
+    def _clients(self, clients: List[Client]) -> None:
+        """Заменяет всю коллекцию (файл перезаписывается, индексы сбрасываются)."""
+        if self.file_path is None:
+            # Вызов из конструктора базового класса, файл еще не открыт
+            return
+        with self._lock:
+            self._rewrite(self._encode(client) for client in clients)
+            self._indexes = None
+
+    def _load_from_file(self) -> None:
+        """
+        Открывает файл данных и строит индекс смещений.
+
+        Если сохраненный индекс соответствует файлу, дочитываются только
+        строки после него, иначе файл просматривается целиком.
+        """
+        with self._lock:
+            if not os.path.exists(self.file_path):
+                os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+                open(self.file_path, 'ab').close()
+
+            self._remap()
+            if self._size and self._mm[self._size - 1:self._size] != b'\n':
+                # Файл правили вручную и последняя строка не завершена
+                self._append(b'\n')
+
+            start = self._read_index()
+            if start is None:
+                self._offsets = {}
+                self._stale = 0
+                start = 0
+            self._scan(start)
+            self._max_id = max(self._offsets, default=0)
+            if self._unsaved_lines:
+                self._write_index()
+
+    def _save_to_file(self) -> None:
+        """Перезаписывает файл данных без устаревших строк (см. compact)."""
+        self.compact()
+
+    def close(self) -> None:
+        """Сохраняет индекс и закрывает отображение файла."""
+        with self._lock:
+            if self._unsaved_lines:
+                self._write_index()
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+
+    def compact(self) -> None:
+        """
+        Уплотняет файл данных: оставляет по одной строке на клиента.
+
+        Строки копируются без декодирования, порядок хранения сохраняется.
+        """
+        with self._lock:
+            self._rewrite(self._read_line(offset) for offset in self._offsets.values())
+
+    def get_by_id(self, client_id: int) -> Optional[Client]:
+        """
+        Возвращает объект Client по ID или None, если не найден.
+
+        Декодируется только строка этого клиента.
+
+        Args:
+            client_id: уникальный идентификатор клиента
+
+        Returns:
+            Client объект или None
+        """
+        with self._lock:
+            offset = self._offsets.get(client_id)
+            if offset is None:
+                return None
+            return self._read_client(offset)
+
+    def add(self, client: Client) -> None:
+        """
+        Добавляет новый объект Client (ID = максимальный ID + 1).
+
+        Args:
+            client: объект Client для добавления
+        """
+        with self._lock:
+            client.id = self._max_id + 1
+            self._offsets[client.id] = self._append(self._encode(client))
+            self._max_id = client.id
+            if self._indexes is not None:
+                self._indexes.add(client, len(self._offsets) - 1)
+            self._after_change()
+
+    def replace_by_id(self, client_id: int, new_client: Client) -> None:
+        """
+        Заменяет объект Client по ID на новый объект.
+
+        Новая строка дописывается в конец файла, клиент остается
+        на прежнем месте в порядке хранения.
+
+        Args:
+            client_id: ID клиента для замены
+            new_client: новый объект Client с новыми данными
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        with self._lock:
+            if client_id not in self._offsets:
+                raise ValueError(f"Клиент с ID {client_id} не найден")
+            new_client.id = client_id
+            old_offset = self._offsets[client_id]
+            self._offsets[client_id] = self._append(self._encode(new_client))
+            if self._indexes is not None:
+                self._indexes.replace(self._read_client(old_offset), new_client)
+            self._stale += 1
+            self._after_change()
+
+    def delete_by_id(self, client_id: int) -> None:
+        """
+        Удаляет объект Client по ID (дописывает строку-отметку удаления).
+
+        Args:
+            client_id: ID клиента для удаления
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        with self._lock:
+            if client_id not in self._offsets:
+                raise ValueError(f"Клиент с ID {client_id} не найден")
+            self._append(_ID_PREFIX + str(client_id).encode() + _TOMBSTONE_SUFFIX + b'\n')
+            offset = self._offsets.pop(client_id)
+            if self._indexes is not None:
+                self._indexes.remove(self._read_client(offset))
+            self._stale += 2
+            if client_id == self._max_id:
+                self._max_id = max(self._offsets, default=0)
+            self._after_change()
+
+    def iter_clients(self) -> Iterator[Client]:
+        """
+        Обходит всех клиентов в порядке хранения, декодируя строки по одной.
+
+        Смещения берутся из индекса для каждого клиента отдельно, поэтому
+        обход не ломается, если файл уплотнили во время него; клиенты,
+        удаленные во время обхода, пропускаются.
+
+        Returns:
+            Итератор объектов Client
+        """
+        with self._lock:
+            client_ids = list(self._offsets)
+        for client_id in client_ids:
+            client = self.get_by_id(client_id)
+            if client is not None:
+                yield client
+
+    def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
+        """
+        Возвращает список из n объектов класса ClientShort для k-й страницы.
+
+        Декодируются только строки клиентов этой страницы.
+
+        Args:
+            k: номер страницы (начиная с 1)
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Список объектов ClientShort размером до n элементов
+        """
+        if k < 1:
+            raise ValueError("Номер страницы должен быть >= 1")
+        if n < 1:
+            raise ValueError("Размер страницы должен быть >= 1")
+
+        with self._lock:
+            page_offsets = islice(self._offsets.values(), (k - 1) * n, k * n)
+            return [ClientShort(self._read_client(offset)) for offset in page_offsets]
+
+    def sort_by_field(self, field_name: str) -> None:
+        """
+        Сортирует клиентов по указанному полю и перезаписывает файл в этом порядке.
+
+        Args:
+            field_name: имя поля для сортировки (например, 'last_name')
+
+        Raises:
+            ValueError: если поле не существует в объекте Client
+        """
+        with self._lock:
+            clients = list(self._clients)
+            if not clients:
+                return
+            if not hasattr(clients[0], field_name):
+                raise ValueError(
+                    f"Поле '{field_name}' не найдено в объекте Client. "
+                    f"Доступные поля: id, last_name, first_name, patronymic, phone, email, "
+                    f"passport_series, passport_number, zip_code, city, street, house, total_spending"
+                )
+            clients.sort(key=lambda client: getattr(client, field_name))
+            self._rewrite(self._encode(client) for client in clients)
+            self._touch()
+
+    def get_count(self) -> int:
+        """
+        Возвращает общее количество клиентов.
+
+        Returns:
+            int: количество клиентов
+        """
+        return len(self._offsets)
+
+    def _get_indexes(self) -> ClientIndexes:
+        """
+        Возвращает индексы, при первом обращении строя их одним проходом по файлу.
+
+        Дальше индексы обновляются в add, replace_by_id и delete_by_id,
+        а уплотнение и sort_by_field их не затрагивают (состав коллекции
+        не меняется).
+
+        Returns:
+            Объект ClientIndexes
+        """
+        with self._lock:
+            if self._indexes is None:
+                indexes = ClientIndexes(self.HASH_INDEX_FIELDS, self.SORTED_INDEX_FIELDS)
+                indexes.build(list(self.iter_clients()))
+                self._indexes = indexes
+            return self._indexes
+
+    def _get_built_indexes(self) -> Optional[ClientIndexes]:
+        """Возвращает индексы, только если они уже построены."""
+        return self._indexes
+
+    def find_equal(self, field_name: str, value: Any) -> Optional[List[Client]]:
+        """
+        Находит клиентов с заданным значением поля по индексу.
+
+        Args:
+            field_name: имя поля Client
+            value: искомое значение
+
+        Returns:
+            Список Client в порядке хранения или None, если поле не индексировано
+        """
+        with self._lock:
+            found = self._get_indexes().find_equal(field_name, value)
+            return None if found is None else self._sort_by_storage_order(found)
+
+    def _sort_by_storage_order(self, clients: List[Client]) -> List[Client]:
+        """
+        Упорядочивает клиентов в порядке хранения (на месте) по индексу смещений.
+
+        Args:
+            clients: клиенты из этого репозитория (например, найденные по индексам)
+
+        Returns:
+            Тот же список, отсортированный по позиции в файле
+        """
+        if len(clients) > 1:
+            positions = self._get_positions()
+            clients.sort(key=lambda client: positions[client.id])
+        return clients
+
+    def _get_positions(self) -> Dict[int, int]:
+        """Возвращает карту ID -> позиция в порядке хранения (строится раз на поколение)."""
+        with self._lock:
+            if self._positions is None or self._positions_generation != self._generation:
+                self._positions = {client_id: i for i, client_id in enumerate(self._offsets)}
+                self._positions_generation = self._generation
+            return self._positions
+
+    def _after_change(self) -> None:
+        """Отмечает изменение и при необходимости уплотняет файл."""
+        self._touch()
+        if self._stale >= COMPACT_MIN_STALE and self._stale > len(self._offsets):
+            self.compact()
+        elif self._unsaved_lines >= INDEX_CHECKPOINT_INTERVAL:
+            self._write_index()
+
+    @staticmethod
+    def _encode(client: Client) -> bytes:
+        """Возвращает строку файла для клиента (поле id идет первым)."""
+        return (json.dumps(client.to_dict(), ensure_ascii=False) + '\n').encode('utf-8')
+
+    def _read_line(self, offset: int) -> bytes:
+        """Возвращает строку файла, начинающуюся со смещения offset (с переводом строки)."""
+        end = self._mm.find(b'\n', offset)
+        return self._mm[offset:end + 1]
+
+    def _read_client(self, offset: int) -> Client:
+        """Декодирует клиента из строки файла по смещению."""
+        return Client(**json.loads(self._read_line(offset)))
+
+    def _remap(self) -> None:
+        """Отображает файл данных в память заново (после его перезаписи)."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._size = os.path.getsize(self.file_path)
+        if self._size:
+            with open(self.file_path, 'r+b') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+
+    def _append(self, line: bytes) -> int:
+        """
+        Дописывает строку в конец файла данных.
+
+        Где возможно, строка записывается через увеличенное отображение
+        (_append_through_mapping). Иначе (пустой файл, нет mremap) файл
+        дописывается обычной записью и отображается заново.
+
+        Returns:
+            Смещение дописанной строки
+        """
+        offset = self._size
+        if not self._append_through_mapping(line):
+            with open(self.file_path, 'ab') as f:
+                f.write(line)
+            self._remap()
+        self._unsaved_lines += 1
+        return offset
+
+    def _append_through_mapping(self, line: bytes) -> bool:
+        """
+        Увеличивает файл и отображение на длину строки (mmap.resize) и пишет строку через него.
+
+        Returns:
+            False, если отображения нет или платформа не поддерживает resize
+            (тогда в файле ничего не изменено)
+        """
+        global _mmap_resize_supported
+        if self._mm is None or not _mmap_resize_supported:
+            return False
+        size = self._size + len(line)
+        try:
+            self._mm.resize(size)
+        except SystemError:
+            # Нет mremap: resize отказывает до изменения файла
+            _mmap_resize_supported = False
+            return False
+        self._mm[self._size:size] = line
+        self._size = size
+        return True
+
+    def _rewrite(self, lines: Iterator[bytes]) -> None:
+        """Записывает файл данных заново из строк и перестраивает индекс."""
+        temp_path = f"{self.file_path}.tmp"
+        offsets: Dict[int, int] = {}
+        position = 0
+        with open(temp_path, 'wb') as f:
+            for line in lines:
+                offsets[self._parse_id(line)] = position
+                f.write(line)
+                position += len(line)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        os.replace(temp_path, self.file_path)
+        self._remap()
+        self._offsets = offsets
+        self._stale = 0
+        self._max_id = max(offsets, default=0)
+        self._write_index()
+
+    def _scan(self, start: int) -> None:
+        """
+        Добавляет в индекс строки файла данных начиная со смещения start.
+
+        Для строк, записанных этим репозиторием, ID читается из начала
+        строки без разбора JSON; прочие строки разбираются целиком.
+        """
+        mm, size, position = self._mm, self._size, start
+        offsets = self._offsets
+        while position < size:
+            end = mm.find(b'\n', position)
+            if end == -1:
+                end = size
+            line = mm[position:end]
+            if line.strip():
+                try:
+                    client_id, deleted = self._parse_line(line)
+                except (ValueError, TypeError) as e:
+                    print(f"Ошибка при загрузке строки со смещением {position}: {e}")
+                else:
+                    if deleted:
+                        self._stale += 2 if offsets.pop(client_id, None) is not None else 1
+                    else:
+                        if client_id in offsets:
+                            self._stale += 1
+                        offsets[client_id] = position
+                self._unsaved_lines += 1
+            position = end + 1
+
+    @staticmethod
+    def _parse_line(line: bytes):
+        """
+        Возвращает (ID, признак отметки удаления) для строки файла.
+
+        Raises:
+            ValueError: если строка не содержит корректного ID
+        """
+        if line.startswith(_ID_PREFIX):
+            comma = line.find(b',', len(_ID_PREFIX))
+            if comma != -1 and line[len(_ID_PREFIX):comma].isdigit():
+                return int(line[len(_ID_PREFIX):comma]), line.rstrip().endswith(_TOMBSTONE_SUFFIX)
+        data = json.loads(line)
+        client_id = data['id'] if isinstance(data, dict) and 'id' in data else None
+        if not isinstance(client_id, int) or isinstance(client_id, bool):
+            raise ValueError("в строке нет целочисленного поля id")
+        return client_id, bool(data.get('deleted'))
+
+    @classmethod
+    def _parse_id(cls, line: bytes) -> int:
+        """Возвращает ID клиента из строки записи."""
+        return cls._parse_line(line)[0]
+
+    def _get_index_path(self) -> str:
+        """Возвращает путь к файлу индекса рядом с файлом данных."""
+        return self.file_path + INDEX_SUFFIX
+
+    def _tail_checksum(self, size: int) -> int:
+        """CRC32 последних байт файла данных до смещения size."""
+        if not size:
+            return 0
+        return zlib.crc32(self._mm[max(0, size - _INDEX_CHECK_BYTES):size])
+
+    def _write_index(self) -> None:
+        """Сохраняет индекс смещений (ошибки печатаются, данные не затрагиваются)."""
+        entries = array('q')
+        for client_id, offset in self._offsets.items():
+            entries.append(client_id)
+            entries.append(offset)
+        header = _INDEX_HEADER.pack(
+            _INDEX_MAGIC, _INDEX_VERSION, self._size, self._tail_checksum(self._size),
+            len(self._offsets), self._stale
+        )
+        index_path = self._get_index_path()
+        try:
+            with open(f"{index_path}.tmp", 'wb') as f:
+                f.write(header)
+                entries.tofile(f)
+            os.replace(f"{index_path}.tmp", index_path)
+            self._unsaved_lines = 0
+        except OSError as e:
+            print(f"Ошибка при сохранении индекса {index_path}: {e}")
+
+    def _read_index(self) -> Optional[int]:
+        """
+        Загружает сохраненный индекс, если он соответствует файлу данных.
+
+        Returns:
+            Смещение, с которого нужно дочитать файл данных, или None,
+            если индекса нет или он не подходит
+        """
+        index_path = self._get_index_path()
+        try:
+            with open(index_path, 'rb') as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) != _INDEX_HEADER.size:
+                    return None
+                magic, version, data_size, checksum, count, stale = _INDEX_HEADER.unpack(header)
+                if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+                    return None
+                if data_size > self._size or self._tail_checksum(data_size) != checksum:
+                    # Файл данных перезаписан после сохранения индекса
+                    return None
+                entries = array('q')
+                entries.fromfile(f, count * 2)
+        except (OSError, EOFError) as e:
+            if os.path.exists(index_path):
+                print(f"Ошибка при чтении индекса {index_path}: {e}")
+            return None
+
+        self._offsets = dict(zip(entries[0::2], entries[1::2]))
+        self._stale = stale
+        return data_size
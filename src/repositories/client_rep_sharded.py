@@ -0,0 +1,411 @@
+import heapq
+import json
+import os
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.models.client import Client
+from src.repositories.client_indexes import ClientIndexes
+from src.repositories.client_rep_base import Client_rep_base
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.client_rep_yaml import Client_rep_yaml
+
+
+# Файл с параметрами разбиения в папке репозитория
+MANIFEST_NAME = 'shards.json'
+
+# Поля, по которым клиенты распределяются по шардам
+SHARD_KEYS = ('id', 'city')
+
+DEFAULT_SHARD_COUNT = 8
+
+
+class Client_rep_sharded(Client_rep_base):
+    """
+    Репозиторий, разбитый на несколько файлов (шардов) в одной папке.
+
+    Клиент попадает в шард по id (id % shard_count) или по городу (CRC32
+    названия), каждый шард - обычный Client_rep_json или Client_rep_yaml
+    (по расширению, включая сжатые '.json.gz' и т.п.). Шарды загружаются
+    параллельно в потоках, изменение перезаписывает или дописывает только
+    затронутый шард.
+
+    Каждый шард хранится упорядоченным по ключу порядка (по id, после
+    sort_by_field - по полю), поэтому общий порядок хранения - слияние
+    шардов (heapq.merge) без сортировки. Запросы по упорядоченным индексам
+    (iter_range) и поиск по хэш-индексам (find_equal) выполняются в каждом
+    шарде, а результаты сливаются.
+
+    Число шардов, поле разбиения, расширение и ключ порядка сохраняются
+    в MANIFEST_NAME и не могут быть изменены при повторном открытии.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shard_count: Optional[int] = None,
+        shard_by: Optional[str] = None,
+        extension: Optional[str] = None,
+        load_workers: Optional[int] = 1,
+        **shard_options: Any
+    ):
+        """
+        Открывает или создает репозиторий в папке directory.
+
+        Args:
+            directory: папка с шардами
+            shard_count: число шардов (по умолчанию DEFAULT_SHARD_COUNT или из манифеста)
+            shard_by: поле разбиения из SHARD_KEYS (по умолчанию 'id' или из манифеста)
+            extension: расширение файлов шардов (по умолчанию '.json' или из манифеста)
+            load_workers: число процессов для проверки записей каждого шарда
+            **shard_options: дополнительные параметры шардов (например, compact=True)
+
+        Raises:
+            ValueError: если параметры неверны или не совпадают с манифестом
+        """
+        self._settings = {
+            'shard_count': shard_count,
+            'shard_by': shard_by,
+            'extension': extension,
+            'order_by': None,
+        }
+        self._shard_options = shard_options
+        self._shards: List[Client_rep_base] = []
+        self._shard_of: Dict[int, int] = {}
+        self._max_id: Optional[int] = None
+        self._merged: Optional[List[Client]] = None
+        self._merged_generation: Optional[int] = None
+        self._positions: Optional[Dict[int, int]] = None
+        super().__init__(directory, load_workers=load_workers)
+
+    @property
+    def shard_count(self) -> int:
+        return self._settings['shard_count']
+
+    @property
+    def shard_by(self) -> str:
+        return self._settings['shard_by']
+
+    @property
+    def _clients(self) -> List[Client]:
+        """Вся коллекция в порядке хранения (слияние шардов, кэшируется до изменения)."""
+        if self._merged is None or self._merged_generation != self._generation:
+            self._merged = list(self._merge_shards())
+            self._merged_generation = self._generation
+            self._positions = None
+        return self._merged
+
+    @_clients.setter
+    def _clients(self, clients: List[Client]) -> None:
+        """Распределяет коллекцию по шардам и перезаписывает все шарды."""
+        if not self._shards:
+            return
+        buckets = [[] for _ in self._shards]
+        for client in clients:
+            buckets[self._get_shard_index(client)].append(client)
+        order_key = self._get_order_key()
+        for shard, bucket in zip(self._shards, buckets):
+            bucket.sort(key=order_key)
+            shard._clients = bucket
+            shard._touch()
+            shard._save()
+        self._reset_locations()
+
+    def _load_from_file(self) -> None:
+        """
+        Читает манифест и загружает шарды параллельно.
+
+        Raises:
+            ValueError: если параметры не совпадают с манифестом
+        """
+        os.makedirs(self.file_path, exist_ok=True)
+        self._read_manifest()
+
+        extension = self._settings['extension']
+        repo_class = Client_rep_yaml if '.yaml' in extension or '.yml' in extension else Client_rep_json
+        paths = [os.path.join(self.file_path, f"clients-{i:03d}{extension}") for i in range(self.shard_count)]
+
+        def open_shard(path: str) -> Client_rep_base:
+            return repo_class(path, load_workers=self.load_workers, **self._shard_options)
+
+        with ThreadPoolExecutor(max_workers=self.shard_count) as executor:
+            self._shards = list(executor.map(open_shard, paths))
+        self._reset_locations()
+
+    def _save_to_file(self) -> None:
+        """Перезаписывает все шарды и манифест."""
+        for shard in self._shards:
+            shard._save()
+        self._write_manifest()
+
+    def _read_manifest(self) -> None:
+        """Сверяет параметры с манифестом (или создает его) и заполняет значения по умолчанию."""
+        path = os.path.join(self.file_path, MANIFEST_NAME)
+        stored = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+
+        defaults = {'shard_count': DEFAULT_SHARD_COUNT, 'shard_by': 'id', 'extension': '.json', 'order_by': None}
+        for name, default in defaults.items():
+            value = self._settings[name]
+            if name in stored:
+                if value is not None and value != stored[name]:
+                    raise ValueError(
+                        f"Параметр {name}={value!r} не совпадает с сохраненным {stored[name]!r} "
+                        f"(перераспределение шардов не поддерживается)"
+                    )
+                value = stored[name]
+            self._settings[name] = default if value is None else value
+
+        if not isinstance(self.shard_count, int) or self.shard_count < 1:
+            raise ValueError("Число шардов должно быть >= 1")
+        if self.shard_by not in SHARD_KEYS:
+            raise ValueError(f"Поле разбиения должно быть одним из {SHARD_KEYS}")
+        if not stored:
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        """Сохраняет параметры разбиения."""
+        path = os.path.join(self.file_path, MANIFEST_NAME)
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self._settings, f, ensure_ascii=False, indent=2)
+        except IOError as e:
+            print(f"Ошибка при сохранении в файл {path}: {e}")
+
+    def _get_shard_index(self, client: Client) -> int:
+        """Возвращает номер шарда для клиента."""
+        if self.shard_by == 'id':
+            return client.id % self.shard_count
+        # hash() строк меняется между запусками, CRC32 - нет
+        return zlib.crc32(client.city.encode('utf-8')) % self.shard_count
+
+    def _get_order_key(self) -> Callable[[Client], Any]:
+        """Возвращает ключ порядка хранения (id или поле последней sort_by_field)."""
+        return attrgetter(self._settings['order_by'] or 'id')
+
+    def _merge_shards(self) -> Iterator[Client]:
+        """Обходит клиентов всех шардов в порядке хранения."""
+        return heapq.merge(*(shard._clients for shard in self._shards), key=self._get_order_key())
+
+    def _reset_locations(self) -> None:
+        """Пересчитывает карту id -> шард (для разбиения по городу) и максимальный id."""
+        self._shard_of = {}
+        if self.shard_by != 'id':
+            for i, shard in enumerate(self._shards):
+                for client in shard._clients:
+                    self._shard_of[client.id] = i
+        self._max_id = None
+
+    def _locate(self, client_id: int) -> Optional[int]:
+        """Возвращает номер шарда с клиентом client_id или None."""
+        if self.shard_by != 'id':
+            return self._shard_of.get(client_id)
+        index = client_id % self.shard_count
+        return index if self._shards[index].get_by_id(client_id) is not None else None
+
+    def _insert(self, client: Client) -> None:
+        """Вставляет клиента с назначенным id в его шард, сохраняя порядок шарда."""
+        index = self._get_shard_index(client)
+        shard = self._shards[index]
+        order_key = self._get_order_key()
+        position = bisect_right(shard._clients, order_key(client), key=order_key)
+        shard._insert_client(client, position)
+        if self.shard_by != 'id':
+            self._shard_of[client.id] = index
+
+    def get_by_id(self, client_id: int) -> Optional[Client]:
+        """
+        Возвращает объект Client по ID или None, если не найден.
+
+        Args:
+            client_id: уникальный идентификатор клиента
+
+        Returns:
+            Client объект или None
+        """
+        index = client_id % self.shard_count if self.shard_by == 'id' else self._shard_of.get(client_id)
+        return None if index is None else self._shards[index].get_by_id(client_id)
+
+    def add(self, client: Client) -> None:
+        """
+        Добавляет нового клиента (ID - максимальный существующий + 1) в его шард.
+
+        Args:
+            client: объект Client для добавления
+        """
+        if self._max_id is None:
+            self._max_id = max((c.id for shard in self._shards for c in shard._clients), default=0)
+        self._max_id += 1
+        client.id = self._max_id
+        self._insert(client)
+        self._touch()
+
+    def replace_by_id(self, client_id: int, new_client: Client) -> None:
+        """
+        Заменяет объект Client по ID на новый объект.
+
+        Если клиент должен оказаться в другом шарде (сменился город) или
+        в другом месте шарда (сменилось поле порядка), он переносится.
+
+        Args:
+            client_id: ID клиента для замены
+            new_client: новый объект Client с новыми данными
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        index = self._locate(client_id)
+        if index is None:
+            raise ValueError(f"Клиент с ID {client_id} не найден")
+
+        new_client.id = client_id
+        shard = self._shards[index]
+        order_key = self._get_order_key()
+        same_place = order_key(new_client) == order_key(shard.get_by_id(client_id))
+        if self._get_shard_index(new_client) == index and same_place:
+            shard.replace_by_id(client_id, new_client)
+        else:
+            shard.delete_by_id(client_id)
+            self._insert(new_client)
+        self._touch()
+
+    def delete_by_id(self, client_id: int) -> None:
+        """
+        Удаляет объект Client по ID из его шарда.
+
+        Args:
+            client_id: ID клиента для удаления
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        index = self._locate(client_id)
+        if index is None:
+            raise ValueError(f"Клиент с ID {client_id} не найден")
+
+        self._shards[index].delete_by_id(client_id)
+        self._shard_of.pop(client_id, None)
+        if client_id == self._max_id:
+            self._max_id = None
+        self._touch()
+
+    def iter_clients(self) -> Iterator[Client]:
+        """
+        Обходит всех клиентов в порядке хранения, сливая шарды на лету.
+
+        Returns:
+            Итератор объектов Client
+        """
+        return self._merge_shards()
+
+    def sort_by_field(self, field_name: str) -> None:
+        """
+        Сортирует каждый шард по полю; общий порядок - их слияние по этому полю.
+
+        Args:
+            field_name: имя поля для сортировки (например, 'last_name')
+
+        Raises:
+            ValueError: если поле не существует в объекте Client
+        """
+        if not hasattr(Client, field_name):
+            raise ValueError(f"Поле '{field_name}' не найдено в объекте Client")
+
+        for shard in self._shards:
+            shard.sort_by_field(field_name)
+        self._settings['order_by'] = field_name
+        self._write_manifest()
+        self._touch()
+
+    def get_count(self) -> int:
+        """
+        Возвращает общее количество клиентов во всех шардах.
+
+        Returns:
+            int: количество клиентов
+        """
+        return sum(shard.get_count() for shard in self._shards)
+
+    def find_equal(self, field_name: str, value: Any) -> Optional[List[Client]]:
+        """
+        Находит клиентов с заданным значением поля по индексам шардов.
+
+        Args:
+            field_name: имя поля Client
+            value: искомое значение
+
+        Returns:
+            Список Client в порядке хранения или None, если поле не индексировано
+        """
+        if not self.has_hash_index(field_name):
+            return None
+        found = [shard.find_equal(field_name, value) for shard in self._shards]
+        return list(heapq.merge(*found, key=self._get_order_key()))
+
+    def iter_range(
+        self,
+        field_name: str,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+        reverse: bool = False
+    ) -> Optional[Iterator[Client]]:
+        """
+        Обходит клиентов в порядке поля, сливая упорядоченные потоки шардов (k-way merge).
+
+        Args:
+            field_name: имя поля Client
+            low: нижняя граница (None - без ограничения)
+            high: верхняя граница (None - без ограничения)
+            include_low: включать ли нижнюю границу
+            include_high: включать ли верхнюю границу
+            reverse: обходить ли по убыванию
+
+        Returns:
+            Итератор Client или None, если по полю нет упорядоченного индекса
+        """
+        if not self.has_sorted_index(field_name):
+            return None
+        streams = [
+            shard.iter_range(field_name, low, high, include_low=include_low, include_high=include_high, reverse=reverse)
+            for shard in self._shards
+        ]
+        # Равные значения поля в каждом шарде идут по возрастанию id
+        if reverse:
+            return heapq.merge(*streams, key=lambda c: (getattr(c, field_name), -c.id), reverse=True)
+        return heapq.merge(*streams, key=lambda c: (getattr(c, field_name), c.id))
+
+    def _get_indexes(self) -> ClientIndexes:
+        """
+        Возвращает индексы всей коллекции (для статистики планировщика).
+
+        Собираются слиянием уже построенных индексов шардов, без сортировки.
+        """
+        clients = self._clients
+        if self._indexes is None or self._indexed_list is not clients:
+            parts = [shard._get_indexes() for shard in self._shards]
+            self._indexes = ClientIndexes.merge(self.HASH_INDEX_FIELDS, self.SORTED_INDEX_FIELDS, parts)
+            self._indexed_list = clients
+        return self._indexes
+
+    def _sort_by_storage_order(self, clients: List[Client]) -> List[Client]:
+        """
+        Упорядочивает клиентов репозитория в порядке хранения (на месте).
+
+        Args:
+            clients: клиенты из этого репозитория
+
+        Returns:
+            Тот же список, отсортированный по позиции в общем порядке хранения
+        """
+        merged = self._clients
+        if self._positions is None:
+            self._positions = {client.id: i for i, client in enumerate(merged)}
+        positions = self._positions
+        clients.sort(key=lambda client: positions[client.id])
+        return clients
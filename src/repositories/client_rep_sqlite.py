@@ -0,0 +1,415 @@
+import sqlite3
+from operator import attrgetter
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from src.models.client import Client, ClientShort
+from src.core.sqlite_manager import SQLite_manager
+
+
+# Сколько клиентов вставлять в одной транзакции в add_many
+DEFAULT_BATCH_SIZE = 5000
+
+# Схема таблицы clients. AUTOINCREMENT, как SERIAL в PostgreSQL, не выдает
+# повторно id удаленных клиентов
+CREATE_TABLE_SQL = """CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    last_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    patronymic TEXT NOT NULL DEFAULT '',
+    phone TEXT NOT NULL,
+    email TEXT NOT NULL,
+    passport_series TEXT NOT NULL,
+    passport_number TEXT NOT NULL,
+    zip_code INTEGER NOT NULL,
+    city TEXT NOT NULL,
+    street TEXT NOT NULL,
+    house TEXT NOT NULL,
+    total_spending REAL NOT NULL DEFAULT 0
+)"""
+
+# Счетчик изменений таблицы clients (одна строка), как clients_version
+# в Client_rep_db. Его увеличивают триггеры, поэтому версия учитывает запись
+# из любого процесса; время изменения - в секундах от начала эпохи
+CREATE_VERSION_SQL = (
+    """CREATE TABLE IF NOT EXISTS clients_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL DEFAULT 0,
+        changed_at REAL NOT NULL DEFAULT ((julianday('now') - 2440587.5) * 86400.0)
+    )""",
+    "INSERT OR IGNORE INTO clients_version (id) VALUES (1)",
+) + tuple(
+    f"""CREATE TRIGGER IF NOT EXISTS clients_bump_version_{operation.lower()} AFTER {operation} ON clients
+    BEGIN
+        UPDATE clients_version
+        SET version = version + 1, changed_at = (julianday('now') - 2440587.5) * 86400.0;
+    END"""
+    for operation in ('INSERT', 'UPDATE', 'DELETE')
+)
+
+# Поля со вторичными индексами - те же, что у индексов файловых репозиториев.
+# Каждая запись индекса SQLite заканчивается rowid (= id), поэтому индекс
+# по полю обслуживает и ORDER BY поле, id, и keyset-условие (поле, id)
+INDEXED_FIELDS: Tuple[str, ...] = ('city', 'email', 'phone', 'last_name', 'total_spending', 'zip_code')
+
+# Колонки в порядке параметров INSERT/UPDATE
+DATA_COLUMNS: Tuple[str, ...] = (
+    'last_name', 'first_name', 'patronymic', 'phone', 'email',
+    'passport_series', 'passport_number', 'zip_code', 'city',
+    'street', 'house', 'total_spending',
+)
+_get_values = attrgetter(*DATA_COLUMNS)
+
+INSERT_SQL = (
+    f"INSERT INTO clients ({', '.join(DATA_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(DATA_COLUMNS))}) RETURNING id"
+)
+INSERT_WITH_ID_SQL = (
+    f"INSERT INTO clients (id, {', '.join(DATA_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(DATA_COLUMNS) + 1))})"
+)
+UPDATE_SQL = f"UPDATE clients SET {', '.join(f'{column}=?' for column in DATA_COLUMNS)} WHERE id = ?"
+
+
+def client_values(client: Client) -> tuple:
+    """
+    Возвращает значения колонок DATA_COLUMNS клиента.
+
+    Args:
+        client: объект Client
+
+    Returns:
+        Кортеж значений в порядке DATA_COLUMNS
+    """
+    return _get_values(client)
+
+
+class Client_rep_sqlite:
+    """
+    Класс для управления коллекцией объектов Client во встроенной базе SQLite.
+
+    Реализует интерфейс Client_rep_db, поэтому подключается к приложению
+    через Client_rep_db_adapter, а фильтры и сортировки строит
+    Client_rep_db_decorator (SQLite_manager выполняет его запросы с %s).
+    Сервер базы данных не нужен: все данные в одном файле.
+
+    Схема и индексы создаются при открытии, если их еще нет. Повторные
+    запросы берутся из кэша скомпилированных запросов соединения sqlite3
+    (cached_statements), массовая вставка (add_many) идет пачками
+    в отдельных транзакциях, а обход (iter_clients) и get_page_after
+    используют keyset-условие по id вместо OFFSET.
+
+    В отличие от Client_rep_db, replace_by_id и delete_by_id пробрасывают
+    ValueError для отсутствующего id, как файловые репозитории.
+    """
+
+    def __init__(self, db_manager: SQLite_manager):
+        """
+        Инициализирует репозиторий с экземпляром SQLite_manager.
+
+        Args:
+            db_manager: объект SQLite_manager для работы с файлом базы
+        """
+        self.db_manager = db_manager
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Создает таблицу clients, индексы INDEXED_FIELDS и счетчик изменений, если их нет."""
+        self.db_manager.execute_query(CREATE_TABLE_SQL)
+        for field in INDEXED_FIELDS:
+            self.db_manager.execute_query(f"CREATE INDEX IF NOT EXISTS idx_clients_{field} ON clients ({field})")
+        for sql in CREATE_VERSION_SQL:
+            self.db_manager.execute_query(sql)
+        self.db_manager.conn.commit()
+
+    def get_version(self) -> Optional[str]:
+        """
+        Возвращает версию данных таблицы clients из счетчика изменений.
+
+        Версия меняется при любой записи в таблицу, в том числе из других
+        процессов, открывших тот же файл.
+
+        Returns:
+            str: версия вида '<счетчик>-<время изменения в мкс>' или None при ошибке
+        """
+        validators = self.get_validators()
+        return validators[0] if validators else None
+
+    def get_last_modified(self) -> Optional[float]:
+        """
+        Возвращает время последнего изменения таблицы clients.
+
+        Returns:
+            float: время в секундах от начала эпохи или None при ошибке
+        """
+        validators = self.get_validators()
+        return validators[1] if validators else None
+
+    def get_validators(self) -> Optional[Tuple[str, float]]:
+        """
+        Возвращает версию данных и время последнего изменения одним чтением счетчика.
+
+        Returns:
+            (версия как в get_version, время как в get_last_modified) или None при ошибке
+        """
+        row = self._get_version_row()
+        if not row:
+            return None
+        return f"{row['version']}-{int(row['changed_at'] * 1_000_000)}", row['changed_at']
+
+    def _get_version_row(self):
+        """
+        Читает строку счетчика изменений.
+
+        Returns:
+            Строка sqlite3.Row с полями version и changed_at или None
+        """
+        try:
+            return self.db_manager.execute_query_single("SELECT version, changed_at FROM clients_version")
+        except Exception as e:
+            print(f"Ошибка при чтении версии данных: {e}")
+            return None
+
+    @staticmethod
+    def _row_to_client(row) -> Client:
+        """
+        Создает объект Client из строки таблицы.
+
+        Args:
+            row: строка sqlite3.Row
+
+        Returns:
+            Client объект
+        """
+        row = dict(row)
+        row['total_spending'] = float(row['total_spending'])
+        return Client(**row)
+
+    def get_by_id(self, client_id: int) -> Optional[Client]:
+        """
+        Возвращает объект Client по ID из БД или None, если не найден.
+
+        Args:
+            client_id: уникальный идентификатор клиента
+
+        Returns:
+            Client объект или None
+        """
+        try:
+            row = self.db_manager.execute_query_single("SELECT * FROM clients WHERE id = ?", (client_id,))
+            return self._row_to_client(row) if row else None
+        except Exception as e:
+            print(f"Ошибка при выборе клиента по ID: {e}")
+            return None
+
+    def get_k_n_short_list(self, k: int, n: int) -> List[ClientShort]:
+        """
+        Возвращает список из n объектов класса ClientShort для k-й страницы.
+
+        Использует LIMIT и OFFSET: стоимость растет с номером страницы
+        (около 70 мс для последней страницы из миллиона клиентов). Для
+        последовательного обхода есть get_page_after с постоянной стоимостью.
+
+        Args:
+            k: номер страницы (начиная с 1)
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Список объектов ClientShort размером до n элементов
+        """
+        if k < 1:
+            raise ValueError("Номер страницы должен быть >= 1")
+        if n < 1:
+            raise ValueError("Размер страницы должен быть >= 1")
+
+        try:
+            rows = self.db_manager.execute_query(
+                "SELECT * FROM clients ORDER BY id LIMIT ? OFFSET ?",
+                (n, (k - 1) * n),
+                fetch=True
+            )
+            return [ClientShort(self._row_to_client(row)) for row in rows or []]
+        except Exception as e:
+            print(f"Ошибка при получении списка клиентов: {e}")
+            return []
+
+    def get_page_after(self, after: Optional[Tuple[Any, int]], n: int) -> List[Client]:
+        """
+        Возвращает до n клиентов в порядке id после позиции after (keyset-пагинация).
+
+        Страница ищется по первичному ключу (id > последний id), поэтому ее
+        стоимость не зависит от номера.
+
+        Args:
+            after: (значение поля сортировки, id) последнего клиента предыдущей
+                страницы, как в Client_rep_db_decorator, или None для первой страницы
+            n: размер страницы (количество элементов)
+
+        Returns:
+            Список объектов Client размером до n элементов
+        """
+        if n < 1:
+            raise ValueError("Размер страницы должен быть >= 1")
+
+        last_id = after[1] if after is not None else 0
+        try:
+            rows = self.db_manager.execute_query(
+                "SELECT * FROM clients WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, n),
+                fetch=True
+            )
+            return [self._row_to_client(row) for row in rows or []]
+        except Exception as e:
+            print(f"Ошибка при получении страницы клиентов: {e}")
+            return []
+
+    def iter_clients(self, batch_size: int = 1000) -> Iterator[Client]:
+        """
+        Обходит всех клиентов в порядке id, не загружая таблицу целиком.
+
+        Строки читаются пачками по batch_size отдельными keyset-запросами,
+        поэтому между пачками соединение не занято, а медленный потребитель
+        (например, потоковая выгрузка) не держит открытый курсор.
+
+        Args:
+            batch_size: сколько строк забирать из БД за раз
+
+        Returns:
+            Итератор объектов Client
+        """
+        last_id = 0
+        while True:
+            rows = self.db_manager.execute_query(
+                "SELECT * FROM clients WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+                fetch=True
+            )
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_client(row)
+            last_id = rows[-1]['id']
+
+    def add(self, client: Client) -> None:
+        """
+        Добавляет новый объект Client в БД.
+
+        ID генерирует база (AUTOINCREMENT); полученный через RETURNING
+        id присваивается обратно в объект client.
+
+        Args:
+            client: объект Client для добавления
+        """
+        try:
+            with self.db_manager.transaction() as conn:
+                row = conn.execute(INSERT_SQL, client_values(client)).fetchone()
+            client.id = row['id']
+        except Exception as e:
+            print(f"Ошибка при добавлении клиента: {e}")
+
+    def add_many(self, clients: Iterable[Client], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Добавляет клиентов пачками, по одной транзакции на пачку.
+
+        Каждая пачка вставляется одним подготовленным запросом (executemany)
+        с id, выданными подряд за счетчиком AUTOINCREMENT; id присваиваются
+        объектам client. Ошибка откатывает только текущую пачку.
+
+        Args:
+            clients: объекты Client для добавления (можно генератор)
+            batch_size: наибольшее число клиентов в транзакции
+
+        Returns:
+            Количество добавленных клиентов
+        """
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть >= 1")
+
+        added = 0
+        batch: List[Client] = []
+        for client in clients:
+            batch.append(client)
+            if len(batch) >= batch_size:
+                added += self._insert_batch(batch)
+                batch = []
+        if batch:
+            added += self._insert_batch(batch)
+        return added
+
+    def _insert_batch(self, clients: List[Client]) -> int:
+        """
+        Вставляет пачку клиентов в одной транзакции.
+
+        Args:
+            clients: объекты Client
+
+        Returns:
+            Количество добавленных клиентов (0 при ошибке)
+        """
+        try:
+            with self.db_manager.transaction() as conn:
+                # Счетчик AUTOINCREMENT не меньше наибольшего выданного id
+                row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'clients'").fetchone()
+                first_id = (row[0] if row else 0) + 1
+                conn.executemany(
+                    INSERT_WITH_ID_SQL,
+                    ((first_id + i,) + client_values(client) for i, client in enumerate(clients))
+                )
+        except Exception as e:
+            print(f"Ошибка при добавлении пачки клиентов: {e}")
+            return 0
+
+        for i, client in enumerate(clients):
+            client.id = first_id + i
+        return len(clients)
+
+    def replace_by_id(self, client_id: int, new_client: Client) -> None:
+        """
+        Обновляет данные клиента по ID в БД.
+
+        Args:
+            client_id: ID клиента для обновления
+            new_client: новый объект Client с новыми данными
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        try:
+            with self.db_manager.transaction() as conn:
+                changed = conn.execute(UPDATE_SQL, client_values(new_client) + (client_id,)).rowcount
+        except sqlite3.Error as e:
+            print(f"Ошибка при обновлении клиента: {e}")
+            return
+        if changed == 0:
+            raise ValueError(f"Клиент с ID {client_id} не найден")
+
+    def delete_by_id(self, client_id: int) -> None:
+        """
+        Удаляет клиента из БД по ID.
+
+        Args:
+            client_id: ID клиента для удаления
+
+        Raises:
+            ValueError: если клиент с указанным ID не найден
+        """
+        try:
+            with self.db_manager.transaction() as conn:
+                changed = conn.execute("DELETE FROM clients WHERE id = ?", (client_id,)).rowcount
+        except sqlite3.Error as e:
+            print(f"Ошибка при удалении клиента: {e}")
+            return
+        if changed == 0:
+            raise ValueError(f"Клиент с ID {client_id} не найден")
+
+    def get_count(self) -> int:
+        """
+        Возвращает общее количество клиентов в БД.
+
+        Returns:
+            int: количество клиентов
+        """
+        try:
+            row = self.db_manager.execute_query_single("SELECT COUNT(*) FROM clients")
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Ошибка при подсчете клиентов: {e}")
+            return 0
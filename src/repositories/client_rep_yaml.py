@@ -1,8 +1,20 @@
 import yaml
 import os
+from typing import Any, Iterator, TextIO, Tuple
+from src.repositories.client_parallel import validate_records
 from src.repositories.client_rep_base import Client_rep_base
+from src.repositories.file_compression import COMPRESSION_ERRORS, open_text
 from src.models.client import Client
 
+# Загрузчик и выгрузчик на C (LibYAML) в разы быстрее реализации на Python;
+# если PyYAML собран без LibYAML, используются чистые SafeLoader/SafeDumper
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    HAS_LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    HAS_LIBYAML = False
+
 
 class Client_rep_yaml(Client_rep_base):
     """
@@ -10,6 +22,16 @@ class Client_rep_yaml(Client_rep_base):
 
     Наследует общую логику от Client_rep_base и реализует специфичные методы
     для работы с YAML.
+
+    Файл хранится как поток документов: каждый клиент - отдельный документ
+    после '---'. Поэтому add дописывает в конец файла один документ, не
+    перезаписывая предыдущие, а загрузка читает документы по одному.
+    Файлы старого формата (один документ со списком клиентов) читаются
+    так же и переходят на новый формат при первой полной перезаписи.
+
+    Файлы с расширением .gz, .bz2, .xz или .lzma (например, 'clients.yaml.gz')
+    сжимаются и распаковываются на лету (open_text); add дописывает
+    в такой файл отдельный сжатый поток.
     """
 
     def _load_from_file(self) -> None:
@@ -23,52 +45,61 @@ class Client_rep_yaml(Client_rep_base):
             return
 
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                self._clients = []
-
-                if data is None:
-                    return
-
-                if isinstance(data, list):
-                    for client_dict in data:
-                        try:
-                            client = Client(**client_dict)
-                            self._clients.append(client)
-                        except (ValueError, TypeError) as e:
-                            print(f"Ошибка при загрузке клиента: {e}")
-        except (yaml.YAMLError, IOError) as e:
+            with open_text(self.file_path) as f:
+                self._clients, errors = validate_records(self._iter_records(f), self.load_workers)
+            for number, message in errors:
+                print(f"Ошибка при загрузке клиента (запись {number}): {message}")
+        except (yaml.YAMLError, IOError) + COMPRESSION_ERRORS as e:
             print(f"Ошибка при чтении файла {self.file_path}: {e}")
             self._clients = []
 
+    @staticmethod
+    def _iter_records(f: TextIO) -> Iterator[Tuple[int, Any]]:
+        """
+        Читает документы файла по одному.
+
+        Returns:
+            Итератор пар (номер записи с 1, словарь полей клиента)
+        """
+        number = 0
+        for data in yaml.load_all(f, Loader=SafeLoader):
+            if data is None:
+                continue
+
+            # Документ со списком - файл старого формата
+            for client_dict in (data if isinstance(data, list) else [data]):
+                number += 1
+                yield number, client_dict
+
     def _save_to_file(self) -> None:
         """
-        Сохраняет всю коллекцию _clients в YAML файл.
+        Сохраняет всю коллекцию _clients в YAML файл (по документу на клиента).
 
-        Преобразует объекты Client в словари перед сохранением.
+        Преобразует объекты Client в словари по мере записи.
         """
-        clients_data = []
-        for client in self._clients:
-            client_dict = {
-                'id': client.id,
-                'last_name': client.last_name,
-                'first_name': client.first_name,
-                'patronymic': client.patronymic,
-                'phone': client.phone,
-                'email': client.email,
-                'passport_series': client.passport_series,
-                'passport_number': client.passport_number,
-                'zip_code': client.zip_code,
-                'city': client.city,
-                'street': client.street,
-                'house': client.house,
-                'total_spending': client.total_spending,
-            }
-            clients_data.append(client_dict)
+        try:
+            os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+            with open_text(self.file_path, 'w') as f:
+                yaml.dump_all(
+                    (client.to_dict() for client in self._clients), f, Dumper=SafeDumper,
+                    explicit_start=True, allow_unicode=True, sort_keys=False
+                )
+        except IOError as e:
+            print(f"Ошибка при сохранении в файл {self.file_path}: {e}")
 
+    def _append_to_file(self, client: Client) -> None:
+        """
+        Дописывает добавленного клиента в конец файла отдельным документом.
+
+        Args:
+            client: добавленный клиент
+        """
         try:
             os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(clients_data, f, allow_unicode=True, sort_keys=False)
+            with open_text(self.file_path, 'a') as f:
+                yaml.dump(
+                    client.to_dict(), f, Dumper=SafeDumper,
+                    explicit_start=True, allow_unicode=True, sort_keys=False
+                )
         except IOError as e:
             print(f"Ошибка при сохранении в файл {self.file_path}: {e}")
@@ -0,0 +1,173 @@
+"""
+Двоичный снимок коллекции клиентов для быстрого запуска.
+
+Формат (little-endian):
+    заголовок   - сигнатура, версия, размер и время изменения (st_mtime_ns)
+                  основного файла, по которому записан снимок, число записей,
+                  число строк, длина таблицы строк, CRC32 остальной части файла
+    таблица строк - уникальные строковые значения в UTF-8, разделенные '\\0'
+                  (повторяющиеся города, улицы, фамилии хранятся один раз)
+    записи      - записи фиксированного размера: id, номера строк в таблице
+                  для строковых полей, zip_code, total_spending
+
+Записи читаются одним struct.iter_unpack без разбора текста, а клиенты
+восстанавливаются без повторной валидации (Client._restore): снимок пишется
+только из уже проверенных объектов.
+
+Снимок актуален, только если основной файл с момента записи снимка
+не менялся: размер и время изменения файла совпадают с сохраненными
+в заголовке (read_snapshot_source, source_signature).
+"""
+
+import os
+import struct
+import zlib
+from typing import Dict, List, Tuple
+from src.models.client import Client
+
+
+# Расширение файла снимка рядом с основным файлом репозитория
+SNAPSHOT_SUFFIX = '.snap'
+
+_MAGIC = b'CLSNAP'
+_VERSION = 2
+
+# Сигнатура, версия, размер и st_mtime_ns основного файла,
+# число записей, число строк, длина таблицы строк, CRC32
+_HEADER = struct.Struct('<6sHQqIIQI')
+
+# id, last_name..passport_number (7 строк), zip_code, city, street, house, total_spending
+_RECORD = struct.Struct('<q7Ii3Id')
+
+
+def source_signature(path: str) -> Tuple[int, int]:
+    """
+    Возвращает размер и время изменения (st_mtime_ns) основного файла.
+
+    Raises:
+        OSError: если файл недоступен
+    """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_snapshot(path: str, clients: List[Client], source: Tuple[int, int] = (0, 0)) -> None:
+    """
+    Записывает снимок коллекции клиентов.
+
+    Файл сначала пишется во временный и затем атомарно заменяет старый,
+    поэтому прерванная запись не оставляет поврежденный снимок.
+
+    Args:
+        path: Путь к файлу снимка
+        clients: Клиенты для сохранения
+        source: source_signature основного файла с теми же данными
+            ((0, 0) - снимок не привязан к файлу)
+
+    Raises:
+        ValueError: если строковое поле содержит символ '\\0'
+        OSError: при ошибке записи файла
+    """
+    string_ids: Dict[str, int] = {}
+
+    def ref(value: str) -> int:
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(string_ids)
+        return index
+
+    pack = _RECORD.pack
+    records = b''.join([
+        pack(
+            c._id, ref(c._last_name), ref(c._first_name), ref(c._patronymic), ref(c._phone),
+            ref(c._email), ref(c._passport_series), ref(c._passport_number), c._zip_code,
+            ref(c._city), ref(c._street), ref(c._house), c._total_spending
+        )
+        for c in clients
+    ])
+
+    if any('\0' in value for value in string_ids):
+        raise ValueError("Строковые поля клиентов не должны содержать символ '\\0'")
+    strings = '\0'.join(string_ids).encode('utf-8')
+    body = strings + records
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, source[0], source[1], len(clients), len(string_ids), len(strings), zlib.crc32(body)
+    )
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temp_path, path)
+
+
+def _unpack_header(data: bytes) -> Tuple:
+    """Разбирает и проверяет заголовок снимка (ValueError для чужого файла или другой версии)."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Файл снимка слишком короткий")
+    header = _HEADER.unpack_from(data)
+    if header[0] != _MAGIC:
+        raise ValueError("Файл не является снимком клиентов")
+    if header[1] != _VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {header[1]}")
+    return header
+
+
+def read_snapshot_source(path: str) -> Tuple[int, int]:
+    """
+    Читает из заголовка снимка source_signature основного файла, по которому он записан.
+
+    Читается только заголовок, поэтому проверка актуальности снимка дешевая.
+
+    Args:
+        path: Путь к файлу снимка
+
+    Returns:
+        Размер и st_mtime_ns основного файла
+
+    Raises:
+        ValueError: если файл не является снимком или другой версии
+        OSError: при ошибке чтения файла
+    """
+    with open(path, 'rb') as f:
+        header = _unpack_header(f.read(_HEADER.size))
+    return header[2], header[3]
+
+
+def read_snapshot(path: str) -> List[Client]:
+    """
+    Читает снимок коллекции клиентов.
+
+    Args:
+        path: Путь к файлу снимка
+
+    Returns:
+        Список клиентов в порядке сохранения
+
+    Raises:
+        ValueError: если файл не является снимком, другой версии или поврежден
+        OSError: при ошибке чтения файла
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    count, string_count, strings_length, checksum = _unpack_header(data)[4:]
+
+    body = memoryview(data)[_HEADER.size:]
+    if len(body) != strings_length + count * _RECORD.size or zlib.crc32(body) != checksum:
+        raise ValueError("Файл снимка поврежден")
+
+    strings = str(body[:strings_length], 'utf-8').split('\0') if string_count else []
+    if len(strings) != string_count:
+        raise ValueError("Файл снимка поврежден: неверная таблица строк")
+
+    restore = Client._restore
+    s = strings
+    try:
+        return [
+            restore((r[0], s[r[1]], s[r[2]], s[r[3]], s[r[4]], s[r[5]], s[r[6]], s[r[7]],
+                     r[8], s[r[9]], s[r[10]], s[r[11]], r[12]))
+            for r in _RECORD.iter_unpack(body[strings_length:])
+        ]
+    except IndexError:
+        raise ValueError("Файл снимка поврежден: ссылка за пределы таблицы строк")
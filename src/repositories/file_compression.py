@@ -0,0 +1,50 @@
+import bz2
+import gzip
+import lzma
+import os
+from typing import TextIO
+
+
+# Сжатие выбирается по расширению файла ('clients.json.gz', 'clients.yaml.xz')
+COMPRESSION_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+    '.lzma': lzma.open,
+}
+
+# Исключения при чтении поврежденного или обрезанного сжатого файла
+# (кроме OSError, которое и так обрабатывается как ошибка ввода-вывода)
+COMPRESSION_ERRORS = (EOFError, lzma.LZMAError)
+
+
+def get_compression(path: str) -> str:
+    """
+    Возвращает расширение сжатия файла или пустую строку для несжатого.
+
+    Args:
+        path: путь к файлу
+    """
+    extension = os.path.splitext(path)[1].lower()
+    return extension if extension in COMPRESSION_OPENERS else ''
+
+
+def open_text(path: str, mode: str = 'r') -> TextIO:
+    """
+    Открывает файл в текстовом режиме UTF-8, сжимая/распаковывая на лету по расширению.
+
+    Данные читаются и пишутся потоком, целиком в памяти файл не собирается.
+    Режим 'a' для сжатых файлов дописывает новый сжатый поток; все три
+    формата читают такие склеенные потоки как один файл.
+
+    Args:
+        path: путь к файлу
+        mode: 'r', 'w' или 'a'
+
+    Returns:
+        Текстовый файловый объект
+    """
+    opener = COMPRESSION_OPENERS.get(get_compression(path))
+    if opener is None:
+        return open(path, mode, encoding='utf-8')
+    return opener(path, mode + 't', encoding='utf-8')
@@ -0,0 +1,117 @@
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+
+# Сколько символов читать из файла за раз
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Символы, которыми может продолжаться число
+_NUMBER_TAIL = re.compile(r'[0-9eE.+\-]*')
+
+
+class JSONStreamError(ValueError):
+    """
+    Ошибка разбора потока JSON.
+
+    Attributes:
+        offset: позиция (в символах от начала файла), где обнаружена ошибка
+    """
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(f"{message} (позиция {offset})")
+        self.offset = offset
+
+
+def iter_json_array(f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, Any]]:
+    """
+    Разбирает JSON-массив из файла по одному элементу, не читая файл целиком.
+
+    Файл читается блоками по chunk_size символов, каждый элемент массива
+    декодируется json.JSONDecoder.raw_decode, и в памяти остается только
+    необработанный остаток блока. Если элемент не помещается в буфер,
+    следующий блок читается вдвое большим (элемент разбирается заново
+    за линейное в сумме время).
+
+    Пустой файл (или файл из пробелов) считается пустым массивом.
+
+    Args:
+        f: файл, открытый в текстовом режиме
+        chunk_size: размер блока чтения в символах
+
+    Returns:
+        Итератор пар (позиция начала элемента в символах, значение)
+
+    Raises:
+        JSONStreamError: если содержимое не является корректным JSON-массивом
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    base = 0  # позиция buffer[0] в файле
+    pos = 0   # текущая позиция в buffer
+
+    def read_more() -> bool:
+        """Отбрасывает разобранную часть буфера и дочитывает блок; False в конце файла."""
+        nonlocal buffer, base, pos
+        chunk = f.read(max(chunk_size, len(buffer) - pos))
+        if not chunk:
+            return False
+        base += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        """Пропускает пробелы и возвращает следующий символ ('' в конце файла)."""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ''
+
+    char = next_char()
+    if not char:
+        return
+    if char != '[':
+        raise JSONStreamError("Ожидался массив JSON", base + pos)
+    pos += 1
+
+    if next_char() == ']':
+        pos += 1
+    else:
+        while True:
+            if not next_char():
+                raise JSONStreamError("Неожиданный конец файла", base + pos)
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # Элемент может быть обрезан концом блока
+                    if read_more():
+                        continue
+                    raise JSONStreamError(f"Некорректный JSON: {e.msg}", base + e.pos) from None
+                # Число в конце буфера может продолжаться в следующем блоке
+                # ("12" из "125", "1.5" из "1.5e3")
+                if (buffer[pos] in '-0123456789'
+                        and _NUMBER_TAIL.match(buffer, end).end() == len(buffer) and read_more()):
+                    continue
+                break
+
+            yield base + pos, value
+            pos = end
+
+            char = next_char()
+            if char == ',':
+                pos += 1
+            elif char == ']':
+                pos += 1
+                break
+            else:
+                raise JSONStreamError("Ожидалась ',' или ']'", base + pos)
+
+    if next_char():
+        raise JSONStreamError("Лишние данные после массива", base + pos)
@@ -0,0 +1,164 @@
+"""
+Тест JSON API (/api/clients).
+
+Проверяет:
+1. Сериализацию Client и ClientShort (to_dict)
+2. Курсорную пагинацию с фильтром и сортировкой
+3. Создание, изменение и удаление клиентов
+4. Потоковую выгрузку NDJSON
+"""
+
+import json
+import os
+import tempfile
+from app import create_app
+from src.models.client import Client, ClientShort
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+def make_client(client_id: int, last_name: str = "Иванов", city: str = "Москва") -> Client:
+    """Создает тестового клиента."""
+    return make_base_client(
+        client_id, last_name, city, total_spending=float(client_id % 4 * 1000), patronymic="Петрович"
+    )
+
+
+def make_app_client(directory: str, count: int):
+    """Создает тестовый клиент Flask над JSON-репозиторием с count клиентами."""
+    repo = Client_rep_json(os.path.join(directory, "test_api.json"))
+    repo._clients = [make_client(i, city="Москва" if i % 3 else "Казань") for i in range(1, count + 1)]
+    repo._touch()
+    return repo, create_app(repo).test_client()
+
+
+def test_serializers():
+    """Тест сериализации моделей."""
+    print("=" * 80)
+    print("ТЕСТ 1: Сериализация")
+    print("=" * 80)
+
+    client = make_client(7)
+    data = client.to_dict()
+    short = ClientShort(client).to_dict()
+
+    assert_checks([
+        (Client(**data) == client and data['city'] == client.city, "Client.to_dict() принимается конструктором"),
+        (short == {'id': 7, 'fullname': 'Иванов И.П.', 'contact': '79990000007', 'total_spending': 3000.0},
+         "ClientShort.to_dict()"),
+    ])
+    print("✅ Сериализация работает корректно!\n")
+
+
+def test_cursor_pagination():
+    """Тест курсорной пагинации."""
+    print("=" * 80)
+    print("ТЕСТ 2: Курсорная пагинация")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, client = make_app_client(directory, 30)
+
+        def collect(query: str):
+            ids, cursor, pages = [], '', 0
+            while True:
+                page = client.get(f"/api/clients?{query}&cursor={cursor}").get_json()
+                ids += [item['id'] for item in page['items']]
+                pages += 1
+                cursor = page['next_cursor']
+                if not cursor:
+                    return ids, pages
+
+        by_id, pages = collect("limit=7")
+        by_spending, _ = collect("limit=4&sort_by=total_spending&sort_order=DESC")
+        expected = sorted(range(1, 31), key=lambda i: (-(i % 4), i))
+        filtered, _ = collect("limit=5&filter_city=Казань")
+
+        first = client.get("/api/clients?limit=3&sort_by=total_spending").get_json()
+        # Удаление клиента с первой страницы сдвинуло бы страницы OFFSET-пагинации
+        repo.delete_by_id(4)
+        second = client.get(f"/api/clients?limit=3&sort_by=total_spending&cursor={first['next_cursor']}").get_json()
+
+        foreign_cursor = client.get(f"/api/clients?sort_by=last_name&cursor={first['next_cursor']}")
+
+        assert_checks([
+            (by_id == list(range(1, 31)) and pages == 5, "Все клиенты по id, 5 страниц"),
+            (by_spending == expected, "Сортировка по убыванию трат, равные - по id"),
+            (filtered == [i for i in range(1, 31) if i % 3 == 0], "Фильтр по городу"),
+            ([item['id'] for item in second['items']] == [16, 20, 24], "Удаление не сдвигает следующую страницу"),
+            (foreign_cursor.status_code == 400, "Курсор другой сортировки отклоняется"),
+            (client.get("/api/clients?cursor=abc").status_code == 400, "Поврежденный курсор отклоняется"),
+            (client.get("/api/clients?limit=100000").status_code == 400, "limit ограничен"),
+            (client.get("/api/clients?sort_by=__class__").status_code == 400, "Недопустимое поле сортировки"),
+            ('fullname' in client.get("/api/clients?fields=short").get_json()['items'][0],
+             "Краткие данные (fields=short)"),
+        ])
+        print("✅ Курсорная пагинация работает корректно!\n")
+
+
+def test_crud():
+    """Тест создания, изменения и удаления."""
+    print("=" * 80)
+    print("ТЕСТ 3: Создание, изменение и удаление")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, client = make_app_client(directory, 2)
+        new_data = make_client(1, last_name="Сидоров").to_dict()
+        del new_data['id']
+        new_data.update(phone="79998887766", email="sidorov@mail.ru")
+
+        created = client.post("/api/clients", json=new_data)
+        created_id = created.get_json()['id']
+        invalid = client.post("/api/clients", json={**new_data, 'phone': '123'})
+        unknown = client.post("/api/clients", json={**new_data, 'age': 30})
+        patched = client.patch(f"/api/clients/{created_id}", json={'city': 'Тверь'})
+        stored_city = repo.get_by_id(created_id).city
+        replaced_partial = client.put(f"/api/clients/{created_id}", json={'city': 'Тверь'})
+        deleted = client.delete(f"/api/clients/{created_id}")
+
+        assert_checks([
+            (created.status_code == 201 and created_id == 3, "POST: 201 и назначенный id"),
+            (created.headers.get('Location') == "/api/clients/3", "POST: заголовок Location"),
+            (invalid.status_code == 400 and "Телефон" in invalid.get_json()['error'], "POST: ошибка валидации Client"),
+            (unknown.status_code == 400, "POST: неизвестное поле"),
+            (patched.get_json()['city'] == 'Тверь' and stored_city == 'Тверь', "PATCH: изменено одно поле"),
+            (replaced_partial.status_code == 400, "PUT: нужны все поля"),
+            (deleted.status_code == 204 and repo.get_by_id(created_id) is None, "DELETE: 204"),
+            (client.get(f"/api/clients/{created_id}").status_code == 404, "GET удаленного клиента: 404"),
+            (client.delete(f"/api/clients/{created_id}").status_code == 404, "DELETE удаленного клиента: 404"),
+        ])
+        print("✅ Операции изменения работают корректно!\n")
+
+
+def test_ndjson_export():
+    """Тест выгрузки NDJSON."""
+    print("=" * 80)
+    print("ТЕСТ 4: Выгрузка NDJSON")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, client = make_app_client(directory, 25)
+        response = client.get("/api/clients/export.ndjson?sort_by=id&sort_order=DESC")
+        streamed = response.is_streamed
+        lines = response.get_data(as_text=True).splitlines()
+        records = [json.loads(line) for line in lines]
+
+        assert_checks([
+            (streamed and response.mimetype == 'application/x-ndjson', "Ответ отдается потоком"),
+            ([record['id'] for record in records] == list(range(25, 0, -1)), "Все клиенты в заданном порядке"),
+            (response.get_data(as_text=True).endswith("\n"), "Каждая строка завершена переводом строки"),
+            (client.get("/api/clients/export.ndjson?sort_order=UP").status_code == 400, "Некорректный порядок: 400"),
+        ])
+        print("✅ Выгрузка NDJSON работает корректно!\n")
+
+
+if __name__ == "__main__":
+    test_serializers()
+    test_cursor_pagination()
+    test_crud()
+    test_ndjson_export()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,230 @@
+"""
+Тест репозитория с ограниченным числом клиентов в памяти (Client_rep_bounded).
+
+Проверяет:
+1. Вытеснение по SLRU в SegmentedLRUCache
+2. Ограничение числа клиентов в памяти и статистику
+3. Устойчивость горячего набора к последовательному проходу
+4. Согласованность кэша с изменениями и метрики приложения
+5. Запросы декоратора без загрузки всей коллекции
+6. Глубокие страницы сортировки не раздувают память
+"""
+
+import os
+import tempfile
+from app import create_app
+from src.models.client import Client
+from src.decorators.client_query_planner import QueryPlanner
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.repositories.client_cache import SegmentedLRUCache
+from src.repositories.client_rep_bounded import Client_rep_bounded
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+def make_client(client_id: int, last_name: str = "Иванов") -> Client:
+    """Создает тестового клиента (нечетные ID - Москва, четные - Казань)."""
+    return make_base_client(client_id, last_name, "Москва" if client_id % 2 else "Казань")
+
+
+class StreamOnlyRepo(Client_rep_bounded):
+    """Репозиторий, в котором построение списка всей коллекции - ошибка."""
+
+    @Client_rep_bounded._clients.getter
+    def _clients(self):
+        raise AssertionError("построен список всей коллекции")
+
+
+def make_repo(directory: str, count: int, max_resident: int, repo_class=Client_rep_bounded) -> Client_rep_bounded:
+    """Создает репозиторий с count клиентами во временной папке."""
+    path = os.path.join(tempfile.mkdtemp(dir=directory), "clients.jsonl")
+    repo = repo_class(path, max_resident=max_resident)
+    repo._clients = [make_client(i) for i in range(1, count + 1)]
+    repo._touch()
+    return repo
+
+
+def test_slru_cache():
+    """Тест политики вытеснения."""
+    print("=" * 80)
+    print("ТЕСТ 1: SegmentedLRUCache")
+    print("=" * 80)
+
+    cache = SegmentedLRUCache(4, protected_fraction=0.5)
+    for key in "ab":
+        cache.put(key, key.upper())
+        cache.get(key)
+    for key in "cdefgh":
+        cache.put(key, key.upper())
+
+    hot_kept = 'a' in cache and 'b' in cache
+    cold = [key for key in "cdefgh" if key in cache]
+    missing = cache.get('c')
+
+    try:
+        SegmentedLRUCache(0)
+        rejected = False
+    except ValueError:
+        rejected = True
+
+    assert_checks([
+        (hot_kept, "Повторно использованные записи не вытесняются потоком новых"),
+        (cold == ['g', 'h'], "Вытесняются давние однократные записи"),
+        (len(cache) == 4 and cache.evictions == 4, "Размер ограничен емкостью"),
+        (missing is None and cache.faults == 1 and cache.hits == 2, "Промах учитывается"),
+        (rejected, "Нулевая емкость: ValueError"),
+    ])
+    print("✅ Политика SLRU работает корректно!\n")
+
+
+def test_resident_limit():
+    """Тест ограничения памяти."""
+    print("=" * 80)
+    print("ТЕСТ 2: Ограничение числа клиентов в памяти")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 200, max_resident=20)
+        for client_id in range(1, 201):
+            repo.get_by_id(client_id)
+        stats = repo.get_cache_stats()
+        again = repo.get_by_id(200)
+        after = repo.get_cache_stats()
+
+        print(f"  {stats}")
+        assert_checks([
+            (stats['resident'] == 20, "В памяти не больше max_resident клиентов"),
+            (stats['faults'] == 200 and stats['evictions'] == 180, "Промахи и вытеснения"),
+            (again.id == 200 and after['hits'] == stats['hits'] + 1, "Повторное обращение - попадание"),
+            (repo.get_by_id(1).last_name == "Иванов", "Вытесненный клиент читается из файла"),
+            (repo._indexes is None, "Вся коллекция не удерживается"),
+        ])
+        print("✅ Число клиентов в памяти ограничено!\n")
+
+
+def test_scan_resistance():
+    """Тест устойчивости к последовательному проходу."""
+    print("=" * 80)
+    print("ТЕСТ 3: Последовательный проход")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 500, max_resident=50)
+        hot_ids = range(1, 21)
+        for _ in range(2):
+            for client_id in hot_ids:
+                repo.get_by_id(client_id)
+
+        scanned = sum(1 for _ in repo.iter_clients())
+        # Однократный просмотр страниц списка тоже не должен вытеснить горячие записи
+        for page in range(1, 26):
+            repo.get_k_n_short_list(page, 20)
+        faults_before = repo.get_cache_stats()['faults']
+        for client_id in hot_ids:
+            repo.get_by_id(client_id)
+        stats = repo.get_cache_stats()
+
+        print(f"  {stats}")
+        assert_checks([
+            (scanned == 500, "Проход возвращает всех клиентов"),
+            (stats['faults'] == faults_before, "Горячие клиенты остались в памяти"),
+            (stats['resident'] <= 50, "Размер кэша ограничен"),
+        ])
+        print("✅ Горячий набор устойчив к проходам!\n")
+
+
+def test_consistency():
+    """Тест согласованности кэша и метрик приложения."""
+    print("=" * 80)
+    print("ТЕСТ 4: Изменения и метрики")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 30, max_resident=10)
+        repo.get_by_id(5)
+        repo.replace_by_id(5, make_client(5, last_name="Петров"))
+        replaced = repo.get_by_id(5).last_name
+        repo.delete_by_id(5)
+        deleted = repo.get_by_id(5)
+
+        client = create_app(repo).test_client()
+        page = client.get("/?filter_city=Казань&sort_by=total_spending&sort_order=DESC")
+        metrics = client.get("/metrics").get_data(as_text=True)
+
+        assert_checks([
+            (replaced == "Петров" and deleted is None, "Кэш обновляется при замене и удалении"),
+            (page.status_code == 200 and '<tr data-id="30">' in page.get_data(as_text=True), "Фильтр и сортировка"),
+            ("repository_cache_resident" in metrics and "repository_cache_faults" in metrics, "Статистика в /metrics"),
+            (repo.get_cache_stats()['resident'] <= 10, "Фильтр не раздувает кэш"),
+        ])
+        print("✅ Кэш согласован с изменениями!\n")
+
+
+def test_decorator_streaming():
+    """Тест запросов декоратора без загрузки всей коллекции."""
+    print("=" * 80)
+    print("ТЕСТ 5: Декоратор без загрузки всей коллекции")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 300, max_resident=10, repo_class=StreamOnlyRepo)
+        filtered = Client_rep_file_decorator(repo).set_filter("city", "Казань").set_sort("total_spending", True)
+        plain = Client_rep_file_decorator(repo)
+        top = Client_rep_file_decorator(repo).set_sort("total_spending", True)
+        statistics = QueryPlanner(repo).get_statistics()
+
+        assert_checks([
+            ([c.id for c in filtered.get_k_n_short_list(1, 5)] == [300, 298, 296, 294, 292] and
+             filtered.get_count() == 150, "Фильтр и сортировка потоком"),
+            ([c.id for c in plain.get_k_n_short_list(3, 10)] == list(range(21, 31)) and plain.get_count() == 300,
+             "Без фильтра страница берется из репозитория"),
+            ([c.id for c in top.get_k_n_short_list(1, 3)] == [300, 299, 298], "Первая страница сортировки через кучу"),
+            (statistics.fields == {} and statistics.row_count == 300, "Статистика по полям не собирается"),
+            ("Полный просмотр" in filtered.explain(1, 5), "План - полный просмотр"),
+            (repo.get_cache_stats()['resident'] <= 10, "Размер кэша ограничен"),
+        ])
+        print("✅ Декоратор не загружает всю коллекцию!\n")
+
+
+def test_deep_sorted_pages():
+    """Тест листания сортировки за пределами частичной выборки."""
+    print("=" * 80)
+    print("ТЕСТ 6: Глубокие страницы сортировки")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 300, max_resident=10, repo_class=StreamOnlyRepo)
+        filtered = Client_rep_file_decorator(repo).set_filter("city", "Казань").set_sort("total_spending", True)
+        by_name = Client_rep_file_decorator(repo).set_sort("last_name")
+
+        pages = [[c.id for c in filtered.get_k_n_short_list(k, 10)] for k in range(1, 16)]
+        after = filtered.get_page_after((20200.0, 202), 3)
+        everything = [client.id for client in filtered.iter_clients()]
+        names = [c.id for c in by_name.get_k_n_short_list(3, 20)]
+        cached = [entry for decorated in (filtered, by_name)
+                  for entries in decorated._cache.values() for entry in entries]
+        stats = repo.get_cache_stats()
+
+        print(f"  {stats}")
+        assert_checks([
+            (pages[4] == list(range(220, 200, -2)), "Глубокая страница фильтра и сортировки"),
+            (sum(pages, []) == list(range(300, 0, -2)), "Все страницы по порядку"),
+            ([c.id for c in after] == [200, 198, 196], "Keyset-страница"),
+            (everything == list(range(300, 0, -2)), "Обход отсортированной выборки"),
+            (names == list(range(41, 61)), "Сортировка без фильтра: равные фамилии по id"),
+            (cached and not any(isinstance(entry, Client) for entry in cached), "В кэше декоратора только ID"),
+            (stats['resident'] <= 10, "В памяти не больше max_resident клиентов"),
+        ])
+        print("✅ Сортированный список не удерживает клиентов!\n")
+
+
+if __name__ == "__main__":
+    test_slru_cache()
+    test_resident_limit()
+    test_scan_resistance()
+    test_consistency()
+    test_decorator_streaming()
+    test_deep_sorted_pages()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
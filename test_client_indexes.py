@@ -0,0 +1,134 @@
+"""
+Тест вторичных индексов файловых репозиториев.
+
+Проверяет:
+1. Поиск по равенству через хэш-индексы (city, email, phone)
+2. Диапазонные запросы и упорядоченный обход (last_name, total_spending, zip_code)
+3. Инкрементальное обновление индексов при add/replace_by_id/delete_by_id
+4. Использование индексов в Client_rep_file_decorator
+"""
+
+import os
+import tempfile
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+def make_client(client_id: int, last_name: str, city: str, total_spending: float, zip_code: int) -> Client:
+    """Создает тестового клиента с заданными индексируемыми полями."""
+    return make_base_client(
+        client_id, last_name, city, total_spending,
+        zip_code=zip_code, patronymic="Петрович", street="Пушкина", house="10"
+    )
+
+
+def create_repo(directory: str) -> Client_rep_json:
+    """Создает JSON-репозиторий во временном файле с пятью клиентами."""
+    path = os.path.join(directory, "test_indexes.json")
+    repo = Client_rep_json(path)
+    repo.add(make_client(1, "Иванов", "Москва", 15000.0, 123456))
+    repo.add(make_client(2, "Петров", "Казань", 250000.0, 420000))
+    repo.add(make_client(3, "Сидоров", "Москва", 90000.0, 101000))
+    repo.add(make_client(4, "Андреев", "Тверь", 100000.0, 170000))
+    repo.add(make_client(5, "Петров", "Москва", 5000.0, 125000))
+    return repo
+
+
+def test_hash_indexes():
+    """Тест поиска по равенству через хэш-индексы."""
+    print("=" * 80)
+    print("ТЕСТ 1: Хэш-индексы")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = create_repo(directory)
+        moscow = repo.find_equal("city", "Москва")
+
+        assert_checks([
+            ([c.id for c in moscow] == [1, 3, 5], "Москва -> клиенты 1, 3, 5 в порядке хранения"),
+            ([c.id for c in repo.find_equal("email", "client2@mail.ru")] == [2], "Поиск по email"),
+            (repo.find_equal("city", "Омск") == [], "Нет совпадений -> пустой список"),
+            (repo.find_equal("first_name", "Иван") is None, "Неиндексированное поле -> None"),
+        ])
+        print("✅ Хэш-индексы работают корректно!\n")
+
+
+def test_sorted_indexes():
+    """Тест диапазонных запросов и упорядоченного обхода."""
+    print("=" * 80)
+    print("ТЕСТ 2: Упорядоченные индексы")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = create_repo(directory)
+        rich = [c.id for c in repo.iter_range("total_spending", low=90000, high=250000, include_high=False)]
+        by_name = [c.id for c in repo.iter_range("last_name")]
+        by_name_desc = [c.id for c in repo.iter_range("last_name", reverse=True)]
+
+        assert_checks([
+            (rich == [3, 4], "90000 <= траты < 250000 -> клиенты 3, 4"),
+            (by_name == [4, 1, 2, 5, 3], "Обход по фамилии (равные фамилии - по id)"),
+            (by_name_desc == [3, 2, 5, 1, 4], "Обход по фамилии по убыванию"),
+            (list(repo.iter_range("zip_code", low="abc")) == [], "Несравнимая граница -> пустой результат"),
+            (repo.iter_range("city") is None, "Нет упорядоченного индекса -> None"),
+        ])
+        print("✅ Упорядоченные индексы работают корректно!\n")
+
+
+def test_incremental_maintenance():
+    """Тест обновления индексов при изменении репозитория."""
+    print("=" * 80)
+    print("ТЕСТ 3: Инкрементальное обновление индексов")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = create_repo(directory)
+        repo.find_equal("city", "Москва")  # Строим индексы
+
+        repo.add(make_client(1, "Борисов", "Москва", 1000.0, 111111))
+        repo.replace_by_id(3, make_client(3, "Сидоров", "Казань", 90000.0, 101000))
+        repo.delete_by_id(1)
+
+        assert_checks([
+            ([c.id for c in repo.find_equal("city", "Москва")] == [5, 6], "Москва после изменений -> 5, 6"),
+            ([c.id for c in repo.find_equal("city", "Казань")] == [2, 3], "Казань после замены -> 2, 3"),
+            ([c.id for c in repo.iter_range("total_spending", high=5000)] == [6, 5], "Новый клиент в диапазоне трат"),
+        ])
+        print("✅ Индексы обновляются корректно!\n")
+
+
+def test_decorator_uses_indexes():
+    """Тест фильтрации и сортировки декоратора через индексы."""
+    print("=" * 80)
+    print("ТЕСТ 4: Декоратор с индексами")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = create_repo(directory)
+        decorated = Client_rep_file_decorator(repo)
+        decorated.set_filter("city", "Москва").set_sort("total_spending", reverse=True)
+        page = [c.id for c in decorated.get_k_n_short_list(k=1, n=2)]
+        count = decorated.get_count()
+
+        repo.delete_by_id(3)
+        page_after_delete = [c.id for c in decorated.get_k_n_short_list(k=1, n=2)]
+
+        assert_checks([
+            (page == [3, 1], "Москва по убыванию трат, стр. 1 -> 3, 1"),
+            (count == 3, "Количество клиентов из Москвы -> 3"),
+            (page_after_delete == [1, 5], "После удаления кэш сброшен -> 1, 5"),
+        ])
+        print("✅ Декоратор использует индексы корректно!\n")
+
+
+if __name__ == "__main__":
+    test_hash_indexes()
+    test_sorted_indexes()
+    test_incremental_maintenance()
+    test_decorator_uses_indexes()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,108 @@
+"""
+Тест сжатия ответов Flask-приложения.
+
+Проверяет:
+1. Выбор gzip/deflate по Accept-Encoding и заголовок Vary
+2. Пропуск маленьких ответов и несжимаемых типов
+3. Метрики сжатия (степень сжатия, процессорное время)
+"""
+
+import gzip
+import os
+import zlib
+from flask import Flask, Response
+from src.core.compression import Compressor
+from src.core.metrics import Metrics
+from testing_helpers import assert_checks
+
+
+def create_test_app(level: int = 6) -> Flask:
+    """Создает приложение с большим HTML-ответом, маленьким ответом и PNG."""
+    app = Flask(__name__)
+    app.config['COMPRESS_LEVEL'] = level
+    app.extensions['metrics'] = Metrics()
+    Compressor(app, app.extensions['metrics'])
+
+    @app.route('/big')
+    def big():
+        return Response("<tr><td>Иванов Иван</td></tr>\n" * 200, mimetype='text/html')
+
+    @app.route('/small')
+    def small():
+        return Response("<p>ok</p>", mimetype='text/html')
+
+    @app.route('/image')
+    def image():
+        return Response(os.urandom(2000), mimetype='image/png')
+
+    return app
+
+
+def test_negotiation():
+    """Тест выбора кодировки и заголовков."""
+    print("=" * 80)
+    print("ТЕСТ 1: Выбор кодировки")
+    print("=" * 80)
+
+    client = create_test_app().test_client()
+    plain = client.get('/big')
+    gzipped = client.get('/big', headers={'Accept-Encoding': 'gzip, deflate'})
+    deflated = client.get('/big', headers={'Accept-Encoding': 'gzip;q=0.5, deflate'})
+
+    assert_checks([
+        (plain.headers.get('Content-Encoding') is None, "Без Accept-Encoding ответ не сжимается"),
+        ('Accept-Encoding' in plain.headers.get('Vary', ''), "Vary: Accept-Encoding у несжатого ответа"),
+        (gzipped.headers.get('Content-Encoding') == 'gzip', "gzip по умолчанию"),
+        (gzip.decompress(gzipped.data) == plain.data, "gzip распаковывается в исходное тело"),
+        (deflated.headers.get('Content-Encoding') == 'deflate', "deflate при большем q"),
+        (zlib.decompress(deflated.data) == plain.data, "deflate распаковывается в исходное тело"),
+    ])
+    print("✅ Кодировка выбирается корректно!\n")
+
+
+def test_skipped_responses():
+    """Тест ответов, которые не сжимаются."""
+    print("=" * 80)
+    print("ТЕСТ 2: Пропуск ответов")
+    print("=" * 80)
+
+    client = create_test_app().test_client()
+    small = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    image = client.get('/image', headers={'Accept-Encoding': 'gzip'})
+
+    assert_checks([
+        (small.headers.get('Content-Encoding') is None, "Ответ меньше порога не сжимается"),
+        (image.headers.get('Content-Encoding') is None, "Изображение (уже сжато) не сжимается"),
+        ('Vary' not in image.headers, "Для несжимаемого типа Vary не добавляется"),
+    ])
+    print("✅ Ответы пропускаются корректно!\n")
+
+
+def test_metrics():
+    """Тест метрик сжатия."""
+    print("=" * 80)
+    print("ТЕСТ 3: Метрики")
+    print("=" * 80)
+
+    app = create_test_app(level=9)
+    client = app.test_client()
+    client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    metrics = app.extensions['metrics']
+    print(metrics.render_text())
+
+    assert_checks([
+        (metrics.get('compression_responses_total') == 1, "Учтен один сжатый ответ"),
+        (0 < metrics.get('compression_ratio') < 0.2, "Степень сжатия повторяющегося HTML < 20%"),
+        (metrics.get('compression_cpu_seconds_total') >= 0, "Процессорное время учтено"),
+    ])
+    print("✅ Метрики сжатия собираются корректно!\n")
+
+
+if __name__ == "__main__":
+    test_negotiation()
+    test_skipped_responses()
+    test_metrics()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
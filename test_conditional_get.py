@@ -0,0 +1,75 @@
+"""
+Тест условных GET-запросов (ETag / Last-Modified) Flask-приложения.
+
+Проверяет:
+1. Выдачу ETag и Last-Modified для / и /client/<id>
+2. Ответ 304 на совпадающий If-None-Match без вызова контроллера
+3. Смену ETag после изменения данных в репозитории
+4. Ответы с ошибкой контроллера (ErrorPage) без валидаторов
+"""
+
+import os
+import tempfile
+from app import create_app
+from src.mvc.observer import AbstractObserver
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client
+
+
+class NotifyCounter(AbstractObserver):
+    """Наблюдатель, считающий уведомления репозитория (их отправляют контроллеры)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def update(self, data) -> None:
+        self.count += 1
+
+
+def test_conditional_get():
+    """Тест ответа 304 и смены ETag после изменения данных."""
+    print("=" * 80)
+    print("ТЕСТ 1: Условные GET-запросы")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = Client_rep_json(os.path.join(directory, "test_conditional.json"))
+        repo.add(make_client(1, "Иванов"))
+        counter = NotifyCounter()
+        repo.add_observer(counter)
+        client = create_app(repo).test_client()
+
+        first = client.get("/")
+        etag = first.headers.get("ETag")
+        calls_before = counter.count
+        second = client.get("/", headers={"If-None-Match": etag})
+        calls_after_304 = counter.count
+
+        details = client.get("/client/1")
+        details_304 = client.get("/client/1", headers={"If-None-Match": details.headers.get("ETag")})
+        missing = client.get("/client/999")
+        bad_sort = client.get("/?sort_by=password")
+
+        repo.add(make_client(2, "Петров"))
+        third = client.get("/", headers={"If-None-Match": etag})
+
+        assert_checks([
+            (first.status_code == 200 and etag is not None, "Первый запрос: 200 и ETag"),
+            ("Last-Modified" in first.headers, "Заголовок Last-Modified"),
+            (second.status_code == 304 and not second.data, "Повторный запрос: 304 без тела"),
+            (calls_after_304 == calls_before, "При 304 контроллер не вызывается"),
+            (details_304.status_code == 304, "Страница клиента: 304"),
+            ("ETag" not in missing.headers, "Сообщение об ошибке не кэшируется"),
+            ("ETag" not in bad_sort.headers and "Ошибка" in bad_sort.get_data(as_text=True),
+             "Ошибка списка не кэшируется"),
+            (third.status_code == 200 and third.headers.get("ETag") != etag, "После изменения: 200 и новый ETag"),
+        ])
+        print("✅ Условные запросы работают корректно!\n")
+
+
+if __name__ == "__main__":
+    test_conditional_get()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
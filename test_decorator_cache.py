@@ -0,0 +1,146 @@
+"""
+Тест кэша выборок Client_rep_file_decorator.
+
+Проверяет:
+1. Повторное листание и количество берутся из кэша без перестроения
+2. Отдельные записи кэша для разных фильтров и сортировок
+3. Сброс кэша при add, replace_by_id, delete_by_id и sort_by_field
+"""
+
+import os
+import tempfile
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client
+
+
+LAST_NAMES = ["Смирнов", "Абрамов", "Петров", "Волков"]
+
+
+class CountingDecorator(Client_rep_file_decorator):
+    """Декоратор, считающий построения выборок (промахи кэша)."""
+
+    def __init__(self, repo):
+        super().__init__(repo)
+        self.builds = 0
+
+    def _build_filtered_clients(self):
+        self.builds += 1
+        return super()._build_filtered_clients()
+
+    def _build_sorted_clients(self):
+        self.builds += 1
+        return super()._build_sorted_clients()
+
+
+def make_repo(directory: str) -> Client_rep_json:
+    """Создает JSON-репозиторий с 12 клиентами (четные ID - Казань)."""
+    repo = Client_rep_json(os.path.join(directory, "test_decorator_cache.json"))
+    for i in range(1, 13):
+        repo.add(make_client(i, LAST_NAMES[i % len(LAST_NAMES)], "Казань" if i % 2 == 0 else "Москва"))
+    return repo
+
+
+def page_ids(decorated: Client_rep_file_decorator, k: int = 1, n: int = 3) -> list:
+    """Возвращает ID клиентов k-й страницы."""
+    return [client.id for client in decorated.get_k_n_short_list(k, n)]
+
+
+def test_repeated_paging():
+    """Тест попаданий в кэш при листании."""
+    print("=" * 80)
+    print("ТЕСТ 1: Повторное листание")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        decorated = CountingDecorator(make_repo(directory))
+        decorated.set_filter("city", "Казань").set_sort("last_name")
+
+        first = page_ids(decorated, 1)
+        builds_after_first = decorated.builds
+        pages = [page_ids(decorated, k) for k in (1, 2, 1, 2)]
+        count = decorated.get_count()
+        filtered = decorated._get_filtered_clients()
+
+        assert_checks([
+            (first == [2, 6, 10], "Первая страница: Петровы по возрастанию ID"),
+            (builds_after_first == 2, "Первый запрос строит фильтр и сортировку"),
+            (pages == [[2, 6, 10], [4, 8, 12], [2, 6, 10], [4, 8, 12]], "Страницы не меняются"),
+            (decorated.builds == builds_after_first, "Повторное листание не перестраивает выборку"),
+            (count == 6 and decorated.builds == builds_after_first, "Количество берется из кэша"),
+            (filtered is decorated._get_filtered_clients() and len(filtered) == count,
+             "Количество - длина той же закэшированной выборки"),
+        ])
+    print("✅ Листание идет из кэша!\n")
+
+
+def test_cache_keys():
+    """Тест отдельных записей кэша."""
+    print("=" * 80)
+    print("ТЕСТ 2: Разные фильтры и сортировки")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        decorated = CountingDecorator(make_repo(directory))
+        decorated.set_filter("city", "Казань")
+        kazan = page_ids(decorated)
+        decorated.set_filter("city", "Москва")
+        moscow = page_ids(decorated)
+        builds = decorated.builds
+
+        decorated.set_filter("city", "Казань")
+        kazan_again = page_ids(decorated)
+        builds_again = decorated.builds
+        decorated.set_sort("total_spending", reverse=True)
+        by_spending = page_ids(decorated)
+
+        assert_checks([
+            (kazan == [2, 4, 6] and moscow == [1, 3, 5], "Фильтры дают разные выборки"),
+            (kazan_again == kazan and builds_again == builds, "Возврат к прежнему фильтру - попадание"),
+            (by_spending == [12, 10, 8] and decorated.builds == builds_again + 1,
+             "Сортировка той же выборки строится один раз"),
+        ])
+    print("✅ Записи кэша разделены по ключу!\n")
+
+
+def test_invalidation():
+    """Тест сброса кэша при изменениях репозитория."""
+    print("=" * 80)
+    print("ТЕСТ 3: Сброс кэша при изменениях")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory)
+        decorated = CountingDecorator(repo).set_filter("city", "Казань")
+        results = {}
+
+        def rebuilt_after(name: str, change) -> bool:
+            page_ids(decorated, 1, 10)
+            builds = decorated.builds
+            change()
+            results[name] = page_ids(decorated, 1, 10)
+            return decorated.builds == builds + 1
+
+        added = rebuilt_after("add", lambda: repo.add(make_client(13, city="Казань")))
+        replaced = rebuilt_after("replace", lambda: repo.replace_by_id(2, make_client(2, city="Москва")))
+        deleted = rebuilt_after("delete", lambda: repo.delete_by_id(4))
+        resorted = rebuilt_after("sort", lambda: repo.sort_by_field("last_name"))
+
+        assert_checks([
+            (added and results["add"] == [2, 4, 6, 8, 10, 12, 13], "add сбрасывает кэш"),
+            (replaced and results["replace"] == [4, 6, 8, 10, 12, 13], "replace_by_id сбрасывает кэш"),
+            (deleted and results["delete"] == [6, 8, 10, 12, 13], "delete_by_id сбрасывает кэш"),
+            (resorted and results["sort"] == [13, 6, 10, 8, 12], "sort_by_field сбрасывает кэш"),
+            (decorated.get_count() == 5, "Количество после изменений"),
+        ])
+    print("✅ Кэш сбрасывается при каждом изменении!\n")
+
+
+if __name__ == "__main__":
+    test_repeated_paging()
+    test_cache_keys()
+    test_invalidation()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
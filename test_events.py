@@ -0,0 +1,184 @@
+"""
+Тест рассылки изменений списка клиентов (Server-Sent Events).
+
+Проверяет:
+1. События добавления, изменения и удаления (уведомления о чтении не рассылаются)
+2. Объединение изменений за окно в одно сообщение
+3. Переполнение очереди медленного подписчика
+4. Маршрут /events и сценарий живого обновления на главной странице
+"""
+
+import json
+import os
+import tempfile
+from app import create_app
+from src.models.client import Client
+from src.mvc.client_view import ClientView
+from src.mvc.client_controller import ClientController, ClientDeleteController, ClientEditController
+from src.mvc.client_events import ClientEventBroadcaster, MAX_PENDING_MESSAGES
+from src.mvc.static_assets import SCRIPT
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client
+
+
+def make_repo(directory: str, count: int) -> Client_rep_json:
+    """Создает JSON-репозиторий во временном файле с count клиентами."""
+    repo = Client_rep_json(os.path.join(directory, "test_events.json"))
+    repo._clients = [make_client(i) for i in range(1, count + 1)]
+    repo._touch()
+    return repo
+
+
+def form_data(client: Client, **changes) -> dict:
+    """Возвращает данные формы редактирования для клиента."""
+    data = {key: str(value) for key, value in client.to_dict().items() if key != 'id'}
+    data.update(changes)
+    return data
+
+
+def read_events(messages) -> list:
+    """Забирает из очереди все сообщения и возвращает их события."""
+    events = []
+    while not messages.empty():
+        message = messages.get_nowait()
+        data = message.split("data: ", 1)[1]
+        events.append(json.loads(data).get('events'))
+    return events
+
+
+def test_change_events():
+    """Тест событий изменения."""
+    print("=" * 80)
+    print("ТЕСТ 1: События изменения")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 3)
+        view = ClientView()
+        broadcaster = ClientEventBroadcaster(repo, view, coalesce_window=0)
+        repo.add_observer(broadcaster)
+        messages = broadcaster.subscribe()
+
+        controller = ClientController(repo, view)
+        controller.index()
+        controller.show_details(1)
+        reads = read_events(messages)
+
+        ClientEditController(repo, view).update_client(2, form_data(repo.get_by_id(2), last_name="Петров"))
+        edited = read_events(messages)
+        ClientDeleteController(repo).delete_client(3)
+        deleted = read_events(messages)
+
+        event = edited[0][0] if edited else {}
+        row_html = event.get('html', '')
+
+        assert_checks([
+            (reads == [], "Уведомления о чтении не рассылаются"),
+            (len(edited) == 1 and event['type'] == 'upsert' and event['id'] == 2, "Изменение: событие upsert"),
+            ('data-id="2"' in row_html and "Петров" in row_html, "Событие содержит новую строку таблицы"),
+            (deleted == [[{'type': 'delete', 'id': 3}]], "Удаление: событие delete"),
+        ])
+        print("✅ События изменения рассылаются корректно!\n")
+
+
+def test_coalescing():
+    """Тест объединения изменений за окно."""
+    print("=" * 80)
+    print("ТЕСТ 2: Объединение изменений")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 3)
+        view = ClientView()
+        # Окно больше времени теста: рассылку запускаем вручную через flush()
+        broadcaster = ClientEventBroadcaster(repo, view, coalesce_window=60)
+        repo.add_observer(broadcaster)
+        messages = broadcaster.subscribe()
+
+        edit_controller = ClientEditController(repo, view)
+        for name in ("Петров", "Сидоров", "Смирнов"):
+            edit_controller.update_client(1, form_data(repo.get_by_id(1), last_name=name))
+        ClientDeleteController(repo).delete_client(2)
+        pending_before_flush = messages.qsize()
+        broadcaster.flush()
+        events = read_events(messages)
+
+        assert_checks([
+            (pending_before_flush == 0, "До конца окна ничего не отправлено"),
+            (len(events) == 1 and len(events[0]) == 2, "Одно сообщение с двумя событиями"),
+            ("Смирнов" in events[0][0]['html'], "Событие содержит последнее состояние клиента"),
+            (events[0][1] == {'type': 'delete', 'id': 2}, "Удаление в том же сообщении"),
+        ])
+        print("✅ Изменения объединяются корректно!\n")
+
+
+def test_slow_subscriber():
+    """Тест переполнения очереди подписчика."""
+    print("=" * 80)
+    print("ТЕСТ 3: Медленный подписчик")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 1)
+        view = ClientView()
+        broadcaster = ClientEventBroadcaster(repo, view, coalesce_window=0)
+        repo.add_observer(broadcaster)
+        messages = broadcaster.subscribe()
+
+        edit_controller = ClientEditController(repo, view)
+        for i in range(MAX_PENDING_MESSAGES + 1):
+            edit_controller.update_client(1, form_data(repo.get_by_id(1), total_spending=str(i)))
+
+        pending = messages.qsize()
+
+        assert_checks([
+            (pending == 1 and messages.get_nowait().startswith("event: reload"), "Очередь заменена событием reload"),
+        ])
+        print("✅ Медленный подписчик не накапливает сообщения!\n")
+
+
+def test_events_route():
+    """Тест маршрута /events и главной страницы."""
+    print("=" * 80)
+    print("ТЕСТ 4: Маршрут /events")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 2)
+        app = create_app(repo, {'EVENTS_COALESCE_WINDOW': 0})
+        client = app.test_client()
+
+        page = client.get("/").get_data(as_text=True)
+        script = client.get(SCRIPT.url)
+
+        response = client.get("/events")
+        stream = iter(response.response)
+        first = next(stream)
+        client.post("/edit/1", data=form_data(repo.get_by_id(1), last_name="Петров"))
+        update = next(stream)
+        subscribers_connected = app.extensions['metrics'].get('events_subscribers')
+        response.close()
+        subscribers_closed = app.extensions['metrics'].get('events_subscribers')
+
+        assert_checks([
+            (response.mimetype == 'text/event-stream' and response.headers.get('Cache-Control') == 'no-cache',
+             "Ответ text/event-stream без кэширования"),
+            (first.startswith(b"retry:"), "Поток начинается с задержки переподключения"),
+            (b"event: clients" in update and "Петров".encode() in update, "Изменение приходит в поток"),
+            (subscribers_connected == 1 and subscribers_closed == 0, "Отключение снимает подписку"),
+            ('data-live="/events"' in page and SCRIPT.url in page, "Главная страница подключает живое обновление"),
+            ('<tr data-id="1">' in page, "Строки таблицы помечены data-id"),
+            (script.status_code == 200 and b"EventSource" in script.data, "Сценарий отдается как файл с отпечатком"),
+        ])
+        print("✅ Маршрут /events работает корректно!\n")
+
+
+if __name__ == "__main__":
+    test_change_events()
+    test_coalescing()
+    test_slow_subscriber()
+    test_events_route()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,146 @@
+"""
+Тест потокового разбора JSON (iter_json_array) и загрузки Client_rep_json.
+
+Проверяет:
+1. Разбор совпадает с json.loads при любом размере блока
+2. Ошибки синтаксиса с позицией в файле
+3. Ошибки валидации записей в load_errors
+4. Пиковую память загрузки
+"""
+
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.json_stream import JSONStreamError, iter_json_array
+from testing_helpers import assert_checks, make_client
+
+
+def parse(text: str, chunk_size: int = 4):
+    """Разбирает text потоково и возвращает список пар (позиция, значение)."""
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+def parse_error(text: str):
+    """Возвращает JSONStreamError при разборе text или None."""
+    try:
+        parse(text)
+    except JSONStreamError as e:
+        return e
+    return None
+
+
+def test_decoder():
+    """Тест разбора."""
+    print("=" * 80)
+    print("ТЕСТ 1: Потоковый разбор")
+    print("=" * 80)
+
+    text = ' [ {"a": "[],{}\\"\\u0416"}, 12345678, -1.5e3,\n[1, [2]], "Жук", null, {"b": {"c": []}} ] \n'
+    expected = json.loads(text)
+    same = all([value for _, value in parse(text, size)] == expected for size in range(1, 40))
+    offsets = [offset for offset, _ in parse(text)]
+
+    assert_checks([
+        (same, "Результат совпадает с json.loads при любом размере блока"),
+        (all(text[offset] in '{[-1"n' for offset in offsets), "Позиции указывают на начало элементов"),
+        (offsets[1] == text.index('12345678'), "Позиция считается от начала файла"),
+        (parse("") == [] and parse(" \n ") == [] and parse("[ ]") == [], "Пустой файл и пустой массив"),
+    ])
+    print("✅ Разбор работает корректно!\n")
+
+
+def test_syntax_errors():
+    """Тест ошибок синтаксиса."""
+    print("=" * 80)
+    print("ТЕСТ 2: Ошибки синтаксиса")
+    print("=" * 80)
+
+    broken = parse_error('[{"a": 1}, {"a": }]')
+    print(f"  {broken}")
+    assert_checks([
+        (broken is not None and broken.offset == 17, "Некорректный элемент: позиция ошибки"),
+        (parse_error('[1, 2') is not None, "Незакрытый массив"),
+        (parse_error('[1 2]') is not None, "Нет запятой"),
+        (parse_error('[1] 2') is not None, "Лишние данные после массива"),
+        (parse_error('{"a": 1}') is not None, "Не массив"),
+        (isinstance(broken, ValueError), "JSONStreamError - подкласс ValueError"),
+    ])
+    print("✅ Ошибки синтаксиса обнаруживаются!\n")
+
+
+def test_load_errors():
+    """Тест загрузки с ошибочными записями."""
+    print("=" * 80)
+    print("ТЕСТ 3: Ошибки записей")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        records = [make_client(1).to_dict(), {"id": 2, "last_name": "Петров"}, make_client(3).to_dict(), 5]
+        records[2]['email'] = "не почта"
+        text = json.dumps([make_client(4).to_dict()] + records, ensure_ascii=False, indent=2)
+        path = os.path.join(directory, "clients.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        repo = Client_rep_json(path)
+        offsets = [offset for offset, _ in repo.load_errors]
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text[:-10])
+        truncated = Client_rep_json(path)
+
+        assert_checks([
+            ([c.id for c in repo.iter_clients()] == [4, 1], "Корректные записи загружены"),
+            (len(repo.load_errors) == 3, "Ошибочные записи в load_errors"),
+            (text[offsets[0]:].startswith('{\n    "id": 2') and text[offsets[2]] == '5', "Позиции ошибочных записей"),
+            (truncated.get_count() == 0 and truncated.load_errors == [], "Обрезанный файл: пустой список"),
+            (Client_rep_json(None).load_errors == [], "Репозиторий без файла"),
+        ])
+        print("✅ Ошибки записей сохраняются с позициями!\n")
+
+
+def test_peak_memory():
+    """Тест пиковой памяти загрузки."""
+    print("=" * 80)
+    print("ТЕСТ 4: Пиковая память")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "clients.json")
+        writer = Client_rep_json(None)
+        writer.file_path = path
+        writer._clients = [make_client(i) for i in range(1, 5001)]
+        writer._save_to_file()
+
+        def load_whole_file():
+            with open(path, 'r', encoding='utf-8') as f:
+                return [Client(**client_dict) for client_dict in json.loads(f.read())]
+
+        peaks = []
+        for load in (load_whole_file, lambda: Client_rep_json(path)):
+            tracemalloc.start()
+            result = load()
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1e6)
+            tracemalloc.stop()
+            del result
+
+        print(f"  Пиковая память: json.loads {peaks[0]:.1f} МБ, потоково {peaks[1]:.1f} МБ")
+        assert_checks([
+            (peaks[1] < peaks[0] * 0.8, "Потоковая загрузка требует меньше памяти"),
+        ])
+        print("✅ Пиковая память снижена!\n")
+
+
+if __name__ == "__main__":
+    test_decoder()
+    test_syntax_errors()
+    test_load_errors()
+    test_peak_memory()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
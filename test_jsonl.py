@@ -0,0 +1,254 @@
+"""
+Тест репозитория JSON Lines (Client_rep_jsonl).
+
+Проверяет:
+1. Операции CRUD и порядок хранения
+2. Запуск с сохраненным индексом и без него
+3. Уплотнение файла
+4. Декоратор фильтрации/сортировки и приложение над репозиторием
+5. Индексы и отображение файла обновляются без перестроения
+6. Дописывание без mmap.resize (платформы без mremap, например macOS)
+"""
+
+import mmap
+import os
+import tempfile
+from app import create_app
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.repositories import client_rep_jsonl
+from src.repositories.client_rep_jsonl import COMPACT_MIN_STALE, INDEX_SUFFIX, Client_rep_jsonl
+from testing_helpers import assert_checks, make_client
+
+
+class StreamOnlyRepo(Client_rep_jsonl):
+    """Репозиторий, в котором построение списка всей коллекции - ошибка."""
+
+    @Client_rep_jsonl._clients.getter
+    def _clients(self):
+        raise AssertionError("построен список всей коллекции")
+
+
+class NoResizeMmap(mmap.mmap):
+    """Отображение, которое не умеет менять размер (как mmap без mremap)."""
+
+    def resize(self, newsize):
+        raise SystemError("mmap: resizing not available--no mremap()")
+
+
+def make_repo(directory: str, count: int, repo_class=Client_rep_jsonl):
+    """Создает репозиторий JSON Lines с count клиентами во временной папке."""
+    path = os.path.join(tempfile.mkdtemp(dir=directory), "clients.jsonl")
+    repo = repo_class(path)
+    for i in range(1, count + 1):
+        repo.add(make_client(i, city="Казань" if i % 3 == 0 else "Москва"))
+    return repo, path
+
+
+def count_lines(path: str) -> int:
+    """Возвращает число строк в файле."""
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def test_crud():
+    """Тест операций CRUD."""
+    print("=" * 80)
+    print("ТЕСТ 1: Операции CRUD")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, path = make_repo(directory, 10)
+        repo.replace_by_id(2, make_client(2, last_name="Петров"))
+        repo.delete_by_id(10)
+        repo.delete_by_id(4)
+        repo.add(make_client(1, last_name="Новиков"))
+
+        try:
+            repo.delete_by_id(4)
+            missing_rejected = False
+        except ValueError:
+            missing_rejected = True
+
+        page = [client.id for client in repo.get_k_n_short_list(2, 3)]
+
+        assert_checks([
+            (repo.get_by_id(2).last_name == "Петров", "Замена клиента"),
+            (repo.get_by_id(4) is None and repo.get_count() == 9, "Удаление клиента"),
+            (repo.get_by_id(10).last_name == "Новиков", "Новый ID - максимальный + 1"),
+            ([c.id for c in repo.iter_clients()] == [1, 2, 3, 5, 6, 7, 8, 9, 10], "Замена сохраняет порядок хранения"),
+            (page == [5, 6, 7], "Страница списка"),
+            (missing_rejected, "Удаление отсутствующего клиента: ValueError"),
+            (count_lines(path) == 14, "Изменения дописываются в конец файла"),
+        ])
+        print("✅ Операции CRUD работают корректно!\n")
+
+
+def test_startup():
+    """Тест запуска с индексом и без него."""
+    print("=" * 80)
+    print("ТЕСТ 2: Запуск")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, path = make_repo(directory, 30)
+        repo.replace_by_id(5, make_client(5, last_name="Петров"))
+        repo.delete_by_id(6)
+        repo.close()
+        expected = [c.to_dict() for c in Client_rep_jsonl(path).iter_clients()]
+
+        # Строки, дописанные после сохранения индекса, дочитываются при запуске
+        tail_repo = Client_rep_jsonl(path)
+        tail_repo.add(make_client(1, last_name="Хвостов"))
+        with_tail = Client_rep_jsonl(path)
+
+        os.remove(path + INDEX_SUFFIX)
+        rescanned = Client_rep_jsonl(path)
+        index_recreated = os.path.exists(path + INDEX_SUFFIX)
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"id": 3, "deleted": true}\n')
+        externally_changed = Client_rep_jsonl(path)
+
+        assert_checks([
+            (os.path.exists(path + INDEX_SUFFIX), "Индекс сохраняется рядом с файлом"),
+            (len(expected) == 29 and expected[4]['last_name'] == "Петров", "Запуск по сохраненному индексу"),
+            (with_tail.get_by_id(31).last_name == "Хвостов", "Строки после индекса дочитываются"),
+            ([c.to_dict() for c in rescanned.iter_clients()][:29] == expected, "Без индекса файл просматривается"),
+            (externally_changed.get_by_id(3) is None, "Изменения, дописанные в файл вручную, учитываются"),
+            (index_recreated, "Индекс пересоздается после просмотра файла"),
+        ])
+        print("✅ Запуск работает корректно!\n")
+
+
+def test_compaction():
+    """Тест уплотнения файла."""
+    print("=" * 80)
+    print("ТЕСТ 3: Уплотнение")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, path = make_repo(directory, 5)
+        for i in range(COMPACT_MIN_STALE):
+            repo.replace_by_id(1 + i % 5, make_client(1, last_name="Петров" if i % 2 else "Иванов"))
+        lines_after_auto = count_lines(path)
+
+        repo.delete_by_id(3)
+        repo.compact()
+        reopened = Client_rep_jsonl(path)
+        same_data = reopened.get_by_id(1).to_dict() == repo.get_by_id(1).to_dict()
+
+        repo.sort_by_field('last_name')
+        repo.replace_by_id(1, make_client(1, last_name="Сидоров"))
+        sorted_repo = Client_rep_jsonl(path)
+
+        assert_checks([
+            (lines_after_auto < COMPACT_MIN_STALE, "Файл уплотняется автоматически"),
+            (count_lines(path) == 5 and reopened.get_count() == 4, "compact() оставляет одну строку на клиента"),
+            ([c.id for c in reopened.iter_clients()] == [1, 2, 4, 5], "Порядок хранения сохраняется"),
+            (same_data, "Данные сохраняются"),
+            ([c.id for c in sorted_repo.iter_clients()] == [2, 4, 1, 5], "sort_by_field перезаписывает порядок"),
+        ])
+        print("✅ Уплотнение работает корректно!\n")
+
+
+def test_decorator_and_app():
+    """Тест декоратора и приложения."""
+    print("=" * 80)
+    print("ТЕСТ 4: Декоратор и приложение")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, _ = make_repo(directory, 12)
+        decorated = Client_rep_file_decorator(repo).set_filter("city", "Казань").set_sort("total_spending", True)
+        ids = [client.id for client in decorated.get_k_n_short_list(1, 10)]
+        count_before = decorated.get_count()
+        repo.delete_by_id(12)
+        count_after = decorated.get_count()
+
+        client = create_app(repo).test_client()
+        page = client.get("/?page=2&page_size=5").get_data(as_text=True)
+        api = client.get("/api/clients?limit=3").get_json()
+
+        assert_checks([
+            (ids == [12, 9, 6, 3], "Фильтр и сортировка через декоратор"),
+            (count_before == 4 and count_after == 3, "Декоратор видит изменения"),
+            ('<tr data-id="6">' in page and '<tr data-id="11">' not in page, "Главная страница с пагинацией"),
+            ([item['id'] for item in api['items']] == [1, 2, 3], "JSON API"),
+        ])
+        print("✅ Репозиторий работает с декоратором и приложением!\n")
+
+
+def test_incremental_updates():
+    """Тест обновления индексов и отображения файла."""
+    print("=" * 80)
+    print("ТЕСТ 5: Индексы и отображение файла")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, path = make_repo(directory, 12, repo_class=StreamOnlyRepo)
+        decorated = Client_rep_file_decorator(repo).set_filter("city", "Казань").set_sort("last_name")
+        before = [client.id for client in decorated.get_k_n_short_list(1, 10)]
+        indexes = repo._get_indexes()
+        mapping = repo._mm
+
+        repo.add(make_client(1, city="Казань"))
+        repo.replace_by_id(3, make_client(3, last_name="Петров", city="Казань"))
+        repo.replace_by_id(4, make_client(4, city="Казань"))
+        repo.delete_by_id(6)
+        after = [client.id for client in decorated.get_k_n_short_list(1, 10)]
+        found = [client.id for client in repo.find_equal("city", "Казань")]
+        reopened = Client_rep_jsonl(path)
+
+        assert_checks([
+            (before == [3, 6, 9, 12], "Фильтр и сортировка без списка всей коллекции"),
+            (after == [4, 9, 12, 13, 3], "Декоратор видит изменения"),
+            (repo._get_indexes() is indexes, "Индексы обновляются, а не строятся заново"),
+            (found == [3, 4, 9, 12, 13], "Поиск по индексу в порядке хранения"),
+            (repo._mm is mapping and len(mapping) == os.path.getsize(path), "Отображение файла растет при дописывании"),
+            ([c.id for c in reopened.find_equal("city", "Казань")] == found, "Дописанные строки сохранены в файле"),
+        ])
+        print("✅ Индексы и отображение обновляются на месте!\n")
+
+
+def test_append_without_resize():
+    """Тест дописывания, когда mmap.resize недоступен."""
+    print("=" * 80)
+    print("ТЕСТ 6: Дописывание без mmap.resize")
+    print("=" * 80)
+
+    original_mmap = mmap.mmap
+    mmap.mmap = NoResizeMmap
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            repo, path = make_repo(directory, 5)
+            repo.replace_by_id(2, make_client(2, last_name="Петров"))
+            repo.delete_by_id(3)
+            repo.add(make_client(1, city="Казань"))
+            fallback_used = not client_rep_jsonl._mmap_resize_supported
+            ids = [client.id for client in repo.iter_clients()]
+            reopened = Client_rep_jsonl(path)
+
+            assert_checks([
+                (fallback_used, "Отказ resize замечен, дальше файл дописывается обычной записью"),
+                (ids == [1, 2, 4, 5, 6], "Операции CRUD работают"),
+                (repo.get_by_id(2).last_name == "Петров", "Замена видна через новое отображение"),
+                (len(repo._mm) == os.path.getsize(path), "Отображение покрывает весь файл"),
+                ([client.id for client in reopened.iter_clients()] == ids, "Дописанные строки сохранены в файле"),
+            ])
+    finally:
+        mmap.mmap = original_mmap
+        client_rep_jsonl._mmap_resize_supported = True
+    print("✅ Дописывание работает без mremap!\n")
+
+
+if __name__ == "__main__":
+    test_crud()
+    test_startup()
+    test_compaction()
+    test_decorator_and_app()
+    test_incremental_updates()
+    test_append_without_resize()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
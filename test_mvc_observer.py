@@ -131,7 +131,7 @@ def test_html_rendering(controller: ClientController, repo, view):
         ("Иванов" in html_main, "Фамилия клиента 1"),
         ("Петров" in html_main, "Фамилия клиента 2"),
         ("/client/" in html_main, "Ссылки на детали клиентов"),
-        ("<style>" in html_main, "CSS стили"),
+        ('rel="stylesheet"' in html_main and "<style>" not in html_main, "CSS подключен внешним файлом"),
     ]
     
     for check, description in checks:
@@ -165,7 +165,20 @@ def test_html_rendering(controller: ClientController, repo, view):
     
     if all(check for check, _ in detail_checks):
         print("✓ HTML страницы деталей корректен")
-    
+
+    # 3. Тест экранирования данных
+    print("\nГенерация формы с разметкой в данных...")
+    html_form = view.render_client_form("Добавление", "Создать", "/add", errors=["<script>alert(1)</script>"])
+
+    escape_checks = [
+        ("<script>" not in html_form, "Разметка не попадает в HTML"),
+        ("&lt;script&gt;" in html_form, "Текст экранирован"),
+    ]
+
+    for check, description in escape_checks:
+        status = "✓" if check else "✗"
+        print(f"  {status} {description}")
+
     print("✅ HTML Rendering работает корректно!\n")
 
 
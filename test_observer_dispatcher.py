@@ -0,0 +1,243 @@
+"""
+Тест асинхронной доставки уведомлений наблюдателям (ObserverDispatcher).
+
+Проверяет:
+1. Медленный наблюдатель не задерживает notify
+2. Исключение наблюдателя не мешает остальным
+3. Доставку пачками через update_batch
+4. Обратное давление при заполненной очереди
+5. Подключение в приложении (ASYNC_OBSERVERS)
+"""
+
+import os
+import tempfile
+import threading
+import time
+from typing import Any, List
+from app import create_app
+from src.core.metrics import Metrics
+from src.mvc.client_events import ClientEventBroadcaster
+from src.mvc.observer import AbstractObserver, Subject
+from src.mvc.observer_dispatcher import ObserverDispatcher
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client
+
+
+class RecordingObserver(AbstractObserver):
+    """Наблюдатель, запоминающий уведомления."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.received: List[Any] = []
+
+    def update(self, data: Any) -> None:
+        time.sleep(self.delay)
+        self.received.append(data)
+
+
+class FailingObserver(AbstractObserver):
+    """Наблюдатель, который всегда падает."""
+
+    def update(self, data: Any) -> None:
+        raise RuntimeError("сбой наблюдателя")
+
+
+class BatchObserver(RecordingObserver):
+    """Наблюдатель, принимающий уведомления пачками."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: List[List[Any]] = []
+
+    def update_batch(self, items: List[Any]) -> None:
+        self.batches.append(list(items))
+        self.received.extend(items)
+
+
+class BlockingObserver(RecordingObserver):
+    """Наблюдатель, ждущий разрешения перед обработкой уведомления."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def update(self, data: Any) -> None:
+        self.release.wait(5)
+        self.received.append(data)
+
+
+class SyncObserver(RecordingObserver):
+    """Наблюдатель, отказавшийся от асинхронной доставки."""
+
+    asynchronous = False
+
+
+def make_subject(dispatcher: ObserverDispatcher, *observers) -> Subject:
+    """Создает Subject с асинхронной доставкой и наблюдателями."""
+    subject = Subject()
+    subject.set_dispatcher(dispatcher)
+    for observer in observers:
+        subject.add_observer(observer)
+    return subject
+
+
+def test_slow_observer():
+    """Тест медленного наблюдателя."""
+    print("=" * 80)
+    print("ТЕСТ 1: Медленный наблюдатель")
+    print("=" * 80)
+
+    dispatcher = ObserverDispatcher()
+    slow = RecordingObserver(delay=0.05)
+    sync = SyncObserver()
+    subject = make_subject(dispatcher, slow, sync)
+
+    started = time.perf_counter()
+    for i in range(5):
+        subject.notify(i)
+    notify_time = time.perf_counter() - started
+    sync_received = list(sync.received)
+    flushed = dispatcher.flush(timeout=5)
+    dispatcher.stop()
+
+    print(f"  notify x5: {notify_time * 1000:.1f} мс")
+    assert_checks([
+        (notify_time < 0.05, "notify не ждет медленного наблюдателя"),
+        (flushed and slow.received == [0, 1, 2, 3, 4], "Все уведомления доставлены по порядку"),
+        (sync_received == [0, 1, 2, 3, 4], "Наблюдатель с asynchronous = False вызывается сразу"),
+    ])
+    print("✅ Медленный наблюдатель не задерживает запрос!\n")
+
+
+def test_error_isolation():
+    """Тест изоляции ошибок наблюдателей."""
+    print("=" * 80)
+    print("ТЕСТ 2: Изоляция ошибок")
+    print("=" * 80)
+
+    metrics = Metrics()
+    dispatcher = ObserverDispatcher(metrics=metrics)
+    failing = FailingObserver()
+    healthy = RecordingObserver()
+    subject = make_subject(dispatcher, failing, healthy)
+
+    subject.notify("первое")
+    dispatcher.flush(timeout=5)
+    subject.notify("второе")
+    dispatcher.flush(timeout=5)
+    dispatcher.stop()
+
+    assert_checks([
+        (healthy.received == ["первое", "второе"], "Остальные наблюдатели получают уведомления"),
+        (metrics.get('observer_errors_total') == 2, "Ошибки учтены в метриках"),
+    ])
+    print("✅ Ошибки наблюдателей изолированы!\n")
+
+
+def test_batches():
+    """Тест доставки пачками."""
+    print("=" * 80)
+    print("ТЕСТ 3: Доставка пачками")
+    print("=" * 80)
+
+    metrics = Metrics()
+    dispatcher = ObserverDispatcher(batch_size=10, metrics=metrics)
+    blocker = BlockingObserver()
+    batch_observer = BatchObserver()
+    subject = make_subject(dispatcher, blocker, batch_observer)
+
+    # Пока первая пачка обрабатывается, остальные уведомления копятся в очереди
+    for i in range(25):
+        subject.notify(i)
+    depth = dispatcher.get_queue_depth()
+    blocker.release.set()
+    dispatcher.flush(timeout=5)
+    dispatcher.stop()
+
+    sizes = [len(batch) for batch in batch_observer.batches]
+
+    print(f"  Размеры пачек: {sizes}")
+    assert_checks([
+        (depth > 0, "Уведомления ждут в очереди"),
+        (batch_observer.received == list(range(25)), "Все уведомления доставлены по порядку"),
+        (max(sizes) <= 10 and len(sizes) < 25, "update_batch получает пачки не больше batch_size"),
+        (metrics.get('observer_events_total') == 25, "Счетчик доставленных уведомлений"),
+        (metrics.get('observer_batches_total') == len(sizes), "Счетчик пачек"),
+        (metrics.get('observer_delivery_latency_seconds') > 0, "Задержка доставки"),
+        (metrics.get('observer_queue_depth') == 0, "Глубина очереди после доставки"),
+    ])
+    print("✅ Доставка пачками работает корректно!\n")
+
+
+def test_back_pressure():
+    """Тест обратного давления."""
+    print("=" * 80)
+    print("ТЕСТ 4: Обратное давление")
+    print("=" * 80)
+
+    metrics = Metrics()
+    dispatcher = ObserverDispatcher(max_queue=5, batch_size=1, block_timeout=0.01, metrics=metrics)
+    blocker = BlockingObserver()
+    subject = make_subject(dispatcher, blocker)
+
+    subject.notify(0)
+    time.sleep(0.05)  # рабочий поток забрал первое уведомление и ждет
+    accepted = [dispatcher.submit([blocker], i) for i in range(1, 10)]
+    dispatcher.block_timeout = 0
+    start = time.monotonic()
+    dropped_at_once = dispatcher.submit([blocker], 10) is False and time.monotonic() - start < 0.5
+    blocker.release.set()
+    dispatcher.flush(timeout=5)
+    dispatcher.stop()
+
+    assert_checks([
+        (accepted == [True] * 5 + [False] * 4, "Сверх max_queue уведомления отбрасываются"),
+        (dropped_at_once, "block_timeout=0: отбрасывается без ожидания"),
+        (metrics.get('observer_events_dropped_total') == 5, "Отброшенные уведомления учтены"),
+        (blocker.received == [0, 1, 2, 3, 4, 5], "Принятые уведомления доставлены"),
+    ])
+    print("✅ Обратное давление работает корректно!\n")
+
+
+def test_app_wiring():
+    """Тест подключения в приложении."""
+    print("=" * 80)
+    print("ТЕСТ 5: Подключение в приложении")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = Client_rep_json(os.path.join(directory, "test_dispatcher.json"))
+        repo._clients = [make_client(i) for i in range(1, 4)]
+        repo._touch()
+        app = create_app(repo, {'ASYNC_OBSERVERS': True, 'EVENTS_COALESCE_WINDOW': 0})
+        dispatcher = app.extensions.get('observer_dispatcher')
+        broadcaster_messages = None
+        for observer in repo._observers:
+            if isinstance(observer, ClientEventBroadcaster):
+                broadcaster_messages = observer.subscribe()
+
+        page = app.test_client().get("/")
+        app.test_client().get("/delete/2")
+        dispatcher.flush(timeout=5)
+        dispatcher.stop()
+
+        assert_checks([
+            (dispatcher is not None and repo._dispatcher is dispatcher, "Репозиторий использует диспетчер"),
+            (page.status_code == 200, "Главная страница отдается"),
+            (broadcaster_messages is not None and broadcaster_messages.qsize() == 1, "Удаление разослано подписчикам"),
+            (app.extensions['metrics'].get('observer_events_total') >= 1, "Метрики диспетчера в /metrics"),
+            ('observer_dispatcher' not in create_app(repo).extensions, "По умолчанию доставка синхронная"),
+        ])
+        print("✅ Асинхронная доставка подключается в приложении!\n")
+
+
+if __name__ == "__main__":
+    test_slow_observer()
+    test_error_isolation()
+    test_batches()
+    test_back_pressure()
+    test_app_wiring()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
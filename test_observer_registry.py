@@ -0,0 +1,164 @@
+"""
+Тест реестра наблюдателей (слабые ссылки и подписка на типы событий).
+
+Проверяет:
+1. Доставку ClientEvent только подписанным на тип наблюдателям
+2. Хранение наблюдателей по слабым ссылкам
+3. Время подписки и отписки при большом числе наблюдателей
+4. Типизированные события от контроллеров
+"""
+
+import gc
+import os
+import tempfile
+import time
+from typing import Any, List
+from src.mvc.client_view import ClientView
+from src.mvc.client_controller import ClientController, ClientDeleteController
+from src.mvc.observer import AbstractObserver, ClientEvent, Subject
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client
+
+
+class RecordingObserver(AbstractObserver):
+    """Наблюдатель, запоминающий уведомления."""
+
+    def __init__(self) -> None:
+        self.received: List[Any] = []
+
+    def update(self, data: Any) -> None:
+        self.received.append(data)
+
+
+def test_topics():
+    """Тест подписки на типы событий."""
+    print("=" * 80)
+    print("ТЕСТ 1: Типы событий")
+    print("=" * 80)
+
+    subject = Subject()
+    everything = RecordingObserver()
+    changes = RecordingObserver()
+    deletes = RecordingObserver()
+    subject.add_observer(everything)
+    subject.add_observer(changes, ClientEvent.CHANGES)
+    subject.add_observer(deletes, [ClientEvent.DELETED])
+
+    listed = ClientEvent(ClientEvent.LISTED, clients=[])
+    updated = ClientEvent(ClientEvent.UPDATED, 1, make_client(1))
+    deleted = ClientEvent(ClientEvent.DELETED, 2)
+    for data in (listed, updated, deleted, "нетипизированное"):
+        subject.notify(data)
+
+    # Повторная подписка заменяет набор типов
+    subject.add_observer(deletes, [ClientEvent.ADDED])
+    subject.notify(deleted)
+
+    try:
+        subject.add_observer(RecordingObserver(), ["renamed"])
+        unknown_rejected = False
+    except ValueError:
+        unknown_rejected = True
+    try:
+        ClientEvent("renamed")
+        bad_event_rejected = False
+    except ValueError:
+        bad_event_rejected = True
+
+    assert_checks([
+        (everything.received == [listed, updated, deleted, "нетипизированное", deleted], "Без типов - все уведомления"),
+        (changes.received == [updated, deleted, "нетипизированное", deleted], "CHANGES - только изменения"),
+        (deletes.received == [deleted, "нетипизированное"], "Повторная подписка заменяет типы"),
+        (unknown_rejected and bad_event_rejected, "Неизвестный тип события отклоняется"),
+        (len(subject._observers) == 3, "Каждый наблюдатель зарегистрирован один раз"),
+    ])
+    print("✅ Подписка на типы событий работает корректно!\n")
+
+
+def test_weak_references():
+    """Тест слабых ссылок на наблюдателей."""
+    print("=" * 80)
+    print("ТЕСТ 2: Слабые ссылки")
+    print("=" * 80)
+
+    subject = Subject()
+    kept = RecordingObserver()
+    dropped = RecordingObserver()
+    subject.add_observer(kept)
+    subject.add_observer(dropped, [ClientEvent.DELETED])
+    count_before = len(subject._observers)
+
+    del dropped
+    gc.collect()
+    subject.notify(ClientEvent(ClientEvent.DELETED, 1))
+    subject.remove_observer(kept)
+    subject.notify(ClientEvent(ClientEvent.DELETED, 2))
+
+    assert_checks([
+        (count_before == 2 and subject._observers == [], "Удаленный наблюдатель исчезает из реестра"),
+        (len(kept.received) == 1, "remove_observer отписывает наблюдателя"),
+    ])
+    print("✅ Наблюдатели хранятся по слабым ссылкам!\n")
+
+
+def test_subscribe_scaling():
+    """Тест времени подписки и отписки."""
+    print("=" * 80)
+    print("ТЕСТ 3: Подписка и отписка")
+    print("=" * 80)
+
+    timings = {}
+    for count in (1000, 10000):
+        subject = Subject()
+        observers = [RecordingObserver() for _ in range(count)]
+        started = time.perf_counter()
+        for observer in observers:
+            subject.add_observer(observer, ClientEvent.CHANGES)
+        for observer in observers:
+            subject.remove_observer(observer)
+        timings[count] = (time.perf_counter() - started) / count
+        print(f"  {count} наблюдателей: {timings[count] * 1e6:.2f} мкс на подписку и отписку")
+
+    assert_checks([
+        (timings[10000] < timings[1000] * 5, "Время на наблюдателя не растет с их числом"),
+    ])
+    print("✅ Подписка и отписка выполняются за O(1)!\n")
+
+
+def test_controller_events():
+    """Тест типизированных событий контроллеров."""
+    print("=" * 80)
+    print("ТЕСТ 4: События контроллеров")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = Client_rep_json(os.path.join(directory, "test_registry.json"))
+        repo._clients = [make_client(i) for i in range(1, 4)]
+        repo._touch()
+        view = ClientView()
+        recorder = RecordingObserver()
+        repo.add_observer(recorder)
+        controller = ClientController(repo, view)
+
+        controller.index()
+        controller.show_details(1)
+        ClientDeleteController(repo).delete_client(3)
+
+        assert_checks([
+            ([event.type for event in recorder.received] == ['listed', 'viewed', 'deleted'], "Типы событий"),
+            (recorder.received[0].clients is not None and recorder.received[2].client_id == 3, "Данные событий"),
+            (view in repo._observers, "Представление подписано на репозиторий"),
+            (view._state is recorder.received[2], "Представление получает только изменения"),
+        ])
+        print("✅ Контроллеры отправляют типизированные события!\n")
+
+
+if __name__ == "__main__":
+    test_topics()
+    test_weak_references()
+    test_subscribe_scaling()
+    test_controller_events()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
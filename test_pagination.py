@@ -0,0 +1,111 @@
+"""
+Тест постраничного вывода главной страницы.
+
+Проверяет:
+1. Параметры page и page_size (значения по умолчанию, ограничение размера)
+2. Ссылки "Назад"/"Вперед" и общее количество клиентов
+3. Страница за пределами списка загружается один раз
+"""
+
+import os
+import tempfile
+from src.models.client import Client
+from src.mvc.client_view import ClientView
+from src.mvc.client_controller import ClientController, MAX_PAGE_SIZE
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+class PageCountRepo(Client_rep_json):
+    """JSON-репозиторий, считающий загрузки страниц."""
+
+    page_loads = 0
+
+    def get_k_n_short_list(self, k: int, n: int):
+        self.page_loads += 1
+        return super().get_k_n_short_list(k, n)
+
+
+def make_client(client_id: int) -> Client:
+    """Создает тестового клиента (нечетные ID - Москва, четные - Казань)."""
+    return make_base_client(client_id, city="Москва" if client_id % 2 else "Казань")
+
+
+def make_controller(directory: str, count: int) -> ClientController:
+    """Создает контроллер над JSON-репозиторием с count клиентами."""
+    repo = PageCountRepo(os.path.join(directory, "test_pagination.json"))
+    repo._clients = [make_client(i) for i in range(1, count + 1)]
+    repo._touch()
+    return ClientController(repo, ClientView())
+
+
+def test_page_params():
+    """Тест разбора параметров page и page_size."""
+    print("=" * 80)
+    print("ТЕСТ 1: Параметры страницы")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        controller = make_controller(directory, 0)
+
+        assert_checks([
+            (controller._get_page_params(None) == (1, 10), "Значения по умолчанию"),
+            (controller._get_page_params({'page': '3', 'page_size': '25'}) == (3, 25), "Заданные значения"),
+            (controller._get_page_params({'page': 'x', 'page_size': '-5'}) == (1, 10), "Некорректные значения"),
+            (controller._get_page_params({'page_size': '100000'})[1] == MAX_PAGE_SIZE,
+             "Размер ограничен MAX_PAGE_SIZE"),
+        ])
+        print("✅ Параметры страницы разбираются корректно!\n")
+
+
+def test_navigation():
+    """Тест навигации по страницам."""
+    print("=" * 80)
+    print("ТЕСТ 2: Навигация")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        controller = make_controller(directory, 25)
+        first = controller.index()
+        second = controller.index({'page': '2', 'page_size': '20'})
+        beyond = controller.index({'page': '9', 'page_size': '20'})
+        filtered = controller.index({'filter_city': 'Москва', 'page_size': '5'})
+
+        assert_checks([
+            ("Страница 1 из 3 · Всего клиентов: 25" in first, "Номер страницы и общее количество"),
+            ('<span class="disabled">← Назад</span>' in first, "На первой странице нет ссылки назад"),
+            ('href="/?page=2&amp;page_size=10"' in first, "Ссылка на следующую страницу"),
+            ("<td>21</td>" in second and "<td>20</td>" not in second, "Вторая страница начинается с 21-го клиента"),
+            ('<span class="disabled">Вперед →</span>' in second, "На последней странице нет ссылки вперед"),
+            ("Страница 2 из 2" in beyond and "<td>21</td>" in beyond, "Номер за концом списка заменен последним"),
+            ("Всего клиентов: 13" in filtered, "Количество с учетом фильтра"),
+            ("filter_city=%D0%9C" in filtered, "Фильтр сохраняется в ссылках"),
+        ])
+        print("✅ Навигация работает корректно!\n")
+
+
+def test_out_of_range_page():
+    """Тест страницы за пределами списка."""
+    print("=" * 80)
+    print("ТЕСТ 3: Страница за пределами списка")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        controller = make_controller(directory, 5)
+        html = controller.index({'page': '9', 'page_size': '2'})
+
+        assert_checks([
+            (controller.repo.page_loads == 1, "Страница загружается один раз"),
+            ('<tr data-id="5">' in html and '<tr data-id="4">' not in html, "Показана последняя страница"),
+        ])
+        print("✅ Номер страницы ограничивается до загрузки!\n")
+
+
+if __name__ == "__main__":
+    test_page_params()
+    test_navigation()
+    test_out_of_range_page()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,135 @@
+"""
+Тест параллельной проверки записей при загрузке (validate_records).
+
+Проверяет:
+1. Параллельный результат совпадает с последовательным
+2. Последовательную загрузку небольших файлов и при недоступных процессах
+3. Загрузку Client_rep_json и Client_rep_yaml с load_workers
+"""
+
+import os
+import tempfile
+from src.models.client import Client
+from src.repositories import client_parallel
+from src.repositories.client_parallel import validate_records
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.client_rep_yaml import Client_rep_yaml
+from testing_helpers import assert_checks, make_client
+
+
+def make_records(count: int) -> list:
+    """Создает пары (номер, словарь), каждая седьмая запись с ошибкой."""
+    records = []
+    for i in range(1, count + 1):
+        record = make_client(i).to_dict()
+        if i % 7 == 0:
+            record['email'] = "не почта"
+        records.append((i, record))
+    return records
+
+
+def as_dicts(clients: list) -> list:
+    """Возвращает словари полей клиентов."""
+    return [client.to_dict() for client in clients]
+
+
+class FailingExecutor:
+    """Пул процессов, который невозможно создать."""
+
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        FailingExecutor.created += 1
+        raise OSError("процессы недоступны")
+
+
+def test_parallel_matches_serial():
+    """Тест совпадения результатов."""
+    print("=" * 80)
+    print("ТЕСТ 1: Параллельная проверка")
+    print("=" * 80)
+
+    records = make_records(1000)
+    serial_clients, serial_errors = validate_records(records)
+    clients, errors = validate_records(records, workers=2, chunk_size=64, min_parallel=100)
+
+    try:
+        validate_records(records, workers=0)
+        rejected = False
+    except ValueError:
+        rejected = True
+
+    assert_checks([
+        (as_dicts(clients) == as_dicts(serial_clients) and len(clients) == 858, "Клиенты совпадают и идут по порядку"),
+        (errors == serial_errors and errors[0][0] == 7, "Ошибки с ключами записей"),
+        (all(type(client) is Client for client in clients), "Родитель собирает объекты Client"),
+        (clients[0].phone == serial_clients[0].phone, "Нормализованные значения передаются"),
+        (rejected, "workers=0: ValueError"),
+    ])
+    print("✅ Параллельная проверка работает корректно!\n")
+
+
+def test_serial_fallback():
+    """Тест последовательной загрузки."""
+    print("=" * 80)
+    print("ТЕСТ 2: Последовательная загрузка")
+    print("=" * 80)
+
+    records = make_records(200)
+    original = client_parallel.ProcessPoolExecutor
+    client_parallel.ProcessPoolExecutor = FailingExecutor
+    try:
+        small, _ = validate_records(records, workers=4, min_parallel=500)
+        small_created = FailingExecutor.created
+        fallback, fallback_errors = validate_records(iter(records), workers=4, min_parallel=50)
+    finally:
+        client_parallel.ProcessPoolExecutor = original
+
+    assert_checks([
+        (len(small) == 172 and small_created == 0, "Небольшой файл проверяется без процессов"),
+        (FailingExecutor.created == 1 and len(fallback) == 172 and len(fallback_errors) == 28,
+         "Процессы недоступны: все записи проверены в одном процессе"),
+    ])
+    print("✅ Последовательная загрузка работает!\n")
+
+
+def test_repositories():
+    """Тест загрузки репозиториев."""
+    print("=" * 80)
+    print("ТЕСТ 3: Репозитории с load_workers")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        clients = [make_client(i) for i in range(1, 301)]
+        results = []
+        original = client_parallel.PARALLEL_MIN_RECORDS
+        client_parallel.PARALLEL_MIN_RECORDS = 10
+        try:
+            for repo_class, name in ((Client_rep_json, "clients.json"), (Client_rep_yaml, "clients.yaml")):
+                writer = repo_class(None)
+                writer.file_path = os.path.join(directory, name)
+                writer._clients = clients
+                writer._save_to_file()
+                serial = repo_class(writer.file_path)
+                parallel = repo_class(writer.file_path, load_workers=2)
+                expected = as_dicts(clients)
+                results.append(as_dicts(parallel.iter_clients()) == as_dicts(serial.iter_clients()) == expected)
+        finally:
+            client_parallel.PARALLEL_MIN_RECORDS = original
+
+        assert_checks([
+            (results[0], "Client_rep_json: параллельная загрузка"),
+            (results[1], "Client_rep_yaml: параллельная загрузка"),
+            (Client_rep_json(None).load_workers == 1, "По умолчанию загрузка в одном процессе"),
+        ])
+        print("✅ Репозитории загружаются параллельно!\n")
+
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_serial_fallback()
+    test_repositories()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,96 @@
+"""
+Тест составных условий (предикатов) для декораторов репозиториев.
+
+Проверяет:
+1. Проверку условий в памяти (Eq, In, Range, Prefix, And, Or)
+2. Компиляцию условий в параметризованный SQL со списком разрешенных колонок
+3. Фильтрацию через Client_rep_file_decorator с использованием индексов
+"""
+
+import os
+import tempfile
+from src.repositories.client_rep_json import Client_rep_json
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.decorators.client_predicates import And, Eq, In, Or, Prefix, Range, compare
+from testing_helpers import assert_checks, make_client
+
+
+def test_matches():
+    """Тест проверки условий в памяти."""
+    print("=" * 80)
+    print("ТЕСТ 1: Проверка условий в памяти")
+    print("=" * 80)
+
+    client = make_client(1, "Иванов", "Москва", 150000.0)
+    assert_checks([
+        (Eq("city", "Москва").matches(client), "Eq: city = Москва"),
+        (In("city", ["Казань", "Москва"]).matches(client), "In: city IN (Казань, Москва)"),
+        (compare("total_spending", ">=", 100000).matches(client), "Range: total_spending >= 100000"),
+        (not compare("total_spending", "<", 150000).matches(client), "Range: total_spending < 150000 (ложно)"),
+        (Prefix("last_name", "Ив").matches(client), "Prefix: last_name LIKE 'Ив%'"),
+        ((Eq("city", "Казань") | Prefix("last_name", "Ив")).matches(client), "Or-группа"),
+        (not And(Eq("city", "Москва"), Eq("city", "Казань")).matches(client), "And (ложно)"),
+    ])
+    print("✅ Условия проверяются корректно!\n")
+
+
+def test_sql_compilation():
+    """Тест компиляции условий в SQL."""
+    print("=" * 80)
+    print("ТЕСТ 2: Компиляция в SQL")
+    print("=" * 80)
+
+    predicate = And(Eq("city", "Москва"), Or(Range("total_spending", low=100000), Prefix("last_name", "Ив_")))
+    sql, params = predicate.to_sql()
+    print(f"  SQL: {sql}")
+    print(f"  Параметры: {params}")
+
+    try:
+        Eq("id; DROP TABLE clients", 1).to_sql()
+        rejected = False
+    except ValueError:
+        rejected = True
+
+    assert_checks([
+        ("%s" in sql and "Москва" not in sql, "Значения передаются параметрами"),
+        (params == ["Москва", 100000, "Ив\\_%"], "Спецсимволы LIKE экранированы"),
+        (rejected, "Неразрешенная колонка отклонена"),
+    ])
+    print("✅ Компиляция в SQL работает корректно!\n")
+
+
+def test_file_decorator_predicate():
+    """Тест фильтрации декоратора по составному условию."""
+    print("=" * 80)
+    print("ТЕСТ 3: Составное условие в Client_rep_file_decorator")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "test_predicates.json")
+        repo = Client_rep_json(path)
+        repo.add(make_client(1, "Иванов", "Москва", 150000.0))
+        repo.add(make_client(2, "Петров", "Казань", 250000.0))
+        repo.add(make_client(3, "Ивашин", "Тверь", 5000.0))
+        repo.add(make_client(4, "Сидоров", "Москва", 90000.0))
+
+        decorated = Client_rep_file_decorator(repo)
+        decorated.set_predicate(
+            Or(And(Eq("city", "Москва"), Range("total_spending", low=100000)), Prefix("last_name", "Ив"))
+        )
+        ids = [c.id for c in decorated.get_k_n_short_list(k=1, n=10)]
+
+        assert_checks([
+            (ids == [1, 3], "(Москва И траты >= 100000) ИЛИ фамилия на 'Ив' -> 1, 3"),
+            (decorated.get_count() == 2, "Количество -> 2"),
+        ])
+        print("✅ Декоратор фильтрует по составному условию корректно!\n")
+
+
+if __name__ == "__main__":
+    test_matches()
+    test_sql_compilation()
+    test_file_decorator_predicate()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
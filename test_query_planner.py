@@ -0,0 +1,109 @@
+"""
+Тест стоимостного планировщика запросов файлового декоратора.
+
+Проверяет:
+1. Статистику по полям (число различных значений, гистограммы)
+2. Выбор способа доступа: индекс для избирательных условий, полный просмотр для остальных
+3. Вывод explain() с оценками и фактическим числом строк
+"""
+
+import os
+import tempfile
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.decorators.client_predicates import Eq, Range
+from src.decorators.client_query_planner import FullScan, IndexLookup, IndexRange, QueryPlanner
+from testing_helpers import assert_checks, make_client as make_base_client
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск"]
+
+
+def make_client(client_id: int) -> Client:
+    """Создает тестового клиента с равномерно распределенными полями."""
+    return make_base_client(client_id, city=CITIES[client_id % len(CITIES)], zip_code=100000 + client_id * 10)
+
+
+def create_repo(directory: str, count: int = 1000) -> Client_rep_json:
+    """Создает JSON-репозиторий во временном файле с count клиентами."""
+    path = os.path.join(directory, "test_planner.json")
+    repo = Client_rep_json(path)
+    for client_id in range(1, count + 1):
+        repo._clients.append(make_client(client_id))
+    repo._touch()
+    return repo
+
+
+def test_statistics():
+    """Тест сбора статистики и оценки избирательности."""
+    print("=" * 80)
+    print("ТЕСТ 1: Статистика по полям")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        planner = QueryPlanner(create_repo(directory))
+        statistics = planner.get_statistics()
+        spending = planner.estimate_selectivity(Range("total_spending", low=10000, high=30000))
+
+        assert_checks([
+            (statistics.row_count == 1000, "Число строк -> 1000"),
+            (statistics.fields["city"].distinct_count == 4, "Различных городов -> 4"),
+            (statistics.fields["zip_code"].histogram is not None, "Гистограмма по zip_code построена"),
+            (statistics.fields["city"].histogram is None, "Для city гистограммы нет"),
+            (abs(spending - 0.2) < 0.02, f"Оценка 10000 <= траты <= 30000 близка к 20% ({spending:.3f})"),
+            (planner.estimate_selectivity(Eq("city", "Москва")) == 0.25, "Оценка city = Москва -> 25%"),
+        ])
+        print("✅ Статистика собирается корректно!\n")
+
+
+def test_access_path_choice():
+    """Тест выбора способа доступа."""
+    print("=" * 80)
+    print("ТЕСТ 2: Выбор способа доступа")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        planner = QueryPlanner(create_repo(directory))
+        narrow = planner.plan_access(Range("total_spending", low=1000, high=2000)).access
+        wide = planner.plan_access(Range("total_spending", low=1000)).access
+        email = planner.plan_access(Eq("email", "client7@mail.ru")).access
+        unindexed = planner.plan_access(Eq("first_name", "Иван")).access
+
+        assert_checks([
+            (isinstance(narrow, IndexRange), "Узкий диапазон трат -> обход индекса"),
+            (isinstance(wide, FullScan), "Широкий диапазон трат -> полный просмотр"),
+            (isinstance(email, IndexLookup), "Поиск по email -> хэш-индекс"),
+            (isinstance(unindexed, FullScan), "Неиндексированное поле -> полный просмотр"),
+        ])
+        print("✅ Способ доступа выбирается корректно!\n")
+
+
+def test_explain():
+    """Тест вывода плана запроса."""
+    print("=" * 80)
+    print("ТЕСТ 3: explain()")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        decorated = Client_rep_file_decorator(create_repo(directory))
+        decorated.set_predicate(Range("zip_code", low=100000, high=101000)).set_sort("total_spending", reverse=True)
+        plan = decorated.explain(k=1, n=5)
+        print(plan)
+
+        assert_checks([
+            ("Диапазон индекса zip_code" in plan, "В плане указан обход индекса zip_code"),
+            ("факт 100" in plan, "Фактическое число строк -> 100"),
+            ("оценка" in plan, "Выведена оценка числа строк"),
+            ([c.id for c in decorated.get_k_n_short_list(k=1, n=2)] == [100, 99], "Результат запроса не изменился"),
+        ])
+        print("✅ explain() работает корректно!\n")
+
+
+if __name__ == "__main__":
+    test_statistics()
+    test_access_path_choice()
+    test_explain()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,220 @@
+"""
+Тест репозитория с разбиением на шарды (Client_rep_sharded).
+
+Проверяет:
+1. Распределение по шардам и изменение только затронутого шарда
+2. Разбиение по городу и перенос клиента между шардами
+3. Слияние упорядоченных потоков шардов и порядок хранения
+4. Манифест и повторное открытие
+5. Декоратор и приложение над репозиторием
+"""
+
+import os
+import tempfile
+from app import create_app
+from src.models.client import Client
+from src.decorators.client_rep_file_decorator import Client_rep_file_decorator
+from src.repositories.client_rep_sharded import MANIFEST_NAME, Client_rep_sharded
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов"]
+
+
+def make_client(client_id: int, last_name: str = "Иванов", city: str = None) -> Client:
+    """Создает тестового клиента."""
+    return make_base_client(
+        client_id, last_name, city or CITIES[client_id % len(CITIES)],
+        total_spending=float((client_id * 7919) % 1000)
+    )
+
+
+def make_repo(directory: str, count: int, **options) -> Client_rep_sharded:
+    """Создает разбитый на шарды репозиторий с count клиентами во временной папке."""
+    repo = Client_rep_sharded(tempfile.mkdtemp(dir=directory), **options)
+    repo._clients = [make_client(i, last_name=LAST_NAMES[i % 6]) for i in range(1, count + 1)]
+    repo._touch()
+    return repo
+
+
+def shard_mtimes(repo: Client_rep_sharded) -> list:
+    """Возвращает время изменения файлов шардов."""
+    return [os.stat(shard.file_path).st_mtime_ns for shard in repo._shards]
+
+
+def test_id_sharding():
+    """Тест разбиения по id."""
+    print("=" * 80)
+    print("ТЕСТ 1: Разбиение по id")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 40, shard_count=4)
+        distributed = all(
+            all(client.id % 4 == i for client in shard.iter_clients()) and shard.get_count() == 10
+            for i, shard in enumerate(repo._shards)
+        )
+
+        os.utime(repo._shards[0].file_path, ns=(0, 0))
+        os.utime(repo._shards[1].file_path, ns=(0, 0))
+        before = shard_mtimes(repo)
+        repo.add(make_client(1, last_name="Новиков"))
+        after_add = shard_mtimes(repo)
+        repo.replace_by_id(41, make_client(41, last_name="Петров"))
+        repo.delete_by_id(40)
+
+        try:
+            repo.delete_by_id(40)
+            missing_rejected = False
+        except ValueError:
+            missing_rejected = True
+
+        assert_checks([
+            (distributed, "Клиенты распределены по id % 4"),
+            ([i for i in range(4) if before[i] != after_add[i]] == [1], "add меняет только свой шард"),
+            (repo.get_by_id(41).last_name == "Петров" and repo.get_by_id(40) is None, "Замена и удаление"),
+            (repo.get_count() == 40 and [c.id for c in repo.iter_clients()][-3:] == [38, 39, 41],
+             "Порядок хранения по id"),
+            (missing_rejected, "Удаление отсутствующего клиента: ValueError"),
+            ([c.id for c in repo.get_k_n_short_list(2, 5)] == [6, 7, 8, 9, 10], "Страница списка"),
+        ])
+        print("✅ Разбиение по id работает корректно!\n")
+
+
+def test_city_sharding():
+    """Тест разбиения по городу."""
+    print("=" * 80)
+    print("ТЕСТ 2: Разбиение по городу")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 50, shard_count=3, shard_by='city')
+        cities = [{client.city for client in shard.iter_clients()} for shard in repo._shards]
+        by_city = all(
+            not (shard_cities & other_cities)
+            for i, shard_cities in enumerate(cities) for other_cities in cities[i + 1:]
+        )
+
+        client = repo.get_by_id(7)
+        old_shard = repo._get_shard_index(client)
+        moved_city = next(city for city in CITIES if repo._get_shard_index(make_client(7, city=city)) != old_shard)
+        repo.replace_by_id(7, make_client(7, city=moved_city))
+        reopened = Client_rep_sharded(repo.file_path)
+
+        assert_checks([
+            (by_city, "Клиенты одного города в одном шарде"),
+            (repo.get_by_id(7).city == moved_city and repo._shard_of[7] != old_shard, "Смена города переносит клиента"),
+            ([c.id for c in repo.iter_clients()] == list(range(1, 51)), "Перенос сохраняет порядок хранения"),
+            (reopened.shard_by == 'city' and reopened.get_by_id(7).city == moved_city, "Повторное открытие"),
+            (len(repo.find_equal('city', moved_city)) == 11, "find_equal собирает результаты шардов"),
+        ])
+        print("✅ Разбиение по городу работает корректно!\n")
+
+
+def test_merge():
+    """Тест слияния упорядоченных потоков."""
+    print("=" * 80)
+    print("ТЕСТ 3: Слияние потоков шардов")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 300, shard_count=5)
+        clients = list(repo.iter_clients())
+        expected = sorted(clients, key=lambda c: (c.total_spending, c.id))
+        expected_desc = sorted(clients, key=lambda c: (c.total_spending, -c.id), reverse=True)
+        merged = list(repo.iter_range('total_spending'))
+        merged_desc = list(repo.iter_range('total_spending', reverse=True))
+        ranged = [c.id for c in repo.iter_range('total_spending', 100.0, 300.0)]
+
+        repo.sort_by_field('last_name')
+        names = [c.last_name for c in repo.iter_clients()]
+        repo.add(make_client(1, last_name="Иванов"))
+        after_add = [c.last_name for c in repo.iter_clients()]
+
+        assert_checks([
+            (merged == expected, "iter_range сливает шарды по полю и id"),
+            (merged_desc == expected_desc, "Слияние по убыванию"),
+            (ranged == [c.id for c in expected if 100.0 <= c.total_spending <= 300.0], "Диапазон значений"),
+            (repo.iter_range('city') is None, "Поле без упорядоченного индекса: None"),
+            (names == sorted(names) and after_add == sorted(after_add), "sort_by_field: порядок хранения по полю"),
+            (Client_rep_sharded(repo.file_path)._settings['order_by'] == 'last_name',
+             "Порядок сохраняется в манифесте"),
+        ])
+        print("✅ Слияние потоков работает корректно!\n")
+
+
+def test_manifest():
+    """Тест манифеста."""
+    print("=" * 80)
+    print("ТЕСТ 4: Манифест")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 20, shard_count=3, extension='.json.gz', compact=True)
+        reopened = Client_rep_sharded(repo.file_path)
+
+        try:
+            Client_rep_sharded(repo.file_path, shard_count=4)
+            mismatch_rejected = False
+        except ValueError:
+            mismatch_rejected = True
+
+        try:
+            Client_rep_sharded(tempfile.mkdtemp(dir=directory), shard_by='email')
+            key_rejected = False
+        except ValueError:
+            key_rejected = True
+
+        files = sorted(os.listdir(repo.file_path))
+        assert_checks([
+            (files == ['clients-000.json.gz', 'clients-001.json.gz', 'clients-002.json.gz', MANIFEST_NAME],
+             "Шарды и манифест в папке"),
+            (reopened.shard_count == 3 and reopened.get_count() == 20, "Параметры берутся из манифеста"),
+            ([c.to_dict() for c in reopened.iter_clients()] == [c.to_dict() for c in repo.iter_clients()],
+             "Данные загружаются"),
+            (mismatch_rejected, "Другое число шардов: ValueError"),
+            (key_rejected, "Неизвестное поле разбиения: ValueError"),
+        ])
+        print("✅ Манифест работает корректно!\n")
+
+
+def test_decorator_and_app():
+    """Тест декоратора и приложения."""
+    print("=" * 80)
+    print("ТЕСТ 5: Декоратор и приложение")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 60, shard_count=4)
+        decorated = Client_rep_file_decorator(repo).set_filter("city", "Казань").set_sort("total_spending", True)
+        ids = [client.id for client in decorated.get_k_n_short_list(1, 5)]
+        expected = [c.id for c in sorted((c for c in repo.iter_clients() if c.city == "Казань"),
+                                         key=lambda c: (c.total_spending, -c.id), reverse=True)][:5]
+        top = Client_rep_file_decorator(repo).set_sort("total_spending")
+        top_ids = [client.id for client in top.get_k_n_short_list(1, 3)]
+
+        client = create_app(repo).test_client()
+        page = client.get("/?page=2&page_size=5").get_data(as_text=True)
+        api = client.get("/api/clients?limit=3").get_json()
+
+        assert_checks([
+            (ids == expected, "Фильтр и сортировка через декоратор"),
+            (top_ids == [c.id for c in repo.iter_range('total_spending')][:3],
+             "Первая страница по упорядоченному полю"),
+            ('<tr data-id="6">' in page and '<tr data-id="11">' not in page, "Главная страница с пагинацией"),
+            ([item['id'] for item in api['items']] == [1, 2, 3], "JSON API"),
+        ])
+        print("✅ Репозиторий работает с декоратором и приложением!\n")
+
+
+if __name__ == "__main__":
+    test_id_sharding()
+    test_city_sharding()
+    test_merge()
+    test_manifest()
+    test_decorator_and_app()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
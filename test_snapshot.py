@@ -0,0 +1,186 @@
+"""
+Тест двоичного снимка репозитория.
+
+Проверяет:
+1. Запись и чтение снимка без потери данных
+2. Загрузку из снимка, только если он записан по текущему основному файлу
+3. Обновление снимка при изменении коллекции
+4. Восстановление при поврежденном снимке
+"""
+
+import os
+import tempfile
+from src.models.client import Client
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.client_rep_yaml import Client_rep_yaml
+from src.repositories.client_snapshot import SNAPSHOT_SUFFIX, read_snapshot, source_signature, write_snapshot
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+def make_client(client_id: int, last_name: str = "Иванов", city: str = "Москва") -> Client:
+    """Создает тестового клиента."""
+    return make_base_client(
+        client_id, last_name, city, total_spending=client_id * 1000.25,
+        patronymic="Петрович" if client_id % 2 else "", zip_code=100000 + client_id, house=f"{client_id}к2"
+    )
+
+
+def make_repo(directory: str, repo_class, count: int, snapshot: bool = True):
+    """Создает файловый репозиторий с count клиентами во временной папке."""
+    name = "clients.json" if repo_class is Client_rep_json else "clients.yaml"
+    path = os.path.join(tempfile.mkdtemp(dir=directory), name)
+    seed = repo_class(path)
+    for i in range(1, count + 1):
+        seed.add(make_client(i, city="Москва" if i % 3 else "Казань"))
+    return repo_class(path, snapshot=snapshot), path
+
+
+def set_mtime(path: str, offset: float) -> None:
+    """Сдвигает время изменения файла на offset секунд."""
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + offset))
+
+
+def test_round_trip():
+    """Тест записи и чтения снимка."""
+    print("=" * 80)
+    print("ТЕСТ 1: Запись и чтение")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        clients = [make_client(i, city="Москва" if i % 2 else "Санкт-Петербург") for i in range(1, 51)]
+        path = os.path.join(directory, "clients.snap")
+        write_snapshot(path, clients)
+        restored = read_snapshot(path)
+
+        write_snapshot(path, [])
+        empty = read_snapshot(path)
+
+        assert_checks([
+            ([c.to_dict() for c in restored] == [c.to_dict() for c in clients], "Все поля совпадают"),
+            (isinstance(restored[0], Client) and restored[0].city == "Москва", "Восстановлены объекты Client"),
+            (empty == [], "Пустая коллекция"),
+        ])
+        print("✅ Снимок сохраняет данные без потерь!\n")
+
+
+def test_startup_from_snapshot():
+    """Тест загрузки при запуске."""
+    print("=" * 80)
+    print("ТЕСТ 2: Загрузка при запуске")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = []
+        for repo_class in (Client_rep_json, Client_rep_yaml):
+            repo, path = make_repo(directory, repo_class, 20)
+            snapshot_path = path + SNAPSHOT_SUFFIX
+            created = os.path.exists(snapshot_path)
+
+            # Снимок с другими данными, записанный по текущему основному файлу, - используется он
+            write_snapshot(snapshot_path, [make_client(1, last_name="Снимков")], source_signature(path))
+            from_snapshot = repo_class(path, snapshot=True).get_by_id(1).last_name
+
+            # Основной файл изменен позже снимка (например, вручную) - снимок игнорируется
+            set_mtime(path, 10)
+            reloaded = repo_class(path, snapshot=True)
+            rewritten = read_snapshot(snapshot_path)
+
+            # Файл изменен в пределах одной метки времени (грубые метки времени):
+            # размер прежний, время изменения равно времени снимка - снимок все равно игнорируется
+            repo_class(path).replace_by_id(2, make_client(2, last_name="Петров"))
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, os.stat(snapshot_path).st_mtime_ns))
+            same_time = repo_class(path, snapshot=True).get_by_id(2).last_name
+
+            results.append((repo_class.__name__, created, from_snapshot, reloaded.get_count(), len(rewritten),
+                            same_time))
+
+        disabled, disabled_path = make_repo(directory, Client_rep_json, 3, snapshot=False)
+        disabled.add(make_client(4))
+
+        assert_checks([
+            (all(result[1] for result in results), "Снимок создается при первой загрузке"),
+            (all(result[2] == "Снимков" for result in results), "Актуальный снимок загружается вместо файла"),
+            (all(result[3] == 20 for result in results), "Устаревший снимок игнорируется"),
+            (all(result[4] == 20 for result in results), "Устаревший снимок перезаписывается"),
+            (all(result[5] == "Петров" for result in results), "Изменение без сдвига времени замечается"),
+            (not os.path.exists(disabled_path + SNAPSHOT_SUFFIX), "Без snapshot=True снимок не пишется"),
+        ])
+        print("✅ Снимок используется только если он актуален!\n")
+
+
+def test_snapshot_follows_changes():
+    """Тест обновления снимка при изменениях."""
+    print("=" * 80)
+    print("ТЕСТ 3: Обновление снимка")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo, path = make_repo(directory, Client_rep_json, 5)
+        snapshot_path = path + SNAPSHOT_SUFFIX
+        repo.add(make_client(1, last_name="Новиков"))
+        repo.replace_by_id(2, make_client(2, last_name="Петров"))
+        repo.delete_by_id(3)
+        lazy = len(read_snapshot(snapshot_path)) == 5
+        restarted = Client_rep_json(path, snapshot=True)
+        from_json = Client_rep_json(path)
+
+        interval_repo = Client_rep_json(path, snapshot=True, snapshot_interval=2)
+        interval_repo.add(make_client(1))
+        after_one = len(read_snapshot(snapshot_path))
+        interval_repo.add(make_client(1))
+        after_two = len(read_snapshot(snapshot_path))
+        interval_repo.delete_by_id(1)
+        interval_repo.close()
+        after_close = len(read_snapshot(snapshot_path))
+
+        assert_checks([
+            ([c.to_dict() for c in restarted.iter_clients()] == [c.to_dict() for c in from_json.iter_clients()],
+             "Снимок совпадает с основным файлом"),
+            (restarted.get_by_id(6).last_name == "Новиков" and restarted.get_by_id(3) is None, "Изменения сохранены"),
+            (restarted.find_equal('city', 'Казань') is not None, "Индексы строятся по загруженным данным"),
+            (lazy, "Снимок не переписывается при каждом изменении"),
+            ((after_one, after_two, after_close) == (5, 7, 6), "Снимок пишется раз в snapshot_interval и в close()"),
+        ])
+        print("✅ Снимок обновляется вместе с файлом!\n")
+
+
+def test_corrupted_snapshot():
+    """Тест поврежденного снимка."""
+    print("=" * 80)
+    print("ТЕСТ 4: Поврежденный снимок")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, path = make_repo(directory, Client_rep_json, 10)
+        snapshot_path = path + SNAPSHOT_SUFFIX
+        with open(snapshot_path, 'r+b') as f:
+            f.seek(-5, os.SEEK_END)
+            f.write(b'\xff\xff\xff\xff\xff')
+
+        try:
+            read_snapshot(snapshot_path)
+            rejected = False
+        except ValueError:
+            rejected = True
+        repo = Client_rep_json(path, snapshot=True)
+        repaired = len(read_snapshot(snapshot_path))
+
+        assert_checks([
+            (rejected, "Контрольная сумма обнаруживает повреждение"),
+            (repo.get_count() == 10, "Данные загружаются из основного файла"),
+            (repaired == 10, "Снимок перезаписан"),
+        ])
+        print("✅ Поврежденный снимок не мешает запуску!\n")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_startup_from_snapshot()
+    test_snapshot_follows_changes()
+    test_corrupted_snapshot()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
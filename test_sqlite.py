@@ -0,0 +1,267 @@
+"""
+Тест репозитория во встроенной базе SQLite (Client_rep_sqlite).
+
+Проверяет:
+1. CRUD и выдачу id
+2. Массовую вставку пачками
+3. Постраничный вывод и обход
+4. Декоратор БД: фильтры, сортировка, keyset-страницы и индексы
+5. Адаптер и приложение (SQLITE_PATH), версия данных из БД
+"""
+
+import os
+import tempfile
+from app import create_app
+from src.models.client import Client
+from src.core.sqlite_manager import SQLite_manager
+from src.decorators.client_predicates import Prefix, Range
+from src.decorators.client_rep_db_decorator import Client_rep_db_decorator
+from src.repositories.client_rep_db_adapter import Client_rep_db_adapter
+from src.repositories.client_rep_sqlite import Client_rep_sqlite
+from testing_helpers import assert_checks, make_client as make_base_client
+
+
+class CountingRepo(Client_rep_sqlite):
+    """Репозиторий SQLite, считающий чтения счетчика изменений."""
+
+    def __init__(self, db_manager: SQLite_manager):
+        super().__init__(db_manager)
+        self.version_reads = 0
+
+    def _get_version_row(self):
+        self.version_reads += 1
+        return super()._get_version_row()
+
+
+CITIES = ["Москва", "Казань", "Тверь", "Омск", "Пермь"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов"]
+
+
+def make_client(client_id: int, last_name: str = None) -> Client:
+    """Создает тестового клиента."""
+    return make_base_client(
+        client_id, last_name or LAST_NAMES[client_id % len(LAST_NAMES)], CITIES[client_id % len(CITIES)],
+        total_spending=float((client_id * 7919) % 1000)
+    )
+
+
+def make_repo(directory: str, count: int = 0) -> Client_rep_sqlite:
+    """Создает репозиторий с count клиентами в новом файле базы."""
+    repo = Client_rep_sqlite(SQLite_manager(os.path.join(tempfile.mkdtemp(dir=directory), "clients.db")))
+    repo.add_many(make_client(i) for i in range(1, count + 1))
+    return repo
+
+
+def query_plan(repo: Client_rep_sqlite, sql: str, params: tuple) -> str:
+    """Возвращает план выполнения запроса одной строкой."""
+    rows = repo.db_manager.execute_query("EXPLAIN QUERY PLAN " + sql, params, fetch=True)
+    return " | ".join(row['detail'] for row in rows)
+
+
+def test_crud():
+    """Тест CRUD."""
+    print("=" * 80)
+    print("ТЕСТ 1: CRUD")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory)
+        first, second = make_client(1), make_client(1, last_name="Петров")
+        repo.add(first)
+        repo.add(second)
+        repo.replace_by_id(second.id, make_client(1, last_name="Сидоров"))
+        repo.delete_by_id(second.id)
+        third = make_client(1)
+        repo.add(third)
+
+        rejected = []
+        for operation in (lambda: repo.replace_by_id(100, make_client(1)), lambda: repo.delete_by_id(100)):
+            try:
+                operation()
+                rejected.append(False)
+            except ValueError:
+                rejected.append(True)
+
+        journal_mode = repo.db_manager.execute_query_single("PRAGMA journal_mode")[0]
+        reopened = Client_rep_sqlite(SQLite_manager(repo.db_manager.path))
+
+        assert_checks([
+            ((first.id, second.id) == (1, 2), "id выдаются базой"),
+            (third.id == 3, "id удаленного клиента не выдается повторно"),
+            (repo.get_by_id(2) is None and repo.get_by_id(1).to_dict() == first.to_dict(), "Удаление и чтение"),
+            (repo.get_count() == 2 and reopened.get_count() == 2, "Данные сохраняются в файле"),
+            (rejected == [True, True], "Отсутствующий id: ValueError"),
+            (journal_mode == 'wal', "Режим журнала WAL"),
+        ])
+        print("✅ CRUD работает корректно!\n")
+
+
+def test_add_many():
+    """Тест массовой вставки."""
+    print("=" * 80)
+    print("ТЕСТ 2: Массовая вставка")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 5)
+        clients = [make_client(1) for _ in range(25)]
+        added = repo.add_many(clients, batch_size=10)
+
+        class BrokenClient:
+            """Клиент, на котором вставка пачки падает."""
+
+            def __getattr__(self, name):
+                raise RuntimeError("нет данных")
+
+        partial = repo.add_many([make_client(1) for _ in range(10)] + [make_client(1), BrokenClient()], batch_size=10)
+
+        try:
+            repo.add_many([], batch_size=0)
+            batch_rejected = False
+        except ValueError:
+            batch_rejected = True
+
+        assert_checks([
+            (added == 25 and [c.id for c in clients] == list(range(6, 31)), "id присвоены подряд"),
+            (repo.get_by_id(30).email == clients[-1].email, "Клиенты записаны"),
+            (partial == 10 and repo.get_count() == 40, "Ошибка откатывает только свою пачку"),
+            (batch_rejected, "Размер пачки < 1: ValueError"),
+        ])
+        print("✅ Массовая вставка работает корректно!\n")
+
+
+def test_paging():
+    """Тест постраничного вывода."""
+    print("=" * 80)
+    print("ТЕСТ 3: Постраничный вывод и обход")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 50)
+        repo.delete_by_id(3)
+        repo.delete_by_id(12)
+        expected = [i for i in range(1, 51) if i not in (3, 12)]
+
+        page = [c.id for c in repo.get_k_n_short_list(2, 10)]
+        after = repo.get_page_after((None, 10), 5)
+        pages, cursor = [], None
+        while True:
+            chunk = repo.get_page_after(cursor, 7)
+            if not chunk:
+                break
+            pages.extend(c.id for c in chunk)
+            cursor = (chunk[-1].id, chunk[-1].id)
+
+        assert_checks([
+            (page == expected[10:20], "Страница k списка"),
+            (repo.get_k_n_short_list(10, 10) == [], "Страница за концом - пустой список"),
+            ([c.id for c in after] == [11, 13, 14, 15, 16], "Keyset-страница после id"),
+            (pages == expected, "Обход keyset-страницами"),
+            ([c.id for c in repo.iter_clients(batch_size=4)] == expected, "iter_clients пачками"),
+        ])
+        print("✅ Постраничный вывод работает корректно!\n")
+
+
+def test_decorator():
+    """Тест декоратора БД над SQLite."""
+    print("=" * 80)
+    print("ТЕСТ 4: Декоратор БД")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = make_repo(directory, 200)
+        clients = list(repo.iter_clients())
+
+        decorated = Client_rep_db_decorator(repo).set_filter('city', 'Казань').set_sort('total_spending', 'DESC')
+        expected = sorted((c for c in clients if c.city == 'Казань'), key=lambda c: (-c.total_spending, c.id))
+        pages, cursor = [], None
+        while True:
+            chunk = decorated.get_page_after(cursor, 6)
+            if not chunk:
+                break
+            pages.extend(c.id for c in chunk)
+            cursor = (chunk[-1].total_spending, chunk[-1].id)
+
+        predicate = Range('total_spending', low=100.0, high=500.0) & Prefix('last_name', 'Пет')
+        filtered = Client_rep_db_decorator(repo).set_predicate(predicate)
+        expected_filtered = [c.id for c in clients if predicate.matches(c)]
+
+        sorted_plan = query_plan(repo, "SELECT * FROM clients ORDER BY last_name, id LIMIT 5", ())
+        city_plan = query_plan(repo, "SELECT * FROM clients WHERE city = %s", ('Казань',))
+
+        assert_checks([
+            ([c.id for c in decorated.get_k_n_short_list(1, 5)] == [c.id for c in expected[:5]],
+             "Фильтр и сортировка по убыванию"),
+            (pages == [c.id for c in expected], "Keyset-страницы декоратора"),
+            (decorated.get_count() == len(expected), "Количество с фильтром"),
+            ([c.id for c in filtered.iter_clients()] == expected_filtered, "Диапазон и префикс (LIKE)"),
+            (Client_rep_db_decorator(repo).set_filter('last_name', 'пет').get_count() == 0,
+             "Сравнение с учетом регистра"),
+            ('idx_clients_last_name' in sorted_plan and 'TEMP B-TREE' not in sorted_plan,
+             "ORDER BY поле, id идет по индексу"),
+            ('idx_clients_city' in city_plan, "Фильтр по городу идет по индексу"),
+        ])
+        print("✅ Декоратор работает с SQLite!\n")
+
+
+def test_app():
+    """Тест адаптера и приложения."""
+    print("=" * 80)
+    print("ТЕСТ 5: Адаптер и приложение")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_repo(directory, 30).db_manager.path
+        app = create_app(config={'SQLITE_PATH': path})
+        client = app.test_client()
+
+        page = client.get("/?page=2&page_size=5").get_data(as_text=True)
+        first = client.get("/api/clients?limit=4&sort_by=total_spending").get_json()
+        second = client.get(f"/api/clients?limit=4&sort_by=total_spending&cursor={first['next_cursor']}").get_json()
+        filtered = client.get("/api/clients?limit=50&filter_city=Тверь").get_json()
+
+        etag = client.get("/").headers["ETag"]
+        cached = client.get("/", headers={"If-None-Match": etag}).status_code
+
+        # Запись из другого процесса: отдельное соединение с тем же файлом
+        adapter = Client_rep_db_adapter(Client_rep_sqlite(SQLite_manager(path)))
+        version = adapter.get_version()
+        generation = adapter.get_generation()
+        new_client = make_client(1, last_name="Новиков")
+        adapter.add(new_client)
+        after_add = client.get("/", headers={"If-None-Match": etag})
+        SQLite_manager(path).execute_query("DELETE FROM clients WHERE id = %s", (new_client.id,), commit=True)
+
+        counting = CountingRepo(SQLite_manager(path))
+        counting_client = create_app(Client_rep_db_adapter(counting)).test_client()
+        reads_before = counting.version_reads
+        counting_client.get("/", headers={"If-None-Match": etag})
+        version_reads = counting.version_reads - reads_before
+
+        by_spending = sorted((make_client(i) for i in range(1, 31)), key=lambda c: (c.total_spending, c.id))
+        assert_checks([
+            ('<tr data-id="6">' in page and '<tr data-id="11">' not in page, "Главная страница с пагинацией"),
+            ([item['id'] for item in first['items'] + second['items']] == [c.id for c in by_spending[:8]],
+             "JSON API: курсор по сортировке"),
+            ({item['city'] for item in filtered['items']} == {'Тверь'} and len(filtered['items']) == 6,
+             "JSON API: фильтр по городу"),
+            (new_client.id == 31 and adapter.get_generation() == generation + 1, "Адаптер: добавление и поколение"),
+            (cached == 304 and after_add.status_code == 200 and after_add.headers["ETag"] != etag,
+             "ETag меняется при записи из другого соединения"),
+            (adapter.get_version() not in (version, after_add.headers["ETag"].strip('"')),
+             "Версия меняется при записи в обход адаптера"),
+            (version_reads == 1, "ETag и Last-Modified - одним чтением счетчика"),
+        ])
+        print("✅ SQLite работает через адаптер и приложение!\n")
+
+
+if __name__ == "__main__":
+    test_crud()
+    test_add_many()
+    test_paging()
+    test_decorator()
+    test_app()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
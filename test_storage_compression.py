@@ -0,0 +1,156 @@
+"""
+Тест сжатого хранения JSON/YAML репозиториев.
+
+Проверяет:
+1. Сохранение и загрузку сжатых файлов (gzip, bz2, xz) по расширению
+2. Дописывание в сжатый YAML
+3. Компактный JSON
+4. Поврежденные сжатые файлы
+"""
+
+import json
+import os
+import tempfile
+from src.repositories.client_rep_json import Client_rep_json
+from src.repositories.client_rep_yaml import Client_rep_yaml
+from src.repositories.file_compression import get_compression
+from testing_helpers import assert_checks, make_client
+
+
+# Первые байты сжатых файлов
+MAGIC = {'.gz': b'\x1f\x8b', '.bz2': b'BZh', '.xz': b'\xfd7zXZ'}
+
+
+def save(repo_class, path: str, count: int, **options):
+    """Сохраняет count клиентов в path и возвращает репозиторий."""
+    repo = repo_class(None, **options)
+    repo.file_path = path
+    repo._clients = [make_client(i) for i in range(1, count + 1)]
+    repo._save_to_file()
+    return repo
+
+
+def read_bytes(path: str) -> bytes:
+    """Возвращает содержимое файла."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def as_dicts(clients) -> list:
+    """Возвращает словари полей клиентов."""
+    return [client.to_dict() for client in clients]
+
+
+def test_round_trip():
+    """Тест сохранения и загрузки."""
+    print("=" * 80)
+    print("ТЕСТ 1: Сжатые файлы")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        checks = []
+        for repo_class, name in ((Client_rep_json, "clients.json"), (Client_rep_yaml, "clients.yaml")):
+            plain = save(repo_class, os.path.join(directory, name), 200)
+            plain_size = os.path.getsize(plain.file_path)
+            for extension, magic in MAGIC.items():
+                path = os.path.join(directory, name + extension)
+                save(repo_class, path, 200)
+                loaded = repo_class(path)
+                checks.append((
+                    read_bytes(path).startswith(magic) and os.path.getsize(path) < plain_size / 5
+                    and as_dicts(loaded.iter_clients()) == as_dicts(plain._clients),
+                    f"{repo_class.__name__}: {extension}"
+                ))
+
+        by_extension = get_compression("a.JSON.GZ") == '.gz' and get_compression("a.json") == ''
+        checks.append((by_extension, "Выбор по расширению"))
+        assert_checks(checks)
+        print("✅ Сжатые файлы сохраняются и загружаются!\n")
+
+
+def test_yaml_append():
+    """Тест дописывания в сжатый YAML."""
+    print("=" * 80)
+    print("ТЕСТ 2: Дописывание в сжатый YAML")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        checks = []
+        for extension in MAGIC:
+            path = os.path.join(tempfile.mkdtemp(dir=directory), "clients.yaml" + extension)
+            save(Client_rep_yaml, path, 3)
+            before = read_bytes(path)
+            repo = Client_rep_yaml(path)
+            repo.add(make_client(1, last_name="Петров"))
+            reopened = Client_rep_yaml(path)
+            checks.append((
+                read_bytes(path).startswith(before) and reopened.get_by_id(4).last_name == "Петров",
+                f"{extension}: новый поток дописан, файл читается целиком"
+            ))
+
+        assert_checks(checks)
+        print("✅ Дописывание в сжатые файлы работает!\n")
+
+
+def test_compact_json():
+    """Тест компактного JSON."""
+    print("=" * 80)
+    print("ТЕСТ 3: Компактный JSON")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pretty = save(Client_rep_json, os.path.join(directory, "pretty.json"), 100)
+        compact = save(Client_rep_json, os.path.join(directory, "compact.json"), 100, compact=True)
+        text = read_bytes(compact.file_path).decode('utf-8')
+        pretty_text = read_bytes(pretty.file_path).decode('utf-8')
+
+        repo = Client_rep_json(compact.file_path, compact=True)
+        repo.replace_by_id(5, make_client(5, last_name="Петров"))
+        reopened = Client_rep_json(compact.file_path)
+
+        print(f"  Размер: с отступами {len(pretty_text)} симв., компактный {len(text)} симв.")
+        assert_checks([
+            (pretty_text == json.dumps(as_dicts(pretty._clients), ensure_ascii=False, indent=2),
+             "Формат с отступами не изменился"),
+            (json.loads(text) == as_dicts(pretty._clients), "Компактный JSON содержит те же данные"),
+            (len(text) < len(pretty_text) * 0.8 and text.count('\n') == 101, "Без отступов, клиент на строку"),
+            (reopened.get_by_id(5).last_name == "Петров" and '  ' not in read_bytes(compact.file_path).decode('utf-8'),
+             "Режим сохраняется при изменениях"),
+        ])
+        print("✅ Компактный JSON работает!\n")
+
+
+def test_corrupted():
+    """Тест поврежденных файлов."""
+    print("=" * 80)
+    print("ТЕСТ 4: Поврежденные файлы")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        checks = []
+        for repo_class, name in ((Client_rep_json, "clients.json"), (Client_rep_yaml, "clients.yaml")):
+            for extension in MAGIC:
+                path = os.path.join(tempfile.mkdtemp(dir=directory), name + extension)
+                save(repo_class, path, 50)
+                data = read_bytes(path)
+                with open(path, 'wb') as f:
+                    f.write(data[:len(data) // 2])
+                try:
+                    count = repo_class(path).get_count()
+                except Exception as e:
+                    count = f"исключение {type(e).__name__}"
+                checks.append((count == 0, f"{repo_class.__name__}{extension}: обрезанный файл - пустой список"))
+
+        assert_checks(checks)
+        print("✅ Поврежденные файлы обрабатываются!\n")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_yaml_append()
+    test_compact_json()
+    test_corrupted()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
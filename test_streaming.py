@@ -0,0 +1,123 @@
+"""
+Тест потоковой отдачи списка клиентов.
+
+Проверяет:
+1. Заголовок страницы отдается до чтения данных из репозитория
+2. Потоковая страница совпадает с render_main_page для тех же клиентов
+3. Память не растет с числом строк
+4. Маршрут /export (с фильтром и сортировкой)
+"""
+
+import os
+import tempfile
+import tracemalloc
+from app import create_app
+from src.models.client import ClientShort
+from src.mvc.client_view import ClientView, STREAM_BATCH_ROWS
+from src.repositories.client_rep_json import Client_rep_json
+from testing_helpers import assert_checks, make_client
+
+
+def test_stream_main_page():
+    """Тест генератора страницы: порядок частей и совпадение с обычной страницей."""
+    print("=" * 80)
+    print("ТЕСТ 1: Генератор страницы")
+    print("=" * 80)
+
+    view = ClientView()
+    clients = [ClientShort(make_client(i, "Иванов")) for i in range(1, 2 * STREAM_BATCH_ROWS + 2)]
+    consumed = []
+
+    def rows():
+        for client in clients:
+            consumed.append(client.id)
+            yield client
+
+    stream = view.stream_main_page(rows())
+    head = next(stream)
+    consumed_before_head = len(consumed)
+    parts = [head] + list(stream)
+
+    assert_checks([
+        (consumed_before_head == 0 and "<!DOCTYPE html>" in head, "Заголовок отдается до чтения данных"),
+        (len(parts) == 1 + 3 + 1, "Строки отдаются пачками по STREAM_BATCH_ROWS"),
+        ("".join(parts) == view.render_main_page(clients), "Результат совпадает с render_main_page"),
+        ("".join(view.stream_main_page([])).rstrip().endswith("</html>"), "Пустой список: страница завершена"),
+    ])
+    print("✅ Генератор страницы работает корректно!\n")
+
+
+def test_stream_memory():
+    """Тест памяти: пик не зависит от числа строк."""
+    print("=" * 80)
+    print("ТЕСТ 2: Память при потоковой отдаче")
+    print("=" * 80)
+
+    view = ClientView()
+    template = ClientShort(make_client(1, "Иванов"))
+
+    def peak_for(count: int) -> int:
+        tracemalloc.start()
+        for _ in view.stream_main_page(template for _ in range(count)):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    small, large = peak_for(1_000), peak_for(50_000)
+    print(f"  Пик памяти: 1000 строк - {small} байт, 50000 строк - {large} байт")
+
+    assert_checks([
+        (large < small * 2, "Пик памяти не растет с числом строк"),
+    ])
+    print("✅ Потоковая отдача не накапливает страницу в памяти!\n")
+
+
+def test_export_route():
+    """Тест маршрута /export."""
+    print("=" * 80)
+    print("ТЕСТ 3: Маршрут /export")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = Client_rep_json(os.path.join(directory, "test_streaming.json"))
+        repo._clients = [
+            make_client(1, "Иванов"),
+            make_client(2, "Петров", city="Казань"),
+            make_client(3, "Сидоров"),
+        ]
+        repo._touch()
+        client = create_app(repo).test_client()
+
+        full = client.get("/export", headers={"Accept-Encoding": "gzip"})
+        streamed = full.is_streamed
+        html = full.get_data(as_text=True)
+        filtered_url = "/export?filter_city=Москва&sort_by=total_spending&sort_order=DESC"
+        filtered = client.get(filtered_url).get_data(as_text=True)
+        injected = [
+            client.get(f"{path}?sort_by=<script>alert(1)</script>").get_data(as_text=True)
+            for path in ("/", "/export")
+        ]
+
+        assert_checks([
+            (full.status_code == 200 and streamed, "Ответ отдается потоком"),
+            (full.headers.get("X-Accel-Buffering") == "no", "Буферизация прокси отключена"),
+            ("Content-Encoding" not in full.headers, "Потоковый ответ не сжимается целиком"),
+            (all(name in html for name in ("Иванов", "Петров", "Сидоров")), "Выгружены все клиенты"),
+            (html.rstrip().endswith("</html>"), "Страница завершена"),
+            ("Петров" not in filtered, "Фильтр по городу"),
+            (filtered.find("Сидоров") < filtered.find("Иванов"), "Сортировка по убыванию трат"),
+            (all("<script>" not in html and "&lt;script&gt;" in html for html in injected),
+             "Недопустимое поле сортировки экранируется в ошибке"),
+        ])
+        print("✅ Маршрут /export работает корректно!\n")
+
+
+if __name__ == "__main__":
+    test_stream_main_page()
+    test_stream_memory()
+    test_export_route()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
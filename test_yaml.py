@@ -0,0 +1,108 @@
+"""
+Тест YAML репозитория (Client_rep_yaml).
+
+Проверяет:
+1. Загрузчик и выгрузчик LibYAML
+2. Дописывание добавленных клиентов без перезаписи файла
+3. Чтение файлов старого формата (один документ со списком)
+"""
+
+import os
+import tempfile
+import yaml
+from src.repositories import client_rep_yaml
+from src.repositories.client_rep_yaml import Client_rep_yaml
+from testing_helpers import assert_checks, make_client
+
+
+def make_path(directory: str) -> str:
+    """Возвращает путь к YAML файлу во временной папке."""
+    return os.path.join(tempfile.mkdtemp(dir=directory), "clients.yaml")
+
+
+def read_bytes(path: str) -> bytes:
+    """Возвращает содержимое файла."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_libyaml():
+    """Тест выбора загрузчика."""
+    print("=" * 80)
+    print("ТЕСТ 1: LibYAML")
+    print("=" * 80)
+
+    print(f"  PyYAML собран с LibYAML: {yaml.__with_libyaml__}")
+    assert_checks([
+        (client_rep_yaml.HAS_LIBYAML == yaml.__with_libyaml__, "LibYAML используется, если доступна"),
+        ("Safe" in client_rep_yaml.SafeLoader.__name__, "Загрузчик безопасный"),
+    ])
+    print("✅ Загрузчик выбран корректно!\n")
+
+
+def test_append():
+    """Тест дописывания документов."""
+    print("=" * 80)
+    print("ТЕСТ 2: Дописывание")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_path(directory)
+        repo = Client_rep_yaml(path)
+        for i in range(1, 6):
+            repo.add(make_client(i))
+        before = read_bytes(path)
+        repo.add(make_client(1, last_name="Петров"))
+        after = read_bytes(path)
+
+        reopened = Client_rep_yaml(path)
+        documents = list(yaml.safe_load_all(after.decode('utf-8')))
+
+        repo.replace_by_id(2, make_client(2, last_name="Сидоров"))
+        repo.delete_by_id(3)
+        rewritten = Client_rep_yaml(path)
+
+        assert_checks([
+            (after.startswith(before) and after.count(b'---') == 6, "add дописывает один документ"),
+            (len(documents) == 6 and documents[5]['last_name'] == "Петров", "Каждый клиент - отдельный документ"),
+            ([c.id for c in reopened.iter_clients()] == [1, 2, 3, 4, 5, 6], "Дописанные клиенты загружаются"),
+            ('Петров' in after.decode('utf-8'), "Кириллица записывается без экранирования"),
+            ([c.id for c in rewritten.iter_clients()] == [1, 2, 4, 5, 6]
+             and rewritten.get_by_id(2).last_name == "Сидоров", "Замена и удаление перезаписывают файл"),
+        ])
+        print("✅ Дописывание работает корректно!\n")
+
+
+def test_legacy_format():
+    """Тест файла старого формата."""
+    print("=" * 80)
+    print("ТЕСТ 3: Старый формат")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_path(directory)
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.dump([make_client(i).to_dict() for i in (1, 2)], f, allow_unicode=True, sort_keys=False)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("---\n- {id: 3, last_name: Иванов}\n")
+
+        repo = Client_rep_yaml(path)
+        loaded = [c.id for c in repo.iter_clients()]
+        repo.add(make_client(1))
+        reopened = Client_rep_yaml(path)
+
+        assert_checks([
+            (loaded == [1, 2], "Список клиентов загружается, ошибочная запись пропускается"),
+            ([c.id for c in reopened.iter_clients()] == [1, 2, 3], "Дописывание после старого формата"),
+        ])
+        print("✅ Старый формат читается!\n")
+
+
+if __name__ == "__main__":
+    test_libyaml()
+    test_append()
+    test_legacy_format()
+
+    print("=" * 80)
+    print("ВСЕ ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("=" * 80)
@@ -0,0 +1,70 @@
+"""
+Общие помощники тестов: тестовые клиенты и проверка результатов.
+
+Тесты запускаются и через pytest, и напрямую (python test_*.py), поэтому
+проверки печатаются списком, а непрошедшие приводят к AssertionError.
+"""
+
+from typing import Iterable, Optional, Tuple
+from src.models.client import Client
+
+
+def make_client(
+    client_id: int,
+    last_name: str = "Иванов",
+    city: str = "Москва",
+    total_spending: Optional[float] = None,
+    **fields
+) -> Client:
+    """
+    Создает тестового клиента.
+
+    Телефон и email строятся по ID, траты по умолчанию - client_id * 100.
+
+    Args:
+        client_id: ID клиента
+        last_name: фамилия
+        city: город
+        total_spending: сумма трат (None - client_id * 100)
+        **fields: значения остальных полей Client
+
+    Returns:
+        Объект Client
+    """
+    data = dict(
+        id=client_id,
+        last_name=last_name,
+        first_name="Иван",
+        patronymic="",
+        phone=f"7999{client_id:07d}",
+        email=f"client{client_id}@mail.ru",
+        passport_series="1234",
+        passport_number="567890",
+        zip_code=123456,
+        city=city,
+        street="Ленина",
+        house="1",
+        total_spending=client_id * 100.0 if total_spending is None else total_spending
+    )
+    data.update(fields)
+    return Client(**data)
+
+
+def assert_checks(checks: Iterable[Tuple[bool, str]]) -> None:
+    """
+    Печатает результаты проверок и падает, если хотя бы одна не прошла.
+
+    Args:
+        checks: пары (результат проверки, описание)
+
+    Raises:
+        AssertionError: со списком описаний непрошедших проверок
+    """
+    failed = []
+    for check, description in checks:
+        status = "✓" if check else "✗"
+        print(f"  {status} {description}")
+        if not check:
+            failed.append(description)
+    if failed:
+        raise AssertionError("Не пройдены проверки: " + "; ".join(failed))